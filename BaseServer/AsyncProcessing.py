@@ -11,10 +11,22 @@ FUNCTION:
         ProcessStructure: Inherit from process with extra params like id and execution time metrics
         ProcessManager: Control all the ProcessStructure 
 
+    The return value of every ProcessStructure travels back over a pipe, the
+    multiprocessing Manager is only started when mGetManager() is called.
+    ProcessManager(aBackend=ProcessBackend.THREAD) runs the callbacks in
+    threads instead of forked processes (I/O bound callbacks, e.g. SSH).
+
 NOTE:
     None    
 
 History:
+    jydas       18/10/26  - Do not lose the wakeup of a thread ending while
+                            mWaitProcessEvents is not waiting
+    jydas       18/10/26  - Queue wait of the processes held by
+                            multiple_process_limit in the hot path metrics
+    jydas       18/10/26  - Start the multiprocessing Manager lazily, return
+                            values over pipes, event driven mJoinProcess and
+                            thread backend for I/O bound callbacks
     ririgoye    19/02/24  - 36305000: Added process killing enforcement and process start/end logging
     dekuckre    19/01/24  - 36203786: Correctly pick the process in waitlist to be processed
     ririgoye    01/22/24  - 36206720: Add checks to prevent failure when reaching
@@ -41,14 +53,17 @@ import errno
 import enum
 import traceback
 import json
+import threading
 import subprocess as sp
 from datetime import datetime
-from multiprocessing import Process, Manager, Array, Value
+from multiprocessing import Process, Manager, Array, Value, Pipe
+from multiprocessing import connection
 from exabox.core.Context import get_gcontext
 from exabox.core.Error import ExacloudRuntimeError
 from exabox.core.DBStore import ebGetDefaultDB
 from exabox.log.LogMgr import ebLogError, ebLogInfo, ebLogWarn, ebLogVerbose, ebLogDebug, ebLogJson, ebLogTrace
 from exabox.core.CrashDump import CrashDump
+from exabox.core.Metrics import ebMetricsObserve, ebMetricsDump
 
 
 def mExecuteLocal(aLogFx, aCmd, aCurrDir=None, aStdIn=sp.PIPE, aStdOut=sp.PIPE, aStdErr=sp.PIPE):
@@ -108,12 +123,22 @@ class ProcessStructure(Process):
         self.__persistState     = False
         self.__error            = Value(ctypes.c_bool, False)
         self.__running          = Value(ctypes.c_bool, False)
+        self.__return           = None
+        self.__retReader        = None
+        self.__retWriter        = None
+        self.__thread           = None
+        self.__doneEvent        = None
+        self.__queuedAt         = None
 
         self.mDebugHang()
         Process.__init__(self, target=self.mRealCallback, name=self.__id, args=self.__args)
 
     def mDebugHang(self):
 
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is not threading.main_thread():
+            return
+
         def debug(sig, frame):
 
             d={'_frame':frame}
@@ -130,11 +155,113 @@ class ProcessStructure(Process):
 
         if self.__manager is not None:
             self.__shared = self.__manager.dict()
+        elif self.__retReader is None:
+            self.__retReader, self.__retWriter = Pipe(duplex=False)
+
+    def mCloseReturnWriter(self):
+        # Parent side, the child keeps its own copy of the writer
+        if self.__retWriter is not None and self.__thread is None:
+            self.__retWriter.close()
+            self.__retWriter = None
+
+    def mGetReturnReader(self):
+        return self.__retReader
+
+    def mPollReturn(self):
+        # Drain the return value sent by the child, a child blocked on a big
+        # return value is released as soon as the parent reads it
+        if self.__retReader is None:
+            return
+        try:
+            if not self.__retReader.poll():
+                return
+            self.__return = self.__retReader.recv()
+        except (EOFError, OSError):
+            pass
+        self.__retReader.close()
+        self.__retReader = None
+
+    def run(self):
+        try:
+            Process.run(self)
+        finally:
+            # The forked process leaves with os._exit, atexit does not run
+            ebMetricsDump()
+
+    def mGetQueuedAt(self):
+        return self.__queuedAt
+
+    def mSetQueuedAt(self, aMonotonic):
+        self.__queuedAt = aMonotonic
+
+    def mIsThread(self):
+        return self.__thread is not None
+
+    def mStartThread(self, aDoneEvent=None):
+
+        def mThreadCallback():
+            try:
+                self.mRealCallback(*(self.__args or []))
+            except Exception:
+                # Already logged and flagged by mRealCallback
+                pass
+            finally:
+                if self.mGetEndTime() is None:
+                    self.mSetEndTime(self.mNow())
+                if self.__doneEvent is not None:
+                    self.__doneEvent.set()
+
+        self.__doneEvent = aDoneEvent
+        self.__thread = threading.Thread(target=mThreadCallback, name=self.__id, daemon=True)
+        self.__thread.start()
+
+    def is_alive(self):
+        if self.__thread is not None:
+            return self.__thread.is_alive()
+        self.mPollReturn()
+        return Process.is_alive(self)
+
+    def join(self, timeout=None):
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            return
+
+        _deadline = None
+        if timeout is not None:
+            _deadline = time.monotonic() + timeout
+
+        while self.__retReader is not None:
+            _remaining = None
+            if _deadline is not None:
+                _remaining = max(_deadline - time.monotonic(), 0)
+            _ready = connection.wait([self.sentinel, self.__retReader], _remaining)
+            self.mPollReturn()
+            if not _ready or self.sentinel in _ready:
+                break
+
+        if _deadline is not None:
+            Process.join(self, max(_deadline - time.monotonic(), 0))
+        else:
+            Process.join(self)
+
+    @property
+    def exitcode(self):
+        if self.__thread is not None:
+            if self.__thread.is_alive():
+                return None
+            return 1 if self.mGetError() else 0
+        return Process.exitcode.fget(self)
 
     def mRealCallback(self, *args, **kwargs):
 
         ebLogInfo(f"*** Invoking Callback for Process ID: {self.__id}. PID: {os.getpid()} | Callback Function: {self.__callback}")
 
+        if self.__thread is None and self.__retReader is not None:
+            # Child side, only the parent reads the return value
+            self.__retReader.close()
+            self.__retReader = None
+
         self.mDebugHang()
         self.mSetStartTime(self.mNow())
         self.mSetRunning(True)
@@ -190,6 +317,13 @@ class ProcessStructure(Process):
 
     def mKill(self):
 
+        if self.__thread is not None:
+            # Threads cannot be terminated, the daemon thread is abandoned
+            _fx = self.mGetLogTimeoutFx()
+            if _fx:
+                _fx("Unable to terminate thread ({0}), abandoning it".format(self.mStr()))
+            return
+
         _exacloudPath = os.path.abspath(__file__)
         _exacloudPath = _exacloudPath[0: _exacloudPath.rfind("exacloud")+8]
 
@@ -302,14 +436,22 @@ class ProcessStructure(Process):
         self.__error.value = aBool
 
     def mGetReturn(self):
-        if self.__shared is not None and "return" in list(self.__shared.keys()):
-            return self.__shared['return']
-        return None
+        if self.__shared is not None:
+            if "return" in list(self.__shared.keys()):
+                return self.__shared['return']
+            return None
+        self.mPollReturn()
+        return self.__return
 
     def mSetReturn(self, aReturn):
         if aReturn is not None:
             if self.__shared is not None:
                 self.__shared['return'] = aReturn
+            elif self.__thread is not None:
+                self.__return = aReturn
+            elif self.__retWriter is not None:
+                self.__return = aReturn
+                self.__retWriter.send(aReturn)
 
     def mGetArgs(self):
         return self.__args
@@ -382,16 +524,36 @@ class ExitCodeBehavior(enum.Enum):
     IGNORE = 1
     ERROR = 2
 
+class ProcessBackend(enum.Enum):
+    PROCESS = 1
+    THREAD = 2
+
 class ProcessManager(object):
 
-    def __init__(self, aTimeoutBehavior=TimeoutBehavior.ERROR, aExitCodeBehavior=ExitCodeBehavior.ERROR):
+    def __init__(self, aTimeoutBehavior=TimeoutBehavior.ERROR, aExitCodeBehavior=ExitCodeBehavior.ERROR, aBackend=ProcessBackend.PROCESS):
         self.__processList = []
         self.__wait_processlist = []
         self.__status = "idle" #idle, working, done, killed
         self.__timeoutBehavior = aTimeoutBehavior
         self.__exitcodeBehavior = aExitCodeBehavior
+        self.__backend = aBackend
+        self.__doneEvent = threading.Event()
+        self.__manager = None
         self.__managerStarted = False
         self.__maxNewDispatched = 5
+        self.__killedList = []
+
+    def __del__(self):
+        if self.__managerStarted:
+            self.__manager.shutdown()
+
+    def mMarkCurrentWorkerAsCorrupted(self):
+        _worker_pid = os.getpid()
+        _db_instance = ebGetDefaultDB()
+        _input_reg_key = f"{_worker_pid}_WORKER_CORRUPTED"
+        _db_instance.mSetRegEntry(_input_reg_key)
+
+    def mStartManager(self):
 
         _retries = 5
 
@@ -407,21 +569,16 @@ class ProcessManager(object):
                     raise
                 time.sleep(1)
 
-        self.__killedList = []
-
-    def __del__(self):
-        if self.__managerStarted:
-            self.__manager.shutdown()
-
-    def mMarkCurrentWorkerAsCorrupted(self):
-        _worker_pid = os.getpid()
-        _db_instance = ebGetDefaultDB()
-        _input_reg_key = f"{_worker_pid}_WORKER_CORRUPTED"
-        _db_instance.mSetRegEntry(_input_reg_key)
-
     def mGetManager(self):
+        # Only needed by the callers sharing Manager lists/dicts with the
+        # processes, return values do not use it
+        if not self.__managerStarted:
+            self.mStartManager()
         return self.__manager
 
+    def mGetBackend(self):
+        return self.__backend
+
     def mGetStatus(self):
         return self.__status
 
@@ -455,7 +612,6 @@ class ProcessManager(object):
 
     def mAppend(self, aProcess):
         self.__processList.append(aProcess)
-        aProcess.mSetManager(self.__manager)
         aProcess.mInitShared()
 
     def mGetProcessLimit(self):
@@ -470,11 +626,30 @@ class ProcessManager(object):
     def mStartAppend(self, aProcess):
         _pl = self.mGetProcessLimit()
         if self.mGetAliveCount() >= _pl:
+            if aProcess.mGetQueuedAt() is None:
+                aProcess.mSetQueuedAt(time.monotonic())
             self.__wait_processlist.append(aProcess)
         else:
             ebLogTrace(f"mStartAppend: {aProcess.mStr()}")
+            self.mRecordQueueWait(aProcess)
             self.mAppend(aProcess)
-            aProcess.start()
+            if self.__backend == ProcessBackend.THREAD:
+                aProcess.mStartThread(self.__doneEvent)
+            else:
+                aProcess.start()
+                aProcess.mCloseReturnWriter()
+
+    def mRecordQueueWait(self, aProcess):
+        """
+        Time spent in the wait list because of multiple_process_limit, 0 for
+        the processes started at once (core/Metrics.py)
+        """
+
+        _queuedAt = aProcess.mGetQueuedAt()
+        _wait = time.monotonic() - _queuedAt if _queuedAt is not None else 0
+        _callback = getattr(aProcess.mGetCallback(), "__name__", "callback")
+        ebMetricsObserve("process_queue_wait_us", _wait * 1000000,
+                         {"backend": self.__backend.name.lower(), "callback": _callback})
 
     def mGetProcess(self, aId):
         for _p in self.__processList:
@@ -504,6 +679,13 @@ class ProcessManager(object):
         return _timeoutP
 
     def mKillProcess(self, aProcess):
+
+        if aProcess.mIsThread():
+            aProcess.mKill()
+            if aProcess.mGetId() not in self.__killedList:
+                self.__killedList.append(aProcess.mGetId())
+            return
+
         try:
             # Do kill (SIGTERM)
             ebLogInfo(f"Killing process {aProcess.pid}")
@@ -595,13 +777,12 @@ class ProcessManager(object):
                         if self.__timeoutBehavior == TimeoutBehavior.ERROR:
                             _one_failure = True
 
-
-                    else:
-                        _process.join(_process.mGetJoinTimeout())
                 else:
                     if _process.mGetEndTime() is None:
                         _process.mSetEndTime(_process.mNow())
 
+            self.mWaitProcessEvents()
+
         if _one_failure:
             raise ExacloudRuntimeError(0x0756, 0xA,f"Error: {_process.mStr()}. Error while multiprocessing(Process timeout)")
 
@@ -619,6 +800,42 @@ class ProcessManager(object):
             self.__status = "done"
 
 
+    def mWaitProcessEvents(self):
+        """
+        Block until one of the alive processes finishes or sends its return
+        value, or until the next deadline (join timeout or max execution time).
+        """
+
+        _alive = self.mGetAliveProceses()
+        if not _alive:
+            return
+
+        _timeout = min([_p.mGetJoinTimeout() for _p in _alive])
+        for _process in _alive:
+            if _process.mGetMaxExecutionTime() != -1:
+                _execution = datetime.now() - _process.mGetStartTimeDT()
+                _remaining = _process.mGetMaxExecutionTime() - _execution.seconds + 1
+                _timeout = min(_timeout, max(_remaining, 0))
+
+        if self.__backend == ProcessBackend.THREAD:
+            # Clear before the check: a thread sets its end time before the
+            # event, so a thread ending after the check wakes up the wait
+            self.__doneEvent.clear()
+            if any([_p.mGetEndTime() is not None for _p in _alive]):
+                return
+            self.__doneEvent.wait(_timeout)
+            return
+
+        _objects = []
+        for _process in _alive:
+            _objects.append(_process.sentinel)
+            if _process.mGetReturnReader() is not None:
+                _objects.append(_process.mGetReturnReader())
+
+        connection.wait(_objects, _timeout)
+        for _process in _alive:
+            _process.mPollReturn()
+
     def mKillAll(self):
         for _process in self.__processList:
             if _process.is_alive():
@@ -14,6 +14,9 @@ NOTE:
 
 History:
    MODIFIED (MM/DD/YY)
+    jydas      10/18/26 - Read the workers and requests lists as typed rows
+    jydas      10/18/26 - Add /hotpath_metrics endpoint (hot path counters
+                          and histograms of all the exacloud processes)
     aypaul     06/17/26 - SecBug#39392679 Sanitise input for network_info
                           endpoint
     kanmanic   06/15/26 - 39560339 - Fix ECRA DB connection close guards
@@ -253,6 +256,7 @@ from exabox.ovm.cludiag import ebDownloadLog
 from exabox.ovm.cluincident import ebIncidentNode
 from exabox.core.Error import ExacloudRuntimeError
 from exabox.core.DBStore import ebGetDefaultDB
+from exabox.core.Metrics import ebMetricsEnabled, ebMetricsCollect, ebMetricsSummary
 from exabox.core.Core import ebExit
 from exabox.agent.Worker import ebWorkerFactory, ebWorker, gGetDefaultWorkerFactory
 from exabox.agent.Worker import daemonize_process, redirect_std_descriptors
@@ -693,8 +697,7 @@ def dispatchJobToWorker(aReq, _workerLock=None):
     if 'agent_delegation_enabled' in list(_coptions.keys()) and _coptions['agent_delegation_enabled'].upper() == 'TRUE':
         _uuid = '00000000-0000-0000-0000-000000000000'
         _idle_worker = 0
-        _rqlist = literal_eval(_db.mDumpWorkers())
-        for _worker in _rqlist:
+        for _worker in _db.mGetWorkerRows():
             if _worker[0] == _uuid and _worker[1] == 'Idle' and _worker[13] == "NORMAL":
                 _idle_worker = _idle_worker + 1
 
@@ -730,7 +733,7 @@ def dispatchJobToWorker(aReq, _workerLock=None):
             _uuid = '00000000-0000-0000-0000-000000000000'
             _port = 0
             _pid = 0
-            _idleworkers = literal_eval(_db.mDumpWorkers())
+            _idleworkers = _db.mGetWorkerRows()
             _random_idle_workers = random.sample(_idleworkers, k = len(_idleworkers))
             for _worker in _random_idle_workers:
                 if _worker[0] == _uuid and _worker[1] == 'Idle' and _worker[13] == "NORMAL":
@@ -1000,6 +1003,7 @@ class ebRestHttpListener(ExaHTTPRequestHandler):
             "/WWW"          : HttpCb({"GET"  : self.mAgentWWWContent  }, HTMLResponse), #outputs HTML / CSS / JS / JSON / XML / TXT / JPG
             "/logDownload"  : HttpCb({"GET"  : self.mAgentLogDownload }, FileResponse),
             "/system_metrics"    : HttpCb({"GET"  : self.mReturnSystemResourceUsage     }, JSONResponse),
+            "/hotpath_metrics"   : HttpCb({"GET"  : self.mReturnHotPathMetrics          }, JSONResponse),
             "/EDV"          : _edv_request_cb
         }
 
@@ -1410,6 +1414,26 @@ class ebRestHttpListener(ExaHTTPRequestHandler):
         _response = aResponse
         _response['system_metrics'] = json.dumps(_return_json)
 
+    def mReturnHotPathMetrics(self, aParams, aResponse): #--------/hotpath_metrics JSONResponse
+        """
+        Merged hot path metrics of the agent, workers and their processes.
+        Parameters: metric (only this metric), raw=True (buckets instead of
+        percentiles)
+        """
+
+        if not ebMetricsEnabled():
+            ErrorBuilder.response(404, 'metrics_registry_enabled is not set', aResponse)
+            return
+
+        _params = aParams or {}
+        _merged = ebMetricsCollect()
+        if str(_params.get('raw', 'False')).lower() == 'true':
+            _result = _merged
+        else:
+            _result = ebMetricsSummary(_merged, _params.get('metric'))
+            _result["processes"] = _merged["processes"]
+        aResponse['hotpath_metrics'] = json.dumps(_result)
+
     def mShowStatus(self, aParams, aResponse): #--------/Status JSONResponse
         self.mRefreshMock(aParams)
         if self.__mock_mode:
@@ -2175,7 +2199,7 @@ class ebRestHttpListener(ExaHTTPRequestHandler):
         if _cmd == 'refresh':
             _db = ebGetDefaultDB()
             try:
-                _wklist = literal_eval(_db.mDumpWorkers())
+                _wklist = _db.mGetWorkerRows()
             except:
                 ebLogError('*** DB access critical error please review DB integrity')
                 raise
@@ -2201,8 +2225,7 @@ class ebRestHttpListener(ExaHTTPRequestHandler):
                 _uuid = '00000000-0000-0000-0000-000000000000'
                 _port = 0
                 _db = ebGetDefaultDB()
-                _rqlist = literal_eval(_db.mDumpWorkers())
-                for _worker in _rqlist:
+                for _worker in _db.mGetWorkerRows():
                     if _worker[0] == _uuid and _worker[1] == 'Idle':
                         _port = _worker[9]
                         break
@@ -2473,23 +2496,26 @@ class ebRestHttpListener(ExaHTTPRequestHandler):
         _db = ebGetDefaultDB()
 
         try:
-            _rqlist = literal_eval(_db.mDumpRequests())
+            _rqlist = list(_db.mIterRequestRows(aOrderBy={"endtime": "ASC"}))
         except:
             ebLogError("Requests DB access failure in mAgentCluster")
             _rqlist = []
 
         _cluster_dir = {}
-        for _entry in _rqlist:
-            _request = ebJobRequest(None, {}, aDB=ebGetDefaultDB())
-            _request.mPopulate(_entry)
+        for _row in _rqlist:
+            if _row.xml == "Undef" or _row.error != "0":
+                continue
 
-            if ("configpath" not in list(_request.mGetParams().keys())) or (_request.mGetXml()=="Undef") or (_request.mGetError()!="0"):
+            _params = _row.mGetParams()
+            if not isinstance(_params, dict) or "configpath" not in _params:
                 continue
 
-            _config = _request.mGetParams()["configpath"]
+            _config = _params["configpath"]
 
             # For now just use the first XML configuration
             if not _config in list(_cluster_dir.keys()):
+                _request = ebJobRequest(None, {}, aDB=_db)
+                _request.mPopulate(_row._replace(params=_params, body=''))
                 _cluster_dir[_config] = {}
                 _cluster_dir[_config]["request"] = vars(_request)
 
@@ -2563,7 +2589,7 @@ class ebRestHttpListener(ExaHTTPRequestHandler):
         _db = ebGetDefaultDB()
 
         try:
-            _rqlist = literal_eval(_db.mDumpWorkers())
+            _rqlist = _db.mGetWorkerRows()
         except:
             ebLogError("Workers DB access failure in mAgentWorkers")
             _rqlist = []
@@ -18,6 +18,9 @@ NOTE:
 History:
 
     MODIFIED   (MM/DD/YY)
+       jydas    10/18/26 - Use typed worker rows instead of literal_eval
+       jydas    10/18/26 - Push requests to the workers through notify sockets
+                           instead of polling the DB every second
        aypaul   03/03/26 - Bug#38900084 Fix code issues from codev
        shapatna 10/08/25 - Close open sockets caused by initiating Database
                            connection
@@ -25,7 +28,6 @@ History:
 import json
 import datetime
 import os
-import ast
 import time
 import uuid
 import signal
@@ -41,6 +43,8 @@ from exabox.agent.Worker import daemonize_process, redirect_std_descriptors
 from exabox.agent.WClient import ebWorkerCmd
 from exabox.core.Context import get_gcontext
 from exabox.agent.Worker import ebWorkerFactory, ebWorker, gGetDefaultWorkerFactory
+from exabox.agent.WorkerNotify import (ebNotifyEnabled, ebNotifyFallbackInterval, ebNotifySocket,
+                                       ebNotifyWorker, ebNotifyDispatcher, NOTIFY_DISPATCHER)
 
 class ebDispatcher(object):
     _port = 66666
@@ -51,6 +55,7 @@ class ebDispatcher(object):
         self._running = False
         self._worker_factory = ebWorkerFactory()
         self._notify = threading.Event()
+        self._notify_sock = None
         signal.signal(signal.SIGINT, self._mSigHandler)
         signal.signal(signal.SIGTERM, self._mSigHandler)
 
@@ -81,12 +86,32 @@ class ebDispatcher(object):
         ebLogAddDestinationToLoggers([ebGetDefaultLoggerName()], 'log/workers/dflt_dispatcher', ebFormattersEnum.DEFAULT)
         ebLogInfo('Starting dispatcher')
 
+        # New requests and idle workers are notified through the dispatcher
+        # socket, the DB is polled as fallback every worker_notify_fallback_sec
+        if ebNotifyEnabled():
+            self._notify_sock = ebNotifySocket(NOTIFY_DISPATCHER)
+            if self._notify_sock.mOpen():
+                self._timeout = ebNotifyFallbackInterval()
+            else:
+                self._notify_sock = None
+
         self._running = True
         while self._running:
-            self.mDispatcher()
-            self._notify.wait(self._timeout)
+            if self.mDispatcher():
+                # More requests may be pending
+                continue
+            self.mWaitNotification(self._timeout)
+
+        if self._notify_sock is not None:
+            self._notify_sock.mClose()
         ebLogInfo('Exiting dispatcher')
 
+    def mWaitNotification(self, aTimeout):
+        if self._notify_sock is not None and self._running:
+            self._notify_sock.mWait(aTimeout)
+        else:
+            self._notify.wait(aTimeout)
+
 
     def mDispatcher(self):
         _idle_uuid = '00000000-0000-0000-0000-000000000000'
@@ -102,21 +127,21 @@ class ebDispatcher(object):
             _uuid = _row[0]
             ebLogInfo(f'mDispatcher: Finding a worker for uuid {_uuid}')
         else:
-            return
+            return False
 
         try:
             while _worker_assigned is False:
-                _idleworkers = ast.literal_eval(self._db.mGetIdleWorkers())
+                _idleworkers = self._db.mGetWorkerRows(aIdle=True)
                 _random_idle_workers = random.sample(_idleworkers, k = len(_idleworkers))
                 for _worker in _random_idle_workers:
-                    _port = _worker[9]
-                    _pid = _worker[8]
+                    _port = _worker.port
+                    _pid = _worker.pid
                     if _port == 0 or _pid == 0:
                         ebLogWarn(f'mDispatcher: Invalid worker present with port {_port} and pid {_pid}')
                         continue
 
                     _thisWorker = ebWorker(aDB=self._db)
-                    _thisWorker.mLoadWorkerFromDB(int(_worker[9]))
+                    _thisWorker.mLoadWorkerFromDB(int(_worker.port))
                     if _thisWorker.mAcquireSyncLock("Dispatcher"):
                         _worker_lock_acquired = True
                         break
@@ -124,14 +149,18 @@ class ebDispatcher(object):
                     _thisWorker = None
 
                 if _thisWorker is None:
-                    ebLogWarn('Unable to get a worker yet.. Will try again after 1 sec')
-                    time.sleep(1)
+                    if self._notify_sock is not None:
+                        ebLogWarn('Unable to get a worker yet.. Will try again once a worker is idle')
+                    else:
+                        ebLogWarn('Unable to get a worker yet.. Will try again after 1 sec')
+                    self.mWaitNotification(1)
                     continue
 
                 ebLogInfo('*** LOADING WORKER ***')
                 _thisWorker.mSetUUID(_uuid)
                 _thisWorker.mUpdateDB()
                 ebLogInfo(f"Request with UUID: {_uuid} is allocated to worker with port {_port}")
+                ebNotifyWorker(_port, _uuid)
                 _worker_assigned = True
         except Exception as e: 
             ebLogError(f"*** mDispatcher: Exception occured while dispatching request {_uuid}, Exception:{e}")
@@ -140,6 +169,8 @@ class ebDispatcher(object):
                 if _thisWorker.mReleaseSyncLock("Dispatcher") == False:
                     ebLogError(f"*** mDispatcher: Unable to release lock !!!")
 
+        return _worker_assigned
+
     def mStop(self):
         self._running = False
         self._timeout = 0
@@ -150,6 +181,8 @@ class ebDispatcher(object):
         worker.mSetStatus('Exited')
         self._db.mUpdateWorker(worker)
         self._notify.set()
+        if self._notify_sock is not None:
+            ebNotifyDispatcher('stop')
 
     def _mSigHandler(self, signum, frame):
         ebLogInfo('Handling signal {0}'.format(signum))
@@ -18,6 +18,7 @@ NOTE:
 History:
 
     MODIFIED   (MM/DD/YY)
+       jydas       10/18/26 - Use typed worker rows instead of literal_eval
        naps        11/06/25 - Bug 38566523 - remove redundant worker
                               termination logic in supervisor.
        aypaul      03/21/24 - Bug#36391673 Enclose supervisor   main loop with
@@ -444,11 +445,11 @@ class ebSupervisor(object):
                     ebLogWarn("Unsuccessful update for environment resource statistics.")
 
     def mGetCorruptedWorkersForTermination(self):
-        _rqlist = ast.literal_eval(self._db.mDumpWorkers("00000000-0000-0000-0000-000000000000"))
+        _rqlist = self._db.mGetWorkerRows("00000000-0000-0000-0000-000000000000")
         _list_of_workers_to_terminate = list()
         for _worker in _rqlist:
-            if _worker[13] == "CORRUPTED":
-                _port = _worker[9]
+            if _worker.state == "CORRUPTED":
+                _port = _worker.port
                 ebLogInfo(f"Worker with port {_port} is corrupted and is selected for termination.")
                 _list_of_workers_to_terminate.append(_port)
 
@@ -480,7 +481,7 @@ class ebSupervisor(object):
 
     def mGetIdleWorkersForTermination(self):
         _coptions = get_gcontext().mGetConfigOptions()
-        _rqlist = ast.literal_eval(self._db.mDumpWorkers("00000000-0000-0000-0000-000000000000"))
+        _rqlist = self._db.mGetWorkerRows("00000000-0000-0000-0000-000000000000")
         _idle_wc = self.mGetIdleWorkerCount(_coptions)
 
         _workers_to_terminate = 0
@@ -492,9 +493,9 @@ class ebSupervisor(object):
         _list_of_workers_to_terminate = list()
         _workers_selected = 0
         for _worker in _rqlist:
-            if _worker[1] == 'Idle':
-                _lastactivetime = _worker[12]
-                _port = _worker[9]
+            if _worker.status == 'Idle':
+                _lastactivetime = _worker.lastactivetime
+                _port = _worker.port
                 _stime = datetime.datetime.strptime(_lastactivetime, '%Y-%m-%d %H:%M:%S.%f') + datetime.timedelta(minutes = 60)
                 _nowtime = datetime.datetime.now()
                 if _nowtime > _stime and _workers_selected < _workers_to_terminate:
@@ -526,10 +527,10 @@ class ebSupervisor(object):
                         _killed = False
                         _retry = 2
                         while _retry > 0:
-                            _worker_list = ast.literal_eval(self._db.mDumpWorkers("00000000-0000-0000-0000-000000000000"))
+                            _worker_list = self._db.mGetWorkerRows("00000000-0000-0000-0000-000000000000")
                             _retry -= 1
                             for curr_worker in _worker_list:
-                                if curr_worker[9] == _port and curr_worker[1] == 'Exited':
+                                if curr_worker.port == _port and curr_worker.status == 'Exited':
                                     _killed = True
                                     break
                             if _killed:
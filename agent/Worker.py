@@ -14,6 +14,12 @@ NOTE:
 
 History:
    MODIFIED (MM/DD/YY)
+   jydas     10/18/26 - Sampling profiler of the requests enabled for it
+   jydas     10/18/26 - Fork the workers from the worker zygote when
+                        worker_prefork_enabled is set
+   jydas     10/18/26 - Load the workers list as typed rows
+   jydas     10/18/26 - Wait on a notify socket instead of polling the DB
+                        every second while idle
    aypaul    03/16/26 - ER#38277507 Add selinux operation response to ec data.
    prsshukl  03/13/26 - Bug 39077070 - EXACS:25.4.1 ONE OFF3 RC4: DELETE
                         STORAGE: 'DELETE_CELL_CHECK' EXACLOUD LOG HAS A SPACE
@@ -212,6 +218,10 @@ from exabox.infrapatching.core.cludispatcher import ebCluPatchDispatcher
 from exabox.core.Error import ExacloudRuntimeError
 from exabox.ovm.cludiag import exaBoxDiagCtrl, ebDownloadLog
 from exabox.agent.ebJobRequest import ebJobRequest, nsOpt
+from exabox.agent.WorkerNotify import (ebNotifyEnabled, ebNotifyFallbackInterval, ebNotifySocket,
+                                       ebNotifyWorkerName, ebNotifyWorker, ebNotifyDispatcher)
+from exabox.agent.WorkerZygote import ebWorkerPreforkEnabled, ebSpawnPreforkedWorker
+from exabox.tools.profiling.sampler import ebSamplingProfilerStart, ebSamplingProfilerStop
 from exabox.proxy.Client import ebHttpClient
 from exabox.proxy.ebJobResponse import ebJobResponse
 from exabox.proxy.router import Router
@@ -1059,6 +1069,7 @@ class ebWorkerDaemon(object):
         self.__ecs_version = "UNKNOWN"
         self.__thread_log_path = None
         self.__thread_xml_path = None
+        self.__notify = None
 
         try:
             if os.path.exists("config/label.dat"):
@@ -1262,24 +1273,36 @@ class ebWorkerDaemon(object):
         _worker.mLoadWorkerFromDB(self.__port)
         if _worker.mGetType() == 'monitor':
             _db = ebGetDefaultDB()
-            _rqlist = literal_eval(_db.mDumpWorkers())
-            for _worker in _rqlist:
-                if _worker[10] == 'monitor':
-                    if _worker[9] == self.__port:
+            for _row in _db.mGetWorkerRows():
+                if _row[10] == 'monitor':
+                    if _row[9] == self.__port:
                         pass
                     else:
                         ebLogError('*** Monitor already running. Abort launching 2nd monitor process')
                         self.__exit_main_loop
                         break
 
+        # Idle workers wait for the dispatcher notification instead of
+        # polling their DB entry every second
+        if ebNotifyEnabled():
+            self.__notify = ebNotifySocket(ebNotifyWorkerName(self.__port))
+            if not self.__notify.mOpen():
+                self.__notify = None
+        _notify_timeout = ebNotifyFallbackInterval()
+
         # MAIN_LOOP
         _timer = 600
         _err   = None
 
         while not self.get_worker_exit_loop():
 
-            # Delay of 1s between DB checks
-            time.sleep(1)
+            if self.__notify is not None and _worker.mGetType() == 'worker' and \
+               _worker.mGetUUID() == '00000000-0000-0000-0000-000000000000':
+                # DB entry is still polled as fallback of a lost notification
+                self.__notify.mWait(_notify_timeout)
+            else:
+                # Delay of 1s between DB checks
+                time.sleep(1)
 
             # Load Worker DB Entry
             _worker = ebWorker(aDB=_db)
@@ -1657,6 +1680,7 @@ class ebWorkerDaemon(object):
 
                     # Store last options
                     get_gcontext().mSetRegEntry("operation_id", _uuid)
+                    ebSamplingProfilerStart(_uuid, _params)
 
                     _hostname = _params.get('hostname', 'localhost')
 
@@ -2025,6 +2049,8 @@ class ebWorkerDaemon(object):
                     if self.__thread_xml_path:
                         _xml = self.__thread_xml_path
 
+                ebSamplingProfilerStop(aCmdType=_job.mGetCmdType())
+
                 #
                 # Update Job Entry
                 #
@@ -2091,9 +2117,14 @@ class ebWorkerDaemon(object):
                     _worker.mSetState("CORRUPTED")
                     _db.mDelRegEntry(_reg_entry_to_check)
                 _worker.mUpdateDB()
+                ebNotifyDispatcher('idle')
 
         self.__main_loop_exited = True
 
+        if self.__notify is not None:
+            self.__notify.mClose()
+            self.__notify = None
+
         self.mWorker_Stop()
 
         if _err:
@@ -2305,6 +2336,8 @@ class ebWorkerDaemon(object):
     def mWorker_Shutdown(self):
 
         self.__exit_main_loop = True
+        if self.__notify is not None:
+            ebNotifyWorker(self.__port, 'shutdown')
 
         global gDaemonHandle
         gDaemonHandle = None
@@ -2440,7 +2473,7 @@ class ebWorkerFactory(object):
 
         _db = aDB or ebGetDefaultDB()
         try:
-            _rqlist = literal_eval(_db.mDumpWorkers())
+            _rqlist = _db.mGetWorkerRows()
         except:
             ebLogError('*** DB access critical error please review DB integrity')
             raise
@@ -2671,6 +2704,9 @@ class ebWorkerFactory(object):
         for _worker in _rqlist:
             _port_list.append(_worker[9])
 
+        # Workers are forked from the zygote of the workermanager when enabled
+        _prefork = ebWorkerPreforkEnabled() and not get_gcontext().mGetArgsOptions().proxy
+
         # Start workers
         # for _idx in range(0,_wcount):
         _wc = _wcount
@@ -2698,16 +2734,21 @@ class ebWorkerFactory(object):
             _cmd_list.extend(get_gcontext().mGetPropagateProcOptions())
             _child = None
             try:
-                ebLogInfo(f'*** Starting Worker on port ({_port})')
-                _child = subprocess.run(_cmd_list, stdout=subprocess.PIPE,
-                                                stderr=subprocess.PIPE,
-                                                check=True)
+                # Preforked workers are ready as soon as their listener is up
+                _delay, _timeout = 8, 5
+                if _prefork and ebSpawnPreforkedWorker(_port):
+                    ebLogInfo(f'*** Worker forked from zygote on port ({_port})')
+                    _delay, _timeout = 0.5, 80
+                else:
+                    ebLogInfo(f'*** Starting Worker on port ({_port})')
+                    _child = subprocess.run(_cmd_list, stdout=subprocess.PIPE,
+                                                    stderr=subprocess.PIPE,
+                                                    check=True)
 
                 # Wait for Worker to be started (e.g. check for status on given port)
-                _timeout = 5
                 while _timeout:
                     #The wait time has been increased from 2 to 8 seconds after the introduction on MYSQL connections which take more time to initialise.
-                    time.sleep(8)
+                    time.sleep(_delay)
                     _workercmd = ebWorkerCmd(aCmd='status', aPort=_port)
                     _workercmd.mIssueRequest()
                     _json = _workercmd.mWaitForCompletion()
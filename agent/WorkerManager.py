@@ -17,11 +17,16 @@ NOTE:
 History:
 
     MODIFIED   (MM/DD/YY)
+       jydas       10/18/26 - Start the worker zygote when worker_prefork_enabled
+                              is set
+       jydas       10/18/26 - Use typed worker rows instead of literal_eval
+       jydas       10/18/26 - Fork the worker zygote before the first DB access
+       jydas       10/18/26 - Check for a running workermanager before forking
+                              the zygote, stop the zygote by pid
 """
 import json
 import datetime
 import os
-import ast
 import time
 import uuid
 import signal
@@ -33,6 +38,7 @@ from exabox.agent.Worker import daemonize_process, redirect_std_descriptors
 from exabox.agent.WClient import ebWorkerCmd
 from exabox.core.Context import get_gcontext
 from exabox.agent.Worker import ebWorkerFactory, ebWorker, gGetDefaultWorkerFactory
+from exabox.agent.WorkerZygote import ebWorkerPreforkEnabled, ebStartWorkerZygote
 
 class ebWorkermanager(object):
 
@@ -69,6 +75,7 @@ class ebWorkermanager(object):
 
         self._idle_wc = 0
         self._idle_thread_pool_count = 0
+        self._zygote_pid = None
         self.mGetWorkerCount()
 
     def mIsRunning(self):
@@ -77,23 +84,34 @@ class ebWorkermanager(object):
     def mStart(self):
         daemonize_process()
         redirect_std_descriptors()
-        # Initialize after Fork
-        self._db = ebGetDefaultDB()
-        pid = workermanager_running()
+
+        # Checked before the zygote is forked, the zygote of the running
+        # workermanager owns the zygote socket
+        _db = ebGetDefaultDB()
+        pid = workermanager_running(_db)
+        _db.mShutdownDB()
         if pid:
             ebLogWarn('worker manager is already running with PID {0}'.format(pid))
             exit(1)
+
+        # Forked before the workermanager opens its DB connection, log and
+        # threads, the additional workers are then forked from this warm
+        # process
+        if ebWorkerPreforkEnabled():
+            self._zygote_pid = ebStartWorkerZygote()
+
+        # Initialize after Fork
+        self._db = ebGetDefaultDB()
+        worker = ebWorker(aDB=self._db)
+        worker.mSetUUID(uuid.uuid4())
+        worker.mSetStatus('Wmanaging')
+        worker.mSetType('workermanager')
+        worker.mSetPort(self._port)
+        dbworker = self._db.mGetWorkerByType('workermanager')
+        if dbworker:
+            self._db.mUpdateWorker(worker)
         else:
-            worker = ebWorker(aDB=self._db)
-            worker.mSetUUID(uuid.uuid4())
-            worker.mSetStatus('Wmanaging')
-            worker.mSetType('workermanager')
-            worker.mSetPort(self._port)
-            dbworker = self._db.mGetWorkerByType('workermanager')
-            if dbworker:
-                self._db.mUpdateWorker(worker)
-            else:
-                self._db.mInsertNewWorker(worker)
+            self._db.mInsertNewWorker(worker)
 
         ebLogAddDestinationToLoggers([ebGetDefaultLoggerName()], 'log/workers/dflt_workermanager', ebFormattersEnum.DEFAULT)
         ebLogInfo('Starting workermanager')
@@ -153,18 +171,18 @@ class ebWorkermanager(object):
 
 
     def mGetCorruptedWorkersForTermination(self):
-        _rqlist = ast.literal_eval(self._db.mDumpWorkers("00000000-0000-0000-0000-000000000000"))
+        _rqlist = self._db.mGetWorkerRows("00000000-0000-0000-0000-000000000000")
         _list_of_workers_to_terminate = list()
         for _worker in _rqlist:
-            if _worker[13] == "CORRUPTED":
-                _port = _worker[9]
+            if _worker.state == "CORRUPTED":
+                _port = _worker.port
                 ebLogInfo(f"Worker with port {_port} is corrupted and is selected for termination.")
                 _list_of_workers_to_terminate.append(_port)
 
         return _list_of_workers_to_terminate
 
     def mGetIdleWorkersForTermination(self):
-        _rqlist = ast.literal_eval(self._db.mDumpWorkers("00000000-0000-0000-0000-000000000000"))
+        _rqlist = self._db.mGetWorkerRows("00000000-0000-0000-0000-000000000000")
 
         _workers_to_terminate = 0
         if len(_rqlist) > self._idle_wc:
@@ -175,9 +193,9 @@ class ebWorkermanager(object):
         _list_of_workers_to_terminate = list()
         _workers_selected = 0
         for _worker in _rqlist:
-            if _worker[1] == 'Idle':
-                _lastactivetime = _worker[12]
-                _port = _worker[9]
+            if _worker.status == 'Idle':
+                _lastactivetime = _worker.lastactivetime
+                _port = _worker.port
                 _stime = datetime.datetime.strptime(_lastactivetime, '%Y-%m-%d %H:%M:%S.%f') + datetime.timedelta(minutes = self._worker_idle_timeout)
                 _nowtime = datetime.datetime.now()
                 if _nowtime > _stime and _workers_selected < _workers_to_terminate:
@@ -197,9 +215,9 @@ class ebWorkermanager(object):
         self._worker_factory.mCheckFactory(self._db)
         self._worker_factory.mResetWorkersList(self._db)
 
-        _rqlist = ast.literal_eval(self._db.mDumpWorkers())
+        _rqlist = self._db.mGetWorkerRows()
         for _worker in _rqlist:
-            if _worker[0] == _uuid and _worker[1] == 'Idle' and _worker[13] == "NORMAL":
+            if _worker.uuid == _uuid and _worker.status == 'Idle' and _worker.state == "NORMAL":
                 _idle_worker = _idle_worker + 1
 
         if _idle_worker < self._idle_thread_pool_count:
@@ -230,10 +248,10 @@ class ebWorkermanager(object):
                         _killed = False
                         _retry = 5
                         while _retry > 0:
-                            _worker_list = ast.literal_eval(self._db.mDumpWorkers("00000000-0000-0000-0000-000000000000"))
+                            _worker_list = self._db.mGetWorkerRows("00000000-0000-0000-0000-000000000000")
                             _retry -= 1
                             for curr_worker in _worker_list:
-                                if curr_worker[9] == _port and curr_worker[1] == 'Exited':
+                                if curr_worker.port == _port and curr_worker.status == 'Exited':
                                     _killed = True
                                     break
                             if _killed:
@@ -258,15 +276,26 @@ class ebWorkermanager(object):
         worker.mSetPort(self._port)
         worker.mSetStatus('Exited')
         self._db.mUpdateWorker(worker)
+        self.mStopZygote()
         self._notify.set()
 
+    def mStopZygote(self):
+        # By pid: the zygote socket path is shared by every workermanager
+        # of the installation
+        if self._zygote_pid:
+            try:
+                os.kill(self._zygote_pid, signal.SIGTERM)
+            except OSError:
+                pass
+        self._zygote_pid = None
+
     def _mSigHandler(self, signum, frame):
         ebLogInfo('Handling signal {0}'.format(signum))
         self.mStop()
 
 
-def workermanager_running():
-    db = ebGetDefaultDB()
+def workermanager_running(aDB=None):
+    db = aDB or ebGetDefaultDB()
     workermanager = db.mGetWorkerByType('workermanager')
     if workermanager:
         pid = workermanager[8]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/agent/WorkerNotify.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# WorkerNotify.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      WorkerNotify.py - Local wake up notifications between agent processes
+#
+#    DESCRIPTION
+#      UNIX datagram sockets used to wake up the dispatcher when a request is
+#      queued or a worker becomes idle, and to wake up a worker when the
+#      dispatcher assigns it a request.
+#
+#    NOTES
+#      The notifications only carry a hint; the workers and requests tables
+#      remain the source of truth. A lost datagram (process restarting, socket
+#      not bound yet) is recovered by the fallback DB poll of every loop,
+#      every 'worker_notify_fallback_sec' seconds.
+#
+#      Set 'worker_notify_enabled' to 'False' to go back to the 1 second DB
+#      polling of the dispatcher and worker main loops.
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import errno
+import select
+import socket
+
+from exabox.core.Context import get_gcontext
+from exabox.log.LogMgr import ebLogTrace, ebLogWarn
+
+NOTIFY_DIR = os.path.join('log', 'workers', 'notify')
+NOTIFY_DISPATCHER = 'dispatcher'
+NOTIFY_FALLBACK_SEC = 5
+NOTIFY_MAX_MSG = 256
+
+
+def ebNotifyEnabled():
+    _value = get_gcontext().mCheckConfigOption('worker_notify_enabled')
+    return _value is None or str(_value).upper() == 'TRUE'
+
+
+def ebNotifyFallbackInterval():
+    """
+    Seconds between two DB polls of a loop waiting on its notify socket
+    """
+
+    _value = get_gcontext().mCheckConfigOption('worker_notify_fallback_sec')
+    try:
+        return max(1, int(_value)) if _value is not None else NOTIFY_FALLBACK_SEC
+    except ValueError:
+        ebLogWarn(f"Invalid value for worker_notify_fallback_sec: {_value}, using {NOTIFY_FALLBACK_SEC}")
+        return NOTIFY_FALLBACK_SEC
+
+
+def ebNotifyWorkerName(aPort):
+    return f"worker_{aPort}"
+
+
+def ebNotifyPath(aName, aDir=NOTIFY_DIR):
+    # Relative path on purpose: every agent process runs from the exacloud
+    # root and AF_UNIX paths are limited to 108 characters
+    return os.path.join(aDir, f"{aName}.sock")
+
+
+class ebNotifySocket(object):
+    """
+    Receiving end of the notifications of one process (dispatcher or worker)
+    """
+
+    def __init__(self, aName, aDir=NOTIFY_DIR):
+        self.__name = aName
+        self.__dir = aDir
+        self.__path = ebNotifyPath(aName, aDir)
+        self.__sock = None
+
+    def mGetName(self):
+        return self.__name
+
+    def mGetPath(self):
+        return self.__path
+
+    def mIsOpen(self):
+        return self.__sock is not None
+
+    def mOpen(self):
+        """
+        Bind the socket, replacing the one left behind by a previous process
+        with the same name. Return False when binding is not possible, the
+        caller then keeps polling the DB.
+        """
+
+        try:
+            os.makedirs(self.__dir, mode=0o700, exist_ok=True)
+            if os.path.exists(self.__path):
+                os.unlink(self.__path)
+
+            _sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            _sock.bind(self.__path)
+            os.chmod(self.__path, 0o600)
+            _sock.setblocking(False)
+            self.__sock = _sock
+            return True
+
+        except OSError as e:
+            ebLogWarn(f"Unable to bind notify socket {self.__path}, using DB polling: {e}")
+            self.__sock = None
+            return False
+
+    def mWait(self, aTimeout):
+        """
+        Wait up to aTimeout seconds for notifications and return all the
+        queued messages (empty list on timeout).
+        """
+
+        if self.__sock is None:
+            return []
+
+        try:
+            _ready, _, _ = select.select([self.__sock], [], [], aTimeout)
+        except (OSError, ValueError):
+            # Socket closed from a signal handler
+            return []
+
+        if not _ready:
+            return []
+
+        _msgs = []
+        while True:
+            try:
+                _msgs.append(self.__sock.recv(NOTIFY_MAX_MSG).decode('utf-8', 'replace'))
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+
+        return _msgs
+
+    def mClose(self):
+
+        if self.__sock is None:
+            return
+
+        try:
+            self.__sock.close()
+        finally:
+            self.__sock = None
+            try:
+                os.unlink(self.__path)
+            except OSError:
+                pass
+
+
+def ebNotifySend(aName, aMessage='wakeup', aDir=NOTIFY_DIR):
+    """
+    Best effort notification of the process bound to aName. Return False when
+    nobody is listening; the receiver will find the change on its next DB poll.
+    """
+
+    _path = ebNotifyPath(aName, aDir)
+    _sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        _sock.setblocking(False)
+        _sock.sendto(str(aMessage).encode('utf-8')[:NOTIFY_MAX_MSG], _path)
+        return True
+    except OSError as e:
+        if e.errno not in (errno.ENOENT, errno.ECONNREFUSED):
+            ebLogTrace(f"Notify {aName} failed: {e}")
+        return False
+    finally:
+        _sock.close()
+
+
+def ebNotifyDispatcher(aMessage='wakeup'):
+    return ebNotifySend(NOTIFY_DISPATCHER, aMessage)
+
+
+def ebNotifyWorker(aPort, aMessage='wakeup'):
+    return ebNotifySend(ebNotifyWorkerName(aPort), aMessage)
+
+# end of file
@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/agent/WorkerZygote.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# WorkerZygote.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      WorkerZygote.py - Preforked workers out of a warm interpreter
+#
+#    DESCRIPTION
+#      The worker zygote is forked by the workermanager when it starts. It
+#      imports the worker code once and then forks a worker for every spawn
+#      request of ebWorkerFactory.mStartWorkers, instead of the cold start of
+#      one bin/exacloud process per worker. The workers share the pages of
+#      the preloaded modules with the zygote (copy-on-write).
+#
+#    NOTES
+#      Enabled with 'worker_prefork_enabled': 'True'. When the zygote is not
+#      reachable (not started yet, workermanager down) the workers are started
+#      with bin/exacloud as before. Tunables:
+#        worker_prefork_preload     modules imported by the zygote
+#        worker_prefork_socket      path of the zygote socket
+#
+#      The zygote stays single threaded and opens no DB connection, a forked
+#      worker then builds its own DB connections, log files, ExaKms objects
+#      (per pid) and REST listener exactly like a worker started from the
+#      command line (see ebRunPreforkedWorker).
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Never unlink the socket of a running zygote
+#    jydas       10/18/26 - Run the exit finalizers before os._exit
+#    jydas       10/18/26 - Creation
+#
+
+import gc
+import os
+import sys
+import json
+import time
+import errno
+import select
+import signal
+import socket
+import importlib
+
+from exabox.core.Context import get_gcontext
+from exabox.core.Metrics import ebMetricsDump
+from exabox.log.LogMgr import (ebLogInfo, ebLogWarn, ebLogError, ebLogTrace, ebLogAddDestinationToLoggers,
+                               ebLogDeleteLoggerDestination, ebGetDefaultLoggerName, ebFormattersEnum,
+                               ebLogFinalize)
+from exabox.log.LogAsync import ebLogAsyncShutdown
+
+ZYGOTE_SOCKET = os.path.join('log', 'workers', 'worker_zygote.sock')
+ZYGOTE_LOG = os.path.join('log', 'workers', 'dflt_worker_zygote')
+ZYGOTE_POLL_SEC = 1
+ZYGOTE_CLIENT_TIMEOUT_SEC = 30
+ZYGOTE_SPAWN_TIMEOUT_SEC = 25
+ZYGOTE_MAX_MSG = 4096
+
+ZYGOTE_PRELOAD = ["exabox.agent.Agent",
+                  "exabox.agent.Worker",
+                  "exabox.ovm.clucontrol",
+                  "exabox.jsondispatch.jsondispatch",
+                  "exabox.infrapatching.core.cludispatcher"]
+
+
+def ebWorkerPreforkEnabled():
+    return str(get_gcontext().mCheckConfigOption('worker_prefork_enabled')).upper() == 'TRUE'
+
+
+def ebWorkerZygotePath():
+    # Relative like the notify sockets, AF_UNIX paths are limited to 108 characters
+    _path = get_gcontext().mCheckConfigOption('worker_prefork_socket')
+    return _path if _path else ZYGOTE_SOCKET
+
+
+def ebZygoteExit(aRc, aShutdownDB=False):
+    """
+    Leave a process forked by the zygote. os._exit skips atexit, so the
+    metrics, the DB layer and the asynchronous log writer are closed here
+    as the interpreter exit of a bin/exacloud worker does.
+    """
+
+    try:
+        ebMetricsDump()
+        if aShutdownDB:
+            # Avoid loading the DB layer in the zygote
+            from exabox.core.DBStore import ebShutdownDBLayer
+            ebShutdownDBLayer()
+    except BaseException as e:
+        ebLogWarn(f"*** Worker zygote: exit of pid ({os.getpid()}) not clean: {e}")
+    finally:
+        try:
+            ebLogFinalize(None)
+            ebLogAsyncShutdown()
+        finally:
+            os._exit(aRc)
+
+
+def ebRunPreforkedWorker(aPort):
+    """
+    Body of a forked worker, the equivalent of 'bin/exacloud -wp <port> -w -wd'.
+    Return the exit code of the worker.
+    """
+
+    from exabox.agent.ebJobRequest import nsOpt
+    from exabox.agent.Worker import ebWorkerDaemon
+
+    _opt = get_gcontext().mGetArgsOptions()
+    _opt = dict(_opt) if isinstance(_opt, dict) else dict(vars(_opt))
+    _opt.update({"worker": True, "worker_port": str(aPort), "worker_detach": True,
+                 "workermanager": False})
+    get_gcontext().mSetArgsOptions(nsOpt(_opt))
+
+    _workerHandle = ebWorkerDaemon()
+    signal.signal(signal.SIGINT, _workerHandle.mWorker_SigHandler)
+    signal.signal(signal.SIGTERM, _workerHandle.mWorker_SigHandler)
+    return _workerHandle.mWorker_Start()
+
+
+class ebWorkerZygote(object):
+
+    def __init__(self, aPath=None, aSpawnFx=ebRunPreforkedWorker, aPreload=None):
+
+        self.__path = aPath or ebWorkerZygotePath()
+        self.__spawnFx = aSpawnFx
+        self.__preload = aPreload
+        self.__sock = None
+        self.__running = False
+        self.__ppid = os.getppid()
+        self.__log_handler = None
+        self.__spawned = 0
+
+    def mGetPath(self):
+        return self.__path
+
+    def mGetSpawnedCount(self):
+        return self.__spawned
+
+    def mPreload(self):
+        """ Import the modules every worker needs, before any fork """
+
+        _modules = self.__preload
+        if _modules is None:
+            _modules = get_gcontext().mCheckConfigOption('worker_prefork_preload') or ZYGOTE_PRELOAD
+
+        _start = time.time()
+        for _module in _modules:
+            try:
+                importlib.import_module(_module)
+            except Exception as e:
+                ebLogWarn(f"*** Worker zygote: unable to preload {_module}: {e}")
+
+        # Objects of the preloaded modules are left alone by the collector of
+        # the workers, their pages stay shared with the zygote
+        gc.collect()
+        gc.freeze()
+        ebLogInfo(f"*** Worker zygote: {len(_modules)} modules preloaded in {time.time() - _start:.2f}s")
+
+    def mIsSocketAlive(self):
+        """ Whether a process still accepts connections on the socket path """
+
+        _sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            _sock.settimeout(ZYGOTE_POLL_SEC)
+            _sock.connect(self.__path)
+            return True
+        except OSError:
+            return False
+        finally:
+            _sock.close()
+
+    def mOpen(self):
+
+        try:
+            os.makedirs(os.path.dirname(self.__path) or '.', mode=0o700, exist_ok=True)
+            if os.path.exists(self.__path):
+                if self.mIsSocketAlive():
+                    ebLogError(f"*** Worker zygote: {self.__path} is in use by another zygote")
+                    return False
+                # Left by a zygote that did not exit cleanly
+                os.unlink(self.__path)
+
+            _sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            _sock.bind(self.__path)
+            os.chmod(self.__path, 0o600)
+            _sock.listen(16)
+            self.__sock = _sock
+            return True
+
+        except OSError as e:
+            ebLogError(f"*** Worker zygote: unable to bind {self.__path}: {e}")
+            self.__sock = None
+            return False
+
+    def mClose(self):
+
+        if self.__sock is None:
+            return
+
+        try:
+            self.__sock.close()
+        finally:
+            self.__sock = None
+            try:
+                os.unlink(self.__path)
+            except OSError:
+                pass
+
+    def mStop(self):
+        self.__running = False
+
+    def mServe(self, aCheckParent=True):
+        """ Answer the spawn requests until shutdown or the parent exits """
+
+        if self.__sock is None and not self.mOpen():
+            return 1
+
+        self.__running = True
+        ebLogInfo(f"*** Worker zygote ready on {self.__path} pid ({os.getpid()})")
+
+        try:
+            while self.__running:
+
+                if aCheckParent and os.getppid() != self.__ppid:
+                    ebLogInfo("*** Worker zygote: workermanager exited")
+                    break
+
+                try:
+                    _ready, _, _ = select.select([self.__sock], [], [], ZYGOTE_POLL_SEC)
+                except InterruptedError:
+                    continue
+                except (OSError, ValueError):
+                    break
+
+                if not _ready:
+                    continue
+
+                try:
+                    _conn, _ = self.__sock.accept()
+                except OSError:
+                    continue
+
+                with _conn:
+                    _conn.settimeout(ZYGOTE_CLIENT_TIMEOUT_SEC)
+                    try:
+                        _data = self.mReceive(_conn)
+                        if not _data:
+                            # Liveness check of mOpen
+                            continue
+                        _request = json.loads(_data.decode('utf-8'))
+                        _reply = self.mHandleRequest(_request, _conn)
+                        _conn.sendall(json.dumps(_reply).encode('utf-8'))
+                    except (OSError, ValueError) as e:
+                        ebLogWarn(f"*** Worker zygote: invalid request: {e}")
+        finally:
+            self.mClose()
+
+        ebLogInfo("*** Worker zygote exiting")
+        return 0
+
+    @staticmethod
+    def mReceive(aConn):
+        """ Read a message up to the end of stream (the sender shuts down its side) """
+
+        _data = b''
+        while len(_data) < ZYGOTE_MAX_MSG:
+            _chunk = aConn.recv(ZYGOTE_MAX_MSG)
+            if not _chunk:
+                break
+            _data += _chunk
+        return _data
+
+    def mHandleRequest(self, aRequest, aConn=None):
+
+        _cmd = aRequest.get("cmd") if isinstance(aRequest, dict) else None
+
+        if _cmd == "spawn":
+            return self.mSpawn(int(aRequest["port"]), aConn)
+
+        if _cmd == "status":
+            return {"pid": os.getpid(), "spawned": self.__spawned}
+
+        if _cmd == "shutdown":
+            self.__running = False
+            return {"pid": os.getpid()}
+
+        return {"error": f"unknown command {_cmd}"}
+
+    def mSpawn(self, aPort, aConn=None):
+        """
+        Fork a worker for aPort. The forked process daemonizes like a worker
+        started with -wd, its exit code tells if the worker could start.
+        """
+
+        gc.freeze()
+        _start = time.time()
+        _pid = os.fork()
+
+        if _pid == 0:
+            _rc = 1
+            try:
+                self.mInitChild(aConn)
+                _rc = self.__spawnFx(aPort) or 0
+            except SystemExit as e:
+                _rc = e.code if isinstance(e.code, int) else 1
+            except BaseException as e:
+                ebLogError(f"*** Preforked worker on port ({aPort}) failed: {e}")
+            finally:
+                ebZygoteExit(_rc, aShutdownDB=True)
+
+        self.__spawned += 1
+        _rc = None
+        while time.time() - _start < ZYGOTE_SPAWN_TIMEOUT_SEC:
+            try:
+                _wpid, _status = os.waitpid(_pid, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if _wpid:
+                _rc = os.waitstatus_to_exitcode(_status)
+                break
+            time.sleep(0.01)
+
+        ebLogInfo(f"*** Worker zygote: forked worker for port ({aPort}) pid ({_pid}) rc ({_rc}) "
+                  f"in {time.time() - _start:.3f}s")
+        return {"pid": _pid, "rc": _rc}
+
+    def mInitChild(self, aConn=None):
+        """
+        Drop in the forked worker what belongs to the zygote: its sockets,
+        signal handlers and log file.
+        """
+
+        if aConn is not None:
+            aConn.close()
+        if self.__sock is not None:
+            self.__sock.close()
+            self.__sock = None
+        self.__running = False
+
+        for _sig in (signal.SIGINT, signal.SIGTERM, signal.SIGCHLD):
+            signal.signal(_sig, signal.SIG_DFL)
+
+        if self.__log_handler is not None:
+            ebLogDeleteLoggerDestination(ebGetDefaultLoggerName(), self.__log_handler)
+            self.__log_handler = None
+
+    def mRun(self):
+        """ Main of the zygote process """
+
+        os.setsid()
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.mStop())
+
+        self.__log_handler = ebLogAddDestinationToLoggers([ebGetDefaultLoggerName()], ZYGOTE_LOG,
+                                                          ebFormattersEnum.WORKER)
+        self.mPreload()
+        return self.mServe()
+
+
+def ebStartWorkerZygote():
+    """
+    Fork the zygote from the calling process (the workermanager, before it
+    opens its DB connections). Return the pid of the zygote.
+    """
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    _pid = os.fork()
+    if _pid == 0:
+        _rc = 1
+        try:
+            _rc = ebWorkerZygote().mRun()
+        except BaseException as e:
+            ebLogError(f"*** Worker zygote failed: {e}")
+        finally:
+            ebZygoteExit(_rc)
+
+    ebLogInfo(f"*** Worker zygote started pid ({_pid})")
+    return _pid
+
+
+def ebWorkerZygoteRequest(aRequest, aPath=None, aTimeout=ZYGOTE_CLIENT_TIMEOUT_SEC):
+    """ Send aRequest to the zygote, return its reply or None if not reachable """
+
+    _path = aPath or ebWorkerZygotePath()
+    _sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        _sock.settimeout(aTimeout)
+        _sock.connect(_path)
+        _sock.sendall(json.dumps(aRequest).encode('utf-8'))
+        _sock.shutdown(socket.SHUT_WR)
+
+        _data = ebWorkerZygote.mReceive(_sock)
+        return json.loads(_data.decode('utf-8')) if _data else None
+
+    except (OSError, ValueError) as e:
+        if getattr(e, 'errno', None) not in (errno.ENOENT, errno.ECONNREFUSED):
+            ebLogTrace(f"Worker zygote request {aRequest} failed: {e}")
+        return None
+    finally:
+        _sock.close()
+
+
+def ebSpawnPreforkedWorker(aPort, aPath=None):
+    """
+    Ask the zygote for a worker on aPort. Return True when the worker was
+    forked and started, False when the caller has to start it with bin/exacloud.
+    """
+
+    _reply = ebWorkerZygoteRequest({"cmd": "spawn", "port": int(aPort)}, aPath)
+    if not _reply or "pid" not in _reply:
+        return False
+
+    if _reply.get("rc") != 0:
+        ebLogWarn(f"*** Preforked worker on port ({aPort}) did not start: {_reply}")
+        return False
+
+    return True
+
+
+def ebStopWorkerZygote(aPath=None):
+    return ebWorkerZygoteRequest({"cmd": "shutdown"}, aPath) is not None
+
+# end of file
@@ -11,6 +11,8 @@ NOTE:
     None    
 
 History:
+    jydas       10/18/2026 - mPopulate takes the params already as a dict.
+    jydas       10/18/2026 - Notify the dispatcher of new pending requests.
     aypaul      08/08/2025 - Enh#37732728 Store AQ details in the request object.
     aypaul      12/02/2024 - ER-37026034 Add sub command details to request table for persistence.
     jesandov    26/03/2019 - File Creation.
@@ -23,6 +25,8 @@ import json
 import ast
 from copy import deepcopy
 
+from exabox.agent.WorkerNotify import ebNotifyDispatcher
+
 
 class ebJobRequest(object):
 
@@ -179,6 +183,8 @@ class ebJobRequest(object):
     def mRegister(self):
         # Register the Request with the DB
         self.__db.mInsertNewRequest(self)
+        if self.__status == 'Pending':
+            ebNotifyDispatcher('pending')
 
     def mLoadRequestFromDB(self, aUUID):
 
@@ -385,7 +391,10 @@ class ebJobRequest(object):
             self.mSetTimeStampStart(_req_list[2])
             self.mSetTimeStampEnd(_req_list[3])
             self.mSetCmdType(_req_list[4])
-            self.mSetParams(ast.literal_eval(_req_list[5]))
+            if isinstance(_req_list[5], dict):
+                self.mSetParams(_req_list[5])
+            else:
+                self.mSetParams(ast.literal_eval(_req_list[5]))
             self.mSetError(_req_list[6])
             self.mSetErrorStr(_req_list[7])
             self.mSetBody(_req_list[8])
@@ -23,46 +23,73 @@ from enum import Enum
 from typing import Any,Iterator
 import psutil
 
-from exabox.agent.DBService import ExaMySQL, is_mysql_running
-from exabox.core.Node import exaBoxNode
+from exabox.core.LazyImport import ebLazySymbol, ebStartImportProfiler, ebReportImportProfiler
+
+# Installed before the imports below so they are measured too
+ebStartImportProfiler()
+
 from exabox.core.Core import exaBoxCoreInit, exaBoxCoreShutdown
-from exabox.ovm.vmcontrol import ebVgLifeCycle
 from exabox.core.Context import get_gcontext
 from exabox.log.LogMgr import ebLogError, ebLogDebug, ebLogInfo, ebLogWarn, ebLogInit, ebLogFinalize, ebLogCrit
-from exabox.ovm.clucontrol import exaBoxCluCtrl
-from exabox.ovm.clumisc import AgentWorkerPIDListing
-from exabox.core.Threads import ebThreadStartHangMonitoring
-from exabox.publish.Publish import exaBoxPackage
-from exabox.agent.Agent import ebAgentDaemon
-from exabox.agent.AgentSignal import AgentSignal, AgentSignalEnum
-from exabox.agent.AuthenticationStorage import ebBasicAuthStorage
 from exabox.core.DBStore import get_db_version, ebInitDBLayer, ebShutdownDBLayer, ebGetDefaultDB
-from exabox.agent.Client import ebExaClient, ebGetClientConfig
-from exabox.tools.scripts import ebScriptsEngineInit
-from exabox.config.Config import ebJsonConfigFileReader
-from exabox.agent.Worker import ebWorkerDaemon, ebWorkerFactory, ebWorker
-from exabox.agent.WClient import ebWorkerCmd
-from exabox.agent.Supervisor import ebSupervisor, supervisor_running
-from exabox.agent.Dispatcher import ebDispatcher, dispatcher_running
-from exabox.agent.WorkerManager import ebWorkermanager, workermanager_running
-from exabox.agent.Scheduler  import ebScheduler, scheduler_running
-from exabox.agent.ScheduleRegistry  import register_schedule_jobs
-from exabox.ovm.rackcontrol import ebRackControl
-from exabox.agent.ebJobRequest import nsOpt
-from exabox.infrapatching.core.cludispatcher import ebCluPatchDispatcher
 from exabox.core.Error import ExacloudRuntimeError
 from exabox.core.CrashDump import CrashDump
-from exabox.network.dns.DNSConfig import ebDNSConfig
-from exabox.agent.AuthenticationStorage import ebConvertToWalletStorage,ebConfigAuthStorage
-from exabox.core.DBLockTableUtils import sDBLockCleanAllLeftoverLocks
-from exabox.proxy.router import Router
-from exabox.tools.ebXmlGen.ebFacadeXmlGen import ebFacadeXmlGen
-from exabox.exakms.ExaKmsSingleton import ExaKmsSingleton
-from exabox.exakms.ExaKmsEndpoint import ExaKmsEndpoint
-from exabox.jsondispatch.jsondispatch import ebJsonDispatcher
-from exabox.utils.oci_region import load_oci_region_config, parse_region_info, update_oci_config
-from exabox.sop.soputils import process_sop_request
-import exabox.exadbxs.edv as edv
+from exabox.agent.ebJobRequest import nsOpt
+
+#
+# Lazy command registry: the subsystems behind each command line action are
+# only imported when the action dispatches to them, so short CLI calls and
+# workers do not pay the import of modules they never use.
+#
+# exabox.agent.Worker and the agent processes importing it can only be
+# imported after exabox.agent.Agent
+_AGENT = ("exabox.agent.Agent",)
+
+ExaMySQL                        = ebLazySymbol("exabox.agent.DBService", "ExaMySQL")
+is_mysql_running                = ebLazySymbol("exabox.agent.DBService", "is_mysql_running")
+exaBoxNode                      = ebLazySymbol("exabox.core.Node", "exaBoxNode")
+ebVgLifeCycle                   = ebLazySymbol("exabox.ovm.vmcontrol", "ebVgLifeCycle")
+exaBoxCluCtrl                   = ebLazySymbol("exabox.ovm.clucontrol", "exaBoxCluCtrl")
+AgentWorkerPIDListing           = ebLazySymbol("exabox.ovm.clumisc", "AgentWorkerPIDListing")
+ebThreadStartHangMonitoring     = ebLazySymbol("exabox.core.Threads", "ebThreadStartHangMonitoring")
+exaBoxPackage                   = ebLazySymbol("exabox.publish.Publish", "exaBoxPackage")
+ebAgentDaemon                   = ebLazySymbol("exabox.agent.Agent", "ebAgentDaemon")
+AgentSignal                     = ebLazySymbol("exabox.agent.AgentSignal", "AgentSignal")
+AgentSignalEnum                 = ebLazySymbol("exabox.agent.AgentSignal", "AgentSignalEnum")
+ebBasicAuthStorage              = ebLazySymbol("exabox.agent.AuthenticationStorage", "ebBasicAuthStorage")
+ebConvertToWalletStorage        = ebLazySymbol("exabox.agent.AuthenticationStorage", "ebConvertToWalletStorage")
+ebConfigAuthStorage             = ebLazySymbol("exabox.agent.AuthenticationStorage", "ebConfigAuthStorage")
+ebExaClient                     = ebLazySymbol("exabox.agent.Client", "ebExaClient")
+ebGetClientConfig               = ebLazySymbol("exabox.agent.Client", "ebGetClientConfig")
+ebScriptsEngineInit             = ebLazySymbol("exabox.tools.scripts", "ebScriptsEngineInit")
+ebJsonConfigFileReader          = ebLazySymbol("exabox.config.Config", "ebJsonConfigFileReader")
+ebWorkerDaemon                  = ebLazySymbol("exabox.agent.Worker", "ebWorkerDaemon", _AGENT)
+ebWorkerFactory                 = ebLazySymbol("exabox.agent.Worker", "ebWorkerFactory", _AGENT)
+ebWorker                        = ebLazySymbol("exabox.agent.Worker", "ebWorker", _AGENT)
+ebWorkerCmd                     = ebLazySymbol("exabox.agent.WClient", "ebWorkerCmd")
+ebSupervisor                    = ebLazySymbol("exabox.agent.Supervisor", "ebSupervisor", _AGENT)
+supervisor_running              = ebLazySymbol("exabox.agent.Supervisor", "supervisor_running", _AGENT)
+ebDispatcher                    = ebLazySymbol("exabox.agent.Dispatcher", "ebDispatcher", _AGENT)
+dispatcher_running              = ebLazySymbol("exabox.agent.Dispatcher", "dispatcher_running", _AGENT)
+ebWorkermanager                 = ebLazySymbol("exabox.agent.WorkerManager", "ebWorkermanager", _AGENT)
+workermanager_running           = ebLazySymbol("exabox.agent.WorkerManager", "workermanager_running", _AGENT)
+ebScheduler                     = ebLazySymbol("exabox.agent.Scheduler", "ebScheduler")
+scheduler_running               = ebLazySymbol("exabox.agent.Scheduler", "scheduler_running")
+register_schedule_jobs          = ebLazySymbol("exabox.agent.ScheduleRegistry", "register_schedule_jobs")
+ebRackControl                   = ebLazySymbol("exabox.ovm.rackcontrol", "ebRackControl")
+ebCluPatchDispatcher            = ebLazySymbol("exabox.infrapatching.core.cludispatcher", "ebCluPatchDispatcher")
+ebDNSConfig                     = ebLazySymbol("exabox.network.dns.DNSConfig", "ebDNSConfig")
+sDBLockCleanAllLeftoverLocks    = ebLazySymbol("exabox.core.DBLockTableUtils", "sDBLockCleanAllLeftoverLocks")
+Router                          = ebLazySymbol("exabox.proxy.router", "Router")
+ebFacadeXmlGen                  = ebLazySymbol("exabox.tools.ebXmlGen.ebFacadeXmlGen", "ebFacadeXmlGen")
+ExaKmsSingleton                 = ebLazySymbol("exabox.exakms.ExaKmsSingleton", "ExaKmsSingleton")
+ExaKmsEndpoint                  = ebLazySymbol("exabox.exakms.ExaKmsEndpoint", "ExaKmsEndpoint")
+ebJsonDispatcher                = ebLazySymbol("exabox.jsondispatch.jsondispatch", "ebJsonDispatcher")
+load_oci_region_config          = ebLazySymbol("exabox.utils.oci_region", "load_oci_region_config")
+parse_region_info               = ebLazySymbol("exabox.utils.oci_region", "parse_region_info")
+update_oci_config               = ebLazySymbol("exabox.utils.oci_region", "update_oci_config")
+process_sop_request             = ebLazySymbol("exabox.sop.soputils", "process_sop_request")
+edv                             = ebLazySymbol("exabox.exadbxs.edv")
 
 __all__ = ['main']
 
@@ -1196,6 +1223,7 @@ def main(argv=None):
         _rc = 1
     finally:
         shutdown_all(_exabox_state)
+        ebReportImportProfiler()
 
     if _rc is not None and _rc != 0:
         sys.exit(_rc)
@@ -0,0 +1,266 @@
+"""
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    DBConnectionPool.py
+
+FUNCTION:
+    Process wide pool of MySQL connections shared by the DBStore3 objects
+
+NOTE:
+    Enabled with 'mysql_conn_pool_enabled': 'True'. Tunables:
+        mysql_conn_pool_size          idle connections kept per config
+        mysql_conn_pool_wait_sec      wait for a free connection before
+                                      opening an unpooled overflow one
+        mysql_conn_pool_ping_sec      idle time before a health check (ping)
+        mysql_conn_pool_idle_ttl_sec  idle time before the connection is closed
+
+    The pool belongs to the process that created it; a forked child gets a
+    new empty pool and never touches the sockets of the parent.
+
+History:
+    jydas      2026/10/18 - Creation
+    jydas      2026/10/18 - Health check of idle connections outside the lock
+"""
+
+import os
+import json
+import time
+import threading
+import collections
+
+from exabox.log.LogMgr import ebLogTrace, ebLogWarn
+
+DB_POOL_SIZE         = 8
+DB_POOL_WAIT_SEC     = 10
+DB_POOL_PING_SEC     = 30
+DB_POOL_IDLE_TTL_SEC = 600
+
+
+class ebDBConnectionPool(object):
+
+    def __init__(self, aSize=DB_POOL_SIZE, aWait=DB_POOL_WAIT_SEC,
+                 aPingAfter=DB_POOL_PING_SEC, aIdleTTL=DB_POOL_IDLE_TTL_SEC):
+
+        self.__size = aSize
+        self.__wait = aWait
+        self.__pingAfter = aPingAfter
+        self.__idleTTL = aIdleTTL
+        self.__pid = os.getpid()
+        self.__lock = threading.Condition()
+        # key -> deque of (connection, release time)
+        self.__idle = collections.defaultdict(collections.deque)
+        # key -> connections handed out
+        self.__inUse = collections.defaultdict(int)
+        # id(connection) -> key, for the connections owned by the pool
+        self.__owned = {}
+        self.__stats = {"hits": 0, "misses": 0, "overflow": 0, "discarded": 0}
+
+    def mGetPid(self):
+        return self.__pid
+
+    def mGetStats(self):
+        with self.__lock:
+            return dict(self.__stats)
+
+    def mGetIdleCount(self, aConfig=None):
+        with self.__lock:
+            if aConfig is not None:
+                return len(self.__idle[self.mBuildKey(aConfig)])
+            return sum([len(_conns) for _conns in self.__idle.values()])
+
+    def mGetInUseCount(self, aConfig):
+        with self.__lock:
+            return self.__inUse[self.mBuildKey(aConfig)]
+
+    @staticmethod
+    def mBuildKey(aConfig):
+        # Connection config is a dict with non hashable values (ssl options)
+        return json.dumps(aConfig, sort_keys=True, default=str)
+
+    def mIsOwned(self, aConn):
+        with self.__lock:
+            return id(aConn) in self.__owned
+
+    def mIsHealthy(self, aConn, aIdleTime):
+
+        if not getattr(aConn, "open", False):
+            return False
+
+        if aIdleTime < self.__pingAfter:
+            return True
+
+        try:
+            aConn.ping(reconnect=False)
+            return True
+        except Exception as e:
+            ebLogTrace(f"DB pool: discarding broken connection: {e}")
+            return False
+
+    def mAcquire(self, aConfig, aCreateFx):
+        """
+        Return a connection for aConfig, reusing an idle healthy one when
+        possible.  When the pool is exhausted the caller waits up to
+        mysql_conn_pool_wait_sec and then gets an overflow connection, which
+        is closed on release, so nested DB objects of the same thread never
+        deadlock on the pool.
+        """
+
+        if os.getpid() != self.__pid:
+            # Pool inherited through fork, its connections belong to the parent
+            return aCreateFx(aConfig)
+
+        _key = self.mBuildKey(aConfig)
+        _deadline = time.time() + self.__wait
+
+        while True:
+
+            with self.__lock:
+
+                while not self.__idle[_key] and self.__inUse[_key] >= self.__size:
+                    _remaining = _deadline - time.time()
+                    if _remaining <= 0:
+                        self.__stats["overflow"] += 1
+                        ebLogWarn(f"DB pool exhausted ({self.__size} in use), opening an overflow connection")
+                        return aCreateFx(aConfig)
+                    self.__lock.wait(_remaining)
+
+                # The slot is taken before the health check so the size holds
+                self.__inUse[_key] += 1
+                if not self.__idle[_key]:
+                    self.__stats["misses"] += 1
+                    break
+                _conn, _released = self.__idle[_key].pop()
+
+            # Ping outside of the lock, a slow server must not stall the pool
+            if self.mIsHealthy(_conn, time.time() - _released):
+                with self.__lock:
+                    self.__stats["hits"] += 1
+                return _conn
+
+            with self.__lock:
+                self.__owned.pop(id(_conn), None)
+                self.__inUse[_key] -= 1
+                self.__lock.notify()
+            self.mClose(_conn)
+
+        try:
+            _conn = aCreateFx(aConfig)
+        except Exception:
+            with self.__lock:
+                self.__inUse[_key] -= 1
+                self.__lock.notify()
+            raise
+
+        with self.__lock:
+            self.__owned[id(_conn)] = _key
+
+        return _conn
+
+    def mAdopt(self, aConn, aConfig):
+        """
+        Take ownership of a connection created outside of mAcquire (a
+        reconnection after a server error) as if it was acquired.
+        """
+
+        _key = self.mBuildKey(aConfig)
+        with self.__lock:
+            if id(aConn) not in self.__owned:
+                self.__owned[id(aConn)] = _key
+                self.__inUse[_key] += 1
+
+    def mRelease(self, aConn, aDiscard=False):
+
+        with self.__lock:
+
+            _key = self.__owned.get(id(aConn))
+            if _key is None:
+                # Overflow connection
+                self.mClose(aConn)
+                return
+
+            if os.getpid() != self.__pid:
+                # Never close (COM_QUIT) a socket shared with the parent
+                return
+
+            self.__inUse[_key] -= 1
+            self.__lock.notify()
+
+            if aDiscard or not getattr(aConn, "open", False):
+                del self.__owned[id(aConn)]
+                self.__stats["discarded"] += 1
+                self.mClose(aConn)
+                return
+
+            self.__idle[_key].append((aConn, time.time()))
+            self.mEvictIdle()
+
+    def mEvictIdle(self):
+
+        with self.__lock:
+            _now = time.time()
+            for _key, _conns in self.__idle.items():
+                while _conns and (len(_conns) > self.__size or _now - _conns[0][1] > self.__idleTTL):
+                    _conn, _ = _conns.popleft()
+                    self.__owned.pop(id(_conn), None)
+                    self.mClose(_conn)
+
+    def mClose(self, aConn):
+        try:
+            aConn.close()
+        except Exception:
+            # Already closed or broken socket
+            pass
+
+    def mCloseAll(self):
+
+        with self.__lock:
+            for _conns in self.__idle.values():
+                while _conns:
+                    _conn, _ = _conns.popleft()
+                    self.__owned.pop(id(_conn), None)
+                    self.mClose(_conn)
+
+
+_gDBConnectionPool = None
+_gDBConnectionPoolLock = threading.Lock()
+# Pools of the parent left behind by a fork. Their mysql connections would
+# send COM_QUIT on the socket shared with the parent when garbage collected
+_gDBInheritedPools = []
+
+def ebIsDBConnectionPoolEnabled(aConfig):
+    return str(aConfig.get('mysql_conn_pool_enabled', 'False')).upper() == 'TRUE'
+
+def ebGetDBConnectionPool(aConfig):
+    """
+    Return the connection pool of the current process, creating it on the
+    first call (and after a fork) from the mysql_conn_pool_* config options.
+    """
+
+    global _gDBConnectionPool
+
+    with _gDBConnectionPoolLock:
+
+        if _gDBConnectionPool is not None and _gDBConnectionPool.mGetPid() == os.getpid():
+            return _gDBConnectionPool
+
+        if _gDBConnectionPool is not None:
+            _gDBInheritedPools.append(_gDBConnectionPool)
+
+        def _mIntOption(aName, aDefault):
+            _value = aConfig.get(aName)
+            try:
+                return int(_value) if _value is not None else aDefault
+            except ValueError:
+                ebLogWarn(f"Invalid value for {aName}: {_value}, using {aDefault}")
+                return aDefault
+
+        _gDBConnectionPool = ebDBConnectionPool(
+            aSize=_mIntOption('mysql_conn_pool_size', DB_POOL_SIZE),
+            aWait=_mIntOption('mysql_conn_pool_wait_sec', DB_POOL_WAIT_SEC),
+            aPingAfter=_mIntOption('mysql_conn_pool_ping_sec', DB_POOL_PING_SEC),
+            aIdleTTL=_mIntOption('mysql_conn_pool_idle_ttl_sec', DB_POOL_IDLE_TTL_SEC))
+
+        return _gDBConnectionPool
+
+# end of file
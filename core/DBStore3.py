@@ -12,6 +12,23 @@ NOTE:
 
 History:
     MODIFIED   (MM/DD/YY)
+    jydas       10/18/26 - mIterRequestRows only orders, its filters had
+                           no caller
+    jydas       10/18/26 - mFilterRequests and mGetUIRequestRows read typed
+                           request rows instead of str()/literal_eval
+    jydas       10/18/26 - Batched status reads/updates of the patch
+                           dispatcher, status change notification
+    jydas       10/18/26 - data_cache TTL, version and etag columns
+                           (exabox/core/DataCache.py)
+    jydas       10/18/26 - Add mGetProfilerSamples (sampling profiler rows)
+    jydas       10/18/26 - SQL latency per statement template in the hot
+                           path metrics registry
+    jydas       10/18/26 - Typed worker/request rows (ebWorkerRow, ebRequestRow)
+                           with exact match and range request filters
+    jydas       10/18/26 - Indexed starttime_ts/endtime_ts request columns,
+                           batched archival/pruning and keyset UI paging
+    jydas       10/18/26 - Connection pool, mTransaction, mExecuteMany and
+                           lazy debug args formatting
     kanmanic    06/15/26 - 39560339 - Retry failed AQ response publishes
     joysjose    06/05/26 - Bug 38385387 : Memory and OHome Reshape retry enhancement
     aypaul      05/25/26 - SecBug#39392771 Remove proxy implementation from
@@ -133,8 +150,10 @@ import ast
 import uuid
 import json
 import shutil
+import functools
+from contextlib import contextmanager, nullcontext
 
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional
 from datetime import datetime, timedelta
 from glob import glob
 
@@ -154,6 +173,9 @@ from exabox.core.DBLockTableUtils import ebDBLockTypes, sLockDBRowToDict
 from exabox.exakms.ExaKmsEntry import ExaKmsEntry
 from exabox.exakms.ExaKmsHistoryNode import ExaKmsHistoryNode
 from exabox.core.AQResponse import mUpdateResponseToEcra
+from exabox.core.DBConnectionPool import ebGetDBConnectionPool, ebIsDBConnectionPoolEnabled
+from exabox.core.Metrics import ebMetricsTimer, ebMetricsSqlTemplate, ebMetricsEnabled
+from exabox.core.StatusNotify import ebStatusNotify
 
 
 def ebInitDBLayer(aContext, aOptions):
@@ -170,6 +192,135 @@ def ebGetConnConfig(aConfigParam, aConnFile):
     return get_mysql_config(aConfigParam, aConnFile)
 
 
+@functools.lru_cache(maxsize=1024)
+def ebPrepareQueryCached(aSql):
+    """
+    Change bind variable classic format to MySQL format, the SQL statements
+    are constant strings so the conversion is done once per statement
+    """
+
+    _sql = aSql
+    _regex = r'[(,=\ ]{1}[:]{1}([0-9]{1,})'
+
+    _patt = re.search(_regex, _sql)
+    while _patt is not None:
+        _replace = "%({0})s".format(_patt.group(1))
+        _sql = _sql[0:_patt.start()+1] + _replace + _sql[_patt.end():]
+        _patt = re.search(_regex, _sql)
+
+    return _sql
+
+
+REQUEST_TIME_FORMAT = '%a %b %d %H:%M:%S %Y'
+# starttime_ts of the requests whose starttime can not be parsed
+REQUEST_TIME_UNKNOWN = datetime(1970, 1, 1)
+REQUESTS_BATCH_SIZE = 1000
+REQUESTS_COLUMNS = """uuid, status, starttime, endtime, cmdtype, params, error, error_str,
+                      body, xml, statusinfo, clustername, _lock, data, subcmd,
+                      response_sent, aq_name, starttime_ts, endtime_ts"""
+
+def ebRequestTimeToDatetime(aValue):
+    """
+    Convert the start/end time of a request (time.strftime("%c") string)
+    into the datetime stored in starttime_ts/endtime_ts, None when unset.
+    """
+
+    if isinstance(aValue, datetime):
+        return aValue
+
+    if not aValue or not isinstance(aValue, str) or aValue == 'Undef':
+        return None
+
+    try:
+        return datetime.strptime(aValue.strip(), REQUEST_TIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def ebUnmaskRequestParams(aParams):
+    """
+    Return the params of a request as they were before being masked in the
+    requests table (a dict, or the string of erased params).
+    """
+
+    try:
+        if "Erased" in aParams:
+            return aParams
+        return umaskSensitiveData(aParams, full_mask=True)
+    except:
+        return umaskSensitiveData(ast.literal_eval(aParams), full_mask=False)
+
+
+class ebWorkerRow(NamedTuple):
+    """
+    Row of the workers table; positional access matches the former
+    literal_eval(mDumpWorkers()) tuples.
+    """
+    uuid: str
+    status: str
+    starttime: str
+    endtime: str
+    params: str
+    error: str
+    error_str: str
+    statusinfo: str
+    pid: str
+    port: str
+    type: str
+    synclock: str
+    lastactivetime: str
+    state: str
+
+WORKERS_COLUMNS = ", ".join(ebWorkerRow._fields)
+
+
+class ebRequestRow(NamedTuple):
+    """
+    Row of the requests table.  params holds the stored (masked) value, it is
+    only unmasked when mGetParams() or mToDict() is called.  The _lock
+    column is exposed as lock (NamedTuple fields cannot start with '_').
+    """
+    uuid: str
+    status: str
+    starttime: str
+    endtime: str
+    cmdtype: str
+    params: str
+    error: str
+    error_str: str
+    body: str
+    xml: str
+    statusinfo: str
+    clustername: str
+    lock: str
+    data: str
+    subcmd: str
+    response_sent: str
+    aq_name: str
+    starttime_ts: Optional[datetime]
+    endtime_ts: Optional[datetime]
+
+    def mGetParams(self):
+        return ebUnmaskRequestParams(self.params)
+
+    def mToDict(self):
+        """
+        Same dict as ebJobRequest.mToDict() of the request, as returned by
+        mFilterRequests.
+        """
+
+        _subcmd = self.subcmd
+        if not _subcmd and self.cmdtype and "." in self.cmdtype:
+            _subcmd = self.cmdtype.split(".")[1]
+
+        return {"uuid": str(self.uuid), "status": self.status, "starttime": self.starttime,
+                "endtime": self.endtime, "cmdtype": self.cmdtype, "params": self.mGetParams(),
+                "error": self.error, "error_str": self.error_str, "body": self.body,
+                "xml": self.xml, "statusinfo": self.statusinfo, "clustername": self.clustername,
+                "lock": self.lock, "data": self.data, "subcmd": _subcmd,
+                "response_sent": self.response_sent, "aq_name": self.aq_name}
+
+
 #################
 # Mysql DB lite #
 #################
@@ -195,6 +346,10 @@ class ebMysqlDBlite(object):
         # an underlying DB method
         self.__conn = threading.local()
         self.__conn_config = None
+        self.__pool = None
+        self.__pool_conns = []
+        self.__pool_generation = 0
+        self.__pool_lock = threading.Lock()
         self.__is_transaction = False
         self.__retry_conn = True
         self.__retry_kill_switch_path = os.path.abspath(\
@@ -238,7 +393,10 @@ class ebMysqlDBlite(object):
         return self.__lastsql
 
     def mGetLastArgs(self):
-        return self.__lastargs
+        # Formatted on demand, most of the statements never need it
+        if not self.__lastargs:
+            return None
+        return ebMysqlDBlite.mListToDict(self.__lastargs, 40)
 
     def mSetOciExacc(self, aBool):
         self.__ociexacc = aBool
@@ -264,7 +422,28 @@ class ebMysqlDBlite(object):
     def mHasConnection(self):
         return hasattr(self.__conn,'conn')
 
+    def mGetConnectionPool(self):
+        return self.__pool
+
+    def mSetConnectionPool(self, aPool):
+        self.__pool = aPool
+
     def mGetConnection(self):
+
+        if self.__pool is not None:
+            # Connection released by mShutdownDB from another thread
+            if getattr(self.__conn, 'generation', None) != self.__pool_generation:
+                self.__conn.conn = None
+
+            _conn = getattr(self.__conn,'conn',None)
+            if not _conn:
+                _conn = self.__pool.mAcquire(self.mGetConnConfig(), self.mCreateConnection)
+                with self.__pool_lock:
+                    self.__pool_conns.append(_conn)
+                self.__conn.conn = _conn
+                self.__conn.generation = self.__pool_generation
+            return _conn
+
         _conn = getattr(self.__conn,'conn',None)
         if not _conn:
             self.mSetConnection(self.mCreateConnection(self.mGetConnConfig()))
@@ -272,6 +451,21 @@ class ebMysqlDBlite(object):
         return _conn
 
     def mSetConnection(self, aConn):
+
+        if self.__pool is not None:
+            # Reconnection: the old connection is broken, never reuse it
+            _old = getattr(self.__conn, 'conn', None)
+            if getattr(self.__conn, 'generation', None) != self.__pool_generation:
+                _old = None
+            with self.__pool_lock:
+                if _old is not None and _old is not aConn and _old in self.__pool_conns:
+                    self.__pool_conns.remove(_old)
+                    self.__pool.mRelease(_old, aDiscard=True)
+                if aConn is not None and aConn not in self.__pool_conns:
+                    self.__pool.mAdopt(aConn, self.mGetConnConfig())
+                    self.__pool_conns.append(aConn)
+            self.__conn.generation = self.__pool_generation
+
         self.__conn.conn = aConn
 
     def mGetConnConfig(self):
@@ -320,12 +514,62 @@ class ebMysqlDBlite(object):
        raise NotImplementedError()
 
     def mShutdownDB(self):
+
+        if self.__pool is not None:
+            # Give back the connections of every thread of this object
+            with self.__pool_lock:
+                _conns = self.__pool_conns
+                self.__pool_conns = []
+                self.__pool_generation += 1
+            for _conn in _conns:
+                self.__pool.mRelease(_conn)
+            self.__conn.conn = None
+            return
+
         try:
             if self.mHasConnection():
                 self.mGetConnection().close()
         except AttributeError:
             self.mLog(ebLogWarn, 'DB shutdown error')
 
+    def mInTransaction(self):
+        return getattr(self.__conn, 'txdepth', 0) > 0
+
+    @contextmanager
+    def mTransaction(self):
+        """
+        Group several statements in a single transaction of the connection
+        of the current thread:
+
+            with _db.mTransaction():
+                _db.mExecute(...)
+                _db.mExecuteMany(...)
+
+        Statements run inside the block are not committed one by one and are
+        not retried; any exception rolls back the whole transaction.  Nested
+        blocks join the outer transaction.
+        """
+
+        if self.mInTransaction():
+            self.__conn.txdepth += 1
+            try:
+                yield self
+            finally:
+                self.__conn.txdepth -= 1
+
+        else:
+            self.mGetConnection().begin()
+            self.mSetTransaction(True)
+            self.__conn.txdepth = 1
+            try:
+                yield self
+            except BaseException:
+                self.__conn.txdepth = 0
+                self.mRollback()
+                raise
+            self.__conn.txdepth = 0
+            self.mCommit()
+
     def mFetchAllDict(self, aSql, aDataList):
         def mCallback(cursor):
             _rc = []
@@ -351,12 +595,33 @@ class ebMysqlDBlite(object):
             return _rc
         return self.mExecute(aSql, aDataList, mCallback)
 
+    def mIterRows(self, aSql, aDataList=None, aRowType=None):
+        """
+        Generator over the rows of a query, built as aRowType (a NamedTuple)
+        when given.  The result set is fetched at once so the connection is
+        free while the caller iterates, rows are only built when consumed.
+        """
+
+        for _row in self.mFetchAll(aSql, aDataList) or []:
+            yield aRowType._make(_row) if aRowType else _row
+
     def mExecuteLog(self, aSql, aDataList=None):
         self.mSetLog(True)
         _res = self.mExecute(aSql, aDataList)
         self.mSetLog(False)
         return _res
 
+    def mExecuteMany(self, aSql, aDataRows):
+        """
+        Execute the same statement for every row of aDataRows with a single
+        executemany() and commit (multi-row INSERT for INSERT ... VALUES).
+        Returns the number of affected rows.
+        """
+
+        if not aDataRows:
+            return 0
+        return self.mExecute(aSql, aDataRows, aMany=True)
+
     @staticmethod
     def mListToDict(aList, aStrTrimSize=None):
 
@@ -393,17 +658,7 @@ class ebMysqlDBlite(object):
         """
         Change bind variable classic format to MySQL format
         """
-
-        _sql = str(aSql)
-        _regex = '[(,=\ ]{1}[:]{1}([0-9]{1,})'
-
-        _patt = re.search(_regex, _sql)
-        while _patt is not None:
-            _replace = "%({0})s".format(_patt.group(1))
-            _sql = _sql[0:_patt.start()+1] + _replace + _sql[_patt.end():]
-            _patt = re.search(_regex, _sql)
-
-        return _sql
+        return ebPrepareQueryCached(str(aSql))
 
     @staticmethod
     def mFormat(aDataList, aQuery, aValue):
@@ -421,7 +676,13 @@ class ebMysqlDBlite(object):
 
         return ""
 
-    def mExecute(self, aSql, aDataList=None, aCallback=None):
+    def mExecute(self, aSql, aDataList=None, aCallback=None, aMany=False):
+
+        # Inside mTransaction: no commit and no retry, the block owns both
+        if self.mInTransaction():
+            if aMany:
+                return self.mNativeExecuteMany(aSql, aDataList)
+            return self.mNativeExecute(aSql, aDataList, aCallback)
 
         _retries = self.__max_retry
 
@@ -430,7 +691,10 @@ class ebMysqlDBlite(object):
             try:
                 self.mGetConnection().begin()
                 self.mSetTransaction(True)
-                _rc = self.mNativeExecute(aSql, aDataList, aCallback)
+                if aMany:
+                    _rc = self.mNativeExecuteMany(aSql, aDataList)
+                else:
+                    _rc = self.mNativeExecute(aSql, aDataList, aCallback)
                 self.mCommit()
                 return _rc
 
@@ -440,12 +704,12 @@ class ebMysqlDBlite(object):
                     raise
 
                 self.mLogDB('WRN', "DBStore3, InterfaceError while execute query: {0}".format(aSql))
-                self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.__lastargs))
+                self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.mGetLastArgs()))
                 self.mLogDB('WRN', "DBStore3: InterfaceError Try Reconnection")
 
                 if self.mGetDebug():
                     self.mLog(ebLogWarn, "DBStore3: InterfaceError while execute query: {0}".format(e))
-                    self.mLog(ebLogWarn, "`{0}`|`{1}`".format(self.__lastsql, self.__lastargs))
+                    self.mLog(ebLogWarn, "`{0}`|`{1}`".format(self.__lastsql, self.mGetLastArgs()))
                     self.mLog(ebLogWarn, "DBStore3: InterfaceError Try Reconnection")
 
                 if self.mGetDriver().mIsRunning():
@@ -462,7 +726,7 @@ class ebMysqlDBlite(object):
 
                 self.mLogDB('WRN', "DBStore3, OperationalError while execute query: {0}".format(aSql))
                 self.mLogDB('WRN', "DBStore3, OperationalError details: {0}".format(ex))
-                self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.__lastargs))
+                self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.mGetLastArgs()))
 
                 if ex.args[0] == pymysql.constants.CR.CR_SERVER_GONE_ERROR:
 
@@ -484,15 +748,22 @@ class ebMysqlDBlite(object):
                     raise
 
                 self.mLogDB('WRN', "DBStore3, Error while execute query: {0}".format(e))
-                self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.__lastargs))
+                self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.mGetLastArgs()))
 
                 if self.mGetDebug():
                     self.mLog(ebLogWarn, "DBStore3: Error while execute query: {0}".format(e))
-                    self.mLog(ebLogWarn, "`{0}`|`{1}`".format(self.__lastsql, self.__lastargs))
+                    self.mLog(ebLogWarn, "`{0}`|`{1}`".format(self.__lastsql, self.mGetLastArgs()))
 
                 self.mRollback()
                 _retries -= 1
 
+    @staticmethod
+    def mSqlTimer(aSql):
+        # Latency per statement template (core/Metrics.py)
+        if ebMetricsEnabled():
+            return ebMetricsTimer("sql_us", {"sql": ebMetricsSqlTemplate(str(aSql))})
+        return nullcontext()
+
     """
     No third argument    : Execute SQL as before
     List/Tuple argument  : All member converted to String
@@ -522,20 +793,21 @@ class ebMysqlDBlite(object):
                 else:
                     _dict = aDataList
 
-                _debugDict = ebMysqlDB.mListToDict(aDataList, 40)
+                self.__lastargs = aDataList
 
                 if self.mGetLog():
-                    self.mLogDB('NFO', _debugDict)
+                    self.mLogDB('NFO', self.mGetLastArgs())
 
                 if self.mGetDebug():
-                    self.mLog(ebLogDebug, _debugDict)
+                    self.mLog(ebLogDebug, self.mGetLastArgs())
 
-                self.__lastargs = _debugDict
-                _cursor.execute(_sql, _dict)
+                with self.mSqlTimer(aSql):
+                    _cursor.execute(_sql, _dict)
 
             else:
                 self.__lastargs = None
-                _cursor.execute(_sql)
+                with self.mSqlTimer(aSql):
+                    _cursor.execute(_sql)
 
             if aCallback:
                 _rc = aCallback(_cursor)
@@ -552,6 +824,36 @@ class ebMysqlDBlite(object):
 
         return _rc
 
+    def mNativeExecuteMany(self, aSql, aDataRows):
+
+        if not self.mGetConnection().open:
+            self.mSetConnection(self.mCreateConnection(self.mGetConnConfig()))
+
+        with self.mGetConnection().cursor() as _cursor:
+
+            _sql = ebMysqlDB.mPrepareQuery(aSql)
+            self.__lastsql = _sql
+            self.__lastargs = aDataRows[0]
+
+            if self.mGetLog():
+                self.mLogDB('NFO', f"{_sql} ({len(aDataRows)} rows)")
+
+            if self.mGetDebug():
+                self.mLog(ebLogDebug, "DBStore3, mNativeExecuteMany: `{0}` ({1} rows)".format(_sql, len(aDataRows)))
+
+            _rows = []
+            for _row in aDataRows:
+                if isinstance(_row, list) or isinstance(_row, tuple):
+                    _rows.append(ebMysqlDB.mListToDict(_row))
+                else:
+                    _rows.append(_row)
+
+            with self.mSqlTimer(aSql):
+                _cursor.executemany(_sql, _rows)
+            self.__affected_rows = _cursor.rowcount
+
+        return self.__affected_rows
+
     def mCommit(self):
         if self.mIsTransaction():
             self.mGetConnection().commit()
@@ -559,7 +861,7 @@ class ebMysqlDBlite(object):
             if self.mGetDebug():
                 self.mLogDB('WRN', "DBStore3, Commit Successfull")
                 self.mLogDB('WRN', "`{0}`|`{1}`|`{2} affected`".format(self.__lastsql, \
-                                                              self.__lastargs, \
+                                                              self.mGetLastArgs(), \
                                                               self.__affected_rows))
 
             self.mSetTransaction(False)
@@ -569,11 +871,11 @@ class ebMysqlDBlite(object):
             self.mGetConnection().rollback()
         except Exception as e:
             self.mLogDB('WRN', "DBStore3, Error on rollback: {0}".format(e))
-            self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.__lastargs))
+            self.mLogDB('WRN', "`{0}`|`{1}`".format(self.__lastsql, self.mGetLastArgs()))
 
             if self.mGetDebug():
                 self.mLog(ebLogWarn, "DBStore3, Error on rollback: {0}".format(e))
-                self.mLog(ebLogWarn, "`{0}`|`{1}`".format(self.__lastsql, self.__lastargs))
+                self.mLog(ebLogWarn, "`{0}`|`{1}`".format(self.__lastsql, self.mGetLastArgs()))
             # Error on Rollback show that DB connection is corrupted (Packet Sequence number)
             # Recreate it
             self.mGetConnection().close()
@@ -625,7 +927,14 @@ class ebMysqlDB(ebMysqlDBlite):
         if "mysql_config" in self.__config:
             _confile = self.__config["mysql_config"]
         self.mSetConnConfig(ebGetConnConfig(aConfigParam, _confile))
-        self.mSetConnection(self.mCreateConnection(self.mGetConnConfig()))
+        if ebIsDBConnectionPoolEnabled(self.__config):
+            # Connections are taken from the pool on first use, the config
+            # must be complete before as it is the key of the pool
+            self.mGetConnConfig()['connect_timeout'] = self.mGetAccessTimeout()
+            self.mSetConnectionPool(ebGetDBConnectionPool(self.__config))
+            self.mSetMaskParams(self.__config['mask_db_params'])
+        else:
+            self.mSetConnection(self.mCreateConnection(self.mGetConnConfig()))
 
         if 'db_dir' in self.__config.keys():
             self.__db_path = self.__config['db_dir']
@@ -1548,19 +1857,32 @@ class ebExacloudDB(ebMysqlDB):
         if not self.mCheckTableExist('data_cache'):
             self.mExecute('''CREATE TABLE IF NOT EXISTS data_cache (name TEXT,
                                                  data TEXT,
-                                                 creation_date TEXT)''')
+                                                 creation_date TEXT,
+                                                 expires_at DOUBLE NULL,
+                                                 version INTEGER NOT NULL DEFAULT 0,
+                                                 etag VARCHAR(64) NULL,
+                                                 INDEX idx_data_cache_name (name(128)))''')
+        elif not self.mCheckColumnExist('data_cache', 'version'):
+            # TTL and version of exabox/core/DataCache.py
+            self.mExecute('''ALTER TABLE data_cache ADD COLUMN expires_at DOUBLE NULL,
+                                                ADD COLUMN version INTEGER NOT NULL DEFAULT 0,
+                                                ADD COLUMN etag VARCHAR(64) NULL,
+                                                ADD INDEX idx_data_cache_name (name(128))''')
         """
         data_cache fields:
             0. name
             1. data
             2. creation_date
+            3. expires_at (epoch, NULL: no expiry)
+            4. version
+            5. etag
         """
 
     def mInsertDataCache(self, aName: str, aData: str):
 
         _name = aName
         _dataStr = aData
-        _sql = """INSERT INTO data_cache VALUES (%(1)s, %(2)s, %(3)s)"""
+        _sql = """INSERT INTO data_cache (name, data, creation_date) VALUES (%(1)s, %(2)s, %(3)s)"""
         _data = [_name, _dataStr, time.strftime("%c")]
         self.mExecute(_sql, _data)
 
@@ -1576,8 +1898,9 @@ class ebExacloudDB(ebMysqlDB):
         _name = aName
         _dataStr = aData
         _date = time.strftime("%c")
+        # New version: the in-process copies of DataCache revalidate on it
         _sql = """UPDATE data_cache
-                  SET data=%(1)s, creation_date=%(2)s WHERE name=%(3)s"""
+                  SET data=%(1)s, creation_date=%(2)s, version=version+1, etag=NULL WHERE name=%(3)s"""
         _data = [_dataStr, _date, _name]
         self.mExecute(_sql, _data)
 
@@ -1601,6 +1924,42 @@ class ebExacloudDB(ebMysqlDB):
 
         return _out
 
+    def mGetDataCacheEntry(self, aName: str):
+        """ (data, version, etag, expires_at) of aName or None """
+
+        _sql = """SELECT data, version, etag, expires_at FROM data_cache WHERE name=%(1)s"""
+        return self.mFetchOne(_sql, [aName]) or None
+
+    def mGetDataCacheVersion(self, aName: str):
+        """ (version, expires_at) of aName or None, without the data """
+
+        _sql = """SELECT version, expires_at FROM data_cache WHERE name=%(1)s"""
+        return self.mFetchOne(_sql, [aName]) or None
+
+    def mSetDataCacheEntry(self, aName: str, aData: str, aEtag: str, aExpiresAt=None):
+        """ Insert or update aName, returns the new version """
+
+        _date = time.strftime("%c")
+        with self.mTransaction():
+            _rc = self.mFetchOne("""SELECT version FROM data_cache WHERE name=%(1)s FOR UPDATE""", [aName])
+            if _rc:
+                _version = (_rc[0] or 0) + 1
+                _sql = """UPDATE data_cache SET data=%(1)s, creation_date=%(2)s, expires_at=%(3)s,
+                                                version=%(4)s, etag=%(5)s WHERE name=%(6)s"""
+                self.mExecute(_sql, [aData, _date, aExpiresAt, _version, aEtag, aName])
+            else:
+                _version = 1
+                _sql = """INSERT INTO data_cache (name, data, creation_date, expires_at, version, etag)
+                          VALUES (%(1)s, %(2)s, %(3)s, %(4)s, %(5)s, %(6)s)"""
+                self.mExecute(_sql, [aName, aData, _date, aExpiresAt, _version, aEtag])
+
+        return _version
+
+    def mDelExpiredDataCache(self, aNow=None):
+
+        _sql = """DELETE FROM data_cache WHERE expires_at IS NOT NULL AND expires_at < %(1)s"""
+        self.mExecute(_sql, [aNow if aNow is not None else time.time()])
+
  
     def mCreateAgentTable(self):
 
@@ -2292,7 +2651,17 @@ class ebExacloudDB(ebMysqlDB):
                                                     data mediumtext,
                                                     subcmd TEXT,
                                                     response_sent TEXT,
-                                                    aq_name TEXT)''')
+                                                    aq_name TEXT,
+                                                    starttime_ts DATETIME NULL,
+                                                    endtime_ts DATETIME NULL,
+                                                    INDEX idx_requests_starttime_ts (starttime_ts),
+                                                    INDEX idx_requests_endtime_ts (endtime_ts),
+                                                    INDEX idx_requests_status (status(16)))''')
+        else:
+            self.mMigrateRequestsTimestamps('requests')
+            if not self.mCheckIndexExist('requests', 'idx_requests_status'):
+                # Pending requests lookups of the dispatcher
+                self.mExecute('''ALTER TABLE requests ADD INDEX idx_requests_status (status(16))''')
     """
     Request fields:
         0. uuid
@@ -2312,6 +2681,8 @@ class ebExacloudDB(ebMysqlDB):
        14. subcmd
        15. response_sent
        16. aq_name
+       17. starttime_ts (DATETIME of starttime)
+       18. endtime_ts (DATETIME of endtime)
     """
 
     def mCreateRequestsArchiveTable(self):
@@ -2333,7 +2704,14 @@ class ebExacloudDB(ebMysqlDB):
                                                             data mediumtext,
                                                             subcmd TEXT,
                                                             response_sent TEXT,
-                                                            aq_name TEXT)''')
+                                                            aq_name TEXT,
+                                                            starttime_ts DATETIME NULL,
+                                                            endtime_ts DATETIME NULL,
+                                                            INDEX idx_requests_archive_uuid (uuid(64)),
+                                                            INDEX idx_requests_archive_starttime_ts (starttime_ts),
+                                                            INDEX idx_requests_archive_endtime_ts (endtime_ts))''')
+        else:
+            self.mMigrateRequestsTimestamps('requests_archive')
     """
     Request Archive fields:
         0. uuid
@@ -2353,8 +2731,86 @@ class ebExacloudDB(ebMysqlDB):
        14. subcmd
        15. response_sent
        16. aq_name
+       17. starttime_ts
+       18. endtime_ts
     """
 
+    def mCheckColumnExist(self, aTableName, aColumnName):
+        _sql = f"""SHOW COLUMNS FROM {aTableName} LIKE %(1)s"""
+        _fdata = self.mFetchOne(_sql, [aColumnName])
+        return bool(_fdata and len(_fdata) and _fdata[0] == aColumnName)
+
+    def mCheckIndexExist(self, aTableName, aIndexName):
+        _sql = f"""SHOW INDEX FROM {aTableName} WHERE Key_name=%(1)s"""
+        return bool(self.mFetchOne(_sql, [aIndexName]))
+
+    def mGetRequestsBatchSize(self):
+        _value = get_gcontext().mCheckConfigOption('requests_batch_size')
+        try:
+            return max(1, int(_value)) if _value is not None else REQUESTS_BATCH_SIZE
+        except ValueError:
+            ebLogWarn(f"Invalid value for requests_batch_size: {_value}, using {REQUESTS_BATCH_SIZE}")
+            return REQUESTS_BATCH_SIZE
+
+    def mMigrateRequestsTimestamps(self, aTableName):
+        """
+        Add the indexed starttime_ts/endtime_ts columns to a requests table
+        created by a previous version and backfill them from the
+        starttime/endtime strings.
+        """
+
+        if self.mCheckColumnExist(aTableName, 'starttime_ts'):
+            return
+
+        ebLogInfo(f"DBStore3: adding starttime_ts/endtime_ts columns to {aTableName}")
+        _sql = f"""ALTER TABLE {aTableName} ADD COLUMN starttime_ts DATETIME NULL,
+                                ADD COLUMN endtime_ts DATETIME NULL,
+                                ADD INDEX idx_{aTableName}_starttime_ts (starttime_ts),
+                                ADD INDEX idx_{aTableName}_endtime_ts (endtime_ts)"""
+        if aTableName == 'requests_archive':
+            _sql += ", ADD INDEX idx_requests_archive_uuid (uuid(64))"
+        self.mExecute(_sql)
+
+        self.mBackfillRequestsTimestamps(aTableName)
+
+    def mBackfillRequestsTimestamps(self, aTableName):
+        """
+        Fill starttime_ts/endtime_ts of the rows that do not have them, in
+        batches of requests_batch_size rows, one transaction per batch.
+        Return the number of updated rows.
+        """
+
+        _batch = self.mGetRequestsBatchSize()
+        _select = f"""SELECT uuid, starttime, endtime FROM {aTableName}
+                      WHERE starttime_ts IS NULL LIMIT {_batch}"""
+        _update = f"""UPDATE {aTableName} SET starttime_ts=%(1)s, endtime_ts=%(2)s
+                      WHERE uuid=%(3)s AND starttime_ts IS NULL"""
+        _total = 0
+
+        while True:
+            _rows = self.mFetchAll(_select)
+            if not _rows:
+                break
+
+            _data = []
+            for _uuid, _start, _end in _rows:
+                _data.append([ebRequestTimeToDatetime(_start) or REQUEST_TIME_UNKNOWN,
+                              ebRequestTimeToDatetime(_end), _uuid])
+
+            with self.mTransaction():
+                _updated = self.mExecuteMany(_update, _data)
+            if not _updated:
+                # Rows that can not be matched by uuid, do not loop on them
+                ebLogWarn(f"DBStore3: {len(_rows)} rows of {aTableName} can not be backfilled")
+                break
+            _total += _updated
+
+            if len(_rows) < _batch:
+                break
+
+        ebLogInfo(f"DBStore3: backfilled timestamps of {_total} rows of {aTableName}")
+        return _total
+
     def mInsertNewRequest(self, aRequest):
 
         _uuid   = aRequest.mGetUUID()
@@ -2377,13 +2833,16 @@ class ebExacloudDB(ebMysqlDB):
         _response_sent = aRequest.mGetResponseSent()
         _aq_name = aRequest.mGetAqName()
 
-        _sql = """INSERT IGNORE INTO requests
+        _time_ts = ebRequestTimeToDatetime(_time) or REQUEST_TIME_UNKNOWN
+        _end_ts  = ebRequestTimeToDatetime(_end)
+
+        _sql = f"""INSERT IGNORE INTO requests ({REQUESTS_COLUMNS})
                   VALUES (%(1)s, %(2)s, %(3)s, %(4)s, %(5)s, %(6)s,
                           %(7)s, %(8)s, %(9)s, %(10)s, %(11)s, %(12)s, %(13)s, %(14)s, %(15)s, %(16)s,
-                          %(17)s)"""
+                          %(17)s, %(18)s, %(19)s)"""
         _data = [_uuid, _status, _time, _end, _ctype, _params, _error, _error_str, \
                  _body, _xml, _statusinfo, _clustername, _lock, _data, _sub_command, _response_sent, \
-                 _aq_name]
+                 _aq_name, _time_ts, _end_ts]
         self.mExecuteLog(_sql, _data)
 
     def mExecuteWithRetryLock(self, aSql, aData, aUuid):
@@ -2440,6 +2899,7 @@ class ebExacloudDB(ebMysqlDB):
         except Exception as err:
             ebLogError("mUpdateStatusRequestWithLock failed for request id=%s with error %s" % (_uuid, str(err)))
             raise err
+        ebStatusNotify()
 
     @mUpdateResponseToEcra
     def mUpdateStatusRequest(self, aRequest):
@@ -2450,6 +2910,7 @@ class ebExacloudDB(ebMysqlDB):
         _sql = """UPDATE requests SET status=%(1)s, statusinfo=%(2)s WHERE uuid=%(3)s"""
         _data = [_status, _statusinfo, _uuid]
         self.mExecuteLog(_sql, _data)
+        ebStatusNotify()
 
     @mUpdateResponseToEcra
     def mUpdateParams(self, aRequest):
@@ -2489,10 +2950,11 @@ class ebExacloudDB(ebMysqlDB):
         _sql = """UPDATE requests
                   SET status=%(1)s, statusinfo=%(8)s, endtime=%(2)s, error=%(3)s,
                       error_str=%(4)s, body=%(5)s, xml=%(6)s, clustername=%(9)s,
-                      _lock=%(10)s, data=%(11)s, subcmd=%(12)s WHERE uuid=%(7)s"""
+                      _lock=%(10)s, data=%(11)s, subcmd=%(12)s, endtime_ts=%(13)s WHERE uuid=%(7)s"""
         _data = [_status, _end, _error, _error_str, _body, _xml, _uuid, \
-                 _statusinfo, _clustername, _lock, _data, _sub_command]
+                 _statusinfo, _clustername, _lock, _data, _sub_command, ebRequestTimeToDatetime(_end)]
         self.mExecuteLog(_sql, _data)
+        ebStatusNotify()
 
     def mGetRequest(self, aUUID):
         #[WARNING]Don't change the field list arbitrarily. Adding new field here will cause regression with ECRA.
@@ -2504,6 +2966,22 @@ class ebExacloudDB(ebMysqlDB):
             _rc = self.mUnmaskReqParams(_rc)
         return _rc
 
+    def mGetRequestsStatus(self, aUUIDs, aChunk=500):
+        """
+        {uuid: (status, error, error_str)} of the requests aUUIDs, one query
+        per aChunk requests. Unknown requests are not in the result.
+        """
+
+        _uuids = list(dict.fromkeys(_uuid for _uuid in aUUIDs if _uuid))
+        _result = {}
+        for _pos in range(0, len(_uuids), aChunk):
+            _part = _uuids[_pos:_pos + aChunk]
+            _in = ", ".join([f"%({_i})s" for _i in range(1, len(_part) + 1)])
+            _sql = f"SELECT uuid, status, error, error_str FROM requests WHERE uuid IN ({_in})"
+            for _row in self.mFetchAll(_sql, _part):
+                _result[_row[0]] = tuple(_row[1:4])
+        return _result
+
     def mGetCompleteRequest(self, aUUID):
         #Update this field list whenever a new field is added to the requests table.
         _rc = None
@@ -2664,6 +3142,22 @@ class ebExacloudDB(ebMysqlDB):
 
         return self.mFetchAllDict(_sql, _data)
 
+    def mGetProfilerSamples(self, aOperationId=None, aWorkflowId=None, aExaunitId=None):
+
+        _sql = "SELECT * FROM profiler WHERE profiler_type = 'samples'"
+        _data = []
+
+        if aOperationId:
+            _data.append(aOperationId)
+            _sql += f" AND operation_id = %({len(_data)})s"
+        else:
+            _data.extend([aWorkflowId, aExaunitId])
+            _sql += " AND workflow_id = %(1)s AND exaunit_id = %(2)s"
+
+        _sql += " ORDER BY start_time"
+
+        return self.mFetchAllDict(_sql, _data)
+
 
     def mFilterRequests(self, aDict=None, aLimit=None, aOffset=None, aNotCondition=None, aOrderBy=None):
         """
@@ -2685,13 +3179,9 @@ class ebExacloudDB(ebMysqlDB):
 
         Returns: <list> : list of ebJobRequest objects in a dict form
         """
-        def mMigrateRequest(aSqlResult):
-            _req = ebJobRequest(None, {})
-            _req.mPopulate(aSqlResult)
-            return _req.mToDict()
 
         _columns = ebJobRequest.mGetColumns()
-        _query = "SELECT * FROM requests"
+        _query = f"SELECT {REQUESTS_COLUMNS} FROM requests"
 
         _conditions = {"sql": []}
 
@@ -2742,83 +3232,100 @@ class ebExacloudDB(ebMysqlDB):
             if aLimit is not None:
                 _query += " LIMIT {0} ".format(aLimit)
 
-        _objs = []
-        if _conditions.keys() != []:
-            _objs = self.mFetchAll(_query, _conditions)
-        else:
-            _objs = self.mFetchAll(_query)
-
-        _objs = [self.mUnmaskReqParams(x) for x in _objs]
-        _objs = [mMigrateRequest(x) for x in _objs]
-        return _objs
-
-
-    def mGetUIRequests(self, aCmdtype=None, aClustername=None, aLimit=None, aOffset=None):
-        # Need to re-arrange starttime to make ORDER BY work
-        # YYYY = substr(starttime, 21, 4)
-        # MON  = substr(starttime, 5, 3)
-        # DD = substr(CONCAT('00', cast(substr(endtime, 9, 2) as signed)), -2, 2)
-        # The '00' fixes the convertion, ensuring a leading 0 on months with one digit
-        # HH = substr(starttime, 12, 2)
-        # MI = substr(starttime, 15, 2)
-        # SS = substr(starttime, 18, 2)
-        _order_criteria = """
-        cast(CONCAT(substr(starttime, 21, 4),
-            case substr(starttime, 5, 3)
-                when 'Jan' then '01'
-                when 'Feb' then '02'
-                when 'Mar' then '03'
-                when 'Apr' then '04'
-                when 'May' then '05'
-                when 'Jun' then '06'
-                when 'Jul' then '07'
-                when 'Aug' then '08'
-                when 'Sep' then '09'
-                when 'Oct' then '10'
-                when 'Nov' then '11'
-                when 'Dec' then '12'
-            end,
-            substr(CONCAT('00', cast(substr(starttime, 9, 2) as signed)), -2, 2),
-            substr(starttime, 12, 2),
-            substr(starttime, 15, 2),
-            substr(starttime, 18, 2))
-        as signed) as ordertime
+        # Params are unmasked once per row, by mToDict
+        return [_row.mToDict() for _row in self.mIterRows(_query, _conditions, ebRequestRow)]
+
+
+    def mIterRequestRows(self, aOrderBy=None):
+        """
+        Generator of ebRequestRow of all the requests.
+
+        aOrderBy: column -> ASC/DESC, starttime/endtime order by *_ts
+        """
+
+        _columns = ebRequestRow._fields
+        _sql = f"SELECT {REQUESTS_COLUMNS} FROM requests"
+
+        if aOrderBy:
+            _order = []
+            for _key, _direction in aOrderBy.items():
+                if _key not in _columns:
+                    raise ValueError(f"Invalid requests column: {_key}")
+                _direction = "DESC" if str(_direction).upper() == "DESC" else "ASC"
+                _column = f"{_key}_ts" if _key in ("starttime", "endtime") else _key
+                _column = "_lock" if _key == "lock" else _column
+                _order.append(f"{_column} {_direction}")
+            _sql += " ORDER BY " + ", ".join(_order)
+
+        return self.mIterRows(_sql, [], ebRequestRow)
+
+    def mGetUIRequestRows(self, aCmdtype=None, aClustername=None, aLimit=None, aOffset=None, aAfter=None):
+        """
+        Requests and archived requests for the UI, most recent first, as
+        tuples with the unmasked params dict and the ordertime
+        (YYYYMMDDHHMMSS integer) as last column.
+
+        Both tables are read through the starttime_ts index and only up to
+        the rows of the requested page.  aAfter is the (ordertime, uuid) of
+        the last row of the previous page (keyset pagination); aOffset is
+        kept for the page jumps of the UI.
         """
 
         _data = []
-        _query = """
+        _filter = self.mBuildUIFilter(_data, aClustername, aCmdtype)
+
+        if aAfter:
+            _ordertime, _uuid = aAfter
+            _data.extend([datetime.strptime(str(_ordertime), '%Y%m%d%H%M%S'), _uuid])
+            _filter += f"AND (starttime_ts < %({len(_data) - 1})s OR (starttime_ts = %({len(_data) - 1})s AND uuid < %({len(_data)})s)) "
+
+        _order = "ORDER BY starttime_ts DESC, uuid DESC "
+        _branch_limit = ""
+        if aLimit:
+            _branch_limit = f"LIMIT {int(aLimit) + int(aOffset or 0)} "
+
+        _columns = """uuid, status, starttime,
+                endtime, cmdtype, params,
+                error, error_str, '' AS body,
+                xml, statusinfo, clustername,
+                _lock, data, starttime_ts"""
+        _query = f"""
         SELECT uuid, status, starttime,
             endtime, cmdtype, params,
-            error, error_str, '',
+            error, error_str, body,
             xml, statusinfo, clustername,
-            _lock, data, ordertime
+            _lock, data, starttime_ts
         FROM (
-            SELECT uuid, status, starttime,
-                endtime, cmdtype, params,
-                error, error_str, '',
-                xml, statusinfo, clustername,
-                _lock, data, {0}
-            FROM requests
+            (SELECT {_columns} FROM requests {_filter} {_order} {_branch_limit})
             UNION ALL
-            SELECT uuid, status, starttime,
-                endtime, cmdtype, params,
-                error, error_str, '',
-                xml, statusinfo, clustername,
-                _lock, data, {0}
-            FROM requests_archive
+            (SELECT {_columns} FROM requests_archive {_filter} {_order} {_branch_limit})
         ) results
-        """.format(_order_criteria)
-        _query += self.mBuildUIFilter(_data, aClustername, aCmdtype)
+        """
 
-        _query += "ORDER BY ordertime DESC "
-        _query += ebMysqlDB.mFormat(_data, "LIMIT {0} ", aLimit)
-        _query += ebMysqlDB.mFormat(_data, ",{0} ", aOffset)
+        _query += _order
+        if aLimit:
+            _query += f"LIMIT {int(aLimit)} OFFSET {int(aOffset or 0)} "
 
         ebLogDebug("DBStore3.mGetUIRequests query = {} , data = {}".format(_query, _data))
+        _rows = []
+        for row in self.mFetchAll(_query, _data) or []:
+            row = list(row)
+            row[5] = ebUnmaskRequestParams(row[5])
+            # ordertime: YYYYMMDDHHMMSS integer, as built before starttime_ts existed
+            row[14] = int(row[14].strftime('%Y%m%d%H%M%S')) if row[14] else None
+            _rows.append(tuple(row))
+        return _rows
+
+    def mGetUIRequests(self, aCmdtype=None, aClustername=None, aLimit=None, aOffset=None, aAfter=None):
+        """
+        String body of mGetUIRequestRows, params as str(dict)
+        """
+
         _body = '('
-        for row in self.mFetchAll(_query, _data):
-            row = self.mUnmaskReqParams(row)
-            _body = _body + str(row)+','
+        for row in self.mGetUIRequestRows(aCmdtype, aClustername, aLimit, aOffset, aAfter):
+            row = list(row)
+            row[5] = str(row[5])
+            _body = _body + str(tuple(row))+','
         _body = _body + ')'
         return _body
 
@@ -2857,103 +3364,92 @@ class ebExacloudDB(ebMysqlDB):
 
     def mUnmaskReqParams(self, row):
         _params_i = 5
-        try:
-            if "Erased" in row[_params_i]:
-                _params = row[_params_i]
-            else:
-                _params = umaskSensitiveData(row[_params_i], full_mask=True)
-        except:
-            _params = ast.literal_eval(row[_params_i])
-            _params = umaskSensitiveData(_params, full_mask=False)
+        _params = ebUnmaskRequestParams(row[_params_i])
         row = list(row)
         row[_params_i] = str(_params)
         return tuple(row)
 
     # Query with dynamic filters support and data FROM trigger
     def mBackupRequests(self, isoDateStr, ebDbFilters):
-        _sql = """
-            INSERT INTO requests_archive
-            SELECT *
-            FROM requests
-            WHERE endtime != "Undef" AND
-                (cast(CONCAT(substr(endtime, 21, 4),
-                    case substr(endtime, 5, 3)
-                        when 'Jan' then '01'
-                        when 'Feb' then '02'
-                        when 'Mar' then '03'
-                        when 'Apr' then '04'
-                        when 'May' then '05'
-                        when 'Jun' then '06'
-                        when 'Jul' then '07'
-                        when 'Aug' then '08'
-                        when 'Sep' then '09'
-                        when 'Oct' then '10'
-                        when 'Nov' then '11'
-                        when 'Dec' then '12'
-                    end,
-                    substr(CONCAT('00', cast(substr(endtime, 9, 2) as signed)), -2, 2),
-                    substr(endtime, 12, 2),
-                    substr(endtime, 15, 2),
-                    substr(endtime, 18, 2))
-                as signed) <= cast(:1 as signed))"""
-        _bind = [isoDateStr]        #only bind variable
+        """
+        Copy to requests_archive the requests ended before isoDateStr
+        (YYYYMMDDHHMMSS) matching the filters, then delete the Done ones
+        from requests.  Both steps go through the endtime_ts index in batches
+        of requests_batch_size rows so the tables are never locked for long.
+        """
+
+        _limit = datetime.strptime(isoDateStr, '%Y%m%d%H%M%S')
+        _batch = self.mGetRequestsBatchSize()
+
+        _sql = """SELECT uuid, endtime_ts FROM requests
+                  WHERE endtime_ts IS NOT NULL AND endtime_ts <= :1"""
+        _bind = [_limit]        #only bind variable
         for _filter in ebDbFilters: #see dbpolicies/Base.py
             _sql, _bind = _filter.mAppendFilterToQuery(_sql, _bind)
-        self.mExecute(_sql, _bind)
-        self.mExecute("""
-            DELETE FROM requests
-            WHERE Status='Done' AND endtime != "Undef" AND
-                cast(CONCAT(substr(endtime, 21, 4),
-                    case substr(endtime, 5, 3)
-                        when 'Jan' then '01'
-                        when 'Feb' then '02'
-                        when 'Mar' then '03'
-                        when 'Apr' then '04'
-                        when 'May' then '05'
-                        when 'Jun' then '06'
-                        when 'Jul' then '07'
-                        when 'Aug' then '08'
-                        when 'Sep' then '09'
-                        when 'Oct' then '10'
-                        when 'Nov' then '11'
-                        when 'Dec' then '12'
-                    end,
-                    substr(CONCAT('00', cast(substr(endtime, 9, 2) as signed)), -2, 2),
-                    substr(endtime, 12, 2),
-                    substr(endtime, 15, 2),
-                    substr(endtime, 18, 2))
-                as signed) <= cast(%(1)s as signed)
-        """, [isoDateStr])
+
+        # Keyset on (endtime_ts, uuid), rows are not deleted while copying
+        _idx = len(_bind)
+        _sqlNext = _sql + f" AND (endtime_ts > :{_idx + 1} OR (endtime_ts = :{_idx + 1} AND uuid > :{_idx + 2}))"
+        _orderBy = f" ORDER BY endtime_ts, uuid LIMIT {_batch}"
+
+        _copied = 0
+        _last = None
+        while True:
+            if _last is None:
+                _rows = self.mFetchAll(_sql + _orderBy, _bind)
+            else:
+                _rows = self.mFetchAll(_sqlNext + _orderBy, _bind + [_last[1], _last[0]])
+            if not _rows:
+                break
+
+            _uuids = [_row[0] for _row in _rows]
+            _in = ", ".join([f"%({_i})s" for _i in range(1, len(_uuids) + 1)])
+            self.mExecute(f"""INSERT INTO requests_archive ({REQUESTS_COLUMNS})
+                             SELECT {REQUESTS_COLUMNS} FROM requests WHERE uuid IN ({_in})""", _uuids)
+            _copied += len(_uuids)
+            _last = _rows[-1]
+
+            if len(_rows) < _batch:
+                break
+
+        _deleted = 0
+        while True:
+            self.mExecute(f"""DELETE FROM requests
+                             WHERE status='Done' AND endtime_ts IS NOT NULL AND endtime_ts <= %(1)s
+                             LIMIT {_batch}""", [_limit])
+            _count = self.mGetAffectedRows()
+            _deleted += _count
+            if _count < _batch:
+                break
+
+        ebLogInfo(f"DBStore3: archived {_copied} requests, removed {_deleted} done requests")
+        return _copied
 
     # Query with dynamic filters support and data FROM trigger
     def mPruneRequests(self, isoDateStr, ebDbFilters):
+        """
+        Delete the requests ended before isoDateStr (YYYYMMDDHHMMSS) matching
+        the filters, in batches of requests_batch_size rows.
+        """
+
+        _batch = self.mGetRequestsBatchSize()
         _sql = """ DELETE FROM requests
-            WHERE endtime != "Undef" AND (
-                cast(CONCAT(substr(endtime, 21, 4),
-                    case substr(endtime, 5, 3)
-                        when 'Jan' then '01'
-                        when 'Feb' then '02'
-                        when 'Mar' then '03'
-                        when 'Apr' then '04'
-                        when 'May' then '05'
-                        when 'Jun' then '06'
-                        when 'Jul' then '07'
-                        when 'Aug' then '08'
-                        when 'Sep' then '09'
-                        when 'Oct' then '10'
-                        when 'Nov' then '11'
-                        when 'Dec' then '12'
-                    end,
-                    substr(CONCAT('00', cast(substr(endtime, 9, 2) as signed)), -2, 2),
-                    substr(endtime, 12, 2),
-                    substr(endtime, 15, 2),
-                    substr(endtime, 18, 2))
-                as signed) <= cast(:1 as signed))
+            WHERE endtime_ts IS NOT NULL AND endtime_ts <= :1
         """
-        _bind = [isoDateStr]        #only bind variable
+        _bind = [datetime.strptime(isoDateStr, '%Y%m%d%H%M%S')]        #only bind variable
         for _filter in ebDbFilters: #see dbpolicies/Base.py
             _sql, _bind = _filter.mAppendFilterToQuery(_sql, _bind)
-        self.mExecute(_sql, _bind)
+        _sql += f" LIMIT {_batch}"
+
+        _deleted = 0
+        while True:
+            self.mExecute(_sql, _bind)
+            _count = self.mGetAffectedRows()
+            _deleted += _count
+            if _count < _batch:
+                break
+
+        return _deleted
 
     def mClearRegistry(self):
         self.mExecute("""DELETE FROM registry""")
@@ -2969,6 +3465,35 @@ class ebExacloudDB(ebMysqlDB):
 
         self.mExecute(_stmt, _data)
 
+    def mIterWorkerRows(self, aUUID=None, aIdle=False):
+        """
+        Generator of ebWorkerRow ordered by endtime.
+
+        aUUID: only the workers running this request uuid
+        aIdle: only the idle NORMAL workers available for dispatch
+        """
+
+        _sql = f"SELECT {WORKERS_COLUMNS} FROM workers"
+        _conditions = []
+        _data = []
+
+        if aIdle:
+            _conditions.append("type='worker' AND status='Idle' AND state='NORMAL'")
+            aUUID = aUUID or '00000000-0000-0000-0000-000000000000'
+
+        if aUUID:
+            _data.append(aUUID)
+            _conditions.append("uuid=%(1)s")
+
+        if _conditions:
+            _sql += " WHERE " + " AND ".join(_conditions)
+        _sql += " ORDER BY endtime"
+
+        return self.mIterRows(_sql, _data, ebWorkerRow)
+
+    def mGetWorkerRows(self, aUUID=None, aIdle=False):
+        return list(self.mIterWorkerRows(aUUID, aIdle))
+
     def mGetIdleWorkers(self):
         _body = '('
 
@@ -3131,6 +3656,17 @@ class ebExacloudDB(ebMysqlDB):
 
         return None
 
+    def mGetIBFabricEntries(self, aFabricIDs):
+        """ {fabric id: ibfabriclocks row} of aFabricIDs with one query """
+
+        _ids = list(dict.fromkeys(int(_id) for _id in aFabricIDs))
+        if not _ids:
+            return {}
+
+        _in = ", ".join([f"%({_i})s" for _i in range(1, len(_ids) + 1)])
+        _sql = f"SELECT * FROM ibfabriclocks WHERE id IN ({_in})"
+        return {int(_row[0]): _row for _row in self.mFetchAll(_sql, _ids)}
+
     def mUpdateIBFabricEntry(self, aFabricObj):
 
         _id = aFabricObj.mGetIBFabricID()
@@ -3477,6 +4013,21 @@ class ebExacloudDB(ebMysqlDB):
         else:
             raise Exception('mUpdateChildRequestStatus: Invalid input provided.')
 
+    def mUpdateChildRequestsStatus(self, aMasterUUID, aStatusByChild):
+        """ mUpdateChildRequestStatus of several child requests in one transaction """
+
+        if not aMasterUUID:
+            raise Exception('mUpdateChildRequestsStatus: Invalid input provided.')
+
+        _rows = [[_status, aMasterUUID, _child] for _child, _status in aStatusByChild.items() if _child and _status]
+        if len(_rows) != len(aStatusByChild):
+            raise Exception('mUpdateChildRequestsStatus: Invalid input provided.')
+
+        _sql = """UPDATE patchlist SET reqstatus=%(1)s
+                  WHERE master_uuid=%(2)s AND child_uuid=%(3)s"""
+        with self.mTransaction():
+            return self.mExecuteMany(_sql, _rows)
+
     def mUpdateJsonPatchReport(self, aChildUUID, aData):
 
         if aChildUUID and aData:
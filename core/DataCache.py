@@ -0,0 +1,316 @@
+"""
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    DataCache - Cache of computed values over the data_cache table
+
+FUNCTION:
+    Values expensive to compute and shared by the workers (OEDA version,
+    image inventories, rack hardware information) are stored as JSON in the
+    data_cache table with a TTL, a version and an etag, and memoized in the
+    process:
+
+        _version = ebGetDataCache().mGet("oeda_version:<path>", _mFetch, aTtl=3600)
+
+    mGet looks up, in order:
+        1. the memo of the process (LRU, 'datacache_max_entries'). Past
+           'datacache_revalidate_sec' the version of the row is checked
+           (no data transferred), the memo is kept while it did not change.
+        2. the data_cache row, when not expired.
+        3. the loader, run once for all the threads of the process (lock per
+           name) and for all the workers (ExaLock per name): the others wait
+           and get the stored value.
+
+NOTE:
+    Values are JSON serializable. A loader returning None is not cached.
+    Tunables:
+        datacache_max_entries      values memoized per process (256)
+        datacache_default_ttl      seconds, when mGet/mSet get no aTtl (3600)
+        datacache_revalidate_sec   memo served without DB access (30)
+        datacache_purge_sec        expired rows are deleted by a write at
+                                   most once per this period (3600)
+    aTtl <= 0: no expiry.
+
+History:
+    jydas       10/18/2026 - Delete the expired rows from mSet
+    jydas       10/18/2026 - Creation
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import collections
+from typing import Any, NamedTuple, Optional
+
+from exabox.core.Context import get_gcontext
+from exabox.log.LogMgr import ebLogWarn, ebLogTrace
+
+DATACACHE_MAX_ENTRIES  = 256
+DATACACHE_DEFAULT_TTL  = 3600
+DATACACHE_REVALIDATE   = 30
+DATACACHE_PURGE        = 3600
+
+gDataCache = None
+
+
+class ebDataCacheEntry(NamedTuple):
+    value: Any
+    version: int
+    etag: Optional[str]
+    expiresAt: Optional[float]
+    checkedAt: float
+
+    def mIsExpired(self, aNow):
+        return self.expiresAt is not None and aNow >= self.expiresAt
+
+
+def ebDataCacheEnabled():
+    """ Whether the callers use the cache, the API works regardless """
+    return str(get_gcontext().mCheckConfigOption('datacache_enabled')) == 'True'
+
+
+def ebDataCacheEtag(aData):
+    return hashlib.sha1(aData.encode("utf-8")).hexdigest()
+
+
+class ebDataCache(object):
+
+    def __init__(self, aDB=None, aMaxEntries=None, aDefaultTtl=None, aRevalidate=None, aPurge=None):
+
+        def _mNumber(aName, aValue, aDefault):
+            if aValue is None:
+                aValue = get_gcontext().mCheckConfigOption(aName)
+            try:
+                return float(aValue) if aValue not in (None, "") else aDefault
+            except ValueError:
+                ebLogWarn(f"Invalid {aName}: {aValue}, using {aDefault}")
+                return aDefault
+
+        self.__db = aDB
+        self.__maxEntries = max(1, int(_mNumber('datacache_max_entries', aMaxEntries, DATACACHE_MAX_ENTRIES)))
+        self.__defaultTtl = _mNumber('datacache_default_ttl', aDefaultTtl, DATACACHE_DEFAULT_TTL)
+        self.__revalidate = _mNumber('datacache_revalidate_sec', aRevalidate, DATACACHE_REVALIDATE)
+        self.__purge = _mNumber('datacache_purge_sec', aPurge, DATACACHE_PURGE)
+        self.__purgedAt = None
+
+        self.__lock = threading.Lock()
+        self.__memo = collections.OrderedDict()
+        # name -> lock of the loaders of the process
+        self.__loading = {}
+        self.__tableReady = False
+        self.__stats = collections.Counter()
+
+    def mGetDB(self):
+
+        if self.__db is None:
+            # Only needed past the memo
+            from exabox.core.DBStore import ebGetDefaultDB
+            return ebGetDefaultDB()
+        return self.__db
+
+    def mGetTable(self):
+
+        _db = self.mGetDB()
+        if not self.__tableReady:
+            _db.mCreateDataCacheTable()
+            self.__tableReady = True
+        return _db
+
+    def mGetStats(self):
+
+        with self.__lock:
+            _stats = {_key: self.__stats[_key] for _key in
+                      ("hits", "db_hits", "misses", "loads", "load_errors", "coalesced",
+                       "revalidations", "expired", "evictions", "purges")}
+            _stats["entries"] = len(self.__memo)
+        _lookups = _stats["hits"] + _stats["db_hits"] + _stats["misses"]
+        _stats["hit_ratio"] = round((_stats["hits"] + _stats["db_hits"]) / _lookups, 4) if _lookups else 0.0
+        return _stats
+
+    def mCount(self, aStat):
+        with self.__lock:
+            self.__stats[aStat] += 1
+
+    def mExpiresAt(self, aTtl, aNow):
+
+        _ttl = self.__defaultTtl if aTtl is None else aTtl
+        return aNow + _ttl if _ttl and _ttl > 0 else None
+
+    def mMemoGet(self, aName):
+
+        with self.__lock:
+            _entry = self.__memo.get(aName)
+            if _entry is not None:
+                self.__memo.move_to_end(aName)
+            return _entry
+
+    def mMemoPut(self, aName, aEntry):
+
+        with self.__lock:
+            self.__memo[aName] = aEntry
+            self.__memo.move_to_end(aName)
+            while len(self.__memo) > self.__maxEntries:
+                self.__memo.popitem(last=False)
+                self.__stats["evictions"] += 1
+
+    def mMemoDrop(self, aName):
+        with self.__lock:
+            self.__memo.pop(aName, None)
+
+    def mRevalidate(self, aName, aEntry, aNow):
+        """ The memo aEntry when the row still has its version, else None """
+
+        self.mCount("revalidations")
+        _row = self.mGetTable().mGetDataCacheVersion(aName)
+        if not _row or _row[0] != aEntry.version:
+            self.mMemoDrop(aName)
+            return None
+
+        _entry = aEntry._replace(expiresAt=_row[1], checkedAt=aNow)
+        if _entry.mIsExpired(aNow):
+            self.mMemoDrop(aName)
+            return None
+        self.mMemoPut(aName, _entry)
+        return _entry
+
+    def mLookup(self, aName, aNow=None):
+        """ Valid entry of aName from the memo or the table, None on a miss """
+
+        _now = time.time() if aNow is None else aNow
+
+        _entry = self.mMemoGet(aName)
+        if _entry is not None:
+            if _entry.mIsExpired(_now):
+                self.mMemoDrop(aName)
+                self.mCount("expired")
+            elif _now - _entry.checkedAt < self.__revalidate:
+                self.mCount("hits")
+                return _entry
+            else:
+                _entry = self.mRevalidate(aName, _entry, _now)
+                if _entry is not None:
+                    self.mCount("hits")
+                    return _entry
+
+        _row = self.mGetTable().mGetDataCacheEntry(aName)
+        if not _row:
+            return None
+
+        _data, _version, _etag, _expiresAt = _row
+        _entry = ebDataCacheEntry(None, _version or 0, _etag, _expiresAt, _now)
+        if _entry.mIsExpired(_now):
+            self.mCount("expired")
+            return None
+        try:
+            _entry = _entry._replace(value=json.loads(_data))
+        except (TypeError, ValueError):
+            ebLogWarn(f"DataCache: {aName} is not JSON, ignored")
+            return None
+
+        self.mMemoPut(aName, _entry)
+        self.mCount("db_hits")
+        return _entry
+
+    def mGetEntry(self, aName):
+        return self.mLookup(aName)
+
+    def mGetIfModified(self, aName, aEtag):
+        """ Entry of aName when its etag is not aEtag (conditional refresh), else None """
+
+        _entry = self.mLookup(aName)
+        if _entry is None or (aEtag is not None and _entry.etag == aEtag):
+            return None
+        return _entry
+
+    def mPurgeExpired(self, aNow=None):
+        """ Delete the expired rows, at most once per 'datacache_purge_sec' """
+
+        _now = time.time() if aNow is None else aNow
+        with self.__lock:
+            if self.__purgedAt is not None and _now - self.__purgedAt < self.__purge:
+                return False
+            self.__purgedAt = _now
+
+        try:
+            self.mGetTable().mDelExpiredDataCache(_now)
+        except Exception as e:
+            ebLogWarn(f"DataCache: expired rows not deleted: {e}")
+            return False
+
+        self.mCount("purges")
+        return True
+
+    def mSet(self, aName, aValue, aTtl=None):
+
+        _now = time.time()
+        _data = json.dumps(aValue, sort_keys=True)
+        _etag = ebDataCacheEtag(_data)
+        _expiresAt = self.mExpiresAt(aTtl, _now)
+        _version = self.mGetTable().mSetDataCacheEntry(aName, _data, _etag, _expiresAt)
+
+        # The memo keeps the decoded copy of what was stored
+        _entry = ebDataCacheEntry(json.loads(_data), _version, _etag, _expiresAt, _now)
+        self.mMemoPut(aName, _entry)
+
+        # Rows of names not read anymore are only removed here
+        self.mPurgeExpired(_now)
+        return _entry
+
+    def mInvalidate(self, aName):
+
+        self.mMemoDrop(aName)
+        self.mGetTable().mDelDataCache(aName)
+
+    def mGet(self, aName, aLoader=None, aTtl=None, aDefault=None):
+        """
+        Value of aName, computed with aLoader() on a miss. Concurrent misses
+        of the threads and workers run aLoader once.
+        """
+
+        _entry = self.mLookup(aName)
+        if _entry is not None:
+            return _entry.value
+
+        self.mCount("misses")
+        if aLoader is None:
+            return aDefault
+
+        with self.__lock:
+            _lock = self.__loading.setdefault(aName, threading.Lock())
+
+        # Avoid cyclical dependency
+        from exabox.agent.ExaLock import ExaLock
+
+        with _lock, ExaLock(f"datacache_{hashlib.sha1(aName.encode('utf-8')).hexdigest()[:16]}.lock"):
+
+            # Loaded by another thread or worker while waiting
+            _entry = self.mLookup(aName)
+            if _entry is not None:
+                self.mCount("coalesced")
+                return _entry.value
+
+            self.mCount("loads")
+            try:
+                _value = aLoader()
+            except Exception:
+                self.mCount("load_errors")
+                raise
+
+            if _value is None:
+                return aDefault
+
+            ebLogTrace(f"DataCache: {aName} loaded")
+            return self.mSet(aName, _value, aTtl).value
+
+
+def ebGetDataCache():
+    """ Cache of the process, a forked child starts with its own memo """
+
+    global gDataCache
+    if gDataCache is None or gDataCache[0] != os.getpid():
+        gDataCache = (os.getpid(), ebDataCache())
+    return gDataCache[1]
+
+# end of file
@@ -0,0 +1,208 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/core/LazyImport.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# LazyImport.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      LazyImport.py - Lazy imports and import time profiling
+#
+#    DESCRIPTION
+#      ebLazySymbol stands for a module, or a name of a module, that is only
+#      imported the first time it is called or one of its attributes is
+#      used. Entry points keep a registry of them so a command only pays the
+#      import of the subsystems it dispatches to.
+#
+#      ebImportProfiler records the time spent importing every module, like
+#      'python -X importtime', and reports the slowest ones.
+#
+#    NOTES
+#      The profiler is enabled from the environment, before the imports it
+#      has to measure: EXABOX_IMPORT_PROFILE=1 (report on stderr) or
+#      EXABOX_IMPORT_PROFILE=<file> (report appended to the file).
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import sys
+import time
+import importlib
+import threading
+
+EXABOX_IMPORT_PROFILE_ENV = "EXABOX_IMPORT_PROFILE"
+
+
+class ebLazySymbol(object):
+    """
+    aDepends: modules imported before aModule, for modules that can only be
+              imported once another one is (circular imports)
+    """
+
+    def __init__(self, aModule, aName=None, aDepends=()):
+        self.__module = aModule
+        self.__name = aName
+        self.__depends = tuple(aDepends)
+        self.__target = None
+        self.__lock = threading.Lock()
+
+    def mGetModuleName(self):
+        return self.__module
+
+    def mIsResolved(self):
+        return self.__target is not None
+
+    def mResolve(self):
+
+        if self.__target is None:
+            with self.__lock:
+                if self.__target is None:
+                    for _depend in self.__depends:
+                        importlib.import_module(_depend)
+                    _module = importlib.import_module(self.__module)
+                    self.__target = getattr(_module, self.__name) if self.__name else _module
+
+        return self.__target
+
+    def __call__(self, *aArgs, **aKwargs):
+        return self.mResolve()(*aArgs, **aKwargs)
+
+    def __getattr__(self, aName):
+        return getattr(self.mResolve(), aName)
+
+    def __repr__(self):
+        _name = f"{self.__module}.{self.__name}" if self.__name else self.__module
+        return f"<ebLazySymbol {_name} {'resolved' if self.mIsResolved() else 'pending'}>"
+
+
+class _ebTimedLoader(object):
+
+    def __init__(self, aProfiler, aLoader):
+        self.__profiler = aProfiler
+        self.__loader = aLoader
+
+    def __getattr__(self, aName):
+        return getattr(self.__loader, aName)
+
+    def create_module(self, aSpec):
+        return self.__loader.create_module(aSpec)
+
+    def exec_module(self, aModule):
+        self.__profiler.mEnter(aModule.__name__)
+        try:
+            self.__loader.exec_module(aModule)
+        finally:
+            self.__profiler.mLeave(aModule.__name__)
+
+
+class ebImportProfiler(object):
+    """
+    sys.meta_path finder timing the execution of the modules imported while
+    it is installed. Cumulative time includes the nested imports, self time
+    does not.
+    """
+
+    def __init__(self):
+        self.__records = {}
+        self.__stack = []
+        self.__lock = threading.RLock()
+        self.__installed = False
+        self.__start = None
+
+    def mInstall(self):
+        if not self.__installed:
+            sys.meta_path.insert(0, self)
+            self.__installed = True
+            self.__start = time.perf_counter()
+
+    def mUninstall(self):
+        if self.__installed:
+            sys.meta_path.remove(self)
+            self.__installed = False
+
+    def find_spec(self, aFullname, aPath=None, aTarget=None):
+
+        if not self.__installed:
+            return None
+
+        for _finder in sys.meta_path:
+            if _finder is self or not hasattr(_finder, "find_spec"):
+                continue
+            _spec = _finder.find_spec(aFullname, aPath, aTarget)
+            if _spec is not None:
+                if _spec.loader is not None and hasattr(_spec.loader, "exec_module"):
+                    _spec.loader = _ebTimedLoader(self, _spec.loader)
+                return _spec
+        return None
+
+    def mEnter(self, aName):
+        with self.__lock:
+            self.__stack.append([aName, time.perf_counter(), 0.0])
+
+    def mLeave(self, aName):
+        with self.__lock:
+            _name, _start, _nested = self.__stack.pop()
+            _cumulative = time.perf_counter() - _start
+            self.__records[_name] = (_cumulative - _nested, _cumulative, len(self.__stack))
+            if self.__stack:
+                self.__stack[-1][2] += _cumulative
+
+    def mGetRecords(self):
+        """ Return module -> (self seconds, cumulative seconds, depth) """
+        with self.__lock:
+            return dict(self.__records)
+
+    def mGetReport(self, aTop=30):
+
+        _records = self.mGetRecords()
+        _total = time.perf_counter() - self.__start if self.__start else 0
+        _lines = [f"Import profile: {len(_records)} modules, {_total:.3f}s since start",
+                  f"{'self [us]':>12} | {'cumulative':>12} | module"]
+
+        _sorted = sorted(_records.items(), key=lambda x: x[1][1], reverse=True)
+        for _name, (_self, _cumulative, _depth) in _sorted[:aTop]:
+            _lines.append(f"{int(_self * 1e6):>12} | {int(_cumulative * 1e6):>12} | {'  ' * _depth}{_name}")
+
+        return "\n".join(_lines)
+
+    def mWriteReport(self, aTarget, aTop=30):
+
+        _report = self.mGetReport(aTop)
+        if aTarget in ("1", "True", "true", "stderr"):
+            print(_report, file=sys.stderr)
+        else:
+            with open(aTarget, "a") as _fd:
+                _fd.write(f"{_report}\n")
+
+
+_gImportProfiler = None
+
+def ebStartImportProfiler():
+    """ Install the process import profiler if EXABOX_IMPORT_PROFILE is set """
+
+    global _gImportProfiler
+
+    if not os.environ.get(EXABOX_IMPORT_PROFILE_ENV):
+        return None
+
+    if _gImportProfiler is None:
+        _gImportProfiler = ebImportProfiler()
+        _gImportProfiler.mInstall()
+
+    return _gImportProfiler
+
+def ebReportImportProfiler():
+    """ Write the report of the process import profiler, if installed """
+
+    if _gImportProfiler is None:
+        return
+
+    try:
+        _gImportProfiler.mWriteReport(os.environ.get(EXABOX_IMPORT_PROFILE_ENV))
+    except OSError as e:
+        print(f"Import profile not written: {e}", file=sys.stderr)
+
+# end of file
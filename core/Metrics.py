@@ -0,0 +1,542 @@
+"""
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    Metrics.py
+
+FUNCTION:
+    In process registry of hot path counters and latency histograms (SSH
+    connect, remote commands, SFTP throughput, SQL statements, queue wait
+    of the ProcessManager)
+
+NOTE:
+    Enabled with 'metrics_registry_enabled': 'True'. Tunables:
+        metrics_registry_dir         directory of the snapshots (log/metrics)
+        metrics_registry_dump_sec    interval between two snapshots (60)
+        metrics_registry_max_series  label sets kept per metric, the next
+                                     ones are accounted under 'other' (500)
+
+    Histograms are log-linear (HDR style): 16 sub-buckets per power of two,
+    the values are recorded with a relative error below 6.25% and two
+    histograms are merged by adding their buckets.
+
+    Every process writes its snapshot to <dir>/hotpath_<pid>.json (periodic,
+    at exit and at the end of a forked ProcessStructure). ebMetricsCollect
+    merges the snapshots of all the processes, the ones of dead processes are
+    folded into <dir>/hotpath_archive.json.
+
+History:
+    jydas      2026/10/18 - Creation
+"""
+
+import os
+import re
+import json
+import time
+import fcntl
+import atexit
+import threading
+import functools
+
+from exabox.core.Context import get_gcontext
+
+METRICS_DIR           = "log/metrics"
+METRICS_DUMP_SEC      = 60
+METRICS_MAX_SERIES    = 500
+METRICS_SUB_BUCKETS   = 16
+METRICS_SUB_BITS      = 4
+METRICS_OTHER_LABEL   = "other"
+METRICS_ARCHIVE_FILE  = "hotpath_archive.json"
+METRICS_PERCENTILES   = (50, 90, 99)
+
+
+class ebMetricsHistogram(object):
+    """
+    Log-linear histogram of non negative integer values (microseconds,
+    bytes per second, ...).
+    """
+
+    def __init__(self):
+        self.__buckets = {}
+        self.__count = 0
+        self.__sum = 0
+        self.__min = None
+        self.__max = None
+
+    @staticmethod
+    def mBucketIndex(aValue):
+        if aValue < METRICS_SUB_BUCKETS:
+            return aValue
+        _shift = aValue.bit_length() - METRICS_SUB_BITS - 1
+        return (_shift + 1) * METRICS_SUB_BUCKETS + (aValue >> _shift) - METRICS_SUB_BUCKETS
+
+    @staticmethod
+    def mBucketRange(aIndex):
+        """ [lower, upper) of the values recorded in the bucket aIndex """
+
+        if aIndex < METRICS_SUB_BUCKETS:
+            return aIndex, aIndex + 1
+        _shift = aIndex // METRICS_SUB_BUCKETS - 1
+        _lower = (aIndex % METRICS_SUB_BUCKETS + METRICS_SUB_BUCKETS) << _shift
+        return _lower, _lower + (1 << _shift)
+
+    def mRecord(self, aValue):
+
+        _value = max(0, int(aValue))
+        _idx = self.mBucketIndex(_value)
+        self.__buckets[_idx] = self.__buckets.get(_idx, 0) + 1
+        self.__count += 1
+        self.__sum += _value
+        if self.__min is None or _value < self.__min:
+            self.__min = _value
+        if self.__max is None or _value > self.__max:
+            self.__max = _value
+
+    def mGetCount(self):
+        return self.__count
+
+    def mGetSum(self):
+        return self.__sum
+
+    def mGetMin(self):
+        return self.__min
+
+    def mGetMax(self):
+        return self.__max
+
+    def mGetPercentile(self, aPercentile):
+        """ Upper bound of the bucket holding the aPercentile-th value, capped to max """
+
+        if not self.__count:
+            return None
+
+        _rank = max(1, int(round(self.__count * aPercentile / 100.0)))
+        _seen = 0
+        for _idx in sorted(self.__buckets):
+            _seen += self.__buckets[_idx]
+            if _seen >= _rank:
+                return min(self.mBucketRange(_idx)[1] - 1, self.__max)
+        return self.__max
+
+    def mMerge(self, aOther):
+
+        for _idx, _count in aOther.__buckets.items():
+            self.__buckets[_idx] = self.__buckets.get(_idx, 0) + _count
+        self.__count += aOther.__count
+        self.__sum += aOther.__sum
+        for _value in (aOther.__min, aOther.__max):
+            if _value is None:
+                continue
+            if self.__min is None or _value < self.__min:
+                self.__min = _value
+            if self.__max is None or _value > self.__max:
+                self.__max = _value
+
+    def mToDict(self):
+        return {"count": self.__count, "sum": self.__sum, "min": self.__min, "max": self.__max,
+                "buckets": {str(_idx): _count for _idx, _count in self.__buckets.items()}}
+
+    @classmethod
+    def mFromDict(cls, aDict):
+
+        _hist = cls()
+        _hist.__count = aDict.get("count", 0)
+        _hist.__sum = aDict.get("sum", 0)
+        _hist.__min = aDict.get("min")
+        _hist.__max = aDict.get("max")
+        _hist.__buckets = {int(_idx): _count for _idx, _count in aDict.get("buckets", {}).items()}
+        return _hist
+
+    def mSummary(self):
+
+        _summary = {"count": self.__count, "sum": self.__sum, "min": self.__min, "max": self.__max,
+                    "avg": round(self.__sum / self.__count, 1) if self.__count else None}
+        for _pct in METRICS_PERCENTILES:
+            _summary[f"p{_pct}"] = self.mGetPercentile(_pct)
+        return _summary
+
+
+class ebMetricsRegistry(object):
+    """
+    Counters and histograms of one process, keyed by metric name and label
+    set ("host=dom0x,family=ls").
+    """
+
+    def __init__(self, aMaxSeries=METRICS_MAX_SERIES):
+
+        self.__maxSeries = aMaxSeries
+        self.__lock = threading.Lock()
+        self.__counters = {}
+        self.__histograms = {}
+        self.__pid = os.getpid()
+        self.__start = time.time()
+        self.__dirty = False
+        self.__dumper = None
+
+    def mGetPid(self):
+        return self.__pid
+
+    def mIsDirty(self):
+        return self.__dirty
+
+    @staticmethod
+    def mLabelKey(aLabels):
+        if not aLabels:
+            return ""
+        return ",".join([f"{_k}={_v}" for _k, _v in sorted(aLabels.items())])
+
+    def __mSeries(self, aTable, aName, aLabels, aFactory):
+
+        _series = aTable.get(aName)
+        if _series is None:
+            _series = aTable[aName] = {}
+
+        _key = self.mLabelKey(aLabels)
+        _entry = _series.get(_key)
+        if _entry is None:
+            if len(_series) >= self.__maxSeries:
+                _key = METRICS_OTHER_LABEL
+                _entry = _series.get(_key)
+            if _entry is None:
+                _entry = _series[_key] = aFactory()
+        return _series, _key, _entry
+
+    def mIncrement(self, aName, aLabels=None, aValue=1):
+
+        with self.__lock:
+            _series, _key, _ = self.__mSeries(self.__counters, aName, aLabels, int)
+            _series[_key] += aValue
+            self.__dirty = True
+
+    def mObserve(self, aName, aValue, aLabels=None):
+
+        with self.__lock:
+            _, _, _hist = self.__mSeries(self.__histograms, aName, aLabels, ebMetricsHistogram)
+            _hist.mRecord(aValue)
+            self.__dirty = True
+
+    def mSnapshot(self):
+
+        with self.__lock:
+            self.__dirty = False
+            return {"pid": self.__pid, "start": self.__start, "time": time.time(),
+                    "counters": {_name: dict(_series) for _name, _series in self.__counters.items()},
+                    "histograms": {_name: {_key: _hist.mToDict() for _key, _hist in _series.items()}
+                                   for _name, _series in self.__histograms.items()}}
+
+    def mReset(self):
+        with self.__lock:
+            self.__counters = {}
+            self.__histograms = {}
+            self.__dirty = False
+
+    def mStartDumper(self, aInterval):
+        """ Thread writing the snapshot of the process every aInterval seconds """
+
+        if self.__dumper is not None or aInterval <= 0:
+            return
+
+        def _mDumpLoop():
+            while True:
+                time.sleep(aInterval)
+                if self.__pid != os.getpid():
+                    return
+                if self.__dirty:
+                    ebMetricsDump(self)
+
+        self.__dumper = threading.Thread(target=_mDumpLoop, name="ebMetricsDumper", daemon=True)
+        self.__dumper.start()
+
+
+class _ebMetricsTimer(object):
+    """ Records the elapsed microseconds, counts '<name>_errors' on exception """
+
+    __slots__ = ("__name", "__labels", "__start")
+
+    def __init__(self, aName, aLabels):
+        self.__name = aName
+        self.__labels = aLabels
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, aType, aValue, aTraceback):
+        ebMetricsObserveSince(self.__name, self.__start, self.__labels)
+        if aType is not None:
+            ebMetricsIncrement(f"{self.__name}_errors", self.__labels)
+        return False
+
+
+class _ebMetricsNoTimer(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, aType, aValue, aTraceback):
+        return False
+
+_gMetricsNoTimer = _ebMetricsNoTimer()
+_gMetricsRegistry = None
+_gMetricsRegistryLock = threading.Lock()
+
+
+def _mIntOption(aName, aDefault):
+    _value = get_gcontext().mCheckConfigOption(aName)
+    try:
+        return int(_value) if _value is not None else aDefault
+    except ValueError:
+        return aDefault
+
+
+def ebMetricsEnabled():
+    try:
+        return get_gcontext().mCheckConfigOption('metrics_registry_enabled') == 'True'
+    except Exception:
+        return False
+
+
+def ebMetricsDir():
+    return get_gcontext().mCheckConfigOption('metrics_registry_dir') or METRICS_DIR
+
+
+def ebGetMetricsRegistry():
+    """
+    Return the registry of the current process, creating it on the first
+    call and after a fork (the child does not report the values of its parent)
+    """
+
+    global _gMetricsRegistry
+
+    _registry = _gMetricsRegistry
+    if _registry is not None and _registry.mGetPid() == os.getpid():
+        return _registry
+
+    with _gMetricsRegistryLock:
+        if _gMetricsRegistry is None or _gMetricsRegistry.mGetPid() != os.getpid():
+            _gMetricsRegistry = ebMetricsRegistry(_mIntOption('metrics_registry_max_series', METRICS_MAX_SERIES))
+            _gMetricsRegistry.mStartDumper(_mIntOption('metrics_registry_dump_sec', METRICS_DUMP_SEC))
+        return _gMetricsRegistry
+
+
+def ebMetricsIncrement(aName, aLabels=None, aValue=1):
+    if ebMetricsEnabled():
+        ebGetMetricsRegistry().mIncrement(aName, aLabels, aValue)
+
+
+def ebMetricsObserve(aName, aValue, aLabels=None):
+    if ebMetricsEnabled():
+        ebGetMetricsRegistry().mObserve(aName, aValue, aLabels)
+
+
+def ebMetricsObserveSince(aName, aStart, aLabels=None):
+    """ Record the microseconds elapsed since aStart (time.perf_counter) """
+
+    if ebMetricsEnabled():
+        ebGetMetricsRegistry().mObserve(aName, (time.perf_counter() - aStart) * 1000000, aLabels)
+
+
+def ebMetricsTimer(aName, aLabels=None):
+    """
+    Context manager recording the duration of the block in microseconds.
+    Usage:
+        with ebMetricsTimer("ssh_connect_us", {"host": _host}):
+            ...
+    """
+
+    if ebMetricsEnabled():
+        return _ebMetricsTimer(aName, aLabels)
+    return _gMetricsNoTimer
+
+
+def ebMetricsHost(aHost):
+    """ Short hostname used as 'host' label """
+    return str(aHost).split(".")[0] if aHost else "local"
+
+
+_gCmdEnvRegex = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+_gCmdPrefixes = frozenset(["sudo", "env", "nohup", "timeout", "time", "nice", "exec", "command"])
+
+@functools.lru_cache(maxsize=4096)
+def ebMetricsCommandFamily(aCmd):
+    """
+    Command family used as label: the basename of the first program of the
+    command line, after variable assignments and wrappers (sudo, timeout...)
+    """
+
+    for _token in str(aCmd).replace(";", " ").replace("&&", " ").replace("|", " ").split():
+        if _gCmdEnvRegex.match(_token) or _token in _gCmdPrefixes or _token.startswith("-") \
+           or _token.isdigit() or _token in ("export",):
+            continue
+        _family = os.path.basename(_token.strip("'\"()"))
+        if _family:
+            return _family[:64]
+    return "none"
+
+
+_gSqlStringRegex = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_gSqlNumberRegex = re.compile(r"(?<![\w:$.])-?\b\d+(?:\.\d+)?\b(?!\)s)")
+_gSqlInRegex = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_gSqlSpaceRegex = re.compile(r"\s+")
+
+@functools.lru_cache(maxsize=4096)
+def ebMetricsSqlTemplate(aSql):
+    """
+    Statement template used as label: literals replaced by '?', IN lists
+    collapsed and blanks squeezed, bind variables (:1, %(1)s) are kept
+    """
+
+    _sql = _gSqlStringRegex.sub("?", str(aSql))
+    _sql = _gSqlNumberRegex.sub("?", _sql)
+    _sql = _gSqlInRegex.sub("(?)", _sql)
+    _sql = _gSqlSpaceRegex.sub(" ", _sql).strip()
+    return _sql[:200]
+
+
+def mMetricsSnapshotPath(aDir, aPid):
+    return os.path.join(aDir, f"hotpath_{aPid}.json")
+
+
+def mMetricsWriteJson(aPath, aData):
+    # Readers never see a partial file
+    _tmp = f"{aPath}.{os.getpid()}.tmp"
+    with open(_tmp, "w") as _fd:
+        json.dump(aData, _fd)
+    os.replace(_tmp, aPath)
+
+
+def ebMetricsDump(aRegistry=None, aDir=None):
+    """ Write the snapshot of the registry of the process, return its path """
+
+    _registry = aRegistry or _gMetricsRegistry
+    if _registry is None or _registry.mGetPid() != os.getpid():
+        return None
+
+    try:
+        _dir = aDir or ebMetricsDir()
+        os.makedirs(_dir, exist_ok=True)
+        _path = mMetricsSnapshotPath(_dir, _registry.mGetPid())
+        mMetricsWriteJson(_path, _registry.mSnapshot())
+        return _path
+    except Exception:
+        return None
+
+
+def ebMetricsMerge(aSnapshots):
+    """ Merge snapshots, return a dict with the counters and histograms """
+
+    _counters = {}
+    _histograms = {}
+
+    for _snapshot in aSnapshots:
+
+        for _name, _series in _snapshot.get("counters", {}).items():
+            _merged = _counters.setdefault(_name, {})
+            for _key, _value in _series.items():
+                _merged[_key] = _merged.get(_key, 0) + _value
+
+        for _name, _series in _snapshot.get("histograms", {}).items():
+            _merged = _histograms.setdefault(_name, {})
+            for _key, _value in _series.items():
+                _hist = ebMetricsHistogram.mFromDict(_value)
+                if _key in _merged:
+                    _merged[_key].mMerge(_hist)
+                else:
+                    _merged[_key] = _hist
+
+    return {"counters": _counters,
+            "histograms": {_name: {_key: _hist.mToDict() for _key, _hist in _series.items()}
+                           for _name, _series in _histograms.items()}}
+
+
+def ebMetricsSummary(aSnapshot, aMetric=None):
+    """ Readable form of a snapshot: percentiles instead of buckets """
+
+    _summary = {"counters": {}, "histograms": {}}
+    for _name, _series in aSnapshot.get("counters", {}).items():
+        if aMetric is None or _name == aMetric:
+            _summary["counters"][_name] = dict(_series)
+    for _name, _series in aSnapshot.get("histograms", {}).items():
+        if aMetric is None or _name == aMetric:
+            _summary["histograms"][_name] = {_key: ebMetricsHistogram.mFromDict(_value).mSummary()
+                                             for _key, _value in _series.items()}
+    return _summary
+
+
+def mMetricsPidAlive(aPid):
+    try:
+        os.kill(aPid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def mMetricsReadJson(aPath):
+    try:
+        with open(aPath) as _fd:
+            return json.load(_fd)
+    except (OSError, ValueError):
+        return None
+
+
+def ebMetricsCollect(aDir=None):
+    """
+    Merge the snapshots of all the processes. The snapshots of the processes
+    gone are folded into the archive and removed.
+    """
+
+    _dir = aDir or ebMetricsDir()
+
+    # Fresh values of the current process
+    if _gMetricsRegistry is not None and _gMetricsRegistry.mGetPid() == os.getpid() \
+       and _gMetricsRegistry.mIsDirty():
+        ebMetricsDump(_gMetricsRegistry, _dir)
+
+    if not os.path.isdir(_dir):
+        return {"processes": 0, "counters": {}, "histograms": {}}
+
+    with open(os.path.join(_dir, ".lock"), "a") as _lockfd:
+        fcntl.flock(_lockfd, fcntl.LOCK_EX)
+        try:
+            _archivePath = os.path.join(_dir, METRICS_ARCHIVE_FILE)
+            _archive = mMetricsReadJson(_archivePath) or {}
+            _live = []
+            _gone = []
+
+            for _file in sorted(os.listdir(_dir)):
+                _match = re.match(r"^hotpath_(\d+)\.json$", _file)
+                if not _match:
+                    continue
+                _path = os.path.join(_dir, _file)
+                _snapshot = mMetricsReadJson(_path)
+                if _snapshot is None:
+                    continue
+                if mMetricsPidAlive(int(_match.group(1))):
+                    _live.append(_snapshot)
+                else:
+                    _gone.append((_path, _snapshot))
+
+            if _gone:
+                _archive = ebMetricsMerge([_archive] + [_snapshot for _, _snapshot in _gone])
+                mMetricsWriteJson(_archivePath, _archive)
+                for _path, _ in _gone:
+                    os.unlink(_path)
+
+            _merged = ebMetricsMerge([_archive] + _live)
+        finally:
+            fcntl.flock(_lockfd, fcntl.LOCK_UN)
+
+    _merged["processes"] = len(_live)
+    return _merged
+
+
+def _mMetricsAtExit():
+    if _gMetricsRegistry is not None and _gMetricsRegistry.mIsDirty():
+        ebMetricsDump(_gMetricsRegistry)
+
+atexit.register(_mMetricsAtExit)
+
+# end of file
@@ -34,6 +34,13 @@ History:
     scoral      03/21/2023 - Enh 34734317: Implemented mGetFileInfo
     aararora    01/29/2024 - Bug 36182157: Added a default timeout of 180 seconds for connection to happen
     gparada     03/25/2025 - Bug 36409407 Add retry to mCopyFile for resiliency
+    jydas       10/18/2026 - Expose streaming execution and line iterator
+    jydas       10/18/2026 - Reconnect stale pooled nodes and flush the process
+                             wide SSH transport pool on host close
+    jydas       10/18/2026 - Add mTransferFiles (parallel resumable SFTP with
+                             sha256 verified during the transfer)
+    jydas       10/18/2026 - Record the SSH connect latency per host in the
+                             hot path metrics registry
 """
 
 from exabox.tools.profiling.profiler import measure_exec_time
@@ -43,9 +50,11 @@ from exabox.core.Context import get_gcontext
 from exabox.network.Connection import exaBoxConnection
 from exabox.network.Local import exaBoxLocal
 from exabox.network.Network import exaBoxNetwork
+from exabox.network.osds.sshpool import ebGetSshTransportPool, ebIsSshTransportPoolEnabled
 from exabox.log.LogMgr import ebLogError, ebLogInfo, ebLogWarn, ebLogDebug, ebLogTrace
 from exabox.core.MockCommand import exaMockCommand
 from exabox.core.Error import ebError, ExacloudRuntimeError
+from exabox.core.Metrics import ebMetricsTimer, ebMetricsHost
 from exabox.utils import common
 from contextlib import closing
 from paramiko import SFTPAttributes
@@ -124,7 +133,9 @@ class exaBoxNodePool:
                     aExaBoxNode.mSetConnectionState(_activeNode.mGetConnectionState())
 
                 else:
-                    aExaBoxNode.mDisconnect()
+                    ebLogTrace(f"Connection {_key} is not active anymore, reconnecting")
+                    _activeNode.mDisconnect(aForce=True)
+                    aExaBoxNode.mDisconnect(aForce=True)
                     aExaBoxNode.mConnectTimed(aHost, aOptions, aTimeout, aKeyOnly)
                     self.__connections[_key] = aExaBoxNode
 
@@ -148,6 +159,11 @@ class exaBoxNodePool:
                 _node.mDisconnect(aForce=True)
                 del self.__connections[_key]
 
+        # Host specific close (e.g. VM shutdown), drop its shared transports too.
+        # Closing the whole request pool keeps the transports for the next request.
+        if _host and ebIsSshTransportPoolEnabled():
+            ebGetSshTransportPool().mCloseConnections(aHost=_host)
+
 
 class exaBoxNode(object):
 
@@ -381,7 +397,8 @@ class exaBoxNode(object):
             if self.__sudo != None:
                 self.__connection.mSetSudo(self.__sudo)
 
-            self.__connection.mConnectAuthInteractive(aHost, aTimeout)
+            with ebMetricsTimer("ssh_connect_us", {"host": ebMetricsHost(aHost)}):
+                self.__connection.mConnectAuthInteractive(aHost, aTimeout)
         self.__state = ebNodeStateConnected
 
     @measure_exec_time(steal_hostname)
@@ -417,7 +434,8 @@ class exaBoxNode(object):
                 self.__connection.mSetSudo(self.__sudo)
 
             self.__connection.mSetMaxRetries(self.__max_retries)
-            self.__connection.mConnectTimed(aHost, aTimeout, aKeyOnly)
+            with ebMetricsTimer("ssh_connect_us", {"host": ebMetricsHost(aHost)}):
+                self.__connection.mConnectTimed(aHost, aTimeout, aKeyOnly)
 
         self.__state = ebNodeStateConnected
 
@@ -493,20 +511,70 @@ class exaBoxNode(object):
                 return _i,_o,_e
 
     # Execute a cmd line tool/script
+    # aStdoutCallback/aStderrCallback receive the output chunks while the command
+    # is running (remote nodes only, local and mock nodes get them at the end).
+    # aStream selects the event driven execution without the 2MB output limit.
     @measure_exec_time(steal_hostname_cmd)
-    def mExecuteCmd(self, aCmd, aCurrDir=None, aStdIn=PIPE, aStdOut=PIPE, aStdErr=PIPE, aTimeout=None, aDecodeUtf8=False):
+    def mExecuteCmd(self, aCmd, aCurrDir=None, aStdIn=PIPE, aStdOut=PIPE, aStdErr=PIPE, aTimeout=None, aDecodeUtf8=False,
+                    aStdoutCallback=None, aStderrCallback=None, aStream=False):
         _curr_dir = aCurrDir
         _stdin = aStdIn
         _std_out = aStdOut
         _stderr = aStdErr
         _timeout = aTimeout
         _decodeutf8 = aDecodeUtf8
+        _streaming = aStream or aStdoutCallback or aStderrCallback
 
         if self.__mockMode:
-            return self.mExecuteMock(aCmd)
+            _streams = self.mExecuteMock(aCmd)
+            if _streaming:
+                return self.mFeedStreamCallbacks(_streams, aStdoutCallback, aStderrCallback)
+            return _streams
+
+        if self.__connection and aCmd:
+
+            if self.mIsLocal():
+                _streams = self.__connection.mExecuteCmd(aCmd, aCurrDir=_curr_dir, aStdIn=_stdin, aStdOut=_std_out, aStdErr=_stderr, aTimeout=_timeout, aDecodeUtf8=_decodeutf8)
+                if _streaming:
+                    return self.mFeedStreamCallbacks(_streams, aStdoutCallback, aStderrCallback)
+                return _streams
+
+            return self.__connection.mExecuteCmd(aCmd, aCurrDir=_curr_dir, aStdIn=_stdin, aStdOut=_std_out, aStdErr=_stderr, aTimeout=_timeout, aDecodeUtf8=_decodeutf8,
+                                                 aStdoutCallback=aStdoutCallback, aStderrCallback=aStderrCallback, aStream=aStream)
+
+    def mFeedStreamCallbacks(self, aStreams, aStdoutCallback=None, aStderrCallback=None):
+        """
+        Replay the complete output of an already executed command through
+        the stream callbacks, used where the output is not produced
+        incrementally (local and mock nodes).
+        """
+
+        _i, _o, _e = aStreams
+        _out = _o.read() if _o else ""
+        _err = _e.read() if _e else ""
+
+        if _out and aStdoutCallback:
+            aStdoutCallback(_out.encode("utf-8"))
+        if _err and aStderrCallback:
+            aStderrCallback(_err.encode("utf-8"))
+
+        return (wrapStrBytesFunctions(StringIO(stream)) for stream in ("", _out, _err))
+
+    # Execute a cmd line tool/script and iterate over the output lines as they
+    # are produced. Yields (aIsStderr, aLine) tuples, the exit status is
+    # available through mGetCmdExitStatus once the iterator is exhausted.
+    def mIterExecuteCmd(self, aCmd, aTimeout=None):
+
+        if self.__mockMode or (self.mIsLocal() and self.__connection):
+            _, _o, _e = self.mExecuteCmd(aCmd, aTimeout=aTimeout)
+            for _line in (_o.readlines() if _o else []):
+                yield False, _line
+            for _line in (_e.readlines() if _e else []):
+                yield True, _line
+            return
 
         if self.__connection and aCmd:
-            return self.__connection.mExecuteCmd(aCmd, aCurrDir=_curr_dir, aStdIn=_stdin, aStdOut=_std_out, aStdErr=_stderr, aTimeout=_timeout, aDecodeUtf8=_decodeutf8)
+            yield from self.__connection.mIterExecuteCmd(aCmd, aTimeout=aTimeout)
 
     # Execute a cmd line tool/script and display the result in the Log/Console
     @measure_exec_time(steal_hostname_cmd)
@@ -595,6 +663,27 @@ class exaBoxNode(object):
             _msg = _msg.format(aFilename)
             raise ExacloudRuntimeError(0x0779, 0xA, _msg)
     
+    # Copy several files over parallel channels of the connection
+    @measure_exec_time(steal_hostname)
+    def mTransferFiles(self, aFiles, aResume=True, aVerify=True):
+        """
+        Copy aFiles, a list of (local path, remote path), multiplexed on the
+        connection and resuming partially copied files.
+
+        :return: dict remote path -> sha256 of the copied file, empty in mock
+                 mode
+        """
+
+        if self.__mockMode:
+            for _local, _remote in aFiles:
+                self.mCopyFile(_local, _remote)
+            return {}
+
+        if self.__connection and aFiles:
+            return self.__connection.mTransferFiles(aFiles, aResume, aVerify)
+
+        return {}
+
     # Read file
     def mReadFile(self, aFilename: str) -> bytes:
         if self.__mockMode:
@@ -0,0 +1,79 @@
+"""
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    StatusNotify - Notification of the request status changes between workers
+
+FUNCTION:
+    The workers touch a file each time they update the status of a request
+    in the requests table. The processes monitoring requests (e.g. the
+    infrapatching dispatcher) wait for its mtime to change instead of
+    sleeping a fixed time, and query the DB only then:
+
+        _stamp = ebStatusStamp()
+        while ...:
+            <query the status of the requests>
+            _stamp = ebStatusWait(_stamp, 30, aMinWait=2)
+
+NOTE:
+    Only the workers of the same exacloud installation touch the file, the
+    wait always ends after its timeout so the requests of other hosts are
+    seen on the next poll anyway.
+
+History:
+    jydas       10/18/2026 - Creation
+"""
+
+import os
+import time
+
+from exabox.core.Context import get_gcontext
+
+STATUS_NOTIFY_FILE = "request_status.notify"
+STATUS_NOTIFY_STEP = 0.5
+
+
+def ebStatusNotifyPath():
+    return os.path.join(get_gcontext().mGetBasePath(), "tmp", STATUS_NOTIFY_FILE)
+
+
+def ebStatusNotify():
+    """ Signal a status change, never fails the caller """
+
+    _path = ebStatusNotifyPath()
+    try:
+        try:
+            os.utime(_path)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(_path), exist_ok=True)
+            with open(_path, "a"):
+                pass
+    except OSError:
+        pass
+
+
+def ebStatusStamp():
+    """ Stamp of the last status change, 0 when none was signaled yet """
+
+    try:
+        return os.stat(ebStatusNotifyPath()).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def ebStatusWait(aStamp, aTimeout, aMinWait=0):
+    """
+    Wait until a status change is signaled after aStamp, at least aMinWait
+    and at most aTimeout seconds. Returns the new stamp.
+    """
+
+    _start = time.monotonic()
+    if aMinWait > 0:
+        time.sleep(min(aMinWait, aTimeout))
+
+    while True:
+        _stamp = ebStatusStamp()
+        _left = aTimeout - (time.monotonic() - _start)
+        if _stamp != aStamp or _left <= 0:
+            return _stamp
+        time.sleep(min(STATUS_NOTIFY_STEP, _left))
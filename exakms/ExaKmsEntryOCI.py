@@ -16,10 +16,14 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Keep the decrypted DEKs in memory for
+#                           exakms_oci_dek_cache_ttl seconds
 #    jesandov    04/27/23 - 35141575: Add support of ECDSA key type
 #    jesandov    06/23/21 - Creation
 #
 
+import time
+import threading
 
 from exabox.core.Context import get_gcontext
 from exabox.exakms.ExaKmsEntry import ExaKmsEntry, ExaKmsHostType
@@ -28,9 +32,17 @@ from exabox.exakms.ExaKmsEntryECDSA import ExaKmsEntryECDSA
 from exabox.kms.crypt import cryptographyAES
 from oci.key_management.models import GenerateKeyDetails, DecryptDataDetails
 
+# encDEK -> (expiration time, plain DEK), shared by the entries of the process
+_gPlainDEKCache = {}
+_gPlainDEKCacheLock = threading.Lock()
+_PLAIN_DEK_CACHE_MAX = 4096
+
 
 class ExaKmsEntryOCI(ExaKmsEntry):
 
+    # Seconds a decrypted DEK is reused, 0 asks KMS every time
+    DEK_CACHE_TTL = 0
+
     def __init__(self, aFQDN, aUser, aPrivateKey, aHostType=ExaKmsHostType.UNKNOWN):
 
         self.__objectName = None
@@ -148,14 +160,37 @@ class ExaKmsEntryOCI(ExaKmsEntry):
         self.__encDEK = aDEK
 
     def mGetPlainEncryptionKey(self):
+
+        _encDEK = self.mGetEncDEK()
+        _ttl = ExaKmsEntryOCI.DEK_CACHE_TTL
+
+        if _ttl > 0:
+            with _gPlainDEKCacheLock:
+                _cached = _gPlainDEKCache.get(_encDEK)
+                if _cached and _cached[0] > time.time():
+                    return _cached[1]
+
         _dataDetails = DecryptDataDetails()
         _dataDetails.key_id = self.__kmsKeyId
-        _dataDetails.ciphertext = self.mGetEncDEK()
+        _dataDetails.ciphertext = _encDEK
 
         _decryptedDEK = self.mGetCryptoClient().decrypt(decrypt_data_details = _dataDetails)
 
+        if _ttl > 0:
+            with _gPlainDEKCacheLock:
+                if len(_gPlainDEKCache) >= _PLAIN_DEK_CACHE_MAX:
+                    _gPlainDEKCache.clear()
+                _gPlainDEKCache[_encDEK] = (time.time() + _ttl, _decryptedDEK.data.plaintext)
+
         return _decryptedDEK.data.plaintext
 
+    @staticmethod
+    def mSetDEKCacheTTL(aSeconds):
+        ExaKmsEntryOCI.DEK_CACHE_TTL = max(0, int(aSeconds))
+        if not ExaKmsEntryOCI.DEK_CACHE_TTL:
+            with _gPlainDEKCacheLock:
+                _gPlainDEKCache.clear()
+
     #################
     # CLASS METHODS #
     #################
@@ -16,6 +16,10 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Leave out of the index the objects that can not
+#                           be read instead of failing the whole sync
+#    jydas       10/18/26 - Search through the bucket index: direct GET of
+#                           exact FQDNs, only changed objects downloaded
 #    jesandov    04/28/26 - Bug#39263025 Fix security issues found using IA
 #    ririgoye    04/27/26 - Updated OCI exception import for urllib3 vendor
 #                           libraries
@@ -55,16 +59,18 @@ import copy
 import socket
 
 from exabox.exakms.ExaKmsEntry import ExaKmsEntry, ExaKmsHostType
-from exabox.exakms.ExaKmsEntryOCI import ExaKmsEntryOCIRSA, ExaKmsEntryOCIECDSA
+from exabox.exakms.ExaKmsEntryOCI import ExaKmsEntryOCI, ExaKmsEntryOCIRSA, ExaKmsEntryOCIECDSA
 from exabox.exakms.ExaKms import ExaKms
 from exabox.core.Context import get_gcontext
 from exabox.core.Error import ExacloudRuntimeError
 from exabox.kms.crypt import cryptographyAES
 from exabox.log.LogMgr import ebLogInfo, ebLogWarn, ebLogTrace, ebLogError
 from exabox.exakms.ExaKmsHistoryOCI import ExaKmsHistoryOCI
+from exabox.exakms.ExaKmsOCIIndex import mGetExaKmsOCIIndex
 from oci.key_management import KmsCryptoClient
 from oci.key_management.models import GenerateKeyDetails, DecryptDataDetails
 from oci.object_storage.models import CreateBucketDetails
+from oci.exceptions import ServiceError
 from typing import List, Mapping, Optional
 from exabox.exaoci.ExaOCIFactory import ExaOCIFactory
 from typing import List
@@ -75,6 +81,9 @@ urlopen = urllib.request.urlopen
 URLError = urllib.error.URLError
 HTTPError = urllib.error.HTTPError
 
+EXAKMS_OCI_SKIP_EXT = ["jpg", "jpge", "tar", "gz", "json", "png"]
+EXAKMS_OCI_HISTORY_OBJECT = "changes.txt"
+
 
 class ExaKmsOCI(ExaKms):
 
@@ -122,6 +131,9 @@ class ExaKmsOCI(ExaKms):
         if get_gcontext().mCheckConfigOption('exakms_oci_retries'):
             self.__retries = int(get_gcontext().mCheckConfigOption('exakms_oci_retries'))
 
+        if get_gcontext().mCheckConfigOption('exakms_oci_dek_cache_ttl'):
+            ExaKmsEntryOCI.mSetDEKCacheTTL(int(get_gcontext().mCheckConfigOption('exakms_oci_dek_cache_ttl')))
+
         self.mObjectStoreInit()
         self.mSetExaKmsHistoryInstance(ExaKmsHistoryOCI(self))
 
@@ -179,6 +191,61 @@ class ExaKmsOCI(ExaKms):
         if aBackup:
             _bucket = self.__backupBucket
 
+        _index = mGetExaKmsOCIIndex(_bucket)
+
+        if "FQDN" in _patternDict and not get_gcontext().mCheckRegEntry("exakms_enable_fetch_clustername"):
+            # Only the object named after the FQDN can hold the entries
+            _objectNames = [_patternDict['FQDN']]
+            self.mRefreshObject(_index, _patternDict['FQDN'], aRefreshKey)
+
+        else:
+            if aRefreshKey or not _index.mIsListingFresh():
+                _index.mSync(self.mListOSS(_bucket), lambda aName: self.mFetchObject(_bucket, aName))
+
+            _objectNames = _index.mGetObjectNames()
+
+            # try single access
+            if "FQDN" in _patternDict:
+                if _patternDict['FQDN'] in _objectNames:
+                    _objectNames = [_patternDict['FQDN']]
+                elif 'strict' in _patternDict and _patternDict['strict']:
+                    _short = _patternDict['FQDN'].split('.')[0]
+                    _objectNames = sorted(set(_index.mFindObjects(_short)) |
+                                          set([_name for _name in _objectNames if _name.split('.')[0] == _short]))
+
+        _entries = []
+        for _objectName in _objectNames:
+
+            if _objectName.split(".")[-1] in EXAKMS_OCI_SKIP_EXT:
+                continue
+
+            _objDict = _index.mGetContent(_objectName)
+            if not _objDict:
+                continue
+
+            _entries.extend(self.mBuildEntriesFromObject(_objectName, _objDict, _patternDict))
+
+        def mGetSortKey(aEntry):
+
+            _str = f"{aEntry.mGetCreationTime()}|"
+
+            if aEntry.mGetObjectName() == aEntry.mGetObjectName():
+                _str = "1|"
+            else:
+                _str = "0|"
+
+            return _str
+
+        _sorted = sorted(_entries, key=mGetSortKey, reverse=True)
+
+        for _entry in _sorted:
+            self.mUpdateCacheKey(_entry.mGetFQDN(), _entry)
+
+        return _sorted
+
+
+    def mGetListRetries(self):
+
         _retries = 3
         if get_gcontext().mCheckConfigOption('exakms_oci_retries'):
             try:
@@ -192,8 +259,17 @@ class ExaKmsOCI(ExaKms):
                        '. Falling back to default value...')
                 ebLogWarn(_msg)
 
+        return _retries
+
+    def mListOSS(self, aBucket):
+        """
+        Return object name -> etag of the ExaKms objects in aBucket
+        """
+
+        _retries = self.mGetListRetries()
+
         # Get all the objects in the bucket
-        _objects = []
+        _objects = {}
         _next_start = None
         _get_objects = True
         _exception_msg = None
@@ -202,9 +278,13 @@ class ExaKmsOCI(ExaKms):
             # an SSLError, which is a common intermittent connection issue
             for _ in range(_retries):
                 try:
-                    _resp = self.__objectStorage.list_objects(self.__namespace,
-                                                     _bucket,start=_next_start)
-                    _objects += _resp.data.objects
+                    _resp = self.__objectStorage.list_objects(self.__namespace, aBucket,
+                                                              start=_next_start, fields="name,etag")
+                    for _object in _resp.data.objects:
+                        if _object.name.split(".")[-1] in EXAKMS_OCI_SKIP_EXT or \
+                           _object.name == EXAKMS_OCI_HISTORY_OBJECT:
+                            continue
+                        _objects[_object.name] = getattr(_object, "etag", None)
                     _next_start = _resp.data.next_start_with
                     _get_objects = _next_start is not None
                     break
@@ -229,116 +309,134 @@ class ExaKmsOCI(ExaKms):
                 ebLogError(_err_msg)
                 raise ExacloudRuntimeError(aErrorMsg=_err_msg) from _exception_msg
 
-        _entries = []
-        _objectList = []
+        return _objects
 
-        # try single access
-        if "FQDN" in _patternDict:
-            for _object in _objects:
-                if _object.name == _patternDict['FQDN']:
-                    _objectList.append(_object)
-                    break
-
-        # Fetch of all the object still needed when aPatternDict = {}
-        if "FQDN" not in _patternDict or get_gcontext().mCheckRegEntry("exakms_enable_fetch_clustername"):
-            if not _objectList:
-                _objectList = _objects
+    def mFetchObject(self, aBucket, aObjectName):
+        """
+        Return (etag, content) of an ExaKms object, None if it does not exist
+        or can not be read, so one object does not fail the whole search.
+        Objects that are not ExaKms records have an empty content.
+        """
 
-        for _object in _objectList:
+        try:
+            try:
+                _obj = self.__objectStorage.get_object(self.__namespace, aBucket, aObjectName)
+                if not _obj or _obj.status != 200:
+                    _obj = self.mGetOSS(aBucket, aObjectName)
+            except ServiceError as e:
+                if e.status == 404:
+                    return None
+                _obj = self.mGetOSS(aBucket, aObjectName)
+            except SSLError:
+                _obj = self.mGetOSS(aBucket, aObjectName)
+        except Exception as e:
+            ebLogWarn(f"ExaKms object {aObjectName} of bucket {aBucket} could not be read, "
+                      f"left out of the index: {e}")
+            return None
+
+        _etag = None
+        if getattr(_obj, "headers", None):
+            _etag = _obj.headers.get("etag")
 
-            if _object.name.split(".")[-1] in ["jpg", "jpge", "tar", "gz", "json", "png"]:
-                continue
+        try:
+            _objDict = json.loads(_obj.data.content.decode('utf-8'))
+        except Exception:
+            _objDict = {}
 
-            try:
-                _obj = self.mGetOSS(_bucket, _object.name)
-                _objDict = json.loads(_obj.data.content.decode('utf-8'))
-            except Exception:
-                continue
+        if not isinstance(_objDict, dict):
+            _objDict = {}
 
-            # Search for the fqdn of each object
-            for _objKey, _objData in _objDict.items():
-                _keyPattern = re.match(r'id_rsa.([\w\-\_]+).([\w\-\_]+)', _objKey)
+        return _etag, _objDict
 
-                if not _keyPattern:
-                    continue
+    def mRefreshObject(self, aIndex, aObjectName, aRefreshKey=False):
+        """ Get aObjectName into aIndex unless its record is still fresh """
 
-                _fqdn = _keyPattern.group(1)
-                if '.' in _object.name:
-                    _fqdn = _object.name
+        if not aRefreshKey and aIndex.mGetContent(aObjectName, aFreshOnly=True) is not None:
+            return
 
-                # If given an FQDN, ignore all other entries.
-                if 'FQDN' in _patternDict:
-                    if 'strict' in _patternDict and _patternDict['strict']:
-                        if _fqdn.split('.')[0] != _patternDict['FQDN'].split('.')[0]:
-                            continue
+        _result = self.mFetchObject(aIndex.mGetBucket(), aObjectName)
+        if _result is None:
+            aIndex.mDropObject(aObjectName)
+        else:
+            aIndex.mPutObject(aObjectName, _result[0], _result[1])
 
-                    else:
-                        if not re.match(_patternDict['FQDN'], _fqdn) and \
-                               _fqdn.split('.')[0] != _patternDict['FQDN'].split('.')[0]:
-                            continue
+    def mBuildEntriesFromObject(self, aObjectName: str, aObjDict: dict, aPatternDict: dict) -> List[ExaKmsEntry]:
+        """
+        Returns the entries of the object aObjectName matching the patterns
+        """
 
-                # If given a user, ignore all other entries
-                if 'user' in _patternDict:
-                    if _keyPattern.group(2) != _patternDict['user']:
-                        continue
+        _entries = []
 
-                if 'encData' not in _objData or 'encDEK' not in _objData:
-                    continue
+        # Search for the fqdn of each object
+        for _objKey, _objData in aObjDict.items():
+            _keyPattern = re.match(r'id_rsa.([\w\-\_]+).([\w\-\_]+)', _objKey)
 
-                if not _objData['encDEK'] or not _objData['encData']:
-                    continue
+            if not _keyPattern:
+                continue
 
-                # Add entry to list
-                _version = None
-                if "version" in _objData:
-                    _version = _objData["version"]
-                else:
-                    _version = "RSA"
+            _fqdn = _keyPattern.group(1)
+            if '.' in aObjectName:
+                _fqdn = aObjectName
 
-                _entry = self.mBuildExaKmsEntry(_fqdn, _keyPattern.group(2), '', aClassName=_version)
-                _entry.mSetCryptoClient(self.__kmsCryptoClient)
-                _entry.mSetEncDEK(_objData['encDEK'])
-                _entry.mSetEncData(_objData['encData'])
-                _entry.mSetObjectName(_object.name)
+            # If given an FQDN, ignore all other entries.
+            if 'FQDN' in aPatternDict:
+                if 'strict' in aPatternDict and aPatternDict['strict']:
+                    if _fqdn.split('.')[0] != aPatternDict['FQDN'].split('.')[0]:
+                        continue
 
-                if "hash" in _objData:
-                    _entry.mSetHash(_objData['hash'])
+                else:
+                    if not re.match(aPatternDict['FQDN'], _fqdn) and \
+                           _fqdn.split('.')[0] != aPatternDict['FQDN'].split('.')[0]:
+                        continue
 
-                if "creationTime" in _objData:
-                    _entry.mSetCreationTime(_objData['creationTime'])
+            # If given a user, ignore all other entries
+            if 'user' in aPatternDict:
+                if _keyPattern.group(2) != aPatternDict['user']:
+                    continue
 
-                if "label" in _objData:
-                    _entry.mSetLabel(_objData['label'])
+            if not isinstance(_objData, dict):
+                continue
 
-                if "exacloud_host" in _objData:
-                    _entry.mSetExacloudHost(_objData['exacloud_host'])
+            if 'encData' not in _objData or 'encDEK' not in _objData:
+                continue
 
-                if 'hostType' in _objData:
-                    _entry.mSetHostType(_objData['hostType'])
+            if not _objData['encDEK'] or not _objData['encData']:
+                continue
 
-                if 'keyValueInfo' in _objData:
-                    _entry.mSetKeyValueInfo(_objData['keyValueInfo'])
+            # Add entry to list
+            _version = None
+            if "version" in _objData:
+                _version = _objData["version"]
+            else:
+                _version = "RSA"
 
-                _entries.append(_entry)
+            _entry = self.mBuildExaKmsEntry(_fqdn, _keyPattern.group(2), '', aClassName=_version)
+            _entry.mSetCryptoClient(self.__kmsCryptoClient)
+            _entry.mSetEncDEK(_objData['encDEK'])
+            _entry.mSetEncData(_objData['encData'])
+            _entry.mSetObjectName(aObjectName)
 
-        def mGetSortKey(aEntry):
+            if "hash" in _objData:
+                _entry.mSetHash(_objData['hash'])
 
-            _str = f"{aEntry.mGetCreationTime()}|"
+            if "creationTime" in _objData:
+                _entry.mSetCreationTime(_objData['creationTime'])
 
-            if aEntry.mGetObjectName() == aEntry.mGetObjectName():
-                _str = "1|"
-            else:
-                _str = "0|"
+            if "label" in _objData:
+                _entry.mSetLabel(_objData['label'])
 
-            return _str
+            if "exacloud_host" in _objData:
+                _entry.mSetExacloudHost(_objData['exacloud_host'])
 
-        _sorted = sorted(_entries, key=mGetSortKey, reverse=True)
+            if 'hostType' in _objData:
+                _entry.mSetHostType(_objData['hostType'])
 
-        for _entry in _sorted:
-            self.mUpdateCacheKey(_entry.mGetFQDN(), _entry)
+            if 'keyValueInfo' in _objData:
+                _entry.mSetKeyValueInfo(_objData['keyValueInfo'])
 
-        return _sorted
+            _entries.append(_entry)
 
+        return _entries
 
     def mDeleteOSS(self, aObjectName):
 
@@ -461,8 +559,10 @@ class ExaKmsOCI(ExaKms):
 
             if not _objDict:
                 self.mDeleteOSS(_objectName)
+                mGetExaKmsOCIIndex(self.__bucket).mDropObject(_objectName)
             else:
-                self.mPutOSS(self.__bucket, _objectName, json.dumps(_objDict))
+                _resp = self.mPutOSS(self.__bucket, _objectName, json.dumps(_objDict))
+                mGetExaKmsOCIIndex(self.__bucket).mPutObject(_objectName, self.mGetEtag(_resp), _objDict)
 
             super().mDeleteExaKmsEntry(aKmsEntry)
             return True
@@ -621,7 +721,16 @@ class ExaKmsOCI(ExaKms):
 
         _objDict[f'id_rsa.{aKmsEntry.mGetFQDN().split(".")[0]}.{aKmsEntry.mGetUser()}'] = _encryptedKey
 
-        self.mPutOSS(aBucket, _objectName, json.dumps(_objDict))
+        _resp = self.mPutOSS(aBucket, _objectName, json.dumps(_objDict))
+        mGetExaKmsOCIIndex(aBucket).mPutObject(_objectName, self.mGetEtag(_resp), _objDict)
+
+    def mGetEtag(self, aResponse):
+        """ etag of a put_object response, None when not available """
+
+        _headers = getattr(aResponse, "headers", None)
+        if not _headers:
+            return None
+        return _headers.get("etag")
 
 
 # end of file
@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exakms/ExaKmsOCIIndex.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# ExaKmsOCIIndex.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      ExaKmsOCIIndex.py - Index of the ExaKms objects of an OCI bucket
+#
+#    DESCRIPTION
+#      Keeps the records of the ExaKms objects of a bucket with their etag,
+#      so a search only downloads the objects changed since the last listing
+#      and the host/user -> object name lookups are done locally.
+#
+#    NOTES
+#      The index is shared by the ExaKmsOCI instances of the process. With
+#      'exakms_oci_cache_dir' set it is also persisted in that directory and
+#      shared by all the worker processes. The records are stored as they are
+#      in the bucket (encData/encDEK), no decrypted material is written.
+#      Tunables:
+#        exakms_oci_cache_dir       directory of the shared cache (unset)
+#        exakms_oci_index_ttl       seconds a listing/record is trusted
+#                                   without asking the bucket (0)
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import re
+import json
+import time
+import fcntl
+import hashlib
+import tempfile
+import threading
+
+from exabox.core.Context import get_gcontext
+from exabox.log.LogMgr import ebLogTrace, ebLogWarn
+
+EXAKMS_INDEX_VERSION = 1
+
+# (bucket, cache path) -> ExaKmsOCIIndex
+_gIndexes = {}
+_gIndexesLock = threading.Lock()
+
+
+def mGetExaKmsOCIIndex(aBucket):
+    """ Return the index of aBucket shared by the process """
+
+    _dir = get_gcontext().mCheckConfigOption('exakms_oci_cache_dir')
+    _path = None
+    if _dir:
+        _name = hashlib.sha256(aBucket.encode('utf-8')).hexdigest()[:16]
+        _path = os.path.join(_dir, f"exakms_oci_{_name}.json")
+
+    _ttl = 0
+    _value = get_gcontext().mCheckConfigOption('exakms_oci_index_ttl')
+    if _value:
+        try:
+            _ttl = max(0, int(_value))
+        except ValueError:
+            ebLogWarn(f"Invalid value for exakms_oci_index_ttl: {_value}, using 0")
+
+    with _gIndexesLock:
+        _key = (aBucket, _path)
+        if _key not in _gIndexes:
+            _gIndexes[_key] = ExaKmsOCIIndex(aBucket, _path)
+        _index = _gIndexes[_key]
+
+    _index.mSetTTL(_ttl)
+    return _index
+
+
+class ExaKmsOCIIndex:
+
+    def __init__(self, aBucket, aPath=None, aTTL=0):
+
+        self.__bucket = aBucket
+        self.__path = aPath
+        self.__ttl = aTTL
+        self.__lock = threading.RLock()
+
+        # object name -> {"etag": str, "time": float, "content": dict}
+        self.__objects = {}
+        self.__listedAt = 0
+        self.__stamp = None
+        self.__hosts = None
+
+    #######################
+    # GETTERS AND SETTERS #
+    #######################
+
+    def mGetBucket(self):
+        return self.__bucket
+
+    def mGetPath(self):
+        return self.__path
+
+    def mGetTTL(self):
+        return self.__ttl
+
+    def mSetTTL(self, aTTL):
+        self.__ttl = aTTL
+
+    ###################
+    # PERSISTENT FILE #
+    ###################
+
+    def mLoad(self):
+        """ Adopt the shared cache file if another process updated it """
+
+        if not self.__path:
+            return
+
+        with self.__lock:
+            try:
+                _st = os.stat(self.__path)
+            except OSError:
+                return
+
+            _stamp = (_st.st_mtime_ns, _st.st_size, _st.st_ino)
+            if _stamp == self.__stamp:
+                return
+
+            _data = self.mReadFile()
+            if _data is not None:
+                self.__objects = _data["objects"]
+                self.__listedAt = _data["listed_at"]
+                self.__hosts = None
+            self.__stamp = _stamp
+
+    def mReadFile(self):
+
+        try:
+            with open(self.__path, "r") as _fd:
+                fcntl.flock(_fd, fcntl.LOCK_SH)
+                _data = json.load(_fd)
+        except (OSError, ValueError) as e:
+            ebLogTrace(f"ExaKms OCI cache {self.__path} not loaded: {e}")
+            return None
+
+        if not isinstance(_data, dict) or _data.get("version") != EXAKMS_INDEX_VERSION or \
+           _data.get("bucket") != self.__bucket:
+            return None
+
+        return _data
+
+    def mUpdate(self, aFx):
+        """
+        Apply aFx(objects) to the latest index, writing the shared file back
+        while holding its lock so concurrent updates are not lost.
+        """
+
+        with self.__lock:
+
+            if not self.__path:
+                aFx(self.__objects)
+                self.__hosts = None
+                return
+
+            _dir = os.path.dirname(self.__path)
+            _applied = False
+            try:
+                os.makedirs(_dir, mode=0o700, exist_ok=True)
+                with open(f"{self.__path}.lock", "a") as _lockFd:
+                    fcntl.flock(_lockFd, fcntl.LOCK_EX)
+
+                    self.__stamp = None
+                    self.mLoad()
+                    aFx(self.__objects)
+                    self.__hosts = None
+                    _applied = True
+
+                    _data = {"version": EXAKMS_INDEX_VERSION, "bucket": self.__bucket,
+                             "listed_at": self.__listedAt, "objects": self.__objects}
+                    _fd, _tmp = tempfile.mkstemp(dir=_dir, prefix=".exakms_oci")
+                    with os.fdopen(_fd, "w") as _out:
+                        json.dump(_data, _out)
+                    os.replace(_tmp, self.__path)
+
+                    _st = os.stat(self.__path)
+                    self.__stamp = (_st.st_mtime_ns, _st.st_size, _st.st_ino)
+
+            except OSError as e:
+                ebLogWarn(f"ExaKms OCI cache {self.__path} not written: {e}")
+                if not _applied:
+                    aFx(self.__objects)
+                    self.__hosts = None
+
+    ###########
+    # RECORDS #
+    ###########
+
+    def mIsListingFresh(self):
+        self.mLoad()
+        return self.__ttl > 0 and time.time() - self.__listedAt < self.__ttl
+
+    def mGetObjectNames(self):
+        self.mLoad()
+        with self.__lock:
+            return sorted(self.__objects.keys())
+
+    def mGetEtags(self):
+        self.mLoad()
+        with self.__lock:
+            return {_name: _record["etag"] for _name, _record in self.__objects.items()}
+
+    def mGetContent(self, aName, aFreshOnly=False):
+        """
+        Return the cached content of aName, None when unknown (or older than
+        the TTL with aFreshOnly).
+        """
+
+        self.mLoad()
+        with self.__lock:
+            _record = self.__objects.get(aName)
+            if not _record:
+                return None
+            if aFreshOnly and (self.__ttl <= 0 or time.time() - _record["time"] >= self.__ttl):
+                return None
+            return _record["content"]
+
+    def mPutObject(self, aName, aEtag, aContent):
+
+        def _mPut(aObjects):
+            aObjects[aName] = {"etag": aEtag, "time": time.time(), "content": aContent}
+
+        self.mUpdate(_mPut)
+
+    def mDropObject(self, aName):
+
+        def _mDrop(aObjects):
+            aObjects.pop(aName, None)
+
+        self.mUpdate(_mDrop)
+
+    def mSync(self, aListing, aFetchFx):
+        """
+        Bring the index in line with aListing (object name -> etag): the
+        objects with a new etag are fetched with aFetchFx(name), which returns
+        (etag, content) or None, the ones gone from the bucket are dropped.
+        """
+
+        _etags = self.mGetEtags()
+        _fetched = {}
+        for _name, _etag in aListing.items():
+            if _etag and _etags.get(_name) == _etag:
+                continue
+            _fetched[_name] = aFetchFx(_name)
+
+        ebLogTrace(f"ExaKms OCI index of {self.__bucket}: {len(aListing)} objects, "
+                   f"{len(_fetched)} fetched")
+
+        def _mSync(aObjects):
+            _now = time.time()
+            for _name in list(aObjects.keys()):
+                if _name not in aListing:
+                    del aObjects[_name]
+            for _name, _result in _fetched.items():
+                if _result is None:
+                    aObjects.pop(_name, None)
+                else:
+                    aObjects[_name] = {"etag": _result[0], "time": _now, "content": _result[1]}
+            for _name in aListing:
+                if _name in aObjects and _name not in _fetched:
+                    aObjects[_name]["time"] = _now
+            self.__listedAt = _now
+
+        self.mUpdate(_mSync)
+
+    def mFindObjects(self, aHostname):
+        """ Return the object names holding keys of the short name of aHostname """
+
+        self.mLoad()
+        with self.__lock:
+            if self.__hosts is None:
+                self.__hosts = {}
+                for _name, _record in self.__objects.items():
+                    for _key in _record["content"]:
+                        _match = re.match(r'id_rsa.([\w\-\_]+).([\w\-\_]+)', _key)
+                        if _match:
+                            self.__hosts.setdefault(_match.group(1), set()).add(_name)
+            return sorted(self.__hosts.get(aHostname.split(".")[0], ()))
+
+# end of file
@@ -18,6 +18,7 @@
 #      processes.
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas     10/18/26 - Mock the typed worker rows
 #    aypaul    06/17/26 - Add unit tests for 39392679
 #    kanmanic  06/15/26 - 39560339 - Fix ECRA DB connection close guards
 #    aypaul    05/26/26 - Fix unit tests for 39392771
@@ -405,7 +406,7 @@ class ebTestAgentClasses(ebTestClucontrol):
         _server_class = ebRestHttpListener(aConfig=None)
         _worker_dump = [["00000000-0000-0000-0000-000000000000","Idle","Sat Feb 12 10:19:12 2022","Undef","NULL","Undef","Undef",\
              '{"status": "000:: No status info available"}',"26447","9139","worker","Undef","2022-02-23 11:51:32.621223", "NORMAL"]]
-        with patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str(_worker_dump)):
+        with patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=_worker_dump):
             _server_class.mAgentWorkers({}, {})
         ebLogInfo("test on ebRestHttpListener.mAgentWorkers succeeded.")
 
@@ -529,14 +530,14 @@ class ebTestAgentClasses(ebTestClucontrol):
 
         _worker_dump = [["7e59b8da-9561-11ec-bdfe-fa163e8a4946","Idle","Sat Feb 12 10:19:12 2022","Undef","NULL","Undef","Undef",\
              '{"status": "000:: No status info available"}',"26447","9139","monitor","Undef","2022-02-23 11:51:32.621223", "NORMAL"]]
-        with patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str(_worker_dump)) as mock1,\
+        with patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=_worker_dump) as mock1,\
              patch('exabox.agent.Worker.ebWorker.mUpdateDB') as mock2:
             _server_class.mMonitor({"cmd":"refresh"}, {})
 
         _worker_dump = [["00000000-0000-0000-0000-000000000000","Idle","Sat Feb 12 10:19:12 2022","Undef","NULL","Undef","Undef",\
              '{"status": "000:: No status info available"}',"26447","9139","worker","Undef","2022-02-23 11:51:32.621223", "NORMAL"]]
         with patch('exabox.agent.ebJobRequest.ebJobRequest.mRegister') as mock1,\
-             patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str(_worker_dump)) as mock3,\
+             patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=_worker_dump) as mock3,\
              patch('exabox.agent.Worker.ebWorker.mUpdateDB') as mock2:
              _server_class.mMonitor({"cmd":"start"}, {})
         ebLogInfo("test on ebRestHttpListener.mMonitor succeeded.")
@@ -969,12 +970,12 @@ class ebTestAgentClasses(ebTestClucontrol):
             _server_class.getResponseFromExacloud("Status", None, {'uuid':'cea45c7a-9488-11ec-ba34-5e2382e085b0'}, None,  None)
 
         with patch('exabox.core.DBStore3.ebExacloudDB.mSelectStatusFromUUIDToECInstance', return_value="InitialReqDone") as mock1,\
-             patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value='dummyworkerid') as mock2:
+             patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', side_effect=ValueError('dummyworkerid')) as mock2:
             _server_class.requestline = "GET https://localhost:1707/Status/cea45c7a-9488-11ec-ba34-5e2382e085b0 HTTP/1.1"
             _server_class.getResponseFromExacloud("Status", None, {'uuid':'cea45c7a-9488-11ec-ba34-5e2382e085b0'}, None,  None)
 
         with patch('exabox.core.DBStore3.ebExacloudDB.mSelectStatusFromUUIDToECInstance', return_value="InitialReqDone") as mock1,\
-             patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value='()') as mock2,\
+             patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=[]) as mock2,\
              patch('exabox.agent.Agent.dispatchJobToWorker', return_value=True) as mock3:
             _server_class.requestline = "GET https://localhost:1707/Status/cea45c7a-9488-11ec-ba34-5e2382e085b0 HTTP/1.1"
             _server_class.getResponseFromExacloud("Status", None, {'uuid':'cea45c7a-9488-11ec-ba34-5e2382e085b0'}, None,  None)
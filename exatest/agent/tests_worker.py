@@ -16,6 +16,7 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Mock the typed worker rows
 #    aypaul      03/30/26 - Adding unit tests for aypaul_bug-38277507
 #    prsshukl    03/13/26 - Add unittest for 39077070
 #    remamid     11/19/25 - Add unittest for 38631342
@@ -162,19 +163,19 @@ class ebTestWorkerClasses(ebTestClucontrol):
         _worker_daemon._ebWorkerDaemon__restlistener = True
         _curr_worker_dump = copy.deepcopy(DEFAULT_WORKER_DUMP)
         _curr_worker_dump[10] = "monitor"
-        with patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str([_curr_worker_dump])),\
+        with patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=[_curr_worker_dump]),\
              patch('exabox.agent.Worker.ebWorker.mGetType', return_value="monitor"),\
              patch('exabox.agent.Worker.ebWorkerDaemon.get_worker_exit_loop', return_value=True):
             _worker_daemon.mWorker_Start()
 
         _curr_worker_dump[9] = 9135
-        with patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str([_curr_worker_dump])),\
+        with patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=[_curr_worker_dump]),\
              patch('exabox.agent.Worker.ebWorker.mGetType', return_value="monitor"),\
              patch('exabox.agent.Worker.ebWorkerDaemon.get_worker_exit_loop', return_value=True):
             _worker_daemon.mWorker_Start()
 
         _curr_worker_dump[9] = 9101
-        with patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str([_curr_worker_dump])),\
+        with patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=[_curr_worker_dump]),\
              patch('exabox.agent.Worker.ebWorker.mGetType', side_effect=iter(["invalidvalue", "monitor", "monitor"])),\
              patch('exabox.agent.Worker.ebWorker.mGetStatus', return_value="Idle"),\
              patch('os.listdir', side_effect=iter([["cluster-mockdir"], ["mockfile.xml"], ["cluster-mockdir"], ["invalidfile"]])),\
@@ -183,7 +184,7 @@ class ebTestWorkerClasses(ebTestClucontrol):
              patch('exabox.agent.Worker.ebWorkerDaemon.get_worker_exit_loop', side_effect=iter([False, False, True])):
             _worker_daemon.mWorker_Start()
 
-        with patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str([_curr_worker_dump])),\
+        with patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=[_curr_worker_dump]),\
              patch('exabox.agent.Worker.ebWorker.mGetType', side_effect=iter(["invalidvalue", "invalidvalue", "proxy", "invalidvalue", "proxy"])),\
              patch('exabox.agent.Worker.ebWorker.mGetUUID', return_vale="3139195c-a50f-11ec-a940-fa163e8a4946"),\
              patch('exabox.agent.Worker.ebWorkerDaemon.get_worker_exit_loop', side_effect=iter([False, False, True])),\
@@ -200,7 +201,7 @@ class ebTestWorkerClasses(ebTestClucontrol):
              patch('exabox.agent.Worker.ebProxyJobRequest.mGetParams', return_value={"request_id": "3139195c-a50f-11ec-a940-fa163e8a4946"}):
             _worker_daemon.mWorker_Start()
         _curr_worker_dump[9] = 9110
-        with patch('exabox.core.DBStore3.ebExacloudDB.mDumpWorkers', return_value=str([_curr_worker_dump])),\
+        with patch('exabox.core.DBStore3.ebExacloudDB.mGetWorkerRows', return_value=[_curr_worker_dump]),\
              patch('exabox.agent.Worker.ebWorker.mGetUUID', return_vale="3139195c-a50f-11ec-a940-fa163e8a4946"),\
              patch('exabox.agent.Worker.ebWorkerDaemon.get_worker_exit_loop', side_effect=iter([False, False, True])),\
              patch('exabox.tools.ebXmlGen.ebFacadeXmlGen.ebFacadeXmlGen.mGenerateXml', return_value='/exacloud/log/xmlgen/3139195c-a50f-11ec-a940-fa163e8a4946/result-3139195c-a50f-11ec-a940-fa163e8a4946.xml'),\
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/agent/tests_worker_notify.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_worker_notify.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_worker_notify.py - Unit tests for exabox/agent/WorkerNotify.py
+#
+#    DESCRIPTION
+#      Unit tests for the dispatcher/worker notify sockets
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.agent.WorkerNotify import ebNotifySocket, ebNotifySend, ebNotifyPath
+from exabox.agent.Dispatcher import ebDispatcher
+from exabox.core.DBStore3 import ebWorkerRow
+
+class ebTestWorkerNotify(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestWorkerNotify, self).setUpClass(aGenerateDatabase=False)
+
+    def setUp(self):
+        # Keep the AF_UNIX path short
+        self.__dir = tempfile.mkdtemp(prefix="ntf", dir="/tmp")
+
+    def tearDown(self):
+        shutil.rmtree(self.__dir, ignore_errors=True)
+
+    def test_mWait_roundtrip(self):
+        ebLogInfo("Running unit test on ebNotifySocket.mWait")
+        _sock = ebNotifySocket("worker_9001", aDir=self.__dir)
+        self.assertTrue(_sock.mOpen())
+        try:
+            self.assertEqual(_sock.mWait(0), [])
+            self.assertTrue(ebNotifySend("worker_9001", "uuid-1", aDir=self.__dir))
+            self.assertTrue(ebNotifySend("worker_9001", "uuid-2", aDir=self.__dir))
+            self.assertEqual(_sock.mWait(1), ["uuid-1", "uuid-2"])
+        finally:
+            _sock.mClose()
+        self.assertFalse(os.path.exists(_sock.mGetPath()))
+
+    def test_ebNotifySend_no_listener(self):
+        ebLogInfo("Running unit test on ebNotifySend without listener")
+        self.assertFalse(ebNotifySend("worker_9002", aDir=self.__dir))
+
+        # Stale socket file of a dead process
+        _sock = ebNotifySocket("worker_9002", aDir=self.__dir)
+        self.assertTrue(_sock.mOpen())
+        _sock._ebNotifySocket__sock.close()
+        self.assertTrue(os.path.exists(ebNotifyPath("worker_9002", self.__dir)))
+        self.assertFalse(ebNotifySend("worker_9002", aDir=self.__dir))
+
+        # New process with the same name replaces it
+        _new = ebNotifySocket("worker_9002", aDir=self.__dir)
+        self.assertTrue(_new.mOpen())
+        try:
+            self.assertTrue(ebNotifySend("worker_9002", aDir=self.__dir))
+            self.assertEqual(_new.mWait(1), ["wakeup"])
+        finally:
+            _new.mClose()
+
+    def test_mDispatcher_notify_worker(self):
+        ebLogInfo("Running unit test on ebDispatcher.mDispatcher worker notification")
+        with patch("exabox.agent.Dispatcher.ebWorkerFactory"):
+            _dispatcher = ebDispatcher()
+        _dispatcher._db = MagicMock()
+        _dispatcher._db.mGetPendingRequest.return_value = ("uuid-3",)
+        _row = ("00000000-0000-0000-0000-000000000000", "Idle", "", "", "", "", "", "", 4242, 9003, "worker", "", "", "NORMAL")
+        _dispatcher._db.mGetWorkerRows.return_value = [ebWorkerRow._make(_row)]
+
+        with patch("exabox.agent.Dispatcher.ebWorker") as _mockWorker, \
+             patch("exabox.agent.Dispatcher.ebNotifyWorker") as _mockNotify:
+            _mockWorker.return_value.mAcquireSyncLock.return_value = True
+            self.assertTrue(_dispatcher.mDispatcher())
+
+            _mockWorker.return_value.mSetUUID.assert_called_once_with("uuid-3")
+            _mockNotify.assert_called_once_with(9003, "uuid-3")
+
+            # Nothing pending
+            _dispatcher._db.mGetPendingRequest.return_value = None
+            self.assertFalse(_dispatcher.mDispatcher())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/agent/tests_worker_zygote.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_worker_zygote.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_worker_zygote.py - Unit tests for exabox/agent/WorkerZygote.py
+#
+#    DESCRIPTION
+#      Unit tests for the worker zygote, the forked workers only write a
+#      marker file instead of starting a worker daemon
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add test for the socket of a running zygote
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import time
+import socket
+import shutil
+import tempfile
+import unittest
+import threading
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.agent.WorkerZygote import (ebWorkerZygote, ebWorkerZygoteRequest, ebSpawnPreforkedWorker,
+                                       ebStopWorkerZygote)
+
+class ebTestWorkerZygote(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestWorkerZygote, self).setUpClass(aGenerateDatabase=False)
+
+    def setUp(self):
+        # Keep the AF_UNIX path short
+        self.__dir = tempfile.mkdtemp(prefix="zyg", dir="/tmp")
+        self.__path = os.path.join(self.__dir, "zygote.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.__dir, ignore_errors=True)
+
+    def mStartZygote(self, aSpawnFx):
+        _zygote = ebWorkerZygote(self.__path, aSpawnFx=aSpawnFx, aPreload=[])
+        self.assertTrue(_zygote.mOpen())
+        _thread = threading.Thread(target=_zygote.mServe, kwargs={"aCheckParent": False}, daemon=True)
+        _thread.start()
+        return _zygote, _thread
+
+    def test_spawn(self):
+        ebLogInfo("Running unit test on ebWorkerZygote.mSpawn")
+
+        _parent = os.getpid()
+
+        def _mSpawnFx(aPort):
+            with open(os.path.join(self.__dir, f"worker_{aPort}"), "w") as _fd:
+                _fd.write(str(os.getpid()))
+            return 0 if aPort == 9001 else 1
+
+        _zygote, _thread = self.mStartZygote(_mSpawnFx)
+        try:
+            self.assertTrue(ebSpawnPreforkedWorker(9001, self.__path))
+            with open(os.path.join(self.__dir, "worker_9001")) as _fd:
+                self.assertNotEqual(int(_fd.read()), _parent)
+
+            # Worker not started (e.g. port in use), the caller falls back to bin/exacloud
+            self.assertFalse(ebSpawnPreforkedWorker(9002, self.__path))
+            self.assertTrue(os.path.exists(os.path.join(self.__dir, "worker_9002")))
+
+            _status = ebWorkerZygoteRequest({"cmd": "status"}, self.__path)
+            self.assertEqual(_status, {"pid": _parent, "spawned": 2})
+        finally:
+            self.assertTrue(ebStopWorkerZygote(self.__path))
+            _thread.join(5)
+
+        self.assertFalse(_thread.is_alive())
+        self.assertFalse(os.path.exists(self.__path))
+
+    def test_spawn_exception(self):
+        ebLogInfo("Running unit test on ebWorkerZygote.mSpawn with a failing worker")
+
+        def _mSpawnFx(aPort):
+            raise RuntimeError("worker failed")
+
+        _zygote, _thread = self.mStartZygote(_mSpawnFx)
+        try:
+            self.assertFalse(ebSpawnPreforkedWorker(9001, self.__path))
+            self.assertEqual(ebWorkerZygoteRequest({"cmd": "invalid"}, self.__path),
+                             {"error": "unknown command invalid"})
+        finally:
+            ebStopWorkerZygote(self.__path)
+            _thread.join(5)
+
+    def test_socket_in_use(self):
+        ebLogInfo("Running unit test on ebWorkerZygote.mOpen with a running zygote")
+
+        _zygote, _thread = self.mStartZygote(lambda aPort: 0)
+        try:
+            # A second zygote must not take over the socket of the first one
+            self.assertFalse(ebWorkerZygote(self.__path, aPreload=[]).mOpen())
+            self.assertEqual(ebWorkerZygoteRequest({"cmd": "status"}, self.__path)["spawned"], 0)
+        finally:
+            ebStopWorkerZygote(self.__path)
+            _thread.join(5)
+
+        # Socket left by a zygote that did not exit cleanly
+        _stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        _stale.bind(self.__path)
+        _stale.close()
+        _zygote = ebWorkerZygote(self.__path, aPreload=[])
+        self.assertTrue(_zygote.mOpen())
+        _zygote.mClose()
+
+    def test_no_zygote(self):
+        ebLogInfo("Running unit test on ebSpawnPreforkedWorker without zygote")
+
+        _start = time.time()
+        self.assertFalse(ebSpawnPreforkedWorker(9001, self.__path))
+        self.assertIsNone(ebWorkerZygoteRequest({"cmd": "status"}, self.__path))
+        self.assertLess(time.time() - _start, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/exatest/core/tests_DBConnectionPool.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_DBConnectionPool.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_DBConnectionPool.py - Unit tests for DBConnectionPool
+#
+#    DESCRIPTION
+#      Tests the process wide MySQL connection pool used by DBStore3
+#
+#    NOTES
+#      Connections are mocked, no MySQL server is needed.
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#    jydas       10/18/26 - Health check outside the pool lock
+#
+
+import unittest
+import threading
+from unittest.mock import MagicMock, patch
+
+from exabox.core.DBConnectionPool import (ebDBConnectionPool, ebGetDBConnectionPool,
+                                          ebIsDBConnectionPoolEnabled)
+
+_CONFIG = {"host": "localhost", "port": 3306, "user": "exacloud", "connect_timeout": 10}
+
+def mCreateConnection(aConfig):
+    _conn = MagicMock()
+    _conn.open = True
+    return _conn
+
+
+class DBConnectionPoolTest(unittest.TestCase):
+    """Unit tests for ebDBConnectionPool."""
+
+    def test_mAcquire_reuse(self):
+        """Verify released connections are reused instead of reconnecting."""
+        _pool = ebDBConnectionPool()
+        _create = MagicMock(side_effect=mCreateConnection)
+
+        _conn = _pool.mAcquire(dict(_CONFIG), _create)
+        self.assertTrue(_pool.mIsOwned(_conn))
+        self.assertEqual(_pool.mGetInUseCount(_CONFIG), 1)
+        _pool.mRelease(_conn)
+
+        self.assertIs(_pool.mAcquire(dict(_CONFIG), _create), _conn)
+        self.assertEqual(_create.call_count, 1)
+        self.assertEqual(_pool.mGetStats()["hits"], 1)
+
+        # Different config never shares connections
+        _other = _pool.mAcquire(dict(_CONFIG, port=3307), _create)
+        self.assertIsNot(_other, _conn)
+
+    def test_mAcquire_health_check(self):
+        """Verify broken idle connections are discarded."""
+        _pool = ebDBConnectionPool(aPingAfter=0)
+        _conn = _pool.mAcquire(_CONFIG, mCreateConnection)
+        _pool.mRelease(_conn)
+
+        _conn.ping.side_effect = Exception("MySQL server has gone away")
+        _new = _pool.mAcquire(_CONFIG, mCreateConnection)
+        self.assertIsNot(_new, _conn)
+        _conn.close.assert_called_once()
+
+    def test_mAcquire_ping_unlocked(self):
+        """Verify the health check does not hold the pool lock."""
+        _pool = ebDBConnectionPool(aPingAfter=0)
+        _conn = _pool.mAcquire(_CONFIG, mCreateConnection)
+        _pool.mRelease(_conn)
+
+        _counts = []
+        def _mPing(reconnect=False):
+            _thread = threading.Thread(target=lambda: _counts.append(_pool.mGetInUseCount(_CONFIG)))
+            _thread.start()
+            _thread.join(5)
+        _conn.ping.side_effect = _mPing
+
+        self.assertIs(_pool.mAcquire(_CONFIG, mCreateConnection), _conn)
+        # The slot of the connection being checked is already counted
+        self.assertEqual(_counts, [1])
+
+    def test_mAcquire_overflow(self):
+        """Verify an exhausted pool opens an overflow connection."""
+        _pool = ebDBConnectionPool(aSize=1, aWait=0)
+        _first = _pool.mAcquire(_CONFIG, mCreateConnection)
+        _overflow = _pool.mAcquire(_CONFIG, mCreateConnection)
+
+        self.assertFalse(_pool.mIsOwned(_overflow))
+        self.assertEqual(_pool.mGetStats()["overflow"], 1)
+
+        _pool.mRelease(_overflow)
+        _overflow.close.assert_called_once()
+        _pool.mRelease(_first)
+        self.assertEqual(_pool.mGetIdleCount(_CONFIG), 1)
+
+    def test_mRelease_discard(self):
+        """Verify discarded and closed connections are not pooled."""
+        _pool = ebDBConnectionPool()
+        _conn = _pool.mAcquire(_CONFIG, mCreateConnection)
+        _pool.mRelease(_conn, aDiscard=True)
+        _conn.close.assert_called_once()
+        self.assertEqual(_pool.mGetIdleCount(), 0)
+        self.assertEqual(_pool.mGetInUseCount(_CONFIG), 0)
+
+        # Reconnection adopted by the pool
+        _new = mCreateConnection(_CONFIG)
+        _pool.mAdopt(_new, _CONFIG)
+        self.assertEqual(_pool.mGetInUseCount(_CONFIG), 1)
+        _pool.mRelease(_new)
+        self.assertEqual(_pool.mGetIdleCount(_CONFIG), 1)
+
+    def test_mEvictIdle(self):
+        """Verify idle connections are closed after the TTL."""
+        _pool = ebDBConnectionPool(aIdleTTL=-1)
+        _conn = _pool.mAcquire(_CONFIG, mCreateConnection)
+        _pool.mRelease(_conn)
+        self.assertEqual(_pool.mGetIdleCount(), 0)
+        _conn.close.assert_called_once()
+
+    def test_ebGetDBConnectionPool_fork(self):
+        """Verify a forked child never reuses the connections of the parent."""
+        self.assertFalse(ebIsDBConnectionPoolEnabled({}))
+        self.assertTrue(ebIsDBConnectionPoolEnabled({"mysql_conn_pool_enabled": "True"}))
+
+        _pool = ebGetDBConnectionPool({"mysql_conn_pool_size": "2"})
+        self.assertIs(_pool, ebGetDBConnectionPool({}))
+        _conn = _pool.mAcquire(_CONFIG, mCreateConnection)
+
+        with patch("exabox.core.DBConnectionPool.os.getpid", return_value=_pool.mGetPid() + 1):
+            self.assertIsNot(ebGetDBConnectionPool({}), _pool)
+            _pool.mRelease(_conn)
+            _conn.close.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,14 +17,24 @@
 #      Uses a constructed ebExacloudDB instance with mocked execution helpers.
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - mIterRequestRows only orders the requests
+#    jydas       10/18/26 - Test mFilterRequests and mGetUIRequestRows rows
+#    jydas       10/18/26 - Test batched request status and patch list updates
+#    jydas       10/18/26 - Test request timestamps, batched archival and
+#                           keyset UI paging
+#    jydas       10/18/26 - Test mTransaction, mExecuteMany and pooled
+#                           connections
 #    kanmanic    06/15/26 - 39560339 - Test failed AQ response retry selector
 #    kanmanic    03/17/26 - 37764703 AQ Status Tracker Support
 #
 
 import unittest
+from datetime import datetime
 from unittest.mock import MagicMock
 
-from exabox.core.DBStore3 import ebExacloudDB
+from exabox.core.DBStore3 import (ebExacloudDB, ebMysqlDBlite, ebRequestTimeToDatetime,
+                                  ebWorkerRow, ebRequestRow)
+from exabox.core.DBConnectionPool import ebDBConnectionPool
 
 
 class DBStore3AqNameTest(unittest.TestCase):
@@ -88,5 +98,261 @@ class DBStore3AqNameTest(unittest.TestCase):
         self.db_obj.mFetchAll.assert_not_called()
 
 
+
+class DBStore3TransactionTest(unittest.TestCase):
+    """Unit tests for ebMysqlDBlite transactions, executemany and pooling."""
+
+    def setUp(self):
+        self.db_obj = ebMysqlDBlite()
+        self.conn = MagicMock()
+        self.conn.open = True
+        self.cursor = self.conn.cursor.return_value.__enter__.return_value
+        self.db_obj.mSetConnection(self.conn)
+
+    def test_mTransaction_groups_statements(self):
+        """Verify statements inside mTransaction share one commit."""
+        with self.db_obj.mTransaction():
+            self.db_obj.mExecute("UPDATE workers SET status=:1 WHERE uuid=:2", ["Idle", "w1"])
+            with self.db_obj.mTransaction():
+                self.db_obj.mExecute("UPDATE registry SET value=:1", ["x"])
+
+        self.conn.begin.assert_called_once()
+        self.conn.commit.assert_called_once()
+        self.assertEqual(self.cursor.execute.call_count, 2)
+        self.cursor.execute.assert_any_call(
+            "UPDATE workers SET status=%(1)s WHERE uuid=%(2)s", {"1": "Idle", "2": "w1"})
+
+    def test_mTransaction_rollback(self):
+        """Verify an exception rolls back the whole transaction."""
+        self.cursor.execute.side_effect = [None, Exception("Deadlock found")]
+
+        with self.assertRaises(Exception):
+            with self.db_obj.mTransaction():
+                self.db_obj.mExecute("UPDATE workers SET status='Idle'")
+                self.db_obj.mExecute("UPDATE registry SET value='x'")
+
+        self.conn.rollback.assert_called_once()
+        self.conn.commit.assert_not_called()
+        self.assertFalse(self.db_obj.mInTransaction())
+
+    def test_mExecuteMany(self):
+        """Verify mExecuteMany runs a single executemany and commit."""
+        self.cursor.rowcount = 2
+        _rc = self.db_obj.mExecuteMany("INSERT INTO registry VALUES (:1, :2)",
+                                       [["k1", 1], ["k2", 2]])
+
+        self.assertEqual(_rc, 2)
+        self.cursor.executemany.assert_called_once_with(
+            "INSERT INTO registry VALUES (%(1)s, %(2)s)",
+            [{"1": "k1", "2": 1}, {"1": "k2", "2": 2}])
+        self.conn.commit.assert_called_once()
+        self.assertEqual(self.db_obj.mExecuteMany("INSERT INTO registry VALUES (:1)", []), 0)
+
+    def test_mGetLastArgs_lazy(self):
+        """Verify the debug args are only formatted when requested."""
+        self.db_obj.mExecute("SELECT * FROM requests WHERE uuid=%(1)s", ["x" * 100])
+        self.assertEqual(self.db_obj.mGetLastArgs(), {"1": "x" * 40 + "..."})
+
+    def test_pooled_connections(self):
+        """Verify pooled connections are returned on mShutdownDB."""
+        _pool = ebDBConnectionPool()
+        _db = ebMysqlDBlite()
+        _db.mSetConnConfig({"host": "localhost"})
+        _db.mCreateConnection = MagicMock(return_value=self.conn)
+        _db.mSetConnectionPool(_pool)
+
+        self.assertIs(_db.mGetConnection(), self.conn)
+        self.assertIs(_db.mGetConnection(), self.conn)
+        _db.mCreateConnection.assert_called_once()
+
+        _db.mShutdownDB()
+        self.conn.close.assert_not_called()
+        self.assertEqual(_pool.mGetIdleCount(), 1)
+
+        # Next DB object reuses it without reconnecting
+        _db2 = ebMysqlDBlite()
+        _db2.mSetConnConfig({"host": "localhost"})
+        _db2.mCreateConnection = MagicMock()
+        _db2.mSetConnectionPool(_pool)
+        self.assertIs(_db2.mGetConnection(), self.conn)
+        _db2.mCreateConnection.assert_not_called()
+
+class DBStore3RequestsTimestampTest(unittest.TestCase):
+    """Unit tests for the starttime_ts/endtime_ts request columns."""
+
+    def setUp(self):
+        self.db_obj = ebExacloudDB.__new__(ebExacloudDB)
+        self.db_obj.mFetchAll = MagicMock()
+        self.db_obj.mExecute = MagicMock()
+        self.db_obj.mGetAffectedRows = MagicMock()
+        self.db_obj.mGetRequestsBatchSize = MagicMock(return_value=2)
+
+    def test_ebRequestTimeToDatetime(self):
+        """Verify time.strftime('%c') values are converted."""
+        self.assertEqual(ebRequestTimeToDatetime("Sun Oct  4 10:05:01 2026"), datetime(2026, 10, 4, 10, 5, 1))
+        self.assertEqual(ebRequestTimeToDatetime("Sun Oct 04 10:05:01 2026"), datetime(2026, 10, 4, 10, 5, 1))
+        self.assertIsNone(ebRequestTimeToDatetime("Undef"))
+        self.assertIsNone(ebRequestTimeToDatetime(""))
+        self.assertIsNone(ebRequestTimeToDatetime("not a date"))
+
+    def test_mBackupRequests_batches(self):
+        """Verify archival copies by keyset batches then deletes in batches."""
+        _t1, _t2 = datetime(2026, 1, 1), datetime(2026, 1, 2)
+        self.db_obj.mFetchAll.side_effect = [[("u1", _t1), ("u2", _t2)], [("u3", _t2)]]
+        self.db_obj.mGetAffectedRows.side_effect = [2, 0]
+
+        self.assertEqual(self.db_obj.mBackupRequests("20260201000000", []), 3)
+
+        _sql, _bind = self.db_obj.mFetchAll.call_args_list[1][0]
+        self.assertIn("endtime_ts > :2 OR (endtime_ts = :2 AND uuid > :3)", _sql)
+        self.assertEqual(_bind, [datetime(2026, 2, 1), _t2, "u2"])
+
+        _calls = self.db_obj.mExecute.call_args_list
+        self.assertEqual(len(_calls), 4)
+        self.assertIn("INSERT INTO requests_archive", _calls[0][0][0])
+        self.assertEqual(_calls[0][0][1], ["u1", "u2"])
+        self.assertEqual(_calls[1][0][1], ["u3"])
+        self.assertIn("DELETE FROM requests", _calls[2][0][0])
+        self.assertIn("LIMIT 2", _calls[2][0][0])
+
+    def test_mPruneRequests_batches(self):
+        """Verify pruning deletes in bounded batches until done."""
+        self.db_obj.mGetAffectedRows.side_effect = [2, 2, 1]
+        self.assertEqual(self.db_obj.mPruneRequests("20260201000000", []), 5)
+        self.assertEqual(self.db_obj.mExecute.call_count, 3)
+        self.assertTrue(self.db_obj.mExecute.call_args[0][0].strip().endswith("LIMIT 2"))
+
+    def test_mBackfillRequestsTimestamps(self):
+        """Verify existing rows get their timestamps in batches."""
+        self.db_obj.mTransaction = MagicMock()
+        self.db_obj.mExecuteMany = MagicMock(side_effect=[2, 1])
+        self.db_obj.mFetchAll.side_effect = [
+            [("u1", "Sun Oct  4 10:05:01 2026", "Undef"), ("u2", "bad", "Sun Oct  4 11:00:00 2026")],
+            [("u3", "Sun Oct  4 12:00:00 2026", "Sun Oct  4 12:30:00 2026")]]
+
+        self.assertEqual(self.db_obj.mBackfillRequestsTimestamps("requests"), 3)
+        _rows = self.db_obj.mExecuteMany.call_args_list[0][0][1]
+        self.assertEqual(_rows[0], [datetime(2026, 10, 4, 10, 5, 1), None, "u1"])
+        self.assertEqual(_rows[1], [datetime(1970, 1, 1), datetime(2026, 10, 4, 11), "u2"])
+
+    def test_mGetUIRequests_keyset(self):
+        """Verify the UI listing pages by starttime_ts and returns ordertime."""
+        self.db_obj.mUnmaskReqParams = lambda aRow: aRow
+        self.db_obj.mFetchAll.return_value = [("u1", "Done", "", "", "cluctrl.x", "{}", "", "", "",
+                                               "", "", "c1", "", "", datetime(2026, 10, 4, 10, 5, 1))]
+
+        _body = self.db_obj.mGetUIRequests(aLimit=10, aAfter=(20261004120000, "u9"))
+        self.assertTrue(_body.startswith("(('u1'"))
+        self.assertIn("20261004100501", _body)
+
+        _query, _data = self.db_obj.mFetchAll.call_args[0]
+        self.assertIn("starttime_ts < %(2)s OR (starttime_ts = %(2)s AND uuid < %(3)s)", _query)
+        self.assertEqual(_data, ["monitor.%", datetime(2026, 10, 4, 12), "u9"])
+        self.assertIn("LIMIT 10 OFFSET 0", _query)
+
+class DBStore3RowsTest(unittest.TestCase):
+    """Unit tests for the typed worker/request rows."""
+
+    def setUp(self):
+        self.db_obj = ebExacloudDB.__new__(ebExacloudDB)
+        self.db_obj.mFetchAll = MagicMock()
+
+    def test_mGetWorkerRows(self):
+        """Verify worker rows are typed and idle filter is applied."""
+        self.db_obj.mFetchAll.return_value = [("00000000-0000-0000-0000-000000000000", "Idle", "", "", "", "",
+                                               "", "", 4242, 9001, "worker", "", "", "NORMAL")]
+
+        _rows = self.db_obj.mGetWorkerRows(aIdle=True)
+        self.assertEqual(_rows[0].port, 9001)
+        self.assertEqual(_rows[0][8], 4242)
+        self.assertIsInstance(_rows[0], ebWorkerRow)
+
+        _sql, _data = self.db_obj.mFetchAll.call_args[0]
+        self.assertIn("status='Idle' AND state='NORMAL' AND uuid=%(1)s", _sql)
+        self.assertEqual(_data, ["00000000-0000-0000-0000-000000000000"])
+
+    def test_mIterRequestRows(self):
+        """Verify requests are read as typed rows in the given order."""
+        self.db_obj.mFetchAll.return_value = []
+        _rows = self.db_obj.mIterRequestRows(aOrderBy={"starttime": "desc", "lock": "asc"})
+        self.assertEqual(list(_rows), [])
+
+        _sql, _data = self.db_obj.mFetchAll.call_args[0]
+        self.assertIn("FROM requests ORDER BY starttime_ts DESC, _lock ASC", _sql)
+        self.assertEqual(_data, [])
+
+        with self.assertRaises(ValueError):
+            list(self.db_obj.mIterRequestRows(aOrderBy={"status; DROP": "asc"}))
+
+    def test_ebRequestRow_mToDict(self):
+        """Verify request rows give the mFilterRequests dict."""
+        _row = ebRequestRow("u1", "Done", "s", "e", "cluctrl.vm_cmd", "Erased", "0", "", "", "",
+                            "", "c1", "l1", "", "", "", "", None, None)
+        _dict = _row.mToDict()
+        self.assertEqual(_dict["lock"], "l1")
+        self.assertEqual(_dict["subcmd"], "vm_cmd")
+        self.assertEqual(_dict["params"], "Erased")
+        self.assertNotIn("starttime_ts", _dict)
+
+    def test_mFilterRequests(self):
+        """Verify filtered requests are built from typed rows."""
+        self.db_obj.mFetchAll.return_value = [("u1", "Pending", "s", "Undef", "cluctrl.vm_cmd", "Erased", "0", "",
+                                               "", "", "", "c1", "l1", "", "", "", "", None, None)]
+        _requests = self.db_obj.mFilterRequests({"clustername": "c1"}, aNotCondition={"status": ["Done"]})
+        self.assertEqual(_requests, [ebRequestRow._make(self.db_obj.mFetchAll.return_value[0]).mToDict()])
+
+        _sql, _data = self.db_obj.mFetchAll.call_args[0]
+        self.assertIn("clustername LIKE %(clustername)s AND status NOT LIKE %(status_0)s", _sql)
+        self.assertEqual(_data, {"clustername": "%c1%", "status_0": "%Done%"})
+
+    def test_mGetUIRequestRows(self):
+        """Verify the UI rows keep the params unmasked and the ordertime."""
+        self.db_obj.mFetchAll.return_value = [("u1", "Done", "", "", "cluctrl.x", "Erased", "", "", "",
+                                               "", "", "c1", "", "", datetime(2026, 10, 4, 10, 5, 1))]
+        _rows = self.db_obj.mGetUIRequestRows(aLimit=10)
+        self.assertEqual(_rows[0][5], "Erased")
+        self.assertEqual(_rows[0][14], 20261004100501)
+
+        _body = self.db_obj.mGetUIRequests(aLimit=10)
+        self.assertEqual(_body, "(" + str(_rows[0]) + ",)")
+
+class DBStore3BatchedStatusTest(unittest.TestCase):
+    """Unit tests for the batched queries of the patch dispatcher."""
+
+    def setUp(self):
+        self.db_obj = ebExacloudDB.__new__(ebExacloudDB)
+        self.db_obj.mFetchAll = MagicMock()
+        self.db_obj.mExecuteMany = MagicMock(return_value=2)
+        self.db_obj.mTransaction = MagicMock()
+
+    def test_mGetRequestsStatus_chunks(self):
+        """Verify statuses are read with one IN query per chunk."""
+        self.db_obj.mFetchAll.side_effect = [[("u1", "Done", "0", ""), ("u2", "Pending", "", "")],
+                                             [("u3", "Done", "0x1", "failed")]]
+
+        _status = self.db_obj.mGetRequestsStatus(["u1", "u2", "u1", None, "u3"], aChunk=2)
+        self.assertEqual(_status, {"u1": ("Done", "0", ""), "u2": ("Pending", "", ""),
+                                   "u3": ("Done", "0x1", "failed")})
+        self.assertEqual(self.db_obj.mFetchAll.call_count, 2)
+        _sql, _data = self.db_obj.mFetchAll.call_args_list[0][0]
+        self.assertIn("WHERE uuid IN (%(1)s, %(2)s)", _sql)
+        self.assertEqual(_data, ["u1", "u2"])
+
+        self.db_obj.mFetchAll.reset_mock()
+        self.assertEqual(self.db_obj.mGetRequestsStatus([]), {})
+        self.db_obj.mFetchAll.assert_not_called()
+
+    def test_mUpdateChildRequestsStatus(self):
+        """Verify child statuses are written in one transaction."""
+        self.db_obj.mUpdateChildRequestsStatus("m1", {"c1": "Done", "c2": "Failed"})
+
+        self.db_obj.mTransaction.assert_called_once()
+        _sql, _rows = self.db_obj.mExecuteMany.call_args[0]
+        self.assertIn("WHERE master_uuid=%(2)s AND child_uuid=%(3)s", _sql)
+        self.assertEqual(_rows, [["Done", "m1", "c1"], ["Failed", "m1", "c2"]])
+
+        with self.assertRaises(Exception):
+            self.db_obj.mUpdateChildRequestsStatus("m1", {"c1": None})
+
 if __name__ == '__main__':
     unittest.main()
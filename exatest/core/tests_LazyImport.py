@@ -0,0 +1,101 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/exatest/core/tests_LazyImport.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_LazyImport.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_LazyImport.py - Unit tests for exabox/core/LazyImport.py
+#
+#    DESCRIPTION
+#      Unit tests for the lazy symbols and the import profiler, with a
+#      startup benchmark of bin/exabox.py
+#
+#    NOTES
+#      The benchmark imports exabox.bin.exabox in a fresh interpreter, the
+#      time measured is logged.
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.core.LazyImport import ebLazySymbol, ebImportProfiler
+
+_STARTUP_SCRIPT = """
+import sys, json, time
+_start = time.perf_counter()
+import exabox.bin.exabox
+print(json.dumps({"seconds": time.perf_counter() - _start,
+                  "modules": [_m for _m in sys.modules if _m.startswith("exabox.")]}))
+"""
+
+class ebTestLazyImport(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestLazyImport, self).setUpClass(aGenerateDatabase=False)
+
+    def test_ebLazySymbol(self):
+        ebLogInfo("Running unit test on ebLazySymbol")
+
+        _dumps = ebLazySymbol("json", "dumps")
+        self.assertFalse(_dumps.mIsResolved())
+        self.assertEqual(_dumps({"a": 1}), '{"a": 1}')
+        self.assertTrue(_dumps.mIsResolved())
+
+        _module = ebLazySymbol("json.decoder", aDepends=("json",))
+        self.assertEqual(_module.JSONDecodeError, json.JSONDecodeError)
+
+        _missing = ebLazySymbol("exabox.does.not.exist", "mFunction")
+        with self.assertRaises(ImportError):
+            _missing()
+
+    def test_ebImportProfiler(self):
+        ebLogInfo("Running unit test on ebImportProfiler")
+
+        sys.modules.pop("wave", None)
+        _profiler = ebImportProfiler()
+        _profiler.mInstall()
+        try:
+            import wave
+        finally:
+            _profiler.mUninstall()
+
+        _records = _profiler.mGetRecords()
+        self.assertIn("wave", _records)
+        _self, _cumulative, _depth = _records["wave"]
+        self.assertLessEqual(_self, _cumulative)
+        self.assertEqual(_depth, 0)
+        self.assertIn("wave", _profiler.mGetReport())
+
+    def test_exabox_startup(self):
+        ebLogInfo("Running startup benchmark of bin/exabox.py")
+
+        _env = dict(os.environ)
+        _env["PYTHONPATH"] = os.pathsep.join([_path for _path in sys.path if _path])
+        _proc = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT], stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, env=_env, timeout=300)
+        self.assertEqual(_proc.returncode, 0, _proc.stderr.decode("utf-8", "replace"))
+
+        _result = json.loads(_proc.stdout.decode("utf-8").strip().split("\n")[-1])
+        ebLogInfo(f"bin/exabox.py imported in {_result['seconds']:.3f}s, "
+                  f"{len(_result['modules'])} exabox modules")
+
+        # Subsystems are only imported by the commands using them
+        for _module in ["exabox.ovm.clucontrol", "exabox.infrapatching.core.cludispatcher",
+                        "exabox.jsondispatch.jsondispatch", "exabox.exadbxs.edv",
+                        "exabox.tools.ebXmlGen.ebFacadeXmlGen", "exabox.agent.Worker"]:
+            self.assertNotIn(_module, _result["modules"])
+
+if __name__ == '__main__':
+    unittest.main()
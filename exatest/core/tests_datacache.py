@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/core/tests_datacache.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_datacache.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_datacache.py - Unit tests for exabox/core/DataCache.py
+#
+#    DESCRIPTION
+#      Unit tests for the TTL, the revalidation of the memo on the version
+#      of the row, the LRU bound and the single-flight loading
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add test for the purge of the expired rows
+#    jydas       10/18/26 - Creation
+#
+
+import time
+import unittest
+import threading
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.core.DataCache import ebDataCache
+
+class _DataCacheDB(object):
+    """ data_cache rows of ebExacloudDB in a dict """
+
+    def __init__(self):
+        self.rows = {}
+        self.reads = 0
+
+    def mCreateDataCacheTable(self):
+        pass
+
+    def mGetDataCacheEntry(self, aName):
+        self.reads += 1
+        return self.rows.get(aName)
+
+    def mGetDataCacheVersion(self, aName):
+        _row = self.rows.get(aName)
+        return (_row[1], _row[3]) if _row else None
+
+    def mSetDataCacheEntry(self, aName, aData, aEtag, aExpiresAt=None):
+        _version = self.rows[aName][1] + 1 if aName in self.rows else 1
+        self.rows[aName] = (aData, _version, aEtag, aExpiresAt)
+        return _version
+
+    def mDelDataCache(self, aName):
+        self.rows.pop(aName, None)
+
+    def mDelExpiredDataCache(self, aNow=None):
+        for _name, _row in list(self.rows.items()):
+            if _row[3] is not None and _row[3] < aNow:
+                del self.rows[_name]
+
+class ebTestDataCache(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestDataCache, self).setUpClass(aGenerateDatabase=False)
+
+    def test_ttl_and_revalidation(self):
+        ebLogInfo("Running unit test on ebDataCache TTL and revalidation")
+
+        _db = _DataCacheDB()
+        _cache = ebDataCache(aDB=_db, aRevalidate=3600)
+        _loads = []
+
+        def _mLoad():
+            _loads.append(1)
+            return {"version": "260101"}
+
+        self.assertEqual(_cache.mGet("oeda", _mLoad, aTtl=60), {"version": "260101"})
+        self.assertEqual(_cache.mGet("oeda", _mLoad, aTtl=60), {"version": "260101"})
+        self.assertEqual((len(_loads), _db.reads), (1, 2))
+
+        # Another worker: the row is read once, then memoized
+        _other = ebDataCache(aDB=_db, aRevalidate=0)
+        self.assertEqual(_other.mGet("oeda"), {"version": "260101"})
+        self.assertEqual(_other.mGetStats()["db_hits"], 1)
+
+        # Updated by the first worker: the version check drops the stale memo
+        _entry = _cache.mSet("oeda", {"version": "260202"})
+        self.assertEqual(_entry.version, 2)
+        self.assertEqual(_other.mGet("oeda"), {"version": "260202"})
+        self.assertIsNone(_other.mGetIfModified("oeda", _entry.etag))
+        self.assertEqual(_other.mGetIfModified("oeda", "old").version, 2)
+
+        # Expired
+        _db.rows["oeda"] = _db.rows["oeda"][:3] + (time.time() - 1,)
+        _cache.mInvalidate("missing")
+        _cache = ebDataCache(aDB=_db)
+        self.assertIsNone(_cache.mGet("oeda"))
+        self.assertEqual(_cache.mGet("oeda", lambda: None, aDefault="none"), "none")
+        _stats = _cache.mGetStats()
+        self.assertEqual((_stats["expired"], _stats["misses"], _stats["loads"]), (3, 2, 1))
+
+    def test_lru(self):
+        ebLogInfo("Running unit test on ebDataCache LRU bound")
+
+        _db = _DataCacheDB()
+        _cache = ebDataCache(aDB=_db, aMaxEntries=2, aRevalidate=3600)
+        for _name in ["a", "b", "c"]:
+            _cache.mSet(_name, _name.upper(), aTtl=0)
+        self.assertIsNone(_db.rows["a"][3])
+
+        _reads = _db.reads
+        self.assertEqual([_cache.mGet(_name) for _name in ["b", "c"]], ["B", "C"])
+        self.assertEqual(_db.reads, _reads)
+        self.assertEqual(_cache.mGet("a"), "A")
+        self.assertEqual(_db.reads, _reads + 1)
+        self.assertEqual(_cache.mGetStats()["evictions"], 2)
+
+    def test_purge_expired(self):
+        ebLogInfo("Running unit test on ebDataCache purge of the expired rows")
+
+        _db = _DataCacheDB()
+        _cache = ebDataCache(aDB=_db, aPurge=3600)
+        _db.rows["old"] = ("1", 1, None, time.time() - 1)
+        _db.rows["forever"] = ("2", 1, None, None)
+
+        _cache.mSet("a", "A", aTtl=60)
+        self.assertEqual(set(_db.rows), {"forever", "a"})
+
+        # Not again within datacache_purge_sec
+        _db.rows["old"] = ("1", 1, None, time.time() - 1)
+        _cache.mSet("b", "B", aTtl=60)
+        self.assertIn("old", _db.rows)
+        self.assertEqual(_cache.mGetStats()["purges"], 1)
+
+        self.assertTrue(_cache.mPurgeExpired(time.time() + 3600))
+        self.assertEqual(set(_db.rows), {"forever"})
+
+    def test_single_flight(self):
+        ebLogInfo("Running unit test on ebDataCache single-flight loading")
+
+        _cache = ebDataCache(aDB=_DataCacheDB())
+        _loads = []
+        _results = []
+
+        def _mLoad():
+            _loads.append(1)
+            time.sleep(0.2)
+            return ["X7-2", "X8M-2"]
+
+        _threads = [threading.Thread(target=lambda: _results.append(_cache.mGet("hw", _mLoad)))
+                    for _ in range(5)]
+        for _thread in _threads:
+            _thread.start()
+        for _thread in _threads:
+            _thread.join()
+
+        self.assertEqual(len(_loads), 1)
+        self.assertEqual(_results, [["X7-2", "X8M-2"]] * 5)
+        self.assertEqual(_cache.mGetStats()["coalesced"], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/core/tests_logasync.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_logasync.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_logasync.py - Unit tests for exabox/log/LogAsync.py
+#
+#    DESCRIPTION
+#      Unit tests for the async log writer: ordering, caller resolution in
+#      the logging thread, backpressure and fork
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+import threading
+
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+import exabox.log.LogAsync as LogAsync
+from exabox.log.LogAsync import (ebAsyncRotatingFileHandler, ebLogAsyncWriter, ebLogAsyncStart,
+                                 ebLogAsyncFlush, ebLogAsyncShutdown)
+
+class _ThreadFormatter(logging.Formatter):
+
+    def __init__(self):
+        super().__init__("%(levelname)s %(message)s")
+        self.prepared = set()
+        self.formatted = set()
+
+    def mPrepareRecord(self, aRecord):
+        self.prepared.add(threading.get_ident())
+
+    def format(self, aRecord):
+        self.formatted.add(threading.get_ident())
+        return super().format(aRecord)
+
+class _BlockingHandler(ebAsyncRotatingFileHandler):
+
+    def __init__(self, aPath):
+        super().__init__(aPath)
+        self.entered = threading.Event()
+        self.unblock = threading.Event()
+
+    def mWrite(self, aRecord):
+        if not self.entered.is_set():
+            self.entered.set()
+            self.unblock.wait(10)
+        super().mWrite(aRecord)
+
+class ebTestLogAsync(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestLogAsync, self).setUpClass(aGenerateDatabase=False)
+
+    def setUp(self):
+        self.__dir = tempfile.mkdtemp()
+        self.__saved = LogAsync.gLogAsyncWriter
+        LogAsync.gLogAsyncWriter = None
+        self.__logger = logging.getLogger(f"ebTestLogAsync.{self.id()}")
+        self.__logger.propagate = False
+        self.__logger.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        ebLogAsyncShutdown()
+        LogAsync.gLogAsyncWriter = self.__saved
+        for _handler in list(self.__logger.handlers):
+            self.__logger.removeHandler(_handler)
+            _handler.close()
+        shutil.rmtree(self.__dir, ignore_errors=True)
+
+    def mAddHandler(self, aHandler):
+        aHandler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.__logger.addHandler(aHandler)
+        return aHandler
+
+    def mRead(self, aPath):
+        with open(aPath) as _fd:
+            return _fd.read().splitlines()
+
+    def test_async_writes(self):
+        _path = os.path.join(self.__dir, "async.log")
+        _handler = ebAsyncRotatingFileHandler(_path)
+        _formatter = _ThreadFormatter()
+        _handler.setFormatter(_formatter)
+        self.__logger.addHandler(_handler)
+
+        ebLogAsyncStart()
+        for _idx in range(200):
+            self.__logger.info("message %d", _idx)
+        self.__logger.error("failure")
+        self.assertTrue(ebLogAsyncFlush())
+
+        _lines = self.mRead(_path)
+        self.assertEqual(_lines, [f"INFO message {_idx}" for _idx in range(200)] + ["ERROR failure"])
+        self.assertEqual(_formatter.prepared, {threading.get_ident()})
+        self.assertNotIn(threading.get_ident(), _formatter.formatted)
+        self.assertEqual(LogAsync.ebLogAsyncStats()["written"], 201)
+
+        # Back to synchronous writes
+        ebLogAsyncShutdown()
+        self.__logger.info("sync")
+        self.assertEqual(self.mRead(_path)[-1], "INFO sync")
+
+    def test_backpressure(self):
+        _path = os.path.join(self.__dir, "blocked.log")
+        _handler = self.mAddHandler(_BlockingHandler(_path))
+        LogAsync.gLogAsyncWriter = ebLogAsyncWriter(aQueueSize=4)
+
+        self.__logger.info("first")
+        self.assertTrue(_handler.entered.wait(5))
+
+        for _msg in ["a", "b", "b", "b", "b", "c", "d", "e"]:
+            self.__logger.info(_msg)
+        _handler.unblock.set()
+        self.assertTrue(ebLogAsyncFlush())
+
+        self.assertEqual(self.mRead(_path), ["INFO first", "INFO a", "INFO b",
+                                             "INFO last message repeated 3 times",
+                                             "INFO c", "INFO d",
+                                             "WARNING 1 log messages dropped, log queue full"])
+        _stats = LogAsync.ebLogAsyncStats()
+        self.assertEqual((_stats["coalesced"], _stats["dropped"]), (3, 1))
+
+    def test_fork(self):
+        _path = os.path.join(self.__dir, "fork.log")
+        self.mAddHandler(ebAsyncRotatingFileHandler(_path))
+        ebLogAsyncStart()
+
+        self.__logger.info("before fork")
+        _pid = os.fork()
+        if _pid == 0:
+            try:
+                self.__logger.info("child")
+                ebLogAsyncFlush()
+            finally:
+                os._exit(0)
+
+        os.waitpid(_pid, 0)
+        self.__logger.info("parent")
+        self.assertTrue(ebLogAsyncFlush())
+        self.assertEqual(sorted(self.mRead(_path)), ["INFO before fork", "INFO child", "INFO parent"])
+        self.assertEqual(self.mRead(_path)[0], "INFO before fork")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/core/tests_metrics.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_metrics.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_metrics.py - Unit tests for exabox/core/Metrics.py
+#
+#    DESCRIPTION
+#      Unit tests for the hot path histograms, the registry, the label
+#      helpers and the merge of the snapshots of several processes
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.core.Context import get_gcontext
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+import exabox.core.Metrics as Metrics
+from exabox.core.Metrics import (ebMetricsHistogram, ebMetricsRegistry, ebMetricsCommandFamily,
+                                 ebMetricsSqlTemplate, ebMetricsTimer, ebMetricsDump,
+                                 ebMetricsCollect, ebMetricsSummary, ebGetMetricsRegistry)
+
+class ebTestMetrics(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestMetrics, self).setUpClass(aGenerateDatabase=False)
+
+    def setUp(self):
+        self.__dir = tempfile.mkdtemp()
+        self.__saved = Metrics._gMetricsRegistry
+        Metrics._gMetricsRegistry = None
+        self.__options = {}
+        for _option in ("metrics_registry_enabled", "metrics_registry_dir", "metrics_registry_dump_sec"):
+            self.__options[_option] = get_gcontext().mCheckConfigOption(_option)
+        get_gcontext().mSetConfigOption("metrics_registry_enabled", "True")
+        get_gcontext().mSetConfigOption("metrics_registry_dir", self.__dir)
+        get_gcontext().mSetConfigOption("metrics_registry_dump_sec", "0")
+
+    def tearDown(self):
+        Metrics._gMetricsRegistry = self.__saved
+        for _option, _value in self.__options.items():
+            get_gcontext().mSetConfigOption(_option, _value)
+        shutil.rmtree(self.__dir, ignore_errors=True)
+
+    def test_histogram(self):
+        ebLogInfo("Running unit test on ebMetricsHistogram")
+
+        for _value in [0, 1, 15, 16, 17, 31, 32, 33, 1000, 123456789]:
+            _lower, _upper = ebMetricsHistogram.mBucketRange(ebMetricsHistogram.mBucketIndex(_value))
+            self.assertTrue(_lower <= _value < _upper, _value)
+            self.assertLessEqual(_upper - _lower, max(1, _lower / 16))
+
+        _hist = ebMetricsHistogram()
+        for _value in range(1, 1001):
+            _hist.mRecord(_value)
+        self.assertEqual((_hist.mGetCount(), _hist.mGetMin(), _hist.mGetMax()), (1000, 1, 1000))
+        for _pct in (50, 90, 99):
+            self.assertAlmostEqual(_hist.mGetPercentile(_pct), _pct * 10, delta=_pct * 10 / 16 + 1)
+
+        _other = ebMetricsHistogram()
+        _other.mRecord(5000)
+        _merged = ebMetricsHistogram.mFromDict(_hist.mToDict())
+        _merged.mMerge(_other)
+        self.assertEqual((_merged.mGetCount(), _merged.mGetSum(), _merged.mGetMax()), (1001, 505500, 5000))
+        self.assertEqual(_merged.mGetPercentile(100), 5000)
+
+    def test_labels(self):
+        ebLogInfo("Running unit test on ebMetricsCommandFamily and ebMetricsSqlTemplate")
+
+        self.assertEqual(ebMetricsCommandFamily("/usr/bin/ls -l /tmp"), "ls")
+        self.assertEqual(ebMetricsCommandFamily("export LANG=C; sudo timeout 10 /opt/oracle/dcli -g x"), "dcli")
+        self.assertEqual(ebMetricsCommandFamily(""), "none")
+
+        self.assertEqual(ebMetricsSqlTemplate("SELECT * FROM requests  WHERE uuid = 'abc' AND id=12"),
+                         "SELECT * FROM requests WHERE uuid = ? AND id=?")
+        self.assertEqual(ebMetricsSqlTemplate("UPDATE t1 SET a = :1 WHERE b IN (1, 2, 3)"),
+                         "UPDATE t1 SET a = :1 WHERE b IN (?)")
+
+        _registry = ebMetricsRegistry(aMaxSeries=2)
+        for _host in ["a", "b", "c", "d"]:
+            _registry.mIncrement("calls", {"host": _host})
+        self.assertEqual(_registry.mSnapshot()["counters"]["calls"], {"host=a": 1, "host=b": 1, "other": 2})
+
+    def test_collect(self):
+        ebLogInfo("Running unit test on ebMetricsCollect")
+
+        with ebMetricsTimer("ssh_connect_us", {"host": "dom0a"}):
+            pass
+        with self.assertRaises(ValueError):
+            with ebMetricsTimer("ssh_connect_us", {"host": "dom0a"}):
+                raise ValueError("connect failed")
+
+        # Snapshot of a process gone
+        _dead = ebMetricsRegistry()
+        _dead.mObserve("ssh_connect_us", 1000, {"host": "dom0a"})
+        _dead.mIncrement("ssh_connect_us_errors", {"host": "dom0a"})
+        Metrics.mMetricsWriteJson(Metrics.mMetricsSnapshotPath(self.__dir, 999999999), _dead.mSnapshot())
+
+        _merged = ebMetricsCollect()
+        self.assertEqual(_merged["processes"], 1)
+        self.assertEqual(_merged["counters"]["ssh_connect_us_errors"]["host=dom0a"], 2)
+        self.assertEqual(_merged["histograms"]["ssh_connect_us"]["host=dom0a"]["count"], 3)
+        self.assertFalse(os.path.exists(Metrics.mMetricsSnapshotPath(self.__dir, 999999999)))
+
+        # The archive keeps the values of the processes gone
+        ebGetMetricsRegistry().mObserve("ssh_connect_us", 10, {"host": "dom0b"})
+        _summary = ebMetricsSummary(ebMetricsCollect(), "ssh_connect_us")
+        self.assertEqual(_summary["histograms"]["ssh_connect_us"]["host=dom0a"]["count"], 3)
+        self.assertEqual(_summary["histograms"]["ssh_connect_us"]["host=dom0b"]["p99"], 10)
+        self.assertEqual(_summary["counters"], {})
+
+        # Disabled: nothing recorded
+        get_gcontext().mSetConfigOption("metrics_registry_enabled", "False")
+        with ebMetricsTimer("ssh_connect_us", {"host": "dom0c"}):
+            pass
+        self.assertNotIn("host=dom0c", ebGetMetricsRegistry().mSnapshot()["histograms"]["ssh_connect_us"])
+        self.assertIsNotNone(ebMetricsDump())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/core/tests_statusnotify.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_statusnotify.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_statusnotify.py - Unit tests for exabox/core/StatusNotify.py
+#
+#    DESCRIPTION
+#      Unit tests for the notification of the request status changes
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import threading
+from unittest.mock import patch
+
+import exabox.core.StatusNotify as StatusNotify
+
+class ebTestStatusNotify(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "tmp", StatusNotify.STATUS_NOTIFY_FILE)
+        self.p_path = patch.object(StatusNotify, "ebStatusNotifyPath", return_value=self.path)
+        self.p_path.start()
+
+    def tearDown(self):
+        self.p_path.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_notify_stamp(self):
+        self.assertEqual(StatusNotify.ebStatusStamp(), 0)
+        StatusNotify.ebStatusNotify()
+        self.assertTrue(os.path.exists(self.path))
+        self.assertNotEqual(StatusNotify.ebStatusStamp(), 0)
+
+    def test_wait_timeout(self):
+        _stamp = StatusNotify.ebStatusStamp()
+        _start = time.monotonic()
+        self.assertEqual(StatusNotify.ebStatusWait(_stamp, 0.6), _stamp)
+        self.assertGreaterEqual(time.monotonic() - _start, 0.6)
+
+    def test_wait_notified(self):
+        _stamp = StatusNotify.ebStatusStamp()
+        _timer = threading.Timer(0.2, StatusNotify.ebStatusNotify)
+        _timer.start()
+        _start = time.monotonic()
+        _new = StatusNotify.ebStatusWait(_stamp, 30)
+        _timer.join()
+        self.assertNotEqual(_new, _stamp)
+        self.assertLess(time.monotonic() - _start, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/exatest/exakms/tests_exakmsociindex.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_exakmsociindex.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_exakmsociindex.py - Unit tests for exabox/exakms/ExaKmsOCIIndex.py
+#
+#    DESCRIPTION
+#      Unit tests for the ExaKms OCI bucket index, the object storage is an
+#      in memory stand-in
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#    jydas       10/18/26 - Objects that can not be read are left out
+#
+
+import json
+import uuid
+import shutil
+import tempfile
+import unittest
+import warnings
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from oci.exceptions import ServiceError
+
+from exabox.core.Context import get_gcontext
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.exakms.ExaKmsOCI import ExaKmsOCI
+from exabox.exakms.ExaKmsEntryOCI import ExaKmsEntryOCI
+from exabox.exakms.ExaKmsOCIIndex import ExaKmsOCIIndex, mGetExaKmsOCIIndex, _gIndexes
+
+_OPTIONS = {
+    "kms_key_id": "ocid1.key.oc1.iad.mock",
+    "kms_dp_endpoint": "https://mock-crypto.kms.oci.oraclecloud.com",
+    "exakms_bucket_primary": "exakms_mock",
+    "exakms_bucket_secondary": "",
+    "exakms_oci_cache_dir": "",
+    "exakms_oci_index_ttl": "",
+    "exakms_oci_dek_cache_ttl": "",
+}
+
+def mRecord(aHost, aUser="root"):
+    return {f"id_rsa.{aHost.split('.')[0]}.{aUser}": {"encData": "data", "encDEK": f"dek-{aHost}",
+                                                      "version": "ExaKmsEntryOCIRSA", "hostType": "DOM0"}}
+
+class MockObjectStorage(object):
+
+    def __init__(self):
+        self.objects = {}
+        self.failing = set()
+        self.calls = {"list": 0, "get": 0}
+
+    def get_namespace(self):
+        return SimpleNamespace(data="mock_namespace")
+
+    def list_objects(self, namespace_name, bucket_name, start=None, fields=None):
+        self.calls["list"] += 1
+        _objects = [SimpleNamespace(name=_name, etag=_etag) for _name, (_etag, _) in sorted(self.objects.items())]
+        return SimpleNamespace(data=SimpleNamespace(objects=_objects, next_start_with=None))
+
+    def get_object(self, namespace_name, bucket_name, object_name):
+        self.calls["get"] += 1
+        if object_name in self.failing:
+            raise ServiceError(500, "InternalServerError", {}, f"{object_name} not available")
+        if object_name not in self.objects:
+            raise ServiceError(404, "ObjectNotFound", {}, f"{object_name} not found")
+        _etag, _content = self.objects[object_name]
+        return SimpleNamespace(status=200, headers={"etag": _etag}, data=SimpleNamespace(content=_content))
+
+    def put_object(self, namespace_name, bucket_name, object_name, put_object_body):
+        _etag = str(uuid.uuid4())
+        _body = put_object_body.encode("utf-8") if isinstance(put_object_body, str) else put_object_body
+        self.objects[object_name] = (_etag, _body)
+        return SimpleNamespace(status=200, headers={"etag": _etag})
+
+    def delete_object(self, namespace_name, bucket_name, object_name):
+        self.objects.pop(object_name, None)
+        return SimpleNamespace(status=204, headers={})
+
+    def mPut(self, aName, aDict):
+        self.put_object(None, None, aName, json.dumps(aDict))
+
+class ebTestExaKmsOCIIndex(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestExaKmsOCIIndex, self).setUpClass(aGenerateDatabase=False)
+        warnings.filterwarnings("ignore")
+
+    def setUp(self):
+        self.__saved = {_key: get_gcontext().mCheckConfigOption(_key) for _key in _OPTIONS}
+        for _key, _value in _OPTIONS.items():
+            get_gcontext().mSetConfigOption(_key, _value)
+
+        self.__dir = tempfile.mkdtemp()
+        self.__storage = MockObjectStorage()
+        _gIndexes.clear()
+
+        _factory = MagicMock()
+        _factory.return_value.get_object_storage_client.return_value = self.__storage
+        self.__patch = patch("exabox.exakms.ExaKmsOCI.ExaOCIFactory", _factory)
+        self.__patch.start()
+
+    def tearDown(self):
+        self.__patch.stop()
+        _gIndexes.clear()
+        ExaKmsEntryOCI.mSetDEKCacheTTL(0)
+        for _key, _value in self.__saved.items():
+            get_gcontext().mSetConfigOption(_key, _value if _value is not None else "")
+        shutil.rmtree(self.__dir, ignore_errors=True)
+
+    def test_exact_fqdn_lookup(self):
+        self.__storage.mPut("dom0a.example.com", mRecord("dom0a.example.com"))
+        self.__storage.mPut("dom0b.example.com", mRecord("dom0b.example.com"))
+
+        _exakms = ExaKmsOCI()
+        _entries = _exakms.mSearchExaKmsEntries({"FQDN": "dom0a.example.com", "user": "root"})
+        self.assertEqual([_entry.mGetFQDN() for _entry in _entries], ["dom0a.example.com"])
+        self.assertEqual(self.__storage.calls, {"list": 0, "get": 1})
+
+        self.assertEqual(_exakms.mSearchExaKmsEntries({"FQDN": "dom0c.example.com"}), [])
+
+        # Records are reused within the TTL
+        get_gcontext().mSetConfigOption("exakms_oci_index_ttl", "60")
+        _exakms.mSetCache({})
+        self.__storage.calls["get"] = 0
+        self.assertEqual(len(_exakms.mSearchExaKmsEntries({"FQDN": "dom0a.example.com"})), 1)
+        self.assertEqual(self.__storage.calls["get"], 0)
+
+    def test_incremental_listing(self):
+        for _host in ["dom0a", "dom0b", "dom0c"]:
+            self.__storage.mPut(f"{_host}.example.com", mRecord(f"{_host}.example.com"))
+        self.__storage.mPut("changes.txt", {"history": True})
+
+        _exakms = ExaKmsOCI()
+        self.assertEqual(len(_exakms.mSearchExaKmsEntries({}, aRefreshKey=True)), 3)
+        self.assertEqual(self.__storage.calls, {"list": 1, "get": 3})
+
+        # Only the changed object is downloaded again, the deleted one is gone
+        self.__storage.mPut("dom0b.example.com", mRecord("dom0b.example.com", "opc"))
+        self.__storage.delete_object(None, None, "dom0c.example.com")
+        _entries = _exakms.mSearchExaKmsEntries({}, aRefreshKey=True)
+        self.assertEqual(sorted([(_e.mGetFQDN(), _e.mGetUser()) for _e in _entries]),
+                         [("dom0a.example.com", "root"), ("dom0b.example.com", "opc")])
+        self.assertEqual(self.__storage.calls, {"list": 2, "get": 4})
+
+        # Strict search of a short name through the index
+        get_gcontext().mSetRegEntry("exakms_enable_fetch_clustername", "True")
+        try:
+            _entries = _exakms.mSearchExaKmsEntries({"FQDN": "dom0a", "strict": True}, aRefreshKey=True)
+        finally:
+            get_gcontext().mDelRegEntry("exakms_enable_fetch_clustername")
+        self.assertEqual([_e.mGetFQDN() for _e in _entries], ["dom0a.example.com"])
+
+    def test_unreadable_object(self):
+        for _host in ["dom0a", "dom0b"]:
+            self.__storage.mPut(f"{_host}.example.com", mRecord(f"{_host}.example.com"))
+        self.__storage.failing.add("dom0b.example.com")
+
+        # The search goes on without the object
+        _exakms = ExaKmsOCI()
+        _entries = _exakms.mSearchExaKmsEntries({}, aRefreshKey=True)
+        self.assertEqual([_e.mGetFQDN() for _e in _entries], ["dom0a.example.com"])
+
+        # and gets it once readable
+        self.__storage.failing.clear()
+        _entries = _exakms.mSearchExaKmsEntries({}, aRefreshKey=True)
+        self.assertEqual(sorted([_e.mGetFQDN() for _e in _entries]), ["dom0a.example.com", "dom0b.example.com"])
+
+    def test_shared_cache_file(self):
+        get_gcontext().mSetConfigOption("exakms_oci_cache_dir", self.__dir)
+        self.__storage.mPut("dom0a.example.com", mRecord("dom0a.example.com"))
+
+        _exakms = ExaKmsOCI()
+        _exakms.mSearchExaKmsEntries({}, aRefreshKey=True)
+        _index = mGetExaKmsOCIIndex("exakms_mock")
+        _path = _index.mGetPath()
+        self.assertTrue(_path.startswith(self.__dir))
+
+        # Another worker process sees the records without asking the bucket
+        _other = ExaKmsOCIIndex("exakms_mock", _path)
+        self.assertEqual(_other.mGetObjectNames(), ["dom0a.example.com"])
+
+        # Deletion of the last key of an object drops it from the shared file
+        _entry = _exakms.mSearchExaKmsEntries({"FQDN": "dom0a.example.com"})[0]
+        with patch.object(_exakms.mGetExaKmsHistoryInstance(), "mPutExaKmsHistory"):
+            self.assertTrue(_exakms.mDeleteExaKmsEntry(_entry))
+        self.assertEqual(_other.mGetObjectNames(), [])
+
+        _other.mPutObject("dom0b.example.com", "etag", mRecord("dom0b.example.com"))
+        self.assertEqual(_index.mFindObjects("dom0b"), ["dom0b.example.com"])
+
+    def test_dek_cache(self):
+        get_gcontext().mSetConfigOption("exakms_oci_dek_cache_ttl", "60")
+        self.__storage.mPut("dom0a.example.com", mRecord("dom0a.example.com"))
+
+        _exakms = ExaKmsOCI()
+        _entry = _exakms.mSearchExaKmsEntries({"FQDN": "dom0a.example.com"})[0]
+        _crypto = MagicMock()
+        _crypto.decrypt.return_value = SimpleNamespace(data=SimpleNamespace(plaintext="plain"))
+        _entry.mSetCryptoClient(_crypto)
+
+        self.assertEqual(_entry.mGetPlainEncryptionKey(), "plain")
+        self.assertEqual(_entry.mGetPlainEncryptionKey(), "plain")
+        _crypto.decrypt.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Tests for the batched execution
 #    joysjose    03/24/26 - Bug 38900203 :Codev fixes for exabox/healtcheck
 #    joysjose    01/11/26 - Codex UT iteration 1
 #    aypaul      12/09/25 - Bug#38736166 Enhance code coverage with Cline
@@ -26,6 +27,7 @@
 #
 import copy
 import json
+import threading
 import unittest
 from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
 from exabox.core.Node import exaBoxNode
@@ -841,5 +843,87 @@ class TestCheckExecutorEndToEnd(unittest.TestCase):
 # Auto-generated tests end
 # =========================
 
+class _DummyBatchEbox(_DummyEbox):
+    def __init__(self, options):
+        self._options = options
+    def mCheckConfigOption(self, key):
+        return self._options.get(key)
+
+class TestCheckExecutorBatched(unittest.TestCase):
+    def setUp(self):
+        self.logger = _DummyLogger()
+        self.p_get_logger = patch("exabox.healthcheck.check_executor.get_logger", return_value=self.logger)
+        self.p_get_logger.start()
+        self.regentries = {}
+        _context = MagicMock()
+        _context.mSetRegEntry.side_effect = self.regentries.__setitem__
+        _context.mDelRegEntry.side_effect = self.regentries.pop
+        self.p_context = patch("exabox.healthcheck.check_executor.get_gcontext", return_value=_context)
+        self.p_context.start()
+
+    def tearDown(self):
+        self.p_context.stop()
+        self.p_get_logger.stop()
+
+    def _mk_executor(self, aOptions):
+        _hc = _DummyHC(ebox=_DummyBatchEbox(aOptions))
+        with patch.object(check_executor, "REGISTERED_CLASSES", [_DummyCheckClass]), \
+             patch.object(check_executor, "get_all_registered_classes", return_value=None), \
+             patch("exabox.healthcheck.check_executor.Manager", return_value=DummyManager()):
+            return check_executor.CheckExecutor(_hc)
+
+    def test_execute_checklist_batched(self):
+        _seen = []
+
+        def _check(aInst, aHost):
+            # The check runs on a thread holding a connection pool
+            _seen.append((aHost, list(self.regentries)))
+            return {
+                HcConstants.RES_RESULT: CHK_RESULT.PASS,
+                HcConstants.RES_LOG: [aHost],
+                HcConstants.RES_MSGDETAIL: {},
+                HcConstants.RES_CHECKPARAM: {},
+            }
+
+        _ex = self._mk_executor({"healthcheck_batched": "True"})
+        with patch.object(check_executor, "REGISTERED_CLASSES", [_DummyCheckClass]), \
+             patch.object(_DummyCheckClass, "mCheckDemo", _check), \
+             patch.object(check_executor, "ProcessManager") as pm_ctor:
+            _ex.execute_checklist()
+            pm_ctor.return_value.mStartAppend.assert_not_called()
+
+        self.assertEqual([_host for _host, _ in _seen], ["dom0-1"])
+        self.assertEqual(len(_seen[0][1]), 1)
+        self.assertTrue(_seen[0][1][0].startswith("SSH-POOL-"))
+        self.assertEqual(self.regentries, {})
+        self.assertEqual(len(self.logger.updated), 1)
+        self.assertEqual(self.logger.updated[0][HcConstants.RES_RESULT], "PASS")
+        self.assertEqual(self.logger.updated[0][HcConstants.RES_NODENAME], "dom0-1")
+        self.assertEqual(self.logger.recommend, ["rec1"])
+
+    def test_execute_batched_timeout(self):
+        _release = threading.Event()
+
+        def _check(aHost):
+            if aHost == "slow":
+                _release.wait(10)
+            return CHK_RESULT.PASS
+
+        _ex = self._mk_executor({"healthcheck_batched": "True", "healthcheck_task_timeout": "1"})
+        _tmpl = self.logger.mGetResultTemplate()
+        _tmpl[HcConstants.RES_CHKNAME] = "Demo"
+        _tmpl[HcConstants.RES_NODETYPE] = HcConstants.DOM0
+        _task = check_executor.NodeTask(_ex._hc, HcConstants.DOM0, [{"fp": _check, "result": _tmpl}])
+        try:
+            with patch.object(_task, "mGetHostList", return_value=["slow", "fast"]):
+                _results = _ex.mExecuteBatched([_task])
+        finally:
+            _release.set()
+
+        self.assertEqual([(_r.host, _r.result[HcConstants.RES_RESULT]) for _r in _results],
+                         [("slow", "FAIL"), ("fast", "PASS")])
+        self.assertIn("did not complete within 1 seconds", _results[0].error)
+        self.assertEqual([_r[HcConstants.RES_NODENAME] for _r in self.logger.updated], ["slow", "fast"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,169 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/exatest/healthcheck/tests_hccache.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_hccache.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_hccache.py - Unit tests for exabox/healthcheck/hccache.py
+#
+#    DESCRIPTION
+#      Unit tests for the result cache of the healthcheck checks, its
+#      fingerprint probes and the delta report
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import unittest
+from unittest.mock import patch
+
+import exabox.healthcheck.check_executor as check_executor
+from exabox.healthcheck.hccache import HcResultCache, mValidateProbe, mProbeCommand
+from exabox.healthcheck.hcconstants import HcConstants, CHK_RESULT
+
+class _DummyDataCache:
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+    def mGet(self, aName, aLoader=None, aTtl=None, aDefault=None):
+        return self.values.get(aName, aDefault)
+    def mSet(self, aName, aValue, aTtl=None):
+        self.values[aName] = aValue
+        self.ttls[aName] = aTtl
+
+class _DummyParser:
+    def __init__(self):
+        self.checks = {
+            "CHK_1": {HcConstants.CHK_CACHE_TTL: 600, HcConstants.CHK_FINGERPRINT: ["mtime:/etc/oratab", "imageinfo"]},
+            "CHK_2": {}
+        }
+    def mGetCheckCacheTtl(self, aChkId):
+        return self.checks[aChkId].get(HcConstants.CHK_CACHE_TTL)
+    def mGetCheckFingerprint(self, aChkId):
+        return self.checks[aChkId].get(HcConstants.CHK_FINGERPRINT, [])
+
+class _DummyEbox:
+    def mGetVerbose(self): return False
+
+class _DummyHC:
+    def __init__(self):
+        self._parser = _DummyParser()
+    def mGetCheckParser(self): return self._parser
+    def mGetEbox(self): return _DummyEbox()
+
+def _mk_result(aChkId, aResult):
+    return {
+        HcConstants.RES_HCID: aChkId,
+        HcConstants.RES_CHKNAME: "Demo",
+        HcConstants.RES_PROFILE: "default",
+        HcConstants.RES_ALERTTYPE: "INFO",
+        HcConstants.RES_NODETYPE: HcConstants.DOM0,
+        HcConstants.RES_NODENAME: "dom0-1",
+        HcConstants.RES_CHECKPARAM: {"flag": True},
+        HcConstants.RES_RESULT: aResult,
+        HcConstants.RES_LOG: [],
+        HcConstants.RES_MSGDETAIL: {},
+        HcConstants.RES_STARTTIME: "2026-10-18 10:00:00",
+        HcConstants.RES_ENDTIME: "2026-10-18 10:00:05",
+    }
+
+class TestHcResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.store = _DummyDataCache()
+        self.cache = HcResultCache(_DummyHC(), self.store)
+        self.probe = "stat 1"
+        self.probes = []
+
+        def _probe(aHost, aProbes):
+            self.probes.append(aHost)
+            return self.probe
+        self.p_probe = patch.object(self.cache, "mProbe", side_effect=_probe)
+        self.p_probe.start()
+
+    def tearDown(self):
+        self.p_probe.stop()
+
+    def test_probes(self):
+        for _probe in ["mtime:/etc/oratab", "pid:ocssd.bin", "imageinfo"]:
+            self.assertTrue(mValidateProbe(_probe), _probe)
+        for _probe in ["mtime:", "imageinfo:x", "rpm:kernel", 5]:
+            self.assertFalse(mValidateProbe(_probe), _probe)
+        self.assertEqual(mProbeCommand(["mtime:/etc/my file", "imageinfo"]),
+                         "echo 'mtime:/etc/my file'; stat -c %Y '/etc/my file' 2>/dev/null; "
+                         "echo imageinfo; imageinfo -ver 2>/dev/null")
+
+    def test_get_put(self):
+        _params = {"flag": True}
+        _cached, _fingerprint = self.cache.mGet("dom0-1", "dom0-1", "CHK_1", _params)
+        self.assertIsNone(_cached)
+        self.assertTrue(_fingerprint)
+
+        # Failures are never cached
+        self.cache.mPut("dom0-1", "CHK_1", _params, _fingerprint, _mk_result("CHK_1", "FAIL"))
+        self.assertEqual(self.store.values, {})
+
+        self.cache.mPut("dom0-1", "CHK_1", _params, _fingerprint, _mk_result("CHK_1", "PASS"))
+        self.assertEqual(list(self.store.ttls.values()), [600])
+        _cached, _ = self.cache.mGet("dom0-1", "dom0-1", "CHK_1", _params)
+        self.assertEqual(_cached[HcConstants.RES_RESULT], "PASS")
+        self.assertEqual(_cached[HcConstants.RES_CACHED], "2026-10-18 10:00:05")
+        # Probed once for the run
+        self.assertEqual(self.probes, ["dom0-1"])
+
+        # Other params, other entry
+        self.assertIsNone(self.cache.mGet("dom0-1", "dom0-1", "CHK_1", {"flag": False})[0])
+
+        # A probe changed in the next run
+        self.probe = "stat 2"
+        _next = HcResultCache(_DummyHC(), self.store)
+        with patch.object(_next, "mProbe", return_value=self.probe):
+            self.assertIsNone(_next.mGet("dom0-1", "dom0-1", "CHK_1", _params)[0])
+
+        # Checks without TTL are not cached
+        self.assertEqual(self.cache.mGet("dom0-1", "dom0-1", "CHK_2", {}), (None, None))
+
+    def test_executor(self):
+        _calls = []
+
+        def _check(aHost, aParams):
+            _calls.append(aHost)
+            return CHK_RESULT.PASS
+
+        _template = _mk_result("CHK_1", "")
+        _template[HcConstants.RES_PROFILE] = "other"
+        _task = check_executor.HCTask(_DummyHC(), [{"fp": _check, "result": _template}])
+        _task.mSetResultCache(self.cache)
+
+        _first, _ = _task.mRunSubtask(_task._subtasks[0], {"host": "dom0-1"})
+        _second, _ = _task.mRunSubtask(_task._subtasks[0], {"host": "dom0-1"})
+        self.assertEqual(_calls, ["dom0-1"])
+        self.assertNotIn(HcConstants.RES_CACHED, _first)
+        self.assertEqual(_second[HcConstants.RES_RESULT], "PASS")
+        self.assertEqual(_second[HcConstants.RES_PROFILE], "other")
+        self.assertIn(HcConstants.RES_CACHED, _second)
+
+    def test_delta(self):
+        _map = {
+            "Demo": {"dom0-1": _mk_result("CHK_1", "PASS"), "dom0-2": _mk_result("CHK_1", "PASS")},
+            HcConstants.RES_NODESUMMARY: {"dom0-1": {}},
+        }
+        _delta = self.cache.mBuildDelta(_map, "cluster1:default")
+        self.assertIsNone(_delta["previousRun"])
+        self.assertEqual(len(_delta["changes"]), 2)
+
+        _map["Demo"]["dom0-2"] = _mk_result("CHK_1", "FAIL")
+        _delta = self.cache.mBuildDelta(_map, "cluster1:default")
+        self.assertIsNotNone(_delta["previousRun"])
+        self.assertEqual(_delta["unchanged"], 1)
+        self.assertEqual(_delta["changes"], [{HcConstants.RES_CHKNAME: "Demo", HcConstants.RES_NODENAME: "dom0-2",
+                                              "previous": "PASS", "current": "FAIL"}])
+
+if __name__ == '__main__':
+    unittest.main()
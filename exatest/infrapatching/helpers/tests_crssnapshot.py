@@ -0,0 +1,175 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/exatest/infrapatching/helpers/tests_crssnapshot.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_crssnapshot.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_crssnapshot.py - Unit tests for infrapatching/helpers/crssnapshot.py
+#
+#    DESCRIPTION
+#      Unit tests for the CRS/DB validation snapshot of the domUs and its
+#      use by the detection methods of crshelper
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import time
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+from exabox.infrapatching.helpers.crssnapshot import CrsSnapshot, CRS_SNAPSHOT_CRS_AUTOSTART, \
+    CRS_SNAPSHOT_CDB_STATE, CRS_SNAPSHOT_PDB_STATE
+from exabox.infrapatching.helpers.crshelper import CrsHelper, CRS_IS_DISABLED, PATCH_SUCCESS_EXIT_CODE
+
+_VM_OK = "vm01.example.com"
+_VM_KO = "vm02.example.com"
+_PDB_ERROR = {"error": "downtime", "pdb": "PDB1", "cdb": "CDB1"}
+
+
+class _SnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.regentries = {}
+        _context = MagicMock()
+        _context.mSetRegEntry.side_effect = self.regentries.__setitem__
+        _context.mDelRegEntry.side_effect = self.regentries.pop
+        self.p_context = patch("exabox.infrapatching.helpers.crssnapshot.get_gcontext", return_value=_context)
+        self.p_context.start()
+        self.p_pool = patch("exabox.infrapatching.helpers.crssnapshot.exaBoxNodePool")
+        self.p_pool.start()
+
+    def tearDown(self):
+        self.p_pool.stop()
+        self.p_context.stop()
+
+
+class ebTestCrsSnapshot(_SnapshotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+        self.pools = []
+        self.lock = threading.Lock()
+
+    def _probe(self, aResult):
+        def _fx(aDomU):
+            _connkey = f"{threading.get_ident()}-{os.getpid()}"
+            with self.lock:
+                self.calls.append(aDomU)
+                self.pools.append(f'SSH-POOL-{_connkey}' in self.regentries)
+            time.sleep(0.2)
+            return aResult
+        return _fx
+
+    def test_sweep_parallel_pooled(self):
+        _snapshot = CrsSnapshot(aMaxThreads=4)
+        _domus = [f"vm0{_i}" for _i in range(4)]
+        _start = time.monotonic()
+        _results, _pending = _snapshot.mSweep(_domus, [(CRS_SNAPSHOT_CRS_AUTOSTART, self._probe(PATCH_SUCCESS_EXIT_CODE))])
+        self.assertLess(time.monotonic() - _start, 0.7)
+        self.assertEqual(_pending, [])
+        self.assertEqual(sorted(self.calls), _domus)
+        self.assertTrue(all(self.pools))
+        self.assertEqual(self.regentries, {})
+        self.assertEqual(_results["vm00"], {CRS_SNAPSHOT_CRS_AUTOSTART: PATCH_SUCCESS_EXIT_CODE})
+
+        # Without stage nothing is kept
+        self.assertIsNone(_snapshot.mGet("vm00", CRS_SNAPSHOT_CRS_AUTOSTART))
+
+    def test_stage_cache(self):
+        _snapshot = CrsSnapshot()
+        _snapshot.mSetStage("pre_patch:dom0-1")
+        _probes = [(CRS_SNAPSHOT_CDB_STATE, self._probe((PATCH_SUCCESS_EXIT_CODE, []))),
+                   (CRS_SNAPSHOT_PDB_STATE, self._probe((PATCH_SUCCESS_EXIT_CODE, {})))]
+        _snapshot.mSweep(["vm01"], _probes)
+        self.assertEqual(len(self.calls), 2)
+
+        # Served from the snapshot of the stage
+        _results, _ = _snapshot.mSweep(["vm01"], _probes)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(_results["vm01"][CRS_SNAPSHOT_PDB_STATE], (PATCH_SUCCESS_EXIT_CODE, {}))
+
+        _snapshot.mInvalidate("vm01", CRS_SNAPSHOT_CDB_STATE)
+        self.assertFalse(_snapshot.mHas("vm01", CRS_SNAPSHOT_CDB_STATE))
+        self.assertTrue(_snapshot.mHas("vm01", CRS_SNAPSHOT_PDB_STATE))
+
+        # A new stage drops the results
+        _snapshot.mSetStage("post_patch:dom0-1")
+        self.assertFalse(_snapshot.mHas("vm01", CRS_SNAPSHOT_PDB_STATE))
+        _snapshot.mSweep(["vm01"], _probes)
+        self.assertEqual(len(self.calls), 4)
+
+    def test_failure_timeout(self):
+        _snapshot = CrsSnapshot()
+        _snapshot.mSetStage("pre_patch:dom0-1")
+
+        def _fail(aDomU):
+            raise ValueError("no route")
+
+        _results, _pending = _snapshot.mSweep(["vm01"], [(CRS_SNAPSHOT_CRS_AUTOSTART, _fail)])
+        self.assertEqual((_results, _pending), ({"vm01": {}}, []))
+        self.assertFalse(_snapshot.mHas("vm01", CRS_SNAPSHOT_CRS_AUTOSTART))
+
+        def _slow(aDomU):
+            time.sleep(1)
+            return PATCH_SUCCESS_EXIT_CODE
+
+        _results, _pending = _snapshot.mSweep(["vm01"], [(CRS_SNAPSHOT_CRS_AUTOSTART, _slow)], aTimeout=0.2)
+        self.assertEqual(_pending, ["vm01"])
+        self.assertEqual(_results["vm01"], {})
+
+
+class ebTestCrsHelperSnapshot(_SnapshotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.handler = MagicMock()
+        self.handler.mIsCrsValidationSnapshotEnabled.return_value = True
+        self.handler.mGetCrsValidationSnapshotMaxThreads.return_value = 4
+        self.handler.mGetDBHealthChecksParallelExecutionWaitTimeInSeconds.return_value = 60
+        self.handler.mGetInfrapatchExecutionValidator.return_value.mCheckCondition.return_value = True
+        self.handler.mGetAutonomousVMListWithCustomerHostnames.return_value = []
+        self.crs = CrsHelper(self.handler)
+
+    def test_crs_autostart(self):
+        _rc = {_VM_OK: PATCH_SUCCESS_EXIT_CODE, _VM_KO: CRS_IS_DISABLED}
+        with patch.object(self.crs, "mCheckCrsIsEnabled", side_effect=lambda aDomU: _rc[aDomU]) as _check:
+            self.crs.mGetCrsSnapshot().mSetStage("post_patch:dom0-1")
+            _, _vms = self.crs.mReturnListofVMsWithCRSAutoStartupEnabled([_VM_OK, _VM_KO])
+            self.assertEqual(_vms, [_VM_OK])
+            _, _vms = self.crs.mReturnListofVMsWithCRSAutoStartupEnabled([_VM_OK, _VM_KO])
+            self.assertEqual(_vms, [_VM_OK])
+            self.assertEqual(_check.call_count, 2)
+
+    @patch.object(CrsHelper, "mProbePDBDowntime")
+    @patch.object(CrsHelper, "mProbeCDBDowntime", return_value=(PATCH_SUCCESS_EXIT_CODE, []))
+    def test_pre_patch_one_sweep(self, aCdb, aPdb):
+        aPdb.side_effect = lambda aDomU: (PATCH_SUCCESS_EXIT_CODE, {}) if aDomU == _VM_OK else \
+            (1, _PDB_ERROR)
+
+        self.assertEqual(self.crs.mDetectCDBDowntimeDuringDom0Patching("dom0-1", [_VM_OK, _VM_KO]),
+                         PATCH_SUCCESS_EXIT_CODE)
+        self.assertEqual(aPdb.call_count, 2)
+        self.assertEqual(self.crs.mDetectPDBDowntimeDuringDom0Patching("dom0-1", [_VM_OK, _VM_KO]), 1)
+        # Both detections were served by the same sweep
+        self.assertEqual(aCdb.call_count, 2)
+        self.assertEqual(aPdb.call_count, 2)
+        _error = self.handler.mAddError.call_args[0][1]
+        self.assertIn(f"PDB1 within CDB1 on {_VM_KO}", _error)
+
+        # The results are used once, a detection run again probes the VMs
+        self.crs.mDetectPDBDowntimeDuringDom0Patching("dom0-1", [_VM_OK, _VM_KO])
+        self.assertEqual(aPdb.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
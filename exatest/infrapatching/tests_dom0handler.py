@@ -17,6 +17,7 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Tests for the rolling dom0 patching by waves
 #    jyotdas     05/11/26 - Bug 39347652 - Perform dom0 Elu Rollback With the
 #                           Exasplice Flag Enabled
 #    avimonda    03/17/26 - Unit tests for bug 38969712
@@ -83,6 +84,7 @@ from exabox.log.LogMgr import ebLogInfo
 from exabox.infrapatching.handlers.targetHandler.dom0handler import Dom0Handler
 from exabox.core.MockCommand import exaMockCommand
 from exabox.infrapatching.core.infrapatcherror import (
+    DOM0_NOT_PINGABLE,
     INDIVIDUAL_PATCH_REQUEST_EXCEPTION_ERROR,
     SSH_AUTHENTICATION_FAILED,
     SSH_CONNECTION_TIMEOUT,
@@ -949,5 +951,106 @@ class Dom0HandlerSshMappingTests(unittest.TestCase):
         self.assertIn("phx3dom0", suggestion)
         ebLogInfo(f"Dom0HandlerSshMappingTests.test_connection_timeout_message mapped {code} with suggestion: {suggestion}")
         
+class Dom0HandlerRollingWavesTests(unittest.TestCase):
+
+    class _Dom0HandlerWavesDummy(Dom0Handler):
+        def __init__(self, aDom0ToClusters, aClusterToVms, aDom0ToVms=None):
+            self._dom0_to_clusters = aDom0ToClusters
+            self._cluster_to_vms = aClusterToVms
+            self._dom0_to_vms = aDom0ToVms or {}
+            self.mPatchLogInfo = ebLogInfo
+            self.mPatchLogWarn = ebLogInfo
+            self.mPatchLogError = ebLogInfo
+
+        def mGetClusterListForDom0(self, aDom0):
+            return self._dom0_to_clusters.get(aDom0, [])
+
+        def mGetDom0ToClusterMapping(self):
+            return list(self._dom0_to_clusters.items())
+
+        def mGetCluPatchCheck(self):
+            return MagicMock(**{"mCheckVMsUp.side_effect": lambda aDom0: self._dom0_to_vms.get(aDom0, [])})
+
+        def mGetClusterToVmMapWithNonZeroVcpu(self):
+            return list(self._cluster_to_vms.items())
+
+    def setUp(self):
+        self.handler = self._Dom0HandlerWavesDummy(
+            {"dom0-1": ["c1"], "dom0-2": ["c1", "c2"], "dom0-3": ["c2"], "dom0-4": ["c1"], "dom0-5": []},
+            {"c1": ["vm1", "vm2", "vm4"], "c2": ["vm2b", "vm3"]})
+
+    def test_mBuildDom0RollingWaves(self):
+        _nodes = ["dom0-1", "dom0-2", "dom0-3", "dom0-4", "dom0-5"]
+        self.assertEqual(self.handler.mBuildDom0RollingWaves(_nodes, 1, 1), [[_n] for _n in _nodes])
+        self.assertEqual(self.handler.mBuildDom0RollingWaves(_nodes, 3, 1),
+                         [["dom0-1", "dom0-3", "dom0-5"], ["dom0-2"], ["dom0-4"]])
+        # c1 may lose 2 of its 3 VMs, c2 only 1 of its 2
+        self.assertEqual(self.handler.mBuildDom0RollingWaves(_nodes, 8, 2),
+                         [["dom0-1", "dom0-2", "dom0-5"], ["dom0-3", "dom0-4"]])
+
+    def test_mBuildDom0RollingWaves_unmapped(self):
+        _nodes = ["dom0-1", "dom0-2", "dom0-3", "dom0-4", "dom0-5"]
+        # dom0-5 runs VMs which are not in the mapping
+        _handler = self._Dom0HandlerWavesDummy(
+            {"dom0-1": ["c1"], "dom0-2": ["c1", "c2"], "dom0-3": ["c2"], "dom0-4": ["c1"], "dom0-5": []},
+            {"c1": ["vm1", "vm2", "vm4"], "c2": ["vm2b", "vm3"]}, {"dom0-5": ["vm5"]})
+        self.assertEqual(_handler.mBuildDom0RollingWaves(_nodes, 8, 2),
+                         [["dom0-1", "dom0-2"], ["dom0-3", "dom0-4"], ["dom0-5"]])
+
+        # No mapping from ECRA at all
+        _handler = self._Dom0HandlerWavesDummy({}, {})
+        self.assertEqual(_handler.mBuildDom0RollingWaves(_nodes, 3, 1), [[_n] for _n in _nodes])
+
+    def _mPatchByWaves(self, aPostCheckRc):
+        _handler = self.handler
+        _events = []
+
+        def _stage(aWave, aRollback):
+            _events.append(("stage", tuple(aWave)))
+            return "0x00000000", {_n: ([], "1.0") for _n in aWave}, True
+
+        def _patch(aNodePatcher, aWave, *args):
+            _events.append(("patch", tuple(aWave)))
+            return "0x00000000", aNodePatcher, True
+
+        def _post(aWave, *args):
+            _events.append(("post", tuple(aWave)))
+            return aPostCheckRc, aWave[0]
+
+        for _name in ["mPreDom0UPatchCheck", "mUpdatePatchStatus", "mSetPatchmgrLogPathOnLaunchNode", "mCheckDomuAvailability"]:
+            setattr(_handler, _name, MagicMock())
+        _handler.mGetDom0ToPatchDom0 = lambda: "dom0-launch"
+        _handler.mGetDom0ToPatchInitialDom0 = lambda: None
+        _handler.mGetAdditionalOptions = lambda: []
+        _handler.mGetInfrapatchExecutionValidator = lambda: MagicMock(**{"mCheckCondition.return_value": False})
+        _handler.mGetDom0RollingMaxNodesDownPerCluster = lambda: 1
+        _handler.mGetDom0PatchBaseAfterUnzip = lambda: "/u01/patch/"
+        _handler.mGetMasterReqId = lambda: "uuid"
+        _handler.mGetMetadataJsonFile = lambda: "metadata.json"
+        _handler.mGetIncludeNodeList = lambda: []
+        _handler.mGetSleepbetweenComputeTimeInSec = lambda: 0
+        _handler.mStageDom0RollingWave = _stage
+        _handler.mPrePatchDom0RollingWave = lambda *args: "0x00000000"
+        _handler.mPatchDom0RollingWave = _patch
+        _handler.mPostCheckDom0RollingWave = _post
+
+        with patch("exabox.infrapatching.handlers.targetHandler.dom0handler.mUpdateMetadataLaunchNode"):
+            _rc = _handler.mPatchRollbackDom0sRollingWaves(
+                [("dom0-launch", ["dom0-1", "dom0-3", "dom0-4"])], ["dom0-1", "dom0-3", "dom0-4"], False, [], 2)
+        return _rc, _events
+
+    def test_mPatchRollbackDom0sRollingWaves(self):
+        _rc, _events = self._mPatchByWaves("0x00000000")
+        self.assertEqual(_rc, "0x00000000")
+        self.assertEqual([_e for _e in _events if _e[0] == "patch"], [("patch", ("dom0-1", "dom0-3")), ("patch", ("dom0-4",))])
+        # The next wave is patched after the post checks of the previous one
+        self.assertLess(_events.index(("post", ("dom0-1", "dom0-3"))), _events.index(("patch", ("dom0-4",))))
+        self.assertLess(_events.index(("stage", ("dom0-4",))), _events.index(("patch", ("dom0-4",))))
+
+    def test_mPatchRollbackDom0sRollingWaves_health_gate(self):
+        _rc, _events = self._mPatchByWaves(DOM0_NOT_PINGABLE)
+        self.assertEqual(_rc, DOM0_NOT_PINGABLE)
+        self.assertEqual([_e for _e in _events if _e[0] == "patch"], [("patch", ("dom0-1", "dom0-3"))])
+
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,7 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add test_002_flamegraph
 #    jesandov    01/09/24 - Creation
 #
 
@@ -36,6 +37,7 @@ from exabox.agent.ebJobRequest import ebJobRequest
 
 from exabox.tools.profiling.stepwise import create_profile_info
 from exabox.jsondispatch.handler_profiler import ProfilerHandler
+from exabox.tools.profiling.sampler import ebSamplingProfiler, ebSamplingSetStage, ebSamplingStore
 
 class ebTestProfiler(ebTestClucontrol):
 
@@ -80,6 +82,25 @@ class ebTestProfiler(ebTestClucontrol):
         self.assertTrue(_handler.mParseJsonConfig())
         self.assertEqual(_rc, 0)
 
+    def test_002_flamegraph(self):
+
+        _db = ebGetDefaultDB()
+        _profiler = ebSamplingProfiler("uuid-flamegraph")
+        ebSamplingSetStage("CREATE_USER")
+        _profiler.mSample()
+        ebSamplingSetStage(None)
+        ebSamplingStore(_profiler, "vm_cmd")
+
+        _options = self.mGetContext().mGetArgsOptions()
+        _options.jsonconf = {"operationId": "uuid-flamegraph", "flamegraph": True}
+        _handler = ProfilerHandler(_options, aDb=_db)
+
+        self.assertTrue(_handler.mParseJsonConfig())
+        _rc, _result = _handler.mExecute()
+        self.assertEqual(_rc, 0)
+        self.assertEqual(list(_result["stages"].keys()), ["CREATE_USER"])
+        self.assertEqual(_result["collapsed"], _profiler.mGetCollapsed())
+
 
 if __name__ == '__main__':
     unittest.main(warnings='ignore')
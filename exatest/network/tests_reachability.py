@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/network/tests_reachability.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_reachability.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_reachability.py - Unit tests for exabox/network/Reachability.py
+#
+#    DESCRIPTION
+#      Unit tests for the batch reachability prober, probes target the
+#      loopback interface only
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add test for the IPv6 probes (aFamily)
+#    jydas       10/18/26 - Creation
+#
+
+import socket
+import struct
+import unittest
+from unittest.mock import patch
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.network.Reachability import (ebReachabilityProber, ebBuildEchoRequest, ebParseEchoReply,
+                                         ebIcmpChecksum, ICMP_ECHO_REPLY)
+
+class ebTestReachability(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestReachability, self).setUpClass(aGenerateDatabase=False)
+
+    def setUp(self):
+        ebReachabilityProber.mInvalidateCache()
+
+    def mGetClosedPort(self):
+        _sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        _sock.bind(("127.0.0.1", 0))
+        _port = _sock.getsockname()[1]
+        _sock.close()
+        return _port
+
+    def test_echo_packets(self):
+        ebLogInfo("Running unit test on ebBuildEchoRequest/ebParseEchoReply")
+        _packet = ebBuildEchoRequest(socket.AF_INET, 0x1234, 7)
+        self.assertEqual(ebIcmpChecksum(_packet), 0)
+
+        # Reply as received on a raw socket, behind a 20 bytes IP header
+        _reply = struct.pack('!BBHHH', ICMP_ECHO_REPLY, 0, 0, 0x1234, 7) + _packet[8:]
+        _ip = bytes([0x45]) + b"\0" * 19
+        self.assertEqual(ebParseEchoReply(socket.AF_INET, _ip + _reply, True), (0x1234, 7))
+        self.assertEqual(ebParseEchoReply(socket.AF_INET, _reply, False), (0x1234, 7))
+        self.assertIsNone(ebParseEchoReply(socket.AF_INET, _packet, False))
+
+    def test_mProbe(self):
+        ebLogInfo("Running unit test on ebReachabilityProber.mProbe")
+        _prober = ebReachabilityProber(aTcpPort=self.mGetClosedPort(), aCacheTTL=0)
+        _results = _prober.mProbe(["127.0.0.1", "unknown.invalid"], aTimeout=1)
+
+        self.assertTrue(_results["127.0.0.1"][0])
+        self.assertEqual(_results["unknown.invalid"], (False, None))
+
+    def test_mProbe_tcp(self):
+        ebLogInfo("Running unit test on ebReachabilityProber.mProbe over TCP")
+        # A refused connection is an answer of the host
+        _prober = ebReachabilityProber(aTcpPort=self.mGetClosedPort(), aCacheTTL=0)
+        self.assertTrue(_prober.mProbe(["127.0.0.1"], aTimeout=1, aTcpOnly=True)["127.0.0.1"][0])
+
+        _listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        _listener.bind(("127.0.0.1", 0))
+        _listener.listen(1)
+        try:
+            _prober = ebReachabilityProber(aTcpPort=_listener.getsockname()[1], aCacheTTL=0)
+            self.assertTrue(_prober.mProbe(["127.0.0.1"], aTimeout=1, aTcpOnly=True)["127.0.0.1"][0])
+        finally:
+            _listener.close()
+
+    def test_mIsReachable_cache(self):
+        ebLogInfo("Running unit test on ebReachabilityProber.mIsReachable cache")
+        _prober = ebReachabilityProber(aTcpPort=self.mGetClosedPort(), aCacheTTL=60)
+        self.assertTrue(_prober.mIsReachable("127.0.0.1", aTimeout=1))
+
+        with patch.object(ebReachabilityProber, "mResolve") as _resolve:
+            self.assertTrue(_prober.mIsReachable("127.0.0.1", aTimeout=1))
+            _resolve.assert_not_called()
+
+            ebReachabilityProber.mInvalidateCache("127.0.0.1")
+            _resolve.return_value = {"127.0.0.1": None}
+            self.assertFalse(_prober.mIsReachable("127.0.0.1", aTimeout=1))
+
+    def test_mProbe_family(self):
+        ebLogInfo("Running unit test on ebReachabilityProber.mProbe with aFamily")
+        _prober = ebReachabilityProber(aCacheTTL=60)
+        _info = [(socket.AF_INET6, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', ('fd00::1', 0, 0, 0))]
+
+        with patch("exabox.network.Reachability.socket.getaddrinfo", return_value=_info) as _getaddrinfo:
+            self.assertEqual(_prober.mResolve(["vm01"], socket.AF_INET6),
+                             {"vm01": (socket.AF_INET6, ('fd00::1', 0, 0, 0))})
+            self.assertEqual(_getaddrinfo.call_args[1]["family"], socket.AF_INET6)
+
+        # A host reachable on IPv4 is probed again on IPv6
+        _prober.mSetCached("vm01", 0.001)
+        with patch.object(ebReachabilityProber, "mResolve", return_value={"vm01": None}) as _resolve:
+            self.assertTrue(_prober.mIsReachable("vm01"))
+            self.assertFalse(_prober.mIsReachable("vm01", aFamily=socket.AF_INET6))
+            _resolve.assert_called_once_with(["vm01"], socket.AF_INET6)
+
+        _prober.mSetCached("vm01", 0.001, socket.AF_INET6)
+        self.assertTrue(_prober.mIsReachable("vm01", aFamily=socket.AF_INET6))
+        ebReachabilityProber.mInvalidateCache("vm01")
+        self.assertIsNone(_prober.mGetCached("vm01", socket.AF_INET6))
+        self.assertIsNone(_prober.mGetCached("vm01"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/network/tests_sftpxfer.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_sftpxfer.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_sftpxfer.py - Unit tests for exabox/network/osds/sftpxfer.py
+#
+#    DESCRIPTION
+#      Unit tests for the parallel SFTP transfer engine, the remote side is
+#      a local directory
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import shutil
+import hashlib
+import tempfile
+import unittest
+import subprocess
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.core.Error import ExacloudRuntimeError
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.network.osds.sftpxfer import ebSftpTransfer, ebSftpXferPartPath
+
+class LocalSftpFile(object):
+
+    def __init__(self, aPath, aMode):
+        self.__fd = open(aPath, aMode)
+
+    def set_pipelined(self, aFlag):
+        pass
+
+    def seek(self, aOffset):
+        self.__fd.seek(aOffset)
+
+    def write(self, aData):
+        self.__fd.write(aData)
+
+    def close(self):
+        self.__fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *aArgs):
+        self.close()
+
+class LocalSftp(object):
+    """ paramiko SFTPClient subset working on the local filesystem """
+
+    opened = 0
+
+    def __init__(self, aFailWrites=False):
+        LocalSftp.opened += 1
+        self.__failWrites = aFailWrites
+
+    def open(self, aPath, aMode):
+        if self.__failWrites and aMode == 'r+b':
+            raise IOError("Failure")
+        return LocalSftpFile(aPath, aMode)
+
+    def stat(self, aPath):
+        return os.stat(aPath)
+
+    def truncate(self, aPath, aSize):
+        os.truncate(aPath, aSize)
+
+    def chmod(self, aPath, aMode):
+        os.chmod(aPath, aMode)
+
+    def posix_rename(self, aOld, aNew):
+        os.replace(aOld, aNew)
+
+    def remove(self, aPath):
+        os.remove(aPath)
+
+    def close(self):
+        pass
+
+def mLocalExec(aCmd):
+    _proc = subprocess.run(aCmd, shell=True, stdout=subprocess.PIPE)
+    return _proc.returncode, _proc.stdout.decode('utf-8')
+
+class ebTestSftpTransfer(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestSftpTransfer, self).setUpClass(aGenerateDatabase=False)
+
+    def setUp(self):
+        self.__dir = tempfile.mkdtemp()
+        LocalSftp.opened = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.__dir, ignore_errors=True)
+
+    def mCreateFile(self, aName, aSize):
+        _path = os.path.join(self.__dir, aName)
+        with open(_path, 'wb') as _fd:
+            _fd.write(os.urandom(aSize))
+        return _path
+
+    def mSha256(self, aPath):
+        with open(aPath, 'rb') as _fd:
+            return hashlib.sha256(_fd.read()).hexdigest()
+
+    def test_mTransfer_parallel(self):
+        ebLogInfo("Running unit test on ebSftpTransfer.mTransfer")
+        _big = self.mCreateFile("big.img", 10 * 1024 + 17)
+        _small = self.mCreateFile("small.txt", 10)
+        _empty = self.mCreateFile("empty.txt", 0)
+
+        _files = [(_big, _big + ".remote"), (_small, _small + ".remote"), (_empty, _empty + ".remote")]
+        _engine = ebSftpTransfer(LocalSftp, mLocalExec, aStreams=3, aBlockSize=1024)
+        _digests = _engine.mTransfer(_files)
+
+        for _local, _remote in _files:
+            self.assertEqual(_digests[_remote], self.mSha256(_local))
+            self.assertEqual(self.mSha256(_remote), self.mSha256(_local))
+            self.assertFalse(os.path.exists(ebSftpXferPartPath(_remote)))
+
+        # Control channel and the 3 streams over the connection
+        self.assertEqual(LocalSftp.opened, 4)
+        self.assertEqual(_engine.mGetStats()["files"], 3)
+
+    def test_mTransfer_resume(self):
+        ebLogInfo("Running unit test on ebSftpTransfer.mTransfer resume")
+        _local = self.mCreateFile("image.img", 5000)
+        _remote = _local + ".remote"
+
+        # Partial file of a previous attempt, with a bad last block
+        with open(_local, 'rb') as _fd:
+            _data = _fd.read()
+        with open(ebSftpXferPartPath(_remote), 'wb') as _fd:
+            _fd.write(_data[:2048] + b"\0" * 1000)
+
+        _engine = ebSftpTransfer(LocalSftp, mLocalExec, aStreams=2, aBlockSize=1024)
+        _engine.mTransfer([(_local, _remote)])
+        self.assertEqual(self.mSha256(_remote), self.mSha256(_local))
+        self.assertEqual(_engine.mGetStats()["resumed_bytes"], 2048)
+
+        # Partial file not matching the local one is rewritten
+        with open(ebSftpXferPartPath(_remote), 'wb') as _fd:
+            _fd.write(b"\1" * 3000)
+        _engine = ebSftpTransfer(LocalSftp, mLocalExec, aStreams=2, aBlockSize=1024)
+        _engine.mTransfer([(_local, _remote)])
+        self.assertEqual(self.mSha256(_remote), self.mSha256(_local))
+        self.assertEqual(_engine.mGetStats()["resumed_bytes"], 0)
+
+    def test_mTransfer_errors(self):
+        ebLogInfo("Running unit test on ebSftpTransfer.mTransfer errors")
+        _local = self.mCreateFile("image.img", 4096)
+        _remote = _local + ".remote"
+
+        _engine = ebSftpTransfer(lambda: LocalSftp(aFailWrites=True), mLocalExec, aStreams=2, aBlockSize=1024)
+        with self.assertRaises(ExacloudRuntimeError):
+            _engine.mTransfer([(_local, _remote)])
+        self.assertFalse(os.path.exists(_remote))
+
+        # Remote checksum mismatch removes the partial file
+        _engine = ebSftpTransfer(LocalSftp, lambda aCmd: (0, "0" * 64 + "  file"), aStreams=2, aBlockSize=1024)
+        with self.assertRaises(ExacloudRuntimeError):
+            _engine.mTransfer([(_local, _remote)])
+        self.assertFalse(os.path.exists(_remote))
+        self.assertFalse(os.path.exists(ebSftpXferPartPath(_remote)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,12 @@
 #      NA
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Streaming execution honors aDecodeUtf8
+#    jydas       10/18/26 - Pooled transports are only reused for the same key
+#    jydas       10/18/26 - Add tests for the streaming retry and the timeout
+#                           of a never ending output
+#    jydas       10/18/26 - Add tests for pooled transports
+#    jydas       10/18/26 - Add tests for streaming execution
 #    pbellary    03/10/25 - Bug 35816658 - ETF: FIXED test_mSetupPwdLess & test_mSetupSSHKey testcases
 #    prsshukl    02/06/25 - Enh 37562404 - ETF: DISABLE TESTS_SSHGEN UNTIL
 #                           LOGIC GET FIXED
@@ -35,6 +41,7 @@ import uuid
 import shutil
 import re
 import builtins
+import threading
 from unittest import mock
 from exabox.log.LogMgr import ebLogInfo
 from exabox.core.Error import ExacloudRuntimeError
@@ -44,6 +51,8 @@ from unittest.mock import patch, MagicMock, PropertyMock, mock_open
 from exabox.core.Context import get_gcontext
 from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
 from exabox.network.osds.sshgen import sshconn, execute_local, validate_hostname, validate_user, ping_host, setup_ssh_key, setup_remote_host
+from exabox.network.osds.sshgen import ebSshStreamBuffer, SSH_STREAM_TIMEOUT_EXITCODE
+from exabox.network.osds.sshpool import ebGetSshTransportPool
 
 SSH_PUB = "ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAABgQDa4Wn/bcdeoOgjWZyBbfJL/snzHraj+c1Purlp2OcZt5m3fEeGz3Hdezlmq252Xjp1Ihv3yD7uErQL4BzxAYH3rYw/MO7u7cy76wuhIjNJ9iSU8SO6mIoZhCGUu9FUGMrnhwZeK8yQEITjsdomswBvJCrRIpRWICYgLAYn53orsmTiUNMrPwAvkruXDrXF80LX2UWqNyB1L+5tphcm+MKM8iNKTWgAvhxw+3MZvOQnR5yc1LfoACU4C84DXBSpSWI2e1w46bf7e6otIS9UpB5ijx5FialUtHj9fD95TqbH8CuW3qo1WD5jB4LqEPO8JToY+IcWn2HT7ZV1UAPIRDajpSrQU9sFel+kRD8ujSN9ythuGaTcGtRuxd1Idu7LFlT7lMbHM9bCaL5Wam5rKAYy5+jkkhOERuCnd/vquAmLO22dpNfJiGtvbzhgh1ISrPvmDxepw5OztDOY3YN2n8wJadJde1snAjgiWZUI724QtIlYr4yr+1dqsK4cddHomBO0="
 
@@ -220,6 +229,44 @@ class MockBuffer(object):
     def write(self, data):
         pass
 
+class MockStreamChannel(object):
+    """Channel returning the given chunks as if produced by a running command."""
+
+    def __init__(self, aOut=None, aErr=None, aExitStatus=0, aFinished=True):
+        self.__out = list(aOut or [])
+        self.__err = list(aErr or [])
+        self.__exit_status = aExitStatus
+        self.__finished = aFinished
+        self.eof_received = aFinished
+        self.status_event = threading.Event()
+        self.closed = False
+        if aFinished:
+            self.status_event.set()
+
+    def exec_command(self, command):
+        pass
+
+    def recv_ready(self):
+        return len(self.__out) > 0
+
+    def recv_stderr_ready(self):
+        return len(self.__err) > 0
+
+    def recv(self, nbytes):
+        return self.__out.pop(0)
+
+    def recv_stderr(self, nbytes):
+        return self.__err.pop(0)
+
+    def exit_status_ready(self):
+        return self.__finished and not self.__out and not self.__err
+
+    def recv_exit_status(self):
+        return self.__exit_status
+
+    def close(self):
+        self.closed = True
+
 class ebTestSshConn(ebTestClucontrol):
 
     @classmethod
@@ -238,6 +285,55 @@ class ebTestSshConn(ebTestClucontrol):
             _node.mConnect(aTimeout=None, aKeyOnly=None, aRetryStrategy=True)
             _node.mDisconnect()
     
+    def test_mConnect_pooled(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on sshcon.mConnect with transport pool")
+        _options = copy.deepcopy(self.mGetClubox().mGetArgsOptions())
+        _host = "iad103712exdcl10.iad103712exd.adminiad1.oraclevcn.com"
+        _kmsEntry = MagicMock()
+        _kmsEntry.mGetPrivateKey.return_value = "PRIVATE"
+        _kmsEntry.mGetVersion.return_value = "ECDSA"
+        _client = MockSSHClient()
+        _client.connect = mock.Mock()
+        _sshclient = mock.Mock(return_value=_client)
+
+        get_gcontext().mSetConfigOption('ssh_transport_pool_enabled', 'True')
+        try:
+            with mock.patch.object(paramiko, "SSHClient", _sshclient), \
+                 mock.patch.object(paramiko.ECDSAKey, "from_private_key"):
+                _first = sshconn(_host, _options)
+                _first.mSetUser("root")
+                _first.mSetExaKmsEntry(_kmsEntry)
+                _first.mConnect()
+                self.assertIsNotNone(_first.mGetPooledTransport())
+                _first.mDisconnect()
+                self.assertIsNone(_first.mGetClient())
+
+                # Second connection reuses the authenticated transport
+                _second = sshconn(_host, _options)
+                _second.mSetUser("root")
+                _second.mSetExaKmsEntry(_kmsEntry)
+                _second.mConnect()
+                self.assertIs(_second.mGetClient(), _client)
+                self.assertEqual(_sshclient.call_count, 1)
+
+                # Another key never gets the transport of the first one
+                _otherKms = MagicMock()
+                _otherKms.mGetPrivateKey.return_value = "OTHER"
+                _otherKms.mGetVersion.return_value = "ECDSA"
+                _third = sshconn(_host, _options)
+                _third.mSetUser("root")
+                _third.mSetExaKmsEntry(_otherKms)
+                _third.mConnect()
+                self.assertEqual(_sshclient.call_count, 2)
+                _third.mDisconnect(aDiscardPooled=True)
+
+                _second.mDisconnect(aDiscardPooled=True)
+                self.assertEqual(ebGetSshTransportPool().mGetSize(), 0)
+        finally:
+            get_gcontext().mSetConfigOption('ssh_transport_pool_enabled', 'False')
+            ebGetSshTransportPool().mCloseConnections()
+
     def test_mIsConnectable(self):
         ebLogInfo("")
         ebLogInfo("Running unit test on sshcon.mIsConnectable")
@@ -273,6 +369,131 @@ class ebTestSshConn(ebTestClucontrol):
             self.assertEqual(_node.mGetCmdExitStatus(), True)
             _node.mDisconnect()
 
+    def test_ebSshStreamBuffer(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on ebSshStreamBuffer")
+
+        _buffer = ebSshStreamBuffer()
+        _buffer.mAppend(b"abc")
+        _buffer.mAppend(b"")
+        _buffer.mAppend(b"def")
+        self.assertEqual(_buffer.mGetValue(), b"abcdef")
+        self.assertFalse(_buffer.mIsTruncated())
+        self.assertEqual(_buffer.mGetStream().read(), "abcdef")
+
+        _bounded = ebSshStreamBuffer(4)
+        _bounded.mAppend(b"abc")
+        _bounded.mAppend(b"defgh")
+        self.assertEqual(_bounded.mGetValue(), b"efgh")
+        self.assertEqual(_bounded.mGetSize(), 4)
+        self.assertEqual(_bounded.mGetDroppedBytes(), 4)
+        self.assertTrue(_bounded.mIsTruncated())
+
+    def test_mStreamExecuteCmd(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on sshcon.mStreamExecuteCmd")
+        _options = copy.deepcopy(self.mGetClubox().mGetArgsOptions())
+        _chunks = [b"line1\nli", b"ne2\n" * 1024]
+        _channel = MockStreamChannel(aOut=_chunks, aErr=[b"warn\n"], aExitStatus=3)
+        _received = []
+        with mock.patch.object(paramiko, "SSHClient", mock.Mock(return_value=MockSSHClient()) ):
+            _node = sshconn("iad103712exdcl09.iad103712exd.adminiad1.oraclevcn.com", _options)
+            _node.mSetUser("root")
+            _node.mConnect()
+            _node.mGetClient().get_transport().open_session = mock.Mock(return_value=_channel)
+            _, _o, _e = _node.mExecuteCmd("cat big.log", aStdoutCallback=_received.append)
+            self.assertEqual(_o.read(), "line1\nli" + "ne2\n" * 1024)
+            self.assertEqual(_e.read(), "warn\n")
+            self.assertEqual(_received, _chunks)
+            self.assertEqual(_node.mGetCmdExitStatus(), 3)
+            self.assertTrue(_channel.closed)
+            _node.mDisconnect()
+
+    def test_mStreamExecuteCmd_decode(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on sshcon.mStreamExecuteCmd with aDecodeUtf8")
+        _options = copy.deepcopy(self.mGetClubox().mGetArgsOptions())
+        _channel = MockStreamChannel(aOut=["caf\u00e9\n".encode("utf-8")], aErr=[b"warn\n"])
+        with mock.patch.object(paramiko, "SSHClient", mock.Mock(return_value=MockSSHClient()) ):
+            _node = sshconn("iad103712exdcl09.iad103712exd.adminiad1.oraclevcn.com", _options)
+            _node.mSetUser("root")
+            _node.mConnect()
+            _node.mGetClient().get_transport().open_session = mock.Mock(return_value=_channel)
+            _, _o, _e = _node.mExecuteCmd("cat menu.txt", aStream=True, aDecodeUtf8=True)
+            self.assertIsInstance(_o, io.StringIO)
+            self.assertEqual(_o.read(), "caf\u00e9\n")
+            self.assertEqual(_e.read(), "warn\n")
+            _node.mDisconnect()
+
+    def test_mStreamExecuteCmd_timeout(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on sshcon.mStreamExecuteCmd with timeout")
+        _options = copy.deepcopy(self.mGetClubox().mGetArgsOptions())
+        _channel = MockStreamChannel(aOut=[b"partial"], aFinished=False)
+        with mock.patch.object(paramiko, "SSHClient", mock.Mock(return_value=MockSSHClient())), \
+             mock.patch("exabox.network.osds.sshgen.select.select", return_value=([], [], [])):
+            _node = sshconn("iad103712exdcl09.iad103712exd.adminiad1.oraclevcn.com", _options)
+            _node.mSetUser("root")
+            _node.mConnect()
+            _node.mGetClient().get_transport().open_session = mock.Mock(return_value=_channel)
+            _, _o, _ = _node.mStreamExecuteCmd("sleep 100", aTimeout=0.01)
+            self.assertEqual(_o.read(), "partial")
+            self.assertEqual(_node.mGetCmdExitStatus(), SSH_STREAM_TIMEOUT_EXITCODE)
+            self.assertTrue(_channel.closed)
+            _node.mDisconnect()
+
+    def test_mStreamExecuteCmd_no_retry_after_output(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on sshcon.mStreamExecuteCmd failing after the first chunk")
+        _options = copy.deepcopy(self.mGetClubox().mGetArgsOptions())
+        _channel = MockStreamChannel(aOut=[b"first", b"second"], aFinished=False)
+        _channel.recv = mock.Mock(side_effect=[b"first", EOFError("connection lost")])
+        _received = []
+        with mock.patch.object(paramiko, "SSHClient", mock.Mock(return_value=MockSSHClient()) ):
+            _node = sshconn("iad103712exdcl09.iad103712exd.adminiad1.oraclevcn.com", _options)
+            _node.mSetUser("root")
+            _node.mConnect()
+            _open = mock.Mock(return_value=_channel)
+            _node.mGetClient().get_transport().open_session = _open
+            with self.assertRaises(EOFError):
+                _node.mStreamExecuteCmd("cat big.log", aStdoutCallback=_received.append)
+            # The command is not run again, the chunk is not sent twice
+            self.assertEqual(_open.call_count, 1)
+            self.assertEqual(_received, [b"first"])
+            _node.mDisconnect()
+
+    def test_mStreamExecuteCmd_timeout_endless_output(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on sshcon.mStreamExecuteCmd with timeout and endless output")
+        _options = copy.deepcopy(self.mGetClubox().mGetArgsOptions())
+        _channel = MockStreamChannel(aFinished=False)
+        _channel.recv_ready = mock.Mock(return_value=True)
+        _channel.recv = mock.Mock(return_value=b"y\n")
+        with mock.patch.object(paramiko, "SSHClient", mock.Mock(return_value=MockSSHClient()) ):
+            _node = sshconn("iad103712exdcl09.iad103712exd.adminiad1.oraclevcn.com", _options)
+            _node.mSetUser("root")
+            _node.mConnect()
+            _node.mGetClient().get_transport().open_session = mock.Mock(return_value=_channel)
+            _node.mStreamExecuteCmd("yes", aTimeout=0.05, aMaxBufferSize=64)
+            self.assertEqual(_node.mGetCmdExitStatus(), SSH_STREAM_TIMEOUT_EXITCODE)
+            self.assertTrue(_channel.closed)
+            _node.mDisconnect()
+
+    def test_mIterExecuteCmd(self):
+        ebLogInfo("")
+        ebLogInfo("Running unit test on sshcon.mIterExecuteCmd")
+        _options = copy.deepcopy(self.mGetClubox().mGetArgsOptions())
+        _channel = MockStreamChannel(aOut=[b"a\nb", b"c\nlast"], aErr=[b"err\n"])
+        with mock.patch.object(paramiko, "SSHClient", mock.Mock(return_value=MockSSHClient()) ):
+            _node = sshconn("iad103712exdcl09.iad103712exd.adminiad1.oraclevcn.com", _options)
+            _node.mSetUser("root")
+            _node.mConnect()
+            _node.mGetClient().get_transport().open_session = mock.Mock(return_value=_channel)
+            _lines = list(_node.mIterExecuteCmd("cellcli -e list griddisk"))
+            self.assertEqual(_lines, [(False, "a\n"), (False, "bc\n"), (True, "err\n"), (False, "last")])
+            self.assertEqual(_node.mGetCmdExitStatus(), 0)
+            _node.mDisconnect()
+
     def test_mExecuteCmdLog(self):
         ebLogInfo("")
         ebLogInfo("Running unit test on sshcon.mExecuteCmdLog")
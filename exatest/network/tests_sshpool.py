@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/network/tests_sshpool.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_sshpool.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_sshpool.py - Unit tests for exabox/network/osds/sshpool.py
+#
+#    DESCRIPTION
+#      Unit tests for the process wide SSH transport pool
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#    jydas       10/18/26 - Exact host match in mCloseConnections
+#    jydas       10/18/26 - Fail instead of exceeding the channel cap
+#
+
+import unittest
+from unittest.mock import patch, MagicMock
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.core.Error import ExacloudRuntimeError
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.network.osds.sshpool import (ebSshTransportPool, ebSshKeyFingerprint,
+                                         ebGetSshTransportPool)
+
+def mBuildClient(aActive=True):
+    _client = MagicMock()
+    _client.get_transport.return_value.is_active.return_value = aActive
+    return _client
+
+def mBuildKmsEntry(aPrivateKey="PRIVATE-KEY-1"):
+    _entry = MagicMock()
+    _entry.mGetPrivateKey.return_value = aPrivateKey
+    return _entry
+
+class ebTestSshTransportPool(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestSshTransportPool, self).setUpClass(aGenerateDatabase=False)
+
+    def test_ebSshKeyFingerprint(self):
+        ebLogInfo("Running unit test on ebSshKeyFingerprint")
+        self.assertIsNone(ebSshKeyFingerprint(None))
+        self.assertEqual(ebSshKeyFingerprint(mBuildKmsEntry("a")), ebSshKeyFingerprint(mBuildKmsEntry("a")))
+        self.assertNotEqual(ebSshKeyFingerprint(mBuildKmsEntry("a")), ebSshKeyFingerprint(mBuildKmsEntry("b")))
+
+    def test_mAcquire_reuse(self):
+        ebLogInfo("Running unit test on ebSshTransportPool.mAcquire reuse")
+        _pool = ebSshTransportPool()
+        self.assertIsNone(_pool.mAcquire("root", "dom0a"))
+
+        _kms = mBuildKmsEntry()
+        _client = mBuildClient()
+        _entry = _pool.mRegister("root", "dom0a", _kms, _client)
+        _client.get_transport.return_value.set_keepalive.assert_called_once_with(30)
+        _pool.mRelease(_entry)
+
+        _reused = _pool.mAcquire("root", "dom0a")
+        self.assertIs(_reused, _entry)
+        self.assertIs(_reused.mGetExaKmsEntry(), _kms)
+        self.assertEqual(_reused.mGetBorrowers(), 1)
+
+        # Different key or different user never match
+        self.assertIsNone(_pool.mAcquire("root", "dom0a", ebSshKeyFingerprint(mBuildKmsEntry("other"))))
+        self.assertIsNone(_pool.mAcquire("opc", "dom0a"))
+        self.assertEqual(_pool.mGetStats()["hits"], 1)
+
+    def test_mAcquire_inactive(self):
+        ebLogInfo("Running unit test on ebSshTransportPool.mAcquire with dead transport")
+        _pool = ebSshTransportPool()
+        _client = mBuildClient()
+        _entry = _pool.mRegister("root", "cell01", mBuildKmsEntry(), _client)
+        _pool.mRelease(_entry)
+
+        _client.get_transport.return_value.is_active.return_value = False
+        self.assertIsNone(_pool.mAcquire("root", "cell01"))
+        self.assertTrue(_entry.mIsClosed())
+        _client.close.assert_called_once()
+        self.assertEqual(_pool.mGetSize(), 0)
+
+    def test_mAcquire_channel_cap(self):
+        ebLogInfo("Running unit test on ebSshTransportPool.mAcquire channel cap")
+        _pool = ebSshTransportPool(aMaxChannels=1, aMaxTransportsPerHost=2)
+        _first = _pool.mRegister("root", "dom0b", mBuildKmsEntry(), mBuildClient())
+
+        # Saturated transport and room for another one: caller opens a new one
+        self.assertIsNone(_pool.mAcquire("root", "dom0b"))
+        _second = _pool.mRegister("root", "dom0b", mBuildKmsEntry(), mBuildClient())
+
+        # Host cap reached: least loaded transport is shared
+        _shared = _pool.mAcquire("root", "dom0b")
+        self.assertIn(_shared, [_first, _second])
+        self.assertEqual(_pool.mGetSize(), 2)
+
+    def test_mChannelSlot_timeout(self):
+        ebLogInfo("Running unit test on ebSshPooledTransport.mChannelSlot timeout")
+        _pool = ebSshTransportPool(aMaxChannels=1, aChannelWait=0)
+        _entry = _pool.mRegister("root", "dom0f", mBuildKmsEntry(), mBuildClient())
+
+        with _entry.mChannelSlot():
+            with self.assertRaises(ExacloudRuntimeError):
+                with _entry.mChannelSlot():
+                    pass
+
+        # Slot is given back once the channel is done
+        with _entry.mChannelSlot():
+            pass
+
+    def test_mEvictIdle(self):
+        ebLogInfo("Running unit test on ebSshTransportPool idle eviction")
+        _pool = ebSshTransportPool(aIdleTTL=0)
+        _client = mBuildClient()
+        _entry = _pool.mRegister("root", "dom0c", mBuildKmsEntry(), _client)
+        _pool.mRelease(_entry)
+        _pool.mEvictIdle()
+        self.assertEqual(_pool.mGetSize(), 0)
+        _client.close.assert_called_once()
+
+    def test_mEvictLRU(self):
+        ebLogInfo("Running unit test on ebSshTransportPool LRU eviction")
+        _pool = ebSshTransportPool(aMaxTransports=1)
+        _old = _pool.mRegister("root", "dom0d", mBuildKmsEntry(), mBuildClient())
+        _pool.mRelease(_old)
+        _new = _pool.mRegister("root", "dom0e", mBuildKmsEntry(), mBuildClient())
+        self.assertTrue(_old.mIsClosed())
+        self.assertFalse(_new.mIsClosed())
+        self.assertEqual(_pool.mGetSize(), 1)
+
+    def test_mCloseConnections(self):
+        ebLogInfo("Running unit test on ebSshTransportPool.mCloseConnections")
+        _pool = ebSshTransportPool()
+        _busy = _pool.mRegister("root", "vm01.example.com", mBuildKmsEntry(), mBuildClient())
+        _idle = _pool.mRegister("root", "vm02.example.com", mBuildKmsEntry(), mBuildClient())
+        _pool.mRelease(_idle)
+
+        # Only exact host names match
+        _pool.mCloseConnections(aHost="vm0")
+        _pool.mCloseConnections(aHost="vm01")
+        self.assertEqual(_pool.mGetSize(), 2)
+
+        _pool.mCloseConnections(aHost="vm01.example.com")
+        self.assertFalse(_busy.mIsClosed())
+        self.assertEqual(_pool.mGetSize(), 1)
+
+        # Borrowed transport is closed once released
+        _pool.mRelease(_busy)
+        self.assertTrue(_busy.mIsClosed())
+        self.assertFalse(_idle.mIsClosed())
+
+    def test_ebGetSshTransportPool_fork(self):
+        ebLogInfo("Running unit test on ebGetSshTransportPool after fork")
+        _pool = ebGetSshTransportPool()
+        self.assertIs(_pool, ebGetSshTransportPool())
+
+        with patch("exabox.network.osds.sshpool.os.getpid", return_value=_pool.mGetPid() + 1):
+            _child = ebGetSshTransportPool()
+        self.assertIsNot(_pool, _child)
+
+if __name__ == '__main__':
+    unittest.main()
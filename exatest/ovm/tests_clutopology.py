@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/ovm/tests_clutopology.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_clutopology.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_clutopology.py - Unit tests for exabox/ovm/clutopology.py
+#
+#    DESCRIPTION
+#      Unit tests for the memoized cluster topology and the hostname indexes
+#      of ebCluMachinesConfig and ebCluNetworksConfig
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#    jydas       10/18/26 - Topology generation and network hostname index
+#
+
+import os
+import json
+import tempfile
+import unittest
+import xml.etree.ElementTree as etree
+from unittest.mock import MagicMock
+
+from exabox.ovm.cluconfig import ebCluMachinesConfig, ebCluNetworksConfig
+from exabox.ovm.clutopology import ebCluTopology, ebGetPayloadNodeFilters, ebTopologyMutator, \
+    ebGetTopologyGeneration
+
+_MACHINES_XML = """
+<machines>
+  <machine id="dom0a_id"><hostName>dom0a.example.com</hostName><osType>LinuxKVMHost</osType>
+    <machine id="domua_id"/></machine>
+  <machine id="domua_id"><hostName>domua.example.com</hostName><osType>LinuxKVMGuest</osType></machine>
+</machines>
+"""
+
+_NETWORKS_XML = """
+<networks>
+  <network id="domua_admin"><hostName>domua</hostName><domainName>example.com</domainName></network>
+  <network id="domua_client"><hostName>domua-client</hostName><domainName>example.com</domainName></network>
+</networks>
+"""
+
+class ebTestCluTopology(unittest.TestCase):
+
+    def test_ebGetPayloadNodeFilters(self):
+        self.assertEqual(ebGetPayloadNodeFilters(None), ((), ()))
+        self.assertEqual(ebGetPayloadNodeFilters({"ComputeNodeList": ["dom0a"]}), (("dom0a",), ()))
+        self.assertEqual(ebGetPayloadNodeFilters('{"StorageNodeList": ["cel01"]}'), ((), ("cel01",)))
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as _fd:
+            json.dump({"ComputeNodeList": ["dom0a"]}, _fd)
+        try:
+            self.assertEqual(ebGetPayloadNodeFilters(_fd.name), (("dom0a",), ()))
+
+            # Changed payload file is parsed again
+            with open(_fd.name, "w") as _out:
+                json.dump({"ComputeNodeList": ["dom0a", "dom0b"]}, _out)
+            _st = os.stat(_fd.name)
+            os.utime(_fd.name, ns=(_st.st_atime_ns, _st.st_mtime_ns + 10**9))
+            self.assertEqual(ebGetPayloadNodeFilters(_fd.name), (("dom0a", "dom0b"), ()))
+        finally:
+            os.unlink(_fd.name)
+
+    def test_mGetValue(self):
+        _topology = ebCluTopology(("key",))
+        _compute = MagicMock(return_value={"cel01": [["cel01", "admin"]]})
+
+        _value = _topology.mGetValue("cell_nodes", (False,), _compute)
+        _value["cel02"] = []
+        _again = _topology.mGetValue("cell_nodes", (False,), _compute)
+
+        # Computed once, callers get copies
+        _compute.assert_called_once()
+        self.assertEqual(_again, {"cel01": [["cel01", "admin"]]})
+        self.assertEqual(_topology.mGetStats(), {"hits": 1, "misses": 1})
+
+        _topology.mGetValue("cell_nodes", (True,), _compute)
+        self.assertEqual(_compute.call_count, 2)
+
+    def test_ebTopologyMutator(self):
+
+        class _CluCtrl(object):
+            mInvalidateTopology = MagicMock()
+
+            @ebTopologyMutator
+            def mPatch(self):
+                raise ValueError("Failure")
+
+        with self.assertRaises(ValueError):
+            _CluCtrl().mPatch()
+        _CluCtrl.mInvalidateTopology.assert_called_once()
+
+    def test_mGetMachineConfig_hostname_index(self):
+        _config = MagicMock()
+        _config.mGetConfigElement.return_value = etree.fromstring(_MACHINES_XML)
+        _machines = ebCluMachinesConfig(_config)
+
+        self.assertEqual(_machines.mGetMachineConfig("domua").mGetMacId(), "domua_id")
+        self.assertEqual(_machines.mGetMachineConfig("domua.example.com").mGetMacId(), "domua_id")
+        self.assertIsNone(_machines.mGetMachineConfig("unknown.example.com"))
+
+        # Renamed in place
+        _machines.mGetMachineConfig("domua_id").mSetMacHostName("domub.example.com")
+        self.assertIsNone(_machines.mGetMachineConfig("domua.example.com"))
+        self.assertEqual(_machines.mGetMachineConfig("domub.example.com").mGetMacId(), "domua_id")
+
+    def test_topology_generation(self):
+        _config = MagicMock()
+        _config.mGetConfigElement.return_value = etree.fromstring(_MACHINES_XML)
+        _machines = ebCluMachinesConfig(_config)
+
+        # In place changes of the XML objects change the topology key
+        _generation = ebGetTopologyGeneration()
+        _machines.mGetMachineConfig("domua_id").mSetMacHostName("domub.example.com")
+        self.assertGreater(ebGetTopologyGeneration(), _generation)
+
+        _generation = ebGetTopologyGeneration()
+        _machines.mRemoveMachinesConfig(["domua"])
+        self.assertGreater(ebGetTopologyGeneration(), _generation)
+
+    def test_mGetNetworkConfigByName_hostname_index(self):
+        _config = MagicMock()
+        _config.mGetConfigElement.return_value = etree.fromstring(_NETWORKS_XML)
+        _networks = ebCluNetworksConfig(_config)
+
+        self.assertEqual(_networks.mGetNetworkConfigByName("domua").mGetNetId(), "domua_admin")
+        self.assertEqual(_networks.mGetNetworkConfigByName("domua-client.example.com").mGetNetId(), "domua_client")
+        self.assertIsNone(_networks.mGetNetworkConfigByName("unknown"))
+
+        # Renamed in place
+        _networks.mGetNetworkConfig("domua_client").mSetNetHostName("domub-client")
+        self.assertIsNone(_networks.mGetNetworkConfigByName("domua-client.example.com"))
+        self.assertEqual(_networks.mGetNetworkConfigByName("domub-client").mGetNetId(), "domua_client")
+
+if __name__ == '__main__':
+    unittest.main()
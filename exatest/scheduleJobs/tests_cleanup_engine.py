@@ -0,0 +1,131 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/exatest/scheduleJobs/tests_cleanup_engine.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_cleanup_engine.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_cleanup_engine.py - Unit tests for scheduleJobs.cleanup_engine
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+from exabox.scheduleJobs.cleanup_engine import ebCleanupEngine, ebCleanupPolicy, ebCleanupThrottle
+
+
+class ebTestCleanupEngine(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(cls):
+        super(ebTestCleanupEngine, cls).setUpClass(True, False)
+
+    def setUp(self):
+        self.__dir = tempfile.mkdtemp()
+        self.__state = os.path.join(self.__dir, "state")
+
+    def tearDown(self):
+        shutil.rmtree(self.__dir, ignore_errors=True)
+
+    def mCreate(self, aPath, aAgeSec=0, aSize=10):
+        _path = os.path.join(self.__dir, aPath)
+        os.makedirs(os.path.dirname(_path), exist_ok=True)
+        with open(_path, "w") as _fd:
+            _fd.write("x" * aSize)
+        _mtime = time.time() - aAgeSec
+        os.utime(_path, (_mtime, _mtime))
+        return _path
+
+    def mEngine(self, aTimeBudget=60):
+        return ebCleanupEngine(aStateDir=self.__state, aThreads=2, aTimeBudget=aTimeBudget,
+                               aThrottle=ebCleanupThrottle(0, 0))
+
+    def test_incremental_archive(self):
+        _old = self.mCreate("threads/a/uuid1_x.log", 7200, 100)
+        _new = self.mCreate("threads/a/uuid2_y.log")
+        _running = self.mCreate("threads/b/c/uuid3_z.trc", 7200)
+        self.mCreate("threads/b/ignored.txt", 7200)
+        _archive = os.path.join(self.__dir, "archive")
+
+        _policy = ebCleanupPolicy("threads", os.path.join(self.__dir, "threads"), ("*.log*", "*.trc*"),
+                                  aMaxAgeSec=3600, aArchiveDir=_archive,
+                                  aFilter=lambda aPath: "uuid3" not in aPath)
+
+        _report = self.mEngine().mRun([_policy])["threads"]
+        self.assertEqual((_report["archived"], _report["bytes"], _report["skipped"]), (1, 100, 1))
+        self.assertEqual(_report["entries"], 2)
+        self.assertTrue(_report["complete"])
+        self.assertFalse(os.path.exists(_old))
+        self.assertTrue(os.path.exists(os.path.join(_archive, "uuid1_x.log")))
+        self.assertTrue(os.path.exists(_new) and os.path.exists(_running))
+
+        # threads/a changed with the archive of uuid1_x.log, then nothing to list
+        self.assertEqual(self.mEngine().mRun([_policy])["threads"]["dirs_listed"], 1)
+        _report = self.mEngine().mRun([_policy])["threads"]
+        self.assertEqual((_report["dirs_listed"], _report["dirs_unchanged"]), (0, 4))
+
+        # Only the directory with a new entry is listed again
+        _late = self.mCreate("threads/b/c/uuid4_w.log", 7200)
+        _report = self.mEngine().mRun([_policy])["threads"]
+        self.assertEqual((_report["dirs_listed"], _report["entries_new"], _report["archived"]), (1, 1, 1))
+        self.assertFalse(os.path.exists(_late))
+
+        # A directory removed outside of the engine is forgotten
+        shutil.rmtree(os.path.join(self.__dir, "threads/b"))
+        self.assertEqual(self.mEngine().mRun([_policy])["threads"]["entries"], 1)
+
+    def test_limits_and_budget(self):
+        for _idx in range(5):
+            self.mCreate(f"log/database_{_idx}.log", 100 - _idx)
+        self.mCreate("log/database_err", 1000)
+        self.mCreate("log/sub/database_old.log", 1000)
+
+        _policy = ebCleanupPolicy("database_log", os.path.join(self.__dir, "log"), ("database_*",),
+                                  aMaxFiles=3, aMaxAgeSec=97.5, aExclude=lambda aPath: aPath.endswith("err"))
+
+        # No budget: nothing done, the scan resumes at the next run
+        _report = self.mEngine(aTimeBudget=0).mRun([_policy])["database_log"]
+        self.assertEqual((_report["complete"], _report["dirs_listed"], _report["removed"]), (False, 0, 0))
+
+        _report = self.mEngine().mRun([_policy])["database_log"]
+        self.assertTrue(_report["resumed"])
+        self.assertEqual(_report["removed"], 4)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.__dir, "log"))),
+                         ["database_3.log", "database_4.log", "database_err", "sub"])
+
+    def test_directories(self):
+        self.mCreate("requests.bak/req1/file", 7200)
+        os.utime(os.path.join(self.__dir, "requests.bak/req1"), (time.time() - 7200, time.time() - 7200))
+        self.mCreate("requests.bak/req2/file")
+        self.mCreate("requests.bak/old.tar.gz", 7200)
+        _archive = os.path.join(self.__dir, "archive")
+
+        _policy = ebCleanupPolicy("requests_bak", os.path.join(self.__dir, "requests.bak"), ("*",),
+                                  aMaxDepth=1, aDirs=True, aMaxAgeSec=3600, aArchiveDir=_archive)
+        _report = self.mEngine().mRun([_policy])["requests_bak"]
+
+        self.assertEqual((_report["archived"], _report["dirs_listed"]), (2, 1))
+        self.assertEqual(sorted(os.listdir(_archive)), ["old.tar.gz", "req1"])
+        self.assertEqual(os.listdir(os.path.join(self.__dir, "requests.bak")), ["req2"])
+
+    def test_throttle(self):
+        _throttle = ebCleanupThrottle(aOpsPerSec=100, aBytesPerSec=1000)
+        _start = time.monotonic()
+        for _ in range(10):
+            _throttle.mConsume()
+        _throttle.mConsume(1, 100)
+        self.assertGreaterEqual(time.monotonic() - _start, 0.15)
+        self.assertGreater(_throttle.mGetSlept(), 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
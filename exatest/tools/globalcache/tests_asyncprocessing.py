@@ -16,6 +16,9 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add test for the wakeup of an ended thread
+#    jydas       10/18/26 - Add return value, lazy manager and thread backend
+#                           tests
 #    ririgoye    01/23/24 - Bug 36206720 - EXACS:EXACLOUD:MULTIPROCESS FAILED
 #                           WHEN REACHING THE LIMIT
 #    ririgoye    01/23/24 - Creation
@@ -23,9 +26,11 @@
 
 import time
 import unittest
+from unittest.mock import patch
 
-from exabox.BaseServer.AsyncProcessing import ProcessManager, ProcessStructure
+from exabox.BaseServer.AsyncProcessing import ProcessManager, ProcessStructure, ProcessBackend, TimeoutBehavior
 from exabox.core.Context import get_gcontext
+from exabox.core.Error import ExacloudRuntimeError
 from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
 
 
@@ -48,6 +53,71 @@ class ebTestAsyncProcessing(ebTestClucontrol):
 
         _plist.mJoinProcess()
 
+    def test_process_manager_return_values(self):
+        def my_return(aValue):
+            return aValue
+
+        _plist = ProcessManager()
+        _plist.mStartAppend(ProcessStructure(my_return, ["small"]))
+        # Bigger than the pipe buffer, must not block the child
+        _plist.mStartAppend(ProcessStructure(my_return, ["x" * (1024 * 1024)]))
+        _plist.mJoinProcess()
+
+        _rcs = _plist.mGetReturnValues()
+        self.assertEqual(_rcs[0], "small")
+        self.assertEqual(len(_rcs[1]), 1024 * 1024)
+        self.assertEqual(_plist.mGetStatus(), "done")
+
+    def test_process_manager_lazy_manager(self):
+        _plist = ProcessManager()
+        _plist.mStartAppend(ProcessStructure(time.sleep, [0]))
+        _plist.mJoinProcess()
+        self.assertFalse(_plist._ProcessManager__managerStarted)
+
+        _shared = _plist.mGetManager().list()
+        _shared.append(1)
+        self.assertTrue(_plist._ProcessManager__managerStarted)
+
+    def test_process_manager_thread_backend(self):
+        def my_return(aValue):
+            return aValue * 2
+
+        _plist = ProcessManager(aBackend=ProcessBackend.THREAD)
+        for i in range(4):
+            _plist.mStartAppend(ProcessStructure(my_return, [i]))
+        _plist.mJoinProcess()
+
+        self.assertEqual(_plist.mGetReturnValues(), [0, 2, 4, 6])
+        for _process in _plist.mGetProcessList():
+            self.assertEqual(_process.exitcode, 0)
+            self.assertIsNone(_process.pid)
+
+    def test_process_manager_thread_backend_wakeup(self):
+        _plist = ProcessManager(aBackend=ProcessBackend.THREAD)
+        _p = ProcessStructure(time.sleep, [0])
+        _plist.mStartAppend(_p)
+        _p.join()
+
+        # The event of the ended thread was cleared before the wait, as
+        # when it is set between two waits of mJoinProcess
+        _plist._ProcessManager__doneEvent.clear()
+        with patch.object(ProcessStructure, "is_alive", return_value=True):
+            _start = time.monotonic()
+            _plist.mWaitProcessEvents()
+        self.assertLess(time.monotonic() - _start, 5)
+
+    def test_process_manager_thread_backend_timeout(self):
+        _plist = ProcessManager(aBackend=ProcessBackend.THREAD)
+        _p = ProcessStructure(time.sleep, [5])
+        _p.mSetMaxExecutionTime(1)
+        _plist.mStartAppend(_p)
+
+        with self.assertRaises(ExacloudRuntimeError):
+            _plist.mJoinProcess()
+
+        self.assertEqual(_plist.mGetStatus(), "killed")
+        self.assertIn(_p.mGetId(), _plist.mGetKilledList())
+
 
 if __name__ == '__main__':
     unittest.main(warnings='ignore')
@@ -16,6 +16,8 @@
  History:
 
     MODIFIED   (MM/DD/YY)
+       jydas    10/18/26 - Add test for a failed move of the streamed image
+       jydas    10/18/26 - Add tree distribution unit tests
        joysjose 06/22/26 - Check OEDA replay cp status
        joysjose 06/22/26 - Test OEDA replay cp status failure
        joysjose 06/22/26 - Bug 39588664 validate OEDA alias before shell
@@ -551,6 +553,90 @@ class TestGlobalCacheWorker(ebTestClucontrol, unittest.TestCase):
 
         mock_create_connections.assert_not_called()
 
+    def test_mBuildStreamCmd(self):
+        _worker = GlobalCacheWorker(
+            "images/exatest_image.tgz",
+            "hash-new",
+            ["dom0a", "dom0b"])
+        _node = MagicMock()
+        _node.mFileExists.return_value = True
+
+        with patch.object(_worker, "mGetCopyLimitKbps", return_value=0):
+            _cmd = _worker.mBuildStreamCmd(_node, ["dom0a", "dom0b"])
+
+        self.assertIn("/bin/cat /EXAVMIMAGES/GlobalCache/exatest_image.tgz | /bin/ssh", _cmd)
+        self.assertIn("root@dom0a 'set -o pipefail; /usr/bin/tee /EXAVMIMAGES/GlobalCache/exatest_image.tgz.part | /usr/bin/sha256sum'", _cmd)
+        self.assertIn("root@dom0b", _cmd)
+        self.assertTrue(_cmd.endswith("wait"))
+
+        with patch.object(_worker, "mGetCopyLimitKbps", return_value=102400):
+            _cmd = _worker.mBuildStreamCmd(_node, ["dom0a"])
+        self.assertIn("/usr/bin/pv -q -L 102400k /EXAVMIMAGES/GlobalCache/exatest_image.tgz", _cmd)
+
+    def test_mStreamDom0ToDom0s(self):
+        _worker = GlobalCacheWorker(
+            "images/exatest_image.tgz",
+            "hash-new",
+            ["dom0a", "dom0b", "dom0c"])
+        _node = MagicMock()
+        _out = MagicMock()
+        _out.read.return_value = "dom0c 1 e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855 -\ndom0b 0 hash-new -\n"
+        _node.mExecuteCmd.return_value = (None, _out, None)
+        _worker._GlobalCacheWorker__connections = {"dom0a": _node}
+
+        _results = _worker.mStreamDom0ToDom0s("dom0a", ["dom0b", "dom0c"])
+        self.assertEqual(_results, {"dom0b": "hash-new", "dom0c": None})
+
+    def test_mDistributeDom0ToDom0_tree(self):
+        _dom0s = [f"dom0{_idx}" for _idx in range(7)]
+        _worker = GlobalCacheWorker(
+            "images/exatest_image.tgz",
+            "hash-new",
+            _dom0s)
+        _worker._GlobalCacheWorker__connections = {_dom0: MagicMock() for _dom0 in _dom0s}
+        for _node in _worker.mGetConnections().values():
+            _node.mGetCmdExitStatus.return_value = 0
+        _waves = []
+
+        def mStream(aFromDom0, aToDom0List):
+            _waves.append((aFromDom0, list(aToDom0List)))
+            return {_dom0: ("bad-hash" if _dom0 == "dom06" else "hash-new") for _dom0 in aToDom0List}
+
+        with patch.object(_worker, "mStreamDom0ToDom0s", side_effect=mStream), \
+             patch.object(_worker, "mGetTreeFanout", return_value=2), \
+             patch.object(_worker, "mCreateSymbolicLink"), \
+             patch.object(_worker, "mCalculateImageInfoState", return_value={"path": "p"}), \
+             patch.object(_worker, "mUpdateRemoteImageState") as mock_update:
+            _worker.mSetLocalCopyDom0s(["dom00"])
+            _worker.mDistributeDom0ToDom0(["dom00"], _dom0s[1:])
+
+        # Wave 1: dom00 -> 2 targets, wave 2: 3 sources -> 4 targets
+        self.assertEqual(_waves[0], ("dom00", ["dom01", "dom02"]))
+        self.assertEqual(len(_waves), 3)
+        self.assertEqual(sorted(sum([_targets for _, _targets in _waves], [])), _dom0s[1:])
+
+        # Corrupted stream is not promoted and is retried from exacloud
+        self.assertEqual(_worker.mGetLocalCopyDom0s(), ["dom00", "dom06"])
+        self.assertEqual(mock_update.call_count, 5)
+        _worker.mGetConnections()["dom06"].mExecuteCmd.assert_any_call(
+            "/bin/rm -f /EXAVMIMAGES/GlobalCache/exatest_image.tgz.part")
+
+    def test_mFinishDom0Transfer_move_failure(self):
+        _worker = GlobalCacheWorker(
+            "images/exatest_image.tgz",
+            "hash-new",
+            ["dom0a"])
+        _node = MagicMock()
+        _node.mGetCmdExitStatus.return_value = 1
+        _worker._GlobalCacheWorker__connections = {"dom0a": _node}
+
+        with patch.object(_worker, "mCreateSymbolicLink") as mock_link:
+            self.assertFalse(_worker.mFinishDom0Transfer("dom0a", "hash-new"))
+
+        mock_link.assert_not_called()
+        _node.mExecuteCmd.assert_called_once_with(
+            "/bin/rm -f /EXAVMIMAGES/GlobalCache/exatest_image.tgz.part")
+
 if __name__ == '__main__':
     unittest.main(warnings='ignore')
 
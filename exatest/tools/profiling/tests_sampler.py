@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/exatest/tools/profiling/tests_sampler.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# tests_sampler.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      tests_sampler.py - Unit tests for exabox/tools/profiling/sampler.py
+#
+#    DESCRIPTION
+#      Unit tests for the sampling profiler: stage attribution, collapsed
+#      stacks, DB row chunks and per request activation
+#
+#    NOTES
+#      NA
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add test for the depth limit of the stacks
+#    jydas       10/18/26 - Creation
+#
+
+import sys
+import time
+import unittest
+import threading
+
+from exabox.log.LogMgr import ebLogInfo
+from exabox.core.Context import get_gcontext
+from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
+import exabox.tools.profiling.sampler as sampler
+from exabox.tools.profiling.sampler import (ebSamplingProfiler, ebSamplingSetStage, ebSamplingEnabled,
+                                            ebSamplingProfilerStart, ebSamplingProfilerStop,
+                                            SAMPLER_NO_STAGE, SAMPLER_TRUNCATED)
+
+def _mInnerWait(aEvent):
+    aEvent.wait(10)
+
+def _mOuterWait(aEvent):
+    _mInnerWait(aEvent)
+
+class ebTestSampler(ebTestClucontrol):
+
+    @classmethod
+    def setUpClass(self):
+        super(ebTestSampler, self).setUpClass(aGenerateDatabase=False)
+
+    def setUp(self):
+        self.__event = threading.Event()
+        self.__thread = threading.Thread(target=_mOuterWait, args=(self.__event,), name="sampled")
+        self.__thread.start()
+
+    def tearDown(self):
+        self.__event.set()
+        self.__thread.join()
+        ebSamplingSetStage(None)
+
+    def test_sample(self):
+        ebLogInfo("Running unit test on ebSamplingProfiler.mSample")
+
+        _profiler = ebSamplingProfiler("uuid-1")
+        _profiler.mSample()
+        ebSamplingSetStage("CREATE_GI")
+        _profiler.mSample()
+        _profiler.mSample()
+
+        _stacks = _profiler.mGetStacks()
+        self.assertEqual(set(_stacks), {SAMPLER_NO_STAGE, "CREATE_GI"})
+
+        _sampled = [(_stack, _count) for _stack, _count in _stacks["CREATE_GI"].items()
+                    if _stack.startswith("sampled;")]
+        self.assertEqual(len(_sampled), 1)
+        _stack, _count = _sampled[0]
+        self.assertEqual(_count, 2)
+        self.assertIn("tests_sampler.py:_mOuterWait;tests_sampler.py:_mInnerWait;threading.py:wait", _stack)
+
+        _lines = _profiler.mGetCollapsed()
+        self.assertIn(f"CREATE_GI;{_stack} 2", _lines)
+        self.assertEqual(_profiler.mGetSampleCount(), 3)
+
+        # Rows stay small enough for the details column
+        sampler.SAMPLER_ROW_BYTES, _saved = 10, sampler.SAMPLER_ROW_BYTES
+        try:
+            _rows = _profiler.mChunkRows()
+        finally:
+            sampler.SAMPLER_ROW_BYTES = _saved
+        self.assertEqual(sum([len(_row[3]) for _row in _rows]),
+                         sum([len(_value) for _value in _stacks.values()]))
+        self.assertTrue(all([len(_row[3]) == 1 for _row in _rows]))
+
+    def test_collapse_max_depth(self):
+        ebLogInfo("Running unit test on ebSamplingProfiler.mCollapse")
+
+        _frame = sys._current_frames()[self.__thread.ident]
+        _full = ebSamplingProfiler("uuid-1", aMaxDepth=1000).mCollapse(_frame)
+        self.assertIn("tests_sampler.py:_mOuterWait;tests_sampler.py:_mInnerWait;threading.py:wait", _full)
+
+        # The leaf frames are kept, the root is marked as truncated
+        _stack = ebSamplingProfiler("uuid-1", aMaxDepth=2).mCollapse(_frame).split(";")
+        self.assertEqual(len(_stack), 3)
+        self.assertEqual(_stack[0], SAMPLER_TRUNCATED)
+        self.assertEqual(_stack[1:], _full.split(";")[-2:])
+
+    def test_activation(self):
+        ebLogInfo("Running unit test on ebSamplingProfilerStart")
+
+        _saved = get_gcontext().mCheckConfigOption("sampling_profiler_uuids")
+        get_gcontext().mSetConfigOption("sampling_profiler_uuids", "uuid-1, uuid-2")
+        get_gcontext().mSetConfigOption("sampling_profiler_hz", "100")
+        try:
+            self.assertTrue(ebSamplingEnabled("uuid-2"))
+            self.assertFalse(ebSamplingEnabled("uuid-3"))
+            self.assertTrue(ebSamplingEnabled("uuid-3", {"jsonconf": {"sampling_profiler": "True"}}))
+            self.assertIsNone(ebSamplingProfilerStart("uuid-3"))
+
+            _profiler = ebSamplingProfilerStart("uuid-1")
+            self.assertIsNotNone(_profiler)
+            ebSamplingSetStage("PATCH_MGR")
+            time.sleep(0.3)
+            self.assertIs(ebSamplingProfilerStop(aStore=False), _profiler)
+            self.assertFalse(_profiler.is_alive())
+            self.assertGreater(_profiler.mGetSampleCount(), 5)
+            self.assertIn("PATCH_MGR", _profiler.mGetStacks())
+            self.assertIsNone(ebSamplingProfilerStop())
+        finally:
+            get_gcontext().mSetConfigOption("sampling_profiler_uuids", _saved)
+            get_gcontext().mSetConfigOption("sampling_profiler_hz", None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,8 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add fail fast test with a raising host
+#    jydas       10/18/26 - Add node_exec_cmd_many unit tests
 #    avimonda    04/08/26 - Bug 39084339: Add node utils unit tests
 #    aypaul      07/25/25 - Bug#38202055 Add unit test case for kill_proc_tree.
 #    jfsaldan    10/30/24 - Bug 37207274 -
@@ -28,6 +30,10 @@
 import unittest, psutil
 from exabox.exatest.common.ebTestClucontrol import ebTestClucontrol
 from exabox.utils.node import _update_key_val_str, node_list_process, connect_to_host, kill_proc_tree, CmdRet, node_cmd_abs_path
+from exabox.utils.node import (node_exec_cmd_many, node_iter_exec_cmd_many,
+                               NODE_CONNECT_ERROR_CODE, NODE_CANCELLED_CODE)
+from exabox.core.Error import ExacloudRuntimeError
+from contextlib import contextmanager
 from exabox.core.MockCommand import exaMockCommand
 from exabox.core.Context import get_gcontext
 from exabox.log.LogMgr import ebLogInfo
@@ -239,5 +245,93 @@ newkey=NEW_VAL
 
         ebLogInfo("Unit test on utils.kill_proc_tree completed successfully.")
 
+    def mFanoutPatches(self, aResults, aUnreachable=()):
+        """Patch connect_to_host/node_exec_cmd for the fan-out executor"""
+
+        @contextmanager
+        def _connect(aHost, aCtx, aUser=None, aTimeout=None):
+            if aHost in aUnreachable:
+                raise Exception(f"Unable to connect to {aHost}")
+            _node = MagicMock()
+            _node.mGetHostname.return_value = aHost
+            yield _node
+
+        def _exec(aNode, aCmd, timeout=None):
+            return aResults[aNode.mGetHostname()]
+
+        return (patch('exabox.utils.node.connect_to_host', side_effect=_connect),
+                patch('exabox.utils.node.node_exec_cmd', side_effect=_exec))
+
+    def test_node_exec_cmd_many(self):
+        ebLogInfo("Running unit test on node_exec_cmd_many")
+        _hosts = ["dom0c", "dom0a", "dom0b", "dom0a"]
+        _results = {
+            "dom0a": CmdRet(0, "a", ""),
+            "dom0b": CmdRet(1, "", "failed"),
+            "dom0c": CmdRet(0, "c", ""),
+        }
+        _connect_patch, _exec_patch = self.mFanoutPatches(_results, ["dom0d"])
+        with _connect_patch, _exec_patch as _mock_exec:
+            _ret = node_exec_cmd_many(_hosts, "uptime", max_workers=2)
+            self.assertEqual(["dom0c", "dom0a", "dom0b"], list(_ret.keys()))
+            self.assertEqual(_results, _ret)
+            self.assertEqual(3, _mock_exec.call_count)
+
+            # Unreachable hosts never raise, they report the ssh(1) code
+            _ret = node_exec_cmd_many(["dom0a", "dom0d"], "uptime")
+            self.assertEqual(NODE_CONNECT_ERROR_CODE, _ret["dom0d"].exit_code)
+            self.assertIn("Unable to connect", _ret["dom0d"].stderr)
+
+            with self.assertRaises(ExacloudRuntimeError):
+                node_exec_cmd_many(_hosts, "uptime", check_error=True)
+
+    def test_node_exec_cmd_many_timeout_map(self):
+        ebLogInfo("Running unit test on node_exec_cmd_many per host timeout")
+        _connect_patch, _exec_patch = self.mFanoutPatches(
+            {"cell01": CmdRet(0, "", ""), "cell02": CmdRet(0, "", "")})
+        with _connect_patch, _exec_patch as _mock_exec:
+            node_exec_cmd_many(["cell01", "cell02"], "cellcli -e list cell",
+                               timeout={"cell01": 10})
+            _timeouts = {_call.args[0].mGetHostname(): _call.kwargs["timeout"]
+                         for _call in _mock_exec.call_args_list}
+            self.assertEqual({"cell01": 10, "cell02": None}, _timeouts)
+
+    def test_node_iter_exec_cmd_many_fail_fast(self):
+        ebLogInfo("Running unit test on node_iter_exec_cmd_many fail fast")
+        _hosts = [f"vm{_idx:02d}" for _idx in range(8)]
+        _results = {_host: CmdRet(0, "", "") for _host in _hosts}
+        _results["vm00"] = CmdRet(2, "", "boom")
+        _connect_patch, _exec_patch = self.mFanoutPatches(_results)
+        with _connect_patch, _exec_patch as _mock_exec:
+            _ret = dict(node_iter_exec_cmd_many(
+                _hosts, "true", max_workers=1, fail_fast=True, ordered=False))
+            self.assertEqual(set(_hosts), set(_ret.keys()))
+            self.assertEqual(2, _ret["vm00"].exit_code)
+            self.assertTrue(_mock_exec.call_count < len(_hosts))
+            _cancelled = [_host for _host, _cmdret in _ret.items()
+                          if _cmdret.exit_code == NODE_CANCELLED_CODE]
+            self.assertEqual(len(_hosts) - _mock_exec.call_count,
+                             len(_cancelled))
+
+    def test_node_iter_exec_cmd_many_fail_fast_exception(self):
+        ebLogInfo("Running unit test on node_iter_exec_cmd_many fail fast with a raising host")
+        _hosts = [f"vm{_idx:02d}" for _idx in range(8)]
+        _calls = []
+
+        def _on_host(aHost, *aArgs):
+            _calls.append(aHost)
+            if aHost == "vm00":
+                raise RuntimeError("boom")
+            if aArgs[-1].is_set():
+                return CmdRet(NODE_CANCELLED_CODE, '', 'Cancelled (fail-fast)')
+            return CmdRet(0, "", "")
+
+        with patch('exabox.utils.node._node_exec_cmd_on_host', side_effect=_on_host):
+            _ret = dict(node_iter_exec_cmd_many(
+                _hosts, "true", max_workers=1, fail_fast=True))
+        self.assertEqual(_hosts, list(_ret.keys()))
+        self.assertEqual(CmdRet(NODE_CONNECT_ERROR_CODE, "", "boom"), _ret["vm00"])
+        self.assertTrue(all([_ret[_host].exit_code == NODE_CANCELLED_CODE for _host in _hosts[1:]]))
+
 if __name__ == '__main__':
     unittest.main()
@@ -16,6 +16,12 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Remove the partial image when it cannot be moved
+#                           in place, drop the unused mCopyDom0ToDom0
+#    jydas       10/18/26 - Copy the image with the SFTP transfer engine and
+#                           keep its verified hash
+#    jydas       10/18/26 - Distribute the image dom0 to dom0 as a k-ary tree
+#                           with concurrent streamed and hashed transfers
 #    joysjose    06/22/26 - Bug 39588664 replay OEDA reflink under worker lock
 #    joysjose    05/12/26 - Bug 39354509 Add multigi OEDA requiredfile alias fallback
 #    joysjose    12/05/25 - Bug 38728514 To copy reflink even if original
@@ -45,13 +51,17 @@ import json
 import copy
 
 from exabox.core.Node import exaBoxNode
+from exabox.network.osds.sftpxfer import ebIsSftpXferEnabled
 from exabox.core.Context import get_gcontext
 from exabox.log.LogMgr import ebLogError, ebLogInfo, ebLogWarn, ebLogTrace, ebLogDebug
 from exabox.core.Error import ExacloudRuntimeError
 from exabox.agent.ExaLock import ExaLock
+from exabox.BaseServer.AsyncProcessing import ProcessManager, ProcessStructure, ProcessBackend, ExitCodeBehavior
 _26AIREFERENCE = "232600251021"
 _26AIMAJORMINORREF = "2326"
 _GRID_KLONE_IMAGE_RE = re.compile(r"^grid-klone-Linux-x86-64-[0-9]+\.zip$")
+_DEFAULT_TREE_FANOUT = 2
+_GLOBAL_CACHE_KEY = "/root/.ssh/global_cache_key"
 
 class GlobalCacheWorker:
 
@@ -179,13 +189,9 @@ class GlobalCacheWorker:
                         if _dom0 in self.mGetLocalCopyDom0s():
                             self.mCopyExacloudToDom0(_dom0)
 
-                    # Copy dom0 to dom0
-                    for _dom0 in _missingDom0s:
-
-                        if _dom0 in self.mGetLocalCopyDom0s():
-                            continue
-
-                        self.mCopyDom0ToDom0(self.mGetLocalCopyDom0s()[0], _dom0)
+                    # Copy dom0 to dom0, every finished dom0 becomes a source
+                    _targets = [_dom0 for _dom0 in _missingDom0s if _dom0 not in self.mGetLocalCopyDom0s()]
+                    self.mDistributeDom0ToDom0(list(self.mGetLocalCopyDom0s()), _targets)
 
                     _currentRetry += 1
 
@@ -602,7 +608,14 @@ class GlobalCacheWorker:
         _node.mExecuteCmdLog(f"/bin/mkdir -p {_dirname}")
 
         ebLogInfo(f"Copy image local#{self.mGetImageLocalPath()} to {aDom0}#{self.mGetImageRemotePath()}")
-        _ok = _node.mCopyFile(self.mGetImageLocalPath(), self.mGetImageRemotePath())
+        _hash = None
+        if ebIsSftpXferEnabled():
+            # sha256 computed while copying and verified on the dom0
+            _hashes = _node.mTransferFiles([(self.mGetImageLocalPath(), self.mGetImageRemotePath())])
+            _hash = _hashes.get(self.mGetImageRemotePath())
+            _ok = _hash is not None
+        else:
+            _ok = _node.mCopyFile(self.mGetImageLocalPath(), self.mGetImageRemotePath())
 
         if _node.mFileExists(self.mGetImageRemotePath()):
             ebLogInfo(f"File exists in dom0:{aDom0}, creating reflink in /EXAVMIMAGES")
@@ -610,52 +623,160 @@ class GlobalCacheWorker:
             _ok = True
 
         # Update
-        _info = self.mCalculateImageInfoState(aDom0, self.mGetImageRemotePath(), aCalculateHash=True)
+        _info = self.mCalculateImageInfoState(aDom0, self.mGetImageRemotePath(), aCalculateHash=not _hash)
+        if _hash:
+            _info['hash'] = _hash
         self.mUpdateRemoteImageState(aDom0, _info, aDelete=False)
         ebLogInfo(f"Local Copy {self.mGetImageRemotePath()} complete in {aDom0}")
 
         return _ok
 
-    def mCopyDom0ToDom0(self, aFromDom0, aToDom0):
+    def mGetTreeFanout(self):
+        _fanout = get_gcontext().mGetConfigOptions().get('global_cache_tree_fanout', _DEFAULT_TREE_FANOUT)
+        return max(int(_fanout), 1)
+
+    def mGetCopyLimitKbps(self):
+        # 0 means no bandwidth cap per transfer
+        return int(get_gcontext().mGetConfigOptions().get('global_cache_copy_limit_kbps', 0))
+
+    def mPrepareKnownHost(self, aNodeFrom, aToDom0):
+
+        _baseCmd = "/bin/ssh -o PasswordAuthentication=no -o StrictHostKeyChecking=accept-new"
+
+        for _host in [aToDom0.split('.')[0], aToDom0]:
+            aNodeFrom.mExecuteCmdLog(f"/usr/bin/ssh-keygen -R {_host}")
+            aNodeFrom.mExecuteCmdLog(f"{_baseCmd} root@{_host} '/bin/echo new'")
+
+    def mBuildStreamCmd(self, aNodeFrom, aToDom0List):
+        """
+        Build a single command, executed on the source dom0, that streams the
+        image to every target concurrently.  The sha256 is calculated on the
+        target while the image is written, so no full reread is needed.  Every
+        transfer prints a line '<target> <rc> <sha256>'.
+        """
+
+        _image = self.mGetImageRemotePath()
+        _reader = f"/bin/cat {_image}"
+
+        _limit = self.mGetCopyLimitKbps()
+        if _limit > 0:
+            if aNodeFrom.mFileExists("/usr/bin/pv"):
+                _reader = f"/usr/bin/pv -q -L {_limit}k {_image}"
+            else:
+                ebLogWarn("global_cache_copy_limit_kbps ignored, /usr/bin/pv not found")
+
+        _ssh = f"/bin/ssh -i {_GLOBAL_CACHE_KEY} -o PasswordAuthentication=no -o Compression=no"
+        _remote = f"set -o pipefail; /usr/bin/tee {_image}.part | /usr/bin/sha256sum"
+
+        _jobs = []
+        for _dom0 in aToDom0List:
+            _transfer = f"{_reader} | {_ssh} root@{_dom0} '{_remote}'"
+            _jobs.append(f"( set -o pipefail; _h=$({_transfer}); /bin/echo \"{_dom0} $? $_h\" ) &")
+        _jobs.append("wait")
+
+        return " ".join(_jobs)
+
+    def mStreamDom0ToDom0s(self, aFromDom0, aToDom0List):
+        """
+        Copy the image from aFromDom0 to every dom0 in aToDom0List at the same
+        time.  Returns a dict target -> sha256 calculated during the stream
+        (None on failure).
+        """
 
-        _nodeTo = self.mGetConnections()[aToDom0]
         _nodeFrom = self.mGetConnections()[aFromDom0]
+        _results = dict.fromkeys(aToDom0List)
 
-        _dirname = os.path.dirname(self.mGetImageRemotePath())
-        _nodeTo.mExecuteCmdLog(f"/bin/mkdir -p {_dirname}")
+        for _dom0 in aToDom0List:
+            ebLogInfo(f"Copy image {aFromDom0}#{self.mGetImageRemotePath()} to {_dom0}#{self.mGetImageRemotePath()}")
+            self.mPrepareKnownHost(_nodeFrom, _dom0)
 
-        ebLogInfo(f"Copy image {aFromDom0}#{self.mGetImageRemotePath()} to {aToDom0}#{self.mGetImageRemotePath()}")
+        _, _o, _ = _nodeFrom.mExecuteCmd(self.mBuildStreamCmd(_nodeFrom, aToDom0List))
+        _out = _o.read() if _o else ""
 
-        _cmd = f"/usr/bin/ssh-keygen -R {aToDom0.split('.')[0]}"
-        _nodeFrom.mExecuteCmdLog(_cmd)
-        _cmd = f"/usr/bin/ssh-keygen -R {aToDom0}"
-        _nodeFrom.mExecuteCmdLog(_cmd)
+        for _line in _out.splitlines():
+            _fields = _line.split()
+            if len(_fields) < 3 or _fields[0] not in _results:
+                continue
+            if _fields[1] == "0":
+                _results[_fields[0]] = _fields[2]
+            else:
+                ebLogWarn(f"Transfer {aFromDom0} to {_fields[0]} failed with rc {_fields[1]}")
 
-        _baseCmd = "/bin/ssh -o PasswordAuthentication=no -o StrictHostKeyChecking=accept-new"
-        _cmd = f"{_baseCmd} root@{aToDom0.split('.')[0]} '/bin/echo new'"
-        _nodeFrom.mExecuteCmdLog(_cmd)
-        _cmd = f"{_baseCmd} root@{aToDom0} '/bin/echo new'"
-        _nodeFrom.mExecuteCmdLog(_cmd)
+        return _results
 
-        _cmd = f"/usr/bin/scp"
-        _cmd = f"{_cmd} -i /root/.ssh/global_cache_key"
-        _cmd = f"{_cmd} {self.mGetImageRemotePath()}"
-        _cmd = f"{_cmd} root@{aToDom0}:{self.mGetImageRemotePath()}"
-        _nodeFrom.mExecuteCmdLog(_cmd)
+    def mFinishDom0Transfer(self, aToDom0, aHash):
 
-        _ok = _nodeFrom.mGetCmdExitStatus() == 0
+        _node = self.mGetConnections()[aToDom0]
+        _image = self.mGetImageRemotePath()
 
-        if _ok:
-            self.mCreateSymbolicLink(aToDom0)
-        else:
-            self.mGetLocalCopyDom0s().append(aToDom0)
+        if aHash != self.mGetImageHash():
+            ebLogWarn(f"Invalid hash {aHash} streamed to {aToDom0}, expected {self.mGetImageHash()}")
+            _node.mExecuteCmd(f"/bin/rm -f {_image}.part")
+            return False
 
-        # Update
-        _info = self.mCalculateImageInfoState(aToDom0, self.mGetImageRemotePath(), aCalculateHash=True)
+        _node.mExecuteCmdLog(f"/bin/mv -f {_image}.part {_image}")
+        if _node.mGetCmdExitStatus() != 0:
+            ebLogWarn(f"Image streamed to {aToDom0} could not be moved to {_image}")
+            _node.mExecuteCmd(f"/bin/rm -f {_image}.part")
+            return False
+
+        self.mCreateSymbolicLink(aToDom0)
+
+        # Update, hash already verified while streaming
+        _info = self.mCalculateImageInfoState(aToDom0, _image)
+        _info['hash'] = aHash
         self.mUpdateRemoteImageState(aToDom0, _info, aDelete=False)
-        ebLogInfo(f"Remote Copy {self.mGetImageRemotePath()} complete in {aToDom0}")
+        ebLogInfo(f"Remote Copy {_image} complete in {aToDom0}")
 
-        return _ok
+        return True
+
+    def mDistributeDom0ToDom0(self, aSources, aTargets):
+        """
+        Distribute the image from aSources to aTargets in waves.  On every
+        wave each source streams to global_cache_tree_fanout targets at the
+        same time, and the targets completed join the sources of the next
+        wave, so N dom0s are covered in log(N) waves instead of N copies.
+        Failed targets are added to the local copy dom0s.
+        """
+
+        _sources = list(aSources)
+        _pending = list(aTargets)
+        _fanout = self.mGetTreeFanout()
+        _wave = 0
+
+        _dirname = os.path.dirname(self.mGetImageRemotePath())
+        for _dom0 in _pending:
+            self.mGetConnections()[_dom0].mExecuteCmdLog(f"/bin/mkdir -p {_dirname}")
+
+        while _pending and _sources:
+
+            _wave += 1
+            _plist = ProcessManager(aExitCodeBehavior=ExitCodeBehavior.IGNORE, aBackend=ProcessBackend.THREAD)
+            _assigned = []
+
+            for _source in _sources:
+                if not _pending:
+                    break
+                _targets = _pending[:_fanout]
+                _pending = _pending[_fanout:]
+                _assigned += _targets
+                _p = ProcessStructure(self.mStreamDom0ToDom0s, [_source, _targets])
+                _p.mSetLogTimeoutFx(ebLogWarn)
+                _plist.mStartAppend(_p)
+
+            ebLogInfo(f"Global cache wave {_wave}: {_sources} to {_assigned}")
+            _plist.mJoinProcess()
+
+            _hashes = {}
+            for _rc in _plist.mGetReturnValues():
+                if _rc:
+                    _hashes.update(_rc)
+
+            for _dom0 in _assigned:
+                if self.mFinishDom0Transfer(_dom0, _hashes.get(_dom0)):
+                    _sources.append(_dom0)
+                else:
+                    self.mGetLocalCopyDom0s().append(_dom0)
 
 
 # end of file
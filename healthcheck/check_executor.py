@@ -11,6 +11,9 @@ NOTE:
     None
 
 History:
+    jydas       10/18/2026 - Reuse cached results (healthcheck_result_cache)
+    jydas       10/18/2026 - Batched execution: checks of a host on a thread
+                             over one pooled SSH session (healthcheck_batched)
     joysjose    03/06/2026 - Bug 38900203 - EXACLOUD: ISSUES FOUND BY VOXIO CODEV AGENT IN DIR EXABOX/HEALTHCHECK
     bhpati      07/31/2025 - Bug 38102552 - Log as error instead of warning for healthcheck failure 
     joysjose    06/25/2024 - Bug 36727956 - Regression fix for printing result json correctly
@@ -20,7 +23,7 @@ History:
 """
 
 import six
-from exabox.core.Node import exaBoxNode
+from exabox.core.Node import exaBoxNode, exaBoxNodePool
 from exabox.log.LogMgr import ebLogInfo, ebLogError, ebLogTrace, ebLogVerbose, ebLogWarn
 from exabox.ovm.vmconfig import exaBoxClusterConfig
 import os, sys, subprocess, uuid, time, os.path, traceback
@@ -41,6 +44,8 @@ from exabox.core.DBStore import ebGetDefaultDB
 from multiprocessing import Process, Manager
 import threading
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import NamedTuple, Optional
 
 from exabox.healthcheck.hcutil import Singleton 
 from exabox.healthcheck.hcconstants import HcConstants, gCheckNameFunctionMap, CHK_RESULT, LOG_TYPE
@@ -49,6 +54,7 @@ from exabox.healthcheck.check_parser import CheckParser
 from exabox.healthcheck.clumisc import ebCluPreChecks 
 from exabox.healthcheck.healthcheck import HealthCheck
 from exabox.healthcheck.hclogger import get_logger
+from exabox.healthcheck.hccache import HcResultCache, ebHcResultCacheEnabled
 from exabox.BaseServer.AsyncProcessing import ProcessManager, ProcessStructure
 
 #if debug make it false 
@@ -57,6 +63,24 @@ gRunNodeTaskParallel    = True
 gRunCustomTaskParallel  = True
 gRunExecutorParallel    = True
 gCount  = 0
+gBatchThreads = 16
+
+
+class HCResult(NamedTuple):
+    """ Result of one check run in batched mode """
+    target: str
+    host: Optional[str]
+    checkname: str
+    result: Optional[dict]
+    error: Optional[str]
+
+
+def mGetHcTimeout(aCluHealth):
+    _hc_timeout = 900
+    _hc_timeout_config = aCluHealth.mGetEbox().mCheckConfigOption('healthcheck_task_timeout')
+    if _hc_timeout_config is not None:
+        _hc_timeout = int(_hc_timeout_config)
+    return _hc_timeout
 
 class ObjectStore(object):
     #__metaclass__ = Singleton
@@ -177,10 +201,21 @@ class CheckExecutor(object):
                 except Exception as e:
                     ebLogError("Failed to add check in tasklist, exception: %s"  %(str(e)))
 
+        _cache = None
+        if ebHcResultCacheEnabled(self._hc.mGetEbox()):
+            _cache = HcResultCache(self._hc)
+
         _tasklist = []
         for _targettype, _chklist in six.iteritems(_targetChkList):
             if _chklist:
-                _tasklist.append(HCTask.taskfactory(self._hc, _targettype, _chklist))
+                _task = HCTask.taskfactory(self._hc, _targettype, _chklist)
+                _task.mSetResultCache(_cache)
+                _tasklist.append(_task)
+
+        if str(self._hc.mGetEbox().mCheckConfigOption('healthcheck_batched')) == 'True':
+            self.mExecuteBatched(_tasklist)
+            object.mDeleteInstance()
+            return
 
         _pidList  = []
         _currentPid = str(os.getpid())
@@ -217,6 +252,59 @@ class CheckExecutor(object):
         #remove check infra class's object and release node connection 
         object.mDeleteInstance()
 
+    def mExecuteBatched(self, aTaskList):
+        """
+        Run the tasks on threads instead of nested processes: one unit per
+        host (NodeTask), per custom check (CustomTask) or per task
+        (OtherTask). The checks of a unit run serially on their thread, which
+        holds a connection pool, so all the checks of a host share one SSH
+        session. Units not done within healthcheck_task_timeout are reported
+        as failed.
+        """
+        _units = []
+        for _task in aTaskList:
+            for _options in _task.mGetBatchUnits():
+                _units.append((_task, _options))
+        if not _units:
+            get_logger().mSetRecommend(list(set(get_logger().mGetRecommend())))
+            return []
+
+        _threads = gBatchThreads
+        _threads_config = self._hc.mGetEbox().mCheckConfigOption('healthcheck_batch_threads')
+        if _threads_config is not None:
+            _threads = int(_threads_config)
+        _threads = max(1, min(_threads, len(_units)))
+        _hc_timeout = mGetHcTimeout(self._hc)
+
+        ebLogTrace(f'Batched healthcheck: {len(_units)} units on {_threads} threads')
+        _executor = ThreadPoolExecutor(max_workers=_threads, thread_name_prefix="ebHcBatch")
+        try:
+            _futures = [_executor.submit(_task.mRunBatch, _options) for _task, _options in _units]
+            _done, _notDone = wait(_futures, timeout=_hc_timeout)
+        finally:
+            # Threads of the units timed out are left behind, not waited for
+            _executor.shutdown(wait=False, cancel_futures=True)
+
+        _results = []
+        for (_task, _options), _future in zip(_units, _futures):
+            if _future in _done and _future.exception() is None:
+                _results += _future.result()
+            else:
+                if _future in _done:
+                    _err = f"Checks could not complete execution, exception: {_future.exception()}"
+                else:
+                    _err = f"Checks did not complete within {_hc_timeout} seconds"
+                ebLogError(f"*** Healthcheck - {_task.mGetUnitName(_options)}: {_err}")
+                _results += _task.mFailedBatch(_options, _err)
+
+        # Same order as the check list, whatever the order of completion
+        for _result in _results:
+            if _result.result is not None:
+                get_logger().mUpdateJsonMap(_result.result)
+        # The threads append their recommendations to the shared logger
+        get_logger().mSetRecommend(list(set(get_logger().mGetRecommend())))
+        return _results
+
     def getOrderPid(self, aParentPid):
         _parentPid = aParentPid
         _finalpidlist = []
@@ -246,9 +334,13 @@ class HCTask(object):
         self._name            = self.__class__.__name__
         self._subtasks        = aTaskList
         self._res_fields      = [HcConstants.RES_RESULT, HcConstants.RES_LOG, HcConstants.RES_MSGDETAIL, HcConstants.RES_CHECKPARAM]
+        self._cache           = None
 
     def mGetHc(self):
         return self._hc
+
+    def mSetResultCache(self, aCache):
+        self._cache = aCache
     
     def cleanupSubtaskResult(self, aSubtaskResult):
         aSubtaskResult[HcConstants.RES_RESULT]       = "" 
@@ -258,6 +350,99 @@ class HCTask(object):
         aSubtaskResult[HcConstants.RES_LOG]          = []
         aSubtaskResult[HcConstants.RES_MSGDETAIL]    = {}
         
+    def mRunSubtask(self, aSubtask, aOptions = None):
+        """
+        Result of the check of aSubtask, from the result cache when it holds
+        a valid one, returns (result, error message). The result is None when
+        the check did not return the expected fields.
+        """
+        # Custom checks are commands of the request, never cached
+        if self._cache is None or (aOptions is not None and "host" not in aOptions):
+            return self.mRunCheck(aSubtask, aOptions)
+
+        _template   = aSubtask["result"]
+        _host       = aOptions["host"] if aOptions is not None else None
+        _keyHost    = _host or _template[HcConstants.RES_NODENAME]
+        _chkid      = _template[HcConstants.RES_HCID]
+        _params     = _template[HcConstants.RES_CHECKPARAM]
+
+        _cached, _fingerprint = self._cache.mGet(_host, _keyHost, _chkid, _params)
+        if _cached is not None:
+            # Fields of this run, the profile may differ from the cached one
+            for _field in [HcConstants.RES_PROFILE, HcConstants.RES_ALERTTYPE, HcConstants.RES_NODETYPE]:
+                _cached[_field] = _template[_field]
+            return _cached, None
+
+        _result, _err = self.mRunCheck(aSubtask, aOptions)
+        if _result is not None and _err is None:
+            self._cache.mPut(_keyHost, _chkid, _params, _fingerprint, _result)
+        return _result, _err
+
+    def mRunCheck(self, aSubtask, aOptions = None):
+        """
+        Run the check of aSubtask, returns (result, error message). The
+        result is None when the check did not return the expected fields.
+        """
+        _fp         = aSubtask["fp"]
+        _result     = deepcopy(aSubtask["result"])
+        _err        = None
+        self.cleanupSubtaskResult(_result)
+        starttime = datetime.now().replace(microsecond=0)
+
+        try:
+            if self._hc.mGetEbox().mGetVerbose():
+                ebLogVerbose("executing subtask: %s" %(_result[HcConstants.RES_CHKNAME]))
+            if aOptions is None:
+                if not bool(_result[HcConstants.RES_CHECKPARAM]):
+                    ret = _fp()
+                else:
+                    ret = _fp(_result[HcConstants.RES_CHECKPARAM])
+            elif "host" in aOptions.keys():
+                _result[HcConstants.RES_NODENAME] = aOptions["host"]
+                if not bool(_result[HcConstants.RES_CHECKPARAM]):
+                    ret = _fp(aOptions["host"])
+                else:
+                    ret = _fp(aOptions["host"], _result[HcConstants.RES_CHECKPARAM])
+
+            elif "checkname" in aOptions.keys() and "cmdstr" in aOptions.keys():
+                _result[HcConstants.RES_CHKNAME] = aOptions["checkname"]
+                if not bool(_result[HcConstants.RES_CHECKPARAM]):
+                    ret = _fp(aOptions["cmdstr"])
+                else:
+                    ret = _fp(aOptions["cmdstr"], _result[HcConstants.RES_CHECKPARAM])
+            else:
+                ebLogError("Invalid options to Healthcheck Executor")
+
+            if self._hc.mGetEbox().mGetVerbose():
+                ebLogVerbose("execution completed for subtask: %s" %(_result[HcConstants.RES_CHKNAME]))
+            if isinstance(ret,dict):
+                if all(key in ret.keys() for key in self._res_fields):
+                    _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(ret[HcConstants.RES_RESULT]).upper() 
+                    _result[HcConstants.RES_LOG]          = ret[HcConstants.RES_LOG]
+                    _result[HcConstants.RES_MSGDETAIL]    = ret[HcConstants.RES_MSGDETAIL]
+                    #updating again if changed inside function
+                    #_result[HcConstants.RES_CHECKPARAM]   = ret[HcConstants.RES_CHECKPARAM]
+                else:
+                    ebLogError('result (%s) must contain (%s) for check %s' %(_result[HcConstants.RES_CHKNAME], self._res_fields, ret))
+                    return None, _err
+
+            elif isinstance(ret,(int, bool)):
+                _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(ret).upper()
+
+            else:
+                ebLogError('No return value from check %s, it must return result in specified format' %(_result[HcConstants.RES_CHKNAME]))
+                _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(CHK_RESULT.FAIL).upper()
+
+        except Exception as e:
+            _err     = "Check %s, could not complete execution, exception: %s"  %(_result[HcConstants.RES_CHKNAME], str(e))
+            _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(CHK_RESULT.FAIL).upper()
+            _result[HcConstants.RES_LOG]          = _err
+
+        endtime = datetime.now().replace(microsecond=0)
+        _result[HcConstants.RES_STARTTIME]    = str(starttime)
+        _result[HcConstants.RES_ENDTIME]      = str(endtime)
+        return _result, _err
+
     def execute(self, aResult, aOptions = None):
         _resdict = aResult
         _currentPid = str(os.getpid())
@@ -267,71 +452,63 @@ class HCTask(object):
 
         for _subtask in self._subtasks:
             gCount += 1
-            _fp         = _subtask["fp"]
-            _result     = deepcopy(_subtask["result"])
-            self.cleanupSubtaskResult(_result)
-
-            try:
-                if self._hc.mGetEbox().mGetVerbose():
-                    ebLogVerbose("executing subtask: %s" %(_result[HcConstants.RES_CHKNAME]))
-                starttime = datetime.now().replace(microsecond=0)
-                if aOptions is None:
-                    if not bool(_result[HcConstants.RES_CHECKPARAM]):
-                        ret = _fp()
-                    else:
-                        ret = _fp(_result[HcConstants.RES_CHECKPARAM])
-                elif "host" in aOptions.keys():
-                    _result[HcConstants.RES_NODENAME] = aOptions["host"]
-                    if not bool(_result[HcConstants.RES_CHECKPARAM]):
-                        ret = _fp(aOptions["host"])
-                    else:
-                        ret = _fp(aOptions["host"], _result[HcConstants.RES_CHECKPARAM])
-
-                elif "checkname" in aOptions.keys() and "cmdstr" in aOptions.keys():
-                    _result[HcConstants.RES_CHKNAME] = aOptions["checkname"]
-                    if not bool(_result[HcConstants.RES_CHECKPARAM]):
-                        ret = _fp(aOptions["cmdstr"])
-                    else:
-                        ret = _fp(aOptions["cmdstr"], _result[HcConstants.RES_CHECKPARAM])
-                else:
-                    ebLogError("Invalid options to Healthcheck Executor")
-
-                if self._hc.mGetEbox().mGetVerbose():
-                    ebLogVerbose("execution completed for subtask: %s" %(_result[HcConstants.RES_CHKNAME]))
-                if isinstance(ret,dict):
-                    if all(key in ret.keys() for key in self._res_fields):
-                        _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(ret[HcConstants.RES_RESULT]).upper() 
-                        _result[HcConstants.RES_LOG]          = ret[HcConstants.RES_LOG]
-                        _result[HcConstants.RES_MSGDETAIL]    = ret[HcConstants.RES_MSGDETAIL]
-                        #updating again if changed inside function
-                        #_result[HcConstants.RES_CHECKPARAM]   = ret[HcConstants.RES_CHECKPARAM]
-                    else:
-                        ebLogError('result (%s) must contain (%s) for check %s' %(_result[HcConstants.RES_CHKNAME], self._res_fields, ret))
-                        continue
-
-                elif isinstance(ret,(int, bool)):
-                    _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(ret).upper()
-
-                else:
-                    ebLogError('No return value from check %s, it must return result in specified format' %(_result[HcConstants.RES_CHKNAME]))
-                    _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(CHK_RESULT.FAIL).upper()
-
-            except Exception as e:
-                err_message     = "Check %s, could not complete execution, exception: %s"  %(_result[HcConstants.RES_CHKNAME], str(e))
-                logs.append(err_message)
-
+            _result, _err = self.mRunSubtask(_subtask, aOptions)
+            if _err is not None:
+                logs.append(_err)
                 _resdict[_currentPid + "_log" + str(gCount)] = logs
-                _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(CHK_RESULT.FAIL).upper()
-                _result[HcConstants.RES_LOG]          = err_message
-
-            endtime = datetime.now().replace(microsecond=0)
-            _result[HcConstants.RES_STARTTIME]    = str(starttime)
-            _result[HcConstants.RES_ENDTIME]      = str(endtime)
+            if _result is None:
+                continue
             _resdict[_currentPid + "_results" + str(gCount)] = _result
             _resdict["pids"].append(_currentPid)
         _recommend  =  get_logger().mGetRecommend()
         _resdict[str(_currentPid) + "_recommend" + str(gCount)] = _recommend
-        
+
+    def mGetBatchUnits(self):
+        """ Options of the units of work of the task in batched mode """
+        return [None]
+
+    def mGetUnitName(self, aOptions):
+        if aOptions is None:
+            return self._name
+        return aOptions.get("host") or aOptions.get("checkname") or self._name
+
+    def mRunBatch(self, aOptions = None):
+        """
+        Run the subtasks for aOptions on the calling thread, with a connection
+        pool registered for the thread (see exaBoxNode.mConnect).
+        """
+        _connkey = f"{threading.get_ident()}-{os.getpid()}"
+        _connectionPool = exaBoxNodePool(_connkey)
+        get_gcontext().mSetRegEntry(f'SSH-POOL-{_connkey}', _connectionPool)
+        _results = []
+        try:
+            for _subtask in self._subtasks:
+                _result, _err = self.mRunSubtask(_subtask, aOptions)
+                _results.append(self.mMakeResult(_subtask, aOptions, _result, _err))
+        finally:
+            _connectionPool.mCloseConnections()
+            get_gcontext().mDelRegEntry(f'SSH-POOL-{_connkey}')
+        return _results
+
+    def mFailedBatch(self, aOptions, aError):
+        """ Failed results of the subtasks of a unit which did not complete """
+        _results = []
+        for _subtask in self._subtasks:
+            _result = deepcopy(_subtask["result"])
+            self.cleanupSubtaskResult(_result)
+            if aOptions is not None and "host" in aOptions:
+                _result[HcConstants.RES_NODENAME] = aOptions["host"]
+            if aOptions is not None and "checkname" in aOptions:
+                _result[HcConstants.RES_CHKNAME] = aOptions["checkname"]
+            _result[HcConstants.RES_RESULT]       = CHK_RESULT.reverse_mapping(CHK_RESULT.FAIL).upper()
+            _result[HcConstants.RES_LOG]          = [aError]
+            _results.append(self.mMakeResult(_subtask, aOptions, _result, aError))
+        return _results
+
+    def mMakeResult(self, aSubtask, aOptions, aResult, aError):
+        _options = aOptions or {}
+        _checkname = _options.get("checkname") or aSubtask["result"].get(HcConstants.RES_CHKNAME)
+        return HCResult(aSubtask["result"].get(HcConstants.RES_NODETYPE), _options.get("host"), _checkname, aResult, aError)
 
 
 class NodeTask(HCTask):
@@ -355,6 +532,9 @@ class NodeTask(HCTask):
             pass
 
         return _hostList
+
+    def mGetBatchUnits(self):
+        return [{"host": _host} for _host in (self.mGetHostList() or [])]
         
     def execute(self, aResult):
         _resdict = aResult
@@ -411,6 +591,12 @@ class CustomTask(HCTask):
         
     def mGetCustomCheckList(self):
         return self.mGetHc().mGetCustomCheckList()
+
+    def mGetBatchUnits(self):
+        _chkList = self.mGetCustomCheckList()
+        if _chkList is None:
+            return []
+        return [{"checkname": _chk, "cmdstr": _cmd_str} for _chk, _cmd_str in six.iteritems(_chkList)]
         
     def execute(self, aResult):
         _resdict = aResult
@@ -11,6 +11,7 @@ NOTE:
     None
 
 History:
+    jydas       10/18/2026 - chkCacheTtl and chkFingerprint for the result cache
     bhuvnkum    02/19/2018 - Creation
 
 """
@@ -37,6 +38,7 @@ from multiprocessing import Process
 from exabox.healthcheck.hcutil import mReadConfigFile
 from exabox.healthcheck.hcconstants import HcConstants #, gCheckNameFunctionMap
 from exabox.healthcheck.hclogger import get_logger, mRecordError
+from exabox.healthcheck.hccache import mValidateProbe
 
 
 class CheckParser(object):
@@ -115,6 +117,16 @@ class CheckParser(object):
     def mGetCheckAlertLevel(self, aChkId):
         return self.__masterJson[HcConstants.CHECK_LIST][aChkId][HcConstants.CHK_ALERT_LEVEL]
 
+    def mGetCheckCacheTtl(self, aChkId):
+        """ Seconds the results of the check can be reused, None when not cached """
+        _ttl = self.__masterJson[HcConstants.CHECK_LIST][aChkId].get(HcConstants.CHK_CACHE_TTL)
+        if not _ttl:
+            return None
+        return int(_ttl)
+
+    def mGetCheckFingerprint(self, aChkId):
+        return list(self.__masterJson[HcConstants.CHECK_LIST][aChkId].get(HcConstants.CHK_FINGERPRINT, []))
+
     def loadMasterChecklist(self, aPath):
         checklist_filepath = aPath
         return mReadConfigFile(checklist_filepath)
@@ -154,6 +166,14 @@ class CheckParser(object):
                         return mRecordError("911", "alert level (%s) in check_fields is not valid alert level, allowed alertlevels %s" % (v, str(_jconf[HcConstants.ALERT_LEVEL])))
                         
                     #TBD: validate each of alterlevel defined in levels, target, tags 
+
+                if(k == HcConstants.CHK_CACHE_TTL):
+                    if isinstance(v, bool) or not isinstance(v, int) or v < 0:
+                        return mRecordError("911", "cache ttl (%s) of check %s must be a number of seconds" % (v, _chk_id))
+
+                if(k == HcConstants.CHK_FINGERPRINT):
+                    if not isinstance(v, list) or not all(mValidateProbe(_probe) for _probe in v):
+                        return mRecordError("911", "fingerprint (%s) of check %s is not valid, allowed probes mtime:<path>, pid:<program>, imageinfo" % (v, _chk_id))
                     
         #TODO: add more validation for ref
         return True
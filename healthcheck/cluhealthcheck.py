@@ -13,6 +13,7 @@ NOTE:
 History:
 
     MODIFIED   (MM/DD/YY)
+    jydas       10/18/26   - Delta report of the results with the result cache
     aararora    02/27/26   - Bug 38902170: Correct resource leak issues
     nispaul     12/23/25   - 38730371 - Enable network reconfiguration on running domUs
                              only
@@ -195,6 +196,7 @@ from exabox.healthcheck.hcconstants import HcConstants, LOG_TYPE, CHK_RESULT
 from exabox.healthcheck.check_parser import CheckParser
 from exabox.healthcheck.check_executor import CheckExecutor
 from exabox.healthcheck.profile_parser import ProfileParser
+from exabox.healthcheck.hccache import HcResultCache, ebHcResultCacheEnabled
 
 from exabox.healthcheck.clucheck import ebCluCheck
 from exabox.healthcheck.hclogger import get_logger, init_logging
@@ -711,6 +713,9 @@ class ebCluHealth(object):
             if "Error while multiprocessing(Process timeout)" in str(e):
                 raise ExacloudRuntimeError(0x0756, 0xA, str(e))
 
+        if ebHcResultCacheEnabled(_eBox) and self.mGetPreChecksStatus():
+            self.mUpdateDelta(_jsonMap)
+
         ebLogHealth('NFO', '*** Errors, RECOMMENDs and Warnings ***')
         ebLogTrace('*** Errors, RECOMMENDs and Warnings ***')
         _recommend = get_logger().mGetRecommend()
@@ -754,6 +759,23 @@ class ebCluHealth(object):
 
         return 0
 
+    def mUpdateDelta(self, aJsonMap):
+        """ Add to aJsonMap the results which changed since the previous run of the profile """
+
+        _scope = "%s:%s" % (self.mGetEbox().mGetClusterName(), self.mGetProfileParser().mGetProfileName())
+        try:
+            _delta = HcResultCache(self).mBuildDelta(aJsonMap, _scope)
+        except Exception as e:
+            ebLogWarn('*** Healthcheck delta report not available: %s' % (str(e)))
+            return
+
+        aJsonMap[HcConstants.RES_DELTA] = _delta
+        ebLogHealth('NFO', '*** %d results changed since %s, %d unchanged ***' % (
+            len(_delta["changes"]), _delta["previousRun"], _delta["unchanged"]))
+        for _change in _delta["changes"]:
+            ebLogHealth('NFO', '*** %s on %s: %s -> %s ***' % (_change[HcConstants.RES_CHKNAME],
+                        _change[HcConstants.RES_NODENAME], _change["previous"], _change["current"]))
+
     def mZipResults(self):
         _zippath = self.mGetResultDir()
         _zipF = None
@@ -11,6 +11,7 @@ NOTE:
     None
 
 History:
+    jydas       10/18/2026 - Ping the cluster hosts in one batch (mPingHosts)
     joysjose    03/06/2026 - Bug 38900203 - EXACLOUD: ISSUES FOUND BY VOXIO CODEV AGENT IN DIR EXABOX/HEALTHCHECK
     vikasras    03/17/2021 - Bug 32285465 - BETTER HANDLING OF SSH-KEYGEN
     josedelg    08/03/2021 - Bug 32522779 - Add confirmation when executing
@@ -160,13 +161,14 @@ class ebCluPreChecks(ebCluCheck):
         #
         # Check HOST connectivity
         #
+        _pingable = self.__cluctrl.mPingHosts(list(_cluster_host_d.keys()))
         for _host in _cluster_host_d.keys():
 
             _clunode = _cluster_host_d[_host]
             #
             # Check if HOST is pingable
             #
-            if not self.__cluctrl.mPingHost(_host):
+            if not _pingable[_host]:
                 _clunode.mSetPingable(False)
                 _clunode.mSetSSHConnection(None)
                 _clunode.mSetRootSSHDMode(None)
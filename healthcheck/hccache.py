@@ -0,0 +1,230 @@
+"""
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    hccache.py - Result cache and delta report of the healthcheck checks
+
+FUNCTION:
+    Reuse the results of the checks run recently on a host instead of
+    running them again, and report what changed since the previous run.
+
+NOTE:
+    Opt-in with 'healthcheck_result_cache' set to True. A check is cached
+    when its entry in the master checklist declares a TTL:
+
+        "chkCacheTtl"    : 600,
+        "chkFingerprint" : ["mtime:/etc/oratab", "pid:ocssd.bin", "imageinfo"]
+
+    The result of the check on a host, for the same check params, is reused
+    for chkCacheTtl seconds as long as the probes of chkFingerprint give the
+    same output on the host:
+        mtime:<path>     modification time of the file
+        pid:<program>    PIDs of the program (pidof)
+        imageinfo        image version of the node
+    All the probes of a host run with one command. Probes are only valid for
+    node targets (dom0, domu, cell, switch). Only PASS results are cached,
+    failed checks always run again.
+
+    Results are stored in the data_cache table (core/DataCache.py), shared
+    by the workers.
+
+History:
+    jydas       10/18/2026 - Creation
+"""
+
+import json
+import shlex
+import hashlib
+import threading
+from copy import deepcopy
+from datetime import datetime
+
+from exabox.core.Context import get_gcontext
+from exabox.core.DataCache import ebGetDataCache
+from exabox.log.LogMgr import ebLogWarn, ebLogTrace
+from exabox.healthcheck.hcconstants import HcConstants, CHK_RESULT
+
+HC_PROBE_TYPES = ("mtime", "pid", "imageinfo")
+
+
+def ebHcResultCacheEnabled(aEbox):
+    return str(aEbox.mCheckConfigOption('healthcheck_result_cache')) == 'True'
+
+
+def mValidateProbe(aProbe):
+
+    if not isinstance(aProbe, str):
+        return False
+    _type, _, _arg = aProbe.partition(":")
+    if _type == "imageinfo":
+        return not _arg
+    return _type in HC_PROBE_TYPES and bool(_arg)
+
+
+def mProbeCommand(aProbes):
+    """ One command printing each probe followed by its output """
+
+    _cmds = []
+    for _probe in aProbes:
+        _type, _, _arg = _probe.partition(":")
+        if _type == "mtime":
+            _cmd = f"stat -c %Y {shlex.quote(_arg)}"
+        elif _type == "pid":
+            _cmd = f"pidof {shlex.quote(_arg)}"
+        else:
+            _cmd = "imageinfo -ver"
+        _cmds.append(f"echo {shlex.quote(_probe)}; {_cmd} 2>/dev/null")
+    return "; ".join(_cmds)
+
+
+class HcResultCache(object):
+
+    def __init__(self, aCluHealth, aCache=None):
+        self.__hc = aCluHealth
+        self.__cache = aCache
+        self.__lock = threading.Lock()
+        # (host, probes) -> fingerprint, probed once per run
+        self.__fingerprints = {}
+
+    def mGetCache(self):
+        if self.__cache is None:
+            self.__cache = ebGetDataCache()
+        return self.__cache
+
+    def mGetPolicy(self, aChkId):
+        """ (TTL, probes) of the check, TTL is None when it is not cached """
+
+        _parser = self.__hc.mGetCheckParser()
+        _ttl = _parser.mGetCheckCacheTtl(aChkId)
+        if not _ttl:
+            return None, []
+        return _ttl, _parser.mGetCheckFingerprint(aChkId)
+
+    def mGetKey(self, aHost, aChkId, aParams):
+
+        _params = json.dumps(aParams or {}, sort_keys=True, default=str)
+        return f"hc_result:{aHost}:{aChkId}:{hashlib.sha1(_params.encode('utf-8')).hexdigest()[:16]}"
+
+    def mProbe(self, aHost, aProbes):
+        """ Output of aProbes on aHost """
+
+        # Avoid cyclical dependency
+        from exabox.utils.node import connect_to_host, node_exec_cmd
+
+        with connect_to_host(aHost, get_gcontext()) as _node:
+            _ret = node_exec_cmd(_node, mProbeCommand(aProbes))
+        return _ret.stdout
+
+    def mFingerprint(self, aHost, aProbes):
+        """
+        Digest of the output of aProbes on aHost: '' without probes, None
+        when the probes could not run (the check is then not cached).
+        """
+
+        if not aProbes:
+            return ""
+        if aHost is None:
+            return None
+
+        _key = (aHost, tuple(aProbes))
+        with self.__lock:
+            if _key in self.__fingerprints:
+                return self.__fingerprints[_key]
+
+        try:
+            _fingerprint = hashlib.sha1(self.mProbe(aHost, aProbes).encode("utf-8")).hexdigest()
+        except Exception as e:
+            ebLogWarn(f"*** Healthcheck cache: probes failed on {aHost}: {e}")
+            _fingerprint = None
+
+        with self.__lock:
+            self.__fingerprints[_key] = _fingerprint
+        return _fingerprint
+
+    def mGet(self, aHost, aKeyHost, aChkId, aParams):
+        """
+        (cached result or None, fingerprint) of the check aChkId on aHost,
+        aKeyHost names the target when there is no host. The fingerprint is
+        passed back to mPut once the check ran.
+        """
+
+        _ttl, _probes = self.mGetPolicy(aChkId)
+        if not _ttl:
+            return None, None
+
+        _fingerprint = self.mFingerprint(aHost, _probes)
+        if _fingerprint is None:
+            return None, None
+
+        try:
+            _entry = self.mGetCache().mGet(self.mGetKey(aKeyHost, aChkId, aParams))
+        except Exception as e:
+            ebLogWarn(f"*** Healthcheck cache: lookup of {aChkId} on {aKeyHost} failed: {e}")
+            return None, None
+
+        if not _entry or _entry.get("fingerprint") != _fingerprint:
+            return None, _fingerprint
+
+        ebLogTrace(f"*** Healthcheck cache: {aChkId} on {aKeyHost} from {_entry['time']}")
+        # The memo of the data cache keeps its own copy
+        _result = deepcopy(_entry["result"])
+        _result[HcConstants.RES_CACHED] = _entry["time"]
+        return _result, _fingerprint
+
+    def mPut(self, aKeyHost, aChkId, aParams, aFingerprint, aResult):
+
+        if aFingerprint is None or aResult.get(HcConstants.RES_RESULT) != CHK_RESULT.reverse_mapping(CHK_RESULT.PASS):
+            return
+
+        _ttl, _ = self.mGetPolicy(aChkId)
+        if not _ttl:
+            return
+
+        _entry = {
+            "fingerprint": aFingerprint,
+            "time": aResult.get(HcConstants.RES_ENDTIME) or str(datetime.now().replace(microsecond=0)),
+            "result": aResult
+        }
+        try:
+            self.mGetCache().mSet(self.mGetKey(aKeyHost, aChkId, aParams), _entry, aTtl=_ttl)
+        except Exception as e:
+            ebLogWarn(f"*** Healthcheck cache: could not store {aChkId} on {aKeyHost}: {e}")
+
+    def mBuildDelta(self, aJsonMap, aScope):
+        """
+        Results of aJsonMap which changed since the previous run of aScope
+        (cluster and profile), the results of this run become the reference.
+        """
+
+        _current = {}
+        for _chkname, _nodes in aJsonMap.items():
+            if _chkname in (HcConstants.RES_DISPLAYSTRING, HcConstants.RES_NODESUMMARY, HcConstants.RES_DELTA) or \
+               not isinstance(_nodes, dict):
+                continue
+            for _node, _result in _nodes.items():
+                if isinstance(_result, dict) and HcConstants.RES_RESULT in _result:
+                    _current.setdefault(_chkname, {})[_node] = _result[HcConstants.RES_RESULT]
+
+        _name = f"hc_snapshot:{aScope}"
+        _previous = self.mGetCache().mGet(_name) or {}
+        _before = _previous.get("results", {})
+
+        _changes = []
+        _unchanged = 0
+        for _chkname in sorted(set(_before) | set(_current)):
+            _old = _before.get(_chkname, {})
+            _new = _current.get(_chkname, {})
+            for _node in sorted(set(_old) | set(_new)):
+                if _old.get(_node) == _new.get(_node):
+                    _unchanged += 1
+                    continue
+                _changes.append({
+                    HcConstants.RES_CHKNAME: _chkname,
+                    HcConstants.RES_NODENAME: _node,
+                    "previous": _old.get(_node),
+                    "current": _new.get(_node)
+                })
+
+        _now = str(datetime.now().replace(microsecond=0))
+        self.mGetCache().mSet(_name, {"time": _now, "results": _current}, aTtl=0)
+        return {"previousRun": _previous.get("time"), "changes": _changes, "unchanged": _unchanged}
@@ -11,6 +11,7 @@ NOTE:
     None
 
 History:
+    jydas       10/18/2026 - Result cache fields
     bhuvnkum    02/19/2018 - Creation
 
 """
@@ -68,6 +69,8 @@ class HcConstants(object):
     CHK_TAGS            =   "chkTags"
     CHK_REF             =   "chkRef"
     CHK_ALERT_LEVEL     =   "chkAlertLevel"
+    CHK_CACHE_TTL       =   "chkCacheTtl"
+    CHK_FINGERPRINT     =   "chkFingerprint"
     
     PROFILE_NAME        =   "hcProfileName"
     RESULT_LEVEL        =   "hcResultLevel"
@@ -119,6 +122,8 @@ class HcConstants(object):
     RES_DISPLAYSTRING   =   "hcDisplayString"
     RES_CUSTOMERTAG     =   "chkCustomerDisplayTag"
     RES_NODESUMMARY     =   "nodeSummary"
+    RES_CACHED          =   "hcCachedAt"
+    RES_DELTA           =   "hcDelta"
 
     # networks
     CLIENT              =   "client"
@@ -15,6 +15,7 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Batched patch monitor (enable_batched_patch_monitor)
 #    jyotdas     04/08/26 - Codex scan issue fixes
 #    jyotdas     03/05/26 - 39033262 - Support Targetversion Latest for dom0
 #                           Elu in Non Single Thread Patching
@@ -174,7 +175,7 @@ import traceback
 import secrets
 import glob
 from base64 import b64decode
-from time import sleep
+from time import sleep, monotonic
 from uuid import uuid4
 import os
 from datetime import datetime
@@ -184,6 +185,7 @@ from exabox.agent.Client import ebExaClient
 from exabox.core.Context import get_gcontext
 from exabox.core.DBStore import ebGetDefaultDB
 from exabox.core.Error import ExacloudRuntimeError
+from exabox.core.StatusNotify import ebStatusStamp, ebStatusWait
 from exabox.core.Node import exaBoxNode
 from exabox.infrapatching.handlers.loghandler import LogHandler
 from ast import literal_eval
@@ -252,6 +254,7 @@ class ebCluPatchDispatcher(LogHandler):
         self.__acquire_lock = False
         self.__cluster_key = None
         self.__child_request_uuid = None
+        self.__batched_monitor = False
 
         _get_context = get_gcontext()
 
@@ -1569,6 +1572,12 @@ class ebCluPatchDispatcher(LogHandler):
             for _row in _rows:
                 _master_patch_list[_row[0]] = _row[1]
 
+        # Batched monitor: status of all the pending requests in one query
+        _statuses = {}
+        _fabric_rows = None
+        if self.__batched_monitor:
+            _statuses = _db.mGetRequestsStatus([_req['uuid'] for _req in self.__pending_requests if _req])
+
         # Update individual requests
         for _index, _request in enumerate(self.__pending_requests):
 
@@ -1576,11 +1585,16 @@ class ebCluPatchDispatcher(LogHandler):
                 _done.append(_index)
                 continue
 
-            _row = _db.mGetRequest(_request['uuid'])
+            if self.__batched_monitor:
+                _row = _statuses.get(_request['uuid'])
+            else:
+                _row = _db.mGetRequest(_request['uuid'])
+                if _row:
+                    _row = (_row[1], _row[6], _row[7])
             if _row:
-                self.__pending_requests[_index]['status'] = _row[1]
-                self.__pending_requests[_index]['error'] = _row[6]
-                self.__pending_requests[_index]['error_str'] = _row[7]
+                self.__pending_requests[_index]['status'] = _row[0]
+                self.__pending_requests[_index]['error'] = _row[1]
+                self.__pending_requests[_index]['error_str'] = _row[2]
 
             # If request finished, then we must delete it from pending list
             if self.__pending_requests[_index]['status'].startswith('Done'):
@@ -1589,7 +1603,14 @@ class ebCluPatchDispatcher(LogHandler):
                 _non_ib_switch = self.__pending_requests[_index]['non_ibswitch']
                 _cluid = self.__pending_requests[_index]['cluster_id']
                 _fabric = self.__pending_requests[_index]['fabric_ptr']
-                _fabric.mRefreshData()
+                _fabric_row = None
+                if self.__batched_monitor:
+                    if _fabric_rows is None:
+                        _fabric_rows = _db.mGetIBFabricEntries(
+                            [_req['fabric_ptr'].mGetIBFabricID() for _req in self.__pending_requests if _req])
+                    # A fabric is read again once its lock may have been cleaned below
+                    _fabric_row = _fabric_rows.pop(int(_fabric.mGetIBFabricID()), None)
+                _fabric.mRefreshData(_fabric_row)
                 _list = _fabric.mGetBusyClustersList().strip().split()
                 for _id in _list:
                     if int(_id.strip()) == int(_cluid):
@@ -1621,8 +1642,12 @@ class ebCluPatchDispatcher(LogHandler):
             if _uuid in _master_patch_list and _master_patch_list[_uuid] != _status:
                 _updated_patch_list[_uuid] = _status
         # Update patch list in the db
-        for _key in _updated_patch_list.keys():
-            _db.mUpdateChildRequestStatus(_master_uuid, _key, _updated_patch_list[_key])
+        if self.__batched_monitor:
+            if _updated_patch_list:
+                _db.mUpdateChildRequestsStatus(_master_uuid, _updated_patch_list)
+        else:
+            for _key in _updated_patch_list.keys():
+                _db.mUpdateChildRequestStatus(_master_uuid, _key, _updated_patch_list[_key])
 
         # Delete request from pending list and add it to done requests list
         for _index in reversed(_done):
@@ -1632,6 +1657,17 @@ class ebCluPatchDispatcher(LogHandler):
         self.mUpdateStatusFromRequests()
         return (len(self.__done_requests) + len(self.__pending_requests))
 
+    def mRefreshFabrics(self):
+        """
+        Refreshes all the fabrics by reading their db rows with a single query.
+        """
+
+        _rows = ebGetDefaultDB().mGetIBFabricEntries([_fabric.mGetIBFabricID() for _fabric in self.__ibFabrics])
+        for _fabric in self.__ibFabrics:
+            _row = _rows.get(int(_fabric.mGetIBFabricID()))
+            if _row:
+                _fabric.mRefreshData(_row)
+
     def mGetFabricIDsFromPendingRequests(self):
         """
         Returns the IDs from the fabrics that have pending requests
@@ -1747,6 +1783,12 @@ class ebCluPatchDispatcher(LogHandler):
         1.- It sends all the non_ibswitch requests.
         2.- It sends ibswitch requests only when non_ibswitch requests are running in the fabric
         3.- It waits until all the requests are done.
+
+        With enable_batched_patch_monitor, each pass reads the fabrics and the
+        child requests with one query each and updates the patch list in one
+        transaction. Between passes it waits for a request status change
+        (core/StatusNotify.py) for at least patch_monitor_min_wait_in_seconds
+        and at most SLEEP_TIME seconds.
         """
 
         _db = ebGetDefaultDB()
@@ -1766,6 +1808,15 @@ class ebCluPatchDispatcher(LogHandler):
         _sent_requests = 0
         _patch_operation_timeout_in_sec = self.mCalculatePatchOperationTimeout(aPayloadOptions)
 
+        self.__batched_monitor = str(mGetInfraPatchingConfigParam('enable_batched_patch_monitor')).lower() == 'true'
+        _min_wait = 0
+        if self.__batched_monitor:
+            _min_wait = int(mGetInfraPatchingConfigParam('patch_monitor_min_wait_in_seconds') or 0)
+            self.mPatchLogInfo(f"Batched patch monitor enabled, minimum wait between passes {_min_wait} seconds.")
+        _start_time = monotonic()
+        _status_stamp = ebStatusStamp()
+        _next_status_log = 0
+
         try:
 
             while True:
@@ -1775,10 +1826,14 @@ class ebCluPatchDispatcher(LogHandler):
                     # Get fabric ids from pending requests
                     _pending_fabric_ids = self.mGetFabricIDsFromPendingRequests()
 
+                    if self.__batched_monitor:
+                        self.mRefreshFabrics()
+
                     # Iterate in all fabrics
                     for _fabric in self.__ibFabrics:
                         # Refresh object data (read db info)
-                        _fabric.mRefreshData()
+                        if not self.__batched_monitor:
+                            _fabric.mRefreshData()
 
                         # If pending requests in fabric ignore
                         if int(_fabric.mGetIBFabricID()) in _pending_fabric_ids:
@@ -1823,7 +1878,13 @@ class ebCluPatchDispatcher(LogHandler):
                             f'In Progress Patching Request Info ---> master_patch_uuid: {self.mGetRequestObj().mGetUUID()}  child_patch_uuid: {self.__child_request_uuid} ')
                         self.mPatchLogInfo(f'Dispatcher Log: {self.mGetRequestObj().mGetUUID() + "_patch.patchclu_apply.log"} ')
 
-                if (_elapsed_time % (self.SLEEP_TIME * 5)) == 0:
+                _log_status = (_elapsed_time % (self.SLEEP_TIME * 5)) == 0
+                if self.__batched_monitor:
+                    # Passes are not SLEEP_TIME apart
+                    _log_status = _elapsed_time >= _next_status_log
+                    if _log_status:
+                        _next_status_log = _elapsed_time + self.SLEEP_TIME * 5
+                if _log_status:
                     self.mPatchLogInfo(
                         f"\t\tmonitor_status: ---> Done=[{len(self.__done_requests):d}], Pending=[{len(self.__pending_requests):d}], Expected[{self.__expected_requests:d}]")
 
@@ -1833,8 +1894,12 @@ class ebCluPatchDispatcher(LogHandler):
                     break
 
                 # Sleep monitor
-                sleep(self.SLEEP_TIME)
-                _elapsed_time += self.SLEEP_TIME
+                if self.__batched_monitor:
+                    _status_stamp = ebStatusWait(_status_stamp, self.SLEEP_TIME, _min_wait)
+                    _elapsed_time = monotonic() - _start_time
+                else:
+                    sleep(self.SLEEP_TIME)
+                    _elapsed_time += self.SLEEP_TIME
 
                 if _elapsed_time >= _patch_operation_timeout_in_sec:
                     self.mPatchLogError("Patch request monitor timed out. Admin should check for individual requests status:")
@@ -16,6 +16,7 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - mRefreshData from a row read by the caller
 #    araghave    08/27/24 - Enh 36829406 - PERFORM STRING INTERPOLATION USING
 #                           F-STRINGS FOR ALL THE CORE, PLUGIN AND TASKHANDLER
 #                           FILES
@@ -221,14 +222,17 @@ class IBFabricPatch(LogHandler):
         else:
             self.mPatchLogInfo("No switch fabric entries present in exacloud DB IBfabriclocks table and no action to cleanup stale entries required for now.")
 
-    def mRefreshData(self):
+    def mRefreshData(self, aRow=None):
         """
         Refreshes all the data in this object by reading the values from the db.
+        aRow is the ibfabriclocks row of the fabric when the caller already
+        read it (see DBStore3.mGetIBFabricEntries).
         """
 
-        _db = ebGetDefaultDB()
-
-        _row = _db.mCheckIBFabricEntry(aFabricID=self.mGetIBFabricID())
+        _row = aRow
+        if _row is None:
+            _db = ebGetDefaultDB()
+            _row = _db.mCheckIBFabricEntry(aFabricID=self.mGetIBFabricID())
 
         if _row:
             '''
@@ -16,6 +16,10 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - CRS/DB validation snapshot getters
+#    jydas       10/18/26 - dom0 rolling wave size getters
+#    jydas       10/18/26 - Set the sampling profiler stage with the time
+#                           stats entries
 #    jyotdas     06/20/26 - Enh 39523473 - Track Plugin Progress Status in
 #                           Infrapatching Tooling
 #    araghave    06/08/26 - Bug 39483306 - QMR PATCHING FAILING DUE TO "BAD
@@ -471,6 +475,7 @@ from time import sleep
 from exabox.BaseServer.AsyncProcessing import ProcessManager, ProcessStructure
 from exabox.core.Context import get_gcontext
 from exabox.core.DBStore import ebGetDefaultDB
+from exabox.tools.profiling.sampler import ebSamplingSetStage
 from exabox.core.Node import exaBoxNode
 from exabox.infrapatching.core.infrapatcherror import (
     INDIVIDUAL_PATCH_REQUEST_EXCEPTION_ERROR,
@@ -1878,6 +1883,12 @@ class GenericHandler(LogHandler):
     
     def mGetNodeSleepMaxLimitInSeconds(self):
         return int(mGetInfraPatchingConfigParam('node_sleep_max_limit_in_seconds'))
+
+    def mGetDom0RollingMaxParallelNodes(self):
+        return max(1, int(mGetInfraPatchingConfigParam('dom0_rolling_max_parallel_nodes')))
+
+    def mGetDom0RollingMaxNodesDownPerCluster(self):
+        return max(1, int(mGetInfraPatchingConfigParam('dom0_rolling_max_nodes_down_per_cluster')))
     
     def mGetExadataPatchWorkingSpaceMB(self):
         return int(mGetInfraPatchingConfigParam('exadata_patch_working_space_mb'))
@@ -1972,6 +1983,20 @@ class GenericHandler(LogHandler):
     def mGetDBHealthChecksParallelExecutionWaitTimeInSeconds(self):
         return int(mGetInfraPatchingConfigParam('db_healthchecks_parallel_execution_wait_time_in_seconds'))
 
+    def mIsCrsValidationSnapshotEnabled(self):
+        """
+        CRS/DB validations of the domUs swept on threads and kept for the
+        patch stage (see crssnapshot.py), "enable_crs_validation_snapshot"
+        is False by default.
+        """
+        _enable_crs_validation_snapshot = mGetInfraPatchingConfigParam('enable_crs_validation_snapshot')
+        if _enable_crs_validation_snapshot:
+            return _enable_crs_validation_snapshot.lower() in ['true']
+        return False
+
+    def mGetCrsValidationSnapshotMaxThreads(self):
+        return max(1, int(mGetInfraPatchingConfigParam('crs_validation_snapshot_max_threads')))
+
     def mGetMaxNumberofSshRetries(self):
         return int(mGetInfraPatchingConfigParam('max_number_of_ssh_retries'))
 
@@ -3867,6 +3892,8 @@ class GenericHandler(LogHandler):
         return _launch_node_candidates
 
     def mCreateInfrapatchingTimeStatsEntry(self, aNodes, aStage, aSubStage=''):
+        # Samples of the sampling profiler are attributed to the patching stage
+        ebSamplingSetStage(f"{aStage}:{aSubStage}" if aSubStage else aStage)
         if self.mIsTimeStatsEnabled():
             """
             Sets patching time stat record object
@@ -16,6 +16,8 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Rolling dom0 patching by waves
+#                           (dom0_rolling_max_parallel_nodes)
 #    jyotdas     05/19/26 - Bug 39401571 - Handle payload directory for dom0
 #                           elu in exacc
 #    jyotdas     05/11/26 - Bug 39347652 - Perform dom0 Elu Rollback With the
@@ -602,6 +604,7 @@ import time
 import json
 import traceback
 from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 from exabox.BaseServer.AsyncProcessing import ProcessManager, ProcessStructure
 from exabox.core.Context import get_gcontext
 from exabox.core.Node import exaBoxNode
@@ -4079,7 +4082,16 @@ class Dom0Handler(TargetHandler):
 
         If patching any dom0 fails the rest of the (not yet patched) dom[0U]s
         will not be attempted to be patched.
+
+        With dom0_rolling_max_parallel_nodes above 1 the dom0s are patched
+        by waves instead (mPatchRollbackDom0sRollingWaves).
         """
+        _max_parallel_nodes = self.mGetDom0RollingMaxParallelNodes()
+        if _max_parallel_nodes > 1 and any(len(_l) > 1 for _, _l in aNodePatcherAndPatchList):
+            self.mPatchLogInfo(f"{PATCH_DOM0.upper()} rolling {self.mGetTask()} by waves of up to {_max_parallel_nodes} nodes.")
+            return self.mPatchRollbackDom0sRollingWaves(aNodePatcherAndPatchList, aListOfNodesToBePatched, aRollback,
+                                                        aListOfEluNodes, _max_parallel_nodes)
+
         _callbacks = self.mGetCallBacks()
         _patchMgrObj = None
 
@@ -4573,6 +4585,526 @@ class Dom0Handler(TargetHandler):
 
         return _rc
 
+    def mBuildDom0RollingWaves(self, aNodes, aMaxParallelNodes, aMaxDownPerCluster):
+        """
+        Splits aNodes in waves of dom0s patched at the same time during a
+        rolling patch. A wave has up to aMaxParallelNodes dom0s and never
+        more than aMaxDownPerCluster dom0s hosting VMs of the same cluster.
+        A cluster never loses all its VMs in a wave, dom0s without VMs are
+        not constrained. The order of aNodes is kept as much as possible.
+
+        The clusters come from the dom0domuDetails sent by ECRA. Without
+        them every dom0 is a wave of its own, and a dom0 running VMs which
+        are not in the mapping is patched alone in its wave.
+        """
+        _max_parallel_nodes = max(1, int(aMaxParallelNodes))
+        _max_down_per_cluster = max(1, int(aMaxDownPerCluster))
+
+        _cluster_size = {}
+        for _cluster, _vm_list in (self.mGetClusterToVmMapWithNonZeroVcpu() or []):
+            _cluster_size[_cluster] = len(_vm_list)
+
+        def _mAllowedDown(aCluster):
+            if _cluster_size.get(aCluster, 0) > 1:
+                return min(_max_down_per_cluster, _cluster_size[aCluster] - 1)
+            return 1
+
+        if not self.mGetDom0ToClusterMapping():
+            self.mPatchLogWarn("Dom0 to cluster mapping is not available, dom0s are patched one at a time.")
+            return [[_node] for _node in aNodes]
+
+        _clusters = {}
+        _unmapped = set()
+        for _node in aNodes:
+            _clusters[_node] = set(self.mGetClusterListForDom0(_node))
+            if not _clusters[_node] and self.mGetCluPatchCheck().mCheckVMsUp(_node):
+                self.mPatchLogWarn(f"VMs running on {_node} are not in the dom0 to cluster mapping, {_node} is patched alone.")
+                _unmapped.add(_node)
+
+        _pending = list(aNodes)
+        _waves = []
+        while _pending:
+            _wave = []
+            _down = {}
+            for _node in list(_pending):
+                if len(_wave) >= _max_parallel_nodes:
+                    break
+                if _node in _unmapped:
+                    if not _wave:
+                        _wave.append(_node)
+                        _pending.remove(_node)
+                        break
+                    continue
+                if any(_down.get(_cluster, 0) >= _mAllowedDown(_cluster) for _cluster in _clusters[_node]):
+                    continue
+                for _cluster in _clusters[_node]:
+                    _down[_cluster] = _down.get(_cluster, 0) + 1
+                _wave.append(_node)
+                _pending.remove(_node)
+            _waves.append(_wave)
+        return _waves
+
+    def mStageDom0RollingWave(self, aWave, aRollback):
+        """
+        Gathers the data of the dom0s of aWave needed to patch them and to
+        validate them after patching. Only reads from the nodes, so it runs
+        while the previous wave is post-checked.
+
+        Returns (rc, {dom0: (domU list, pre-patch version)}, system consistency state)
+        """
+        _node_data = {}
+        _is_system_valid_state = True
+        for _node_to_patch in aWave:
+            # stop rollback if it found to be a fresh install
+            if aRollback and self.mCheckFreshInstall(_node_to_patch):
+                _rc = DOM0_ROLLBACK_FAILED_FOR_FRESH_INSTALL
+                _suggestion_msg = f"The node {_node_to_patch} seems to be fresh install and we cannot perform rollback operation. Current operation style is Rolling"
+                self.mAddError(_rc, _suggestion_msg)
+                return _rc, _node_data, _is_system_valid_state
+
+            # Perform system consistency check only during patch operation.
+            if not aRollback:
+                _is_valid_state, _ = self.mCheckSystemConsitency([_node_to_patch])
+                _is_system_valid_state = _is_system_valid_state and _is_valid_state
+
+            _domU_listed_by_xm_list = self.mGetCluPatchCheck().mCheckVMsUp(_node_to_patch)
+            self.mPatchLogInfo(f"List of domUs : {str(_domU_listed_by_xm_list)} running on dom0 :{_node_to_patch} ")
+            self.mGetCRSHelper().mCollectEDVCellInfo(_domU_listed_by_xm_list)
+            _pre_patch_version = self.mGetCluPatchCheck().mCheckTargetVersion(
+                _node_to_patch, PATCH_DOM0, aIsexasplice=self.mIsExaSplice())
+            _node_data[_node_to_patch] = (_domU_listed_by_xm_list, _pre_patch_version)
+
+        return PATCH_SUCCESS_EXIT_CODE, _node_data, _is_system_valid_state
+
+    def mPrePatchDom0RollingWave(self, aWave, aNodeData, aLaunchNodes, aLaunchNodeUser, aRollback):
+        """
+        Pre patch plugins and database downtime detection on the dom0s of
+        aWave. Runs once the previous wave passed its post-patch checks.
+        """
+        _rc = PATCH_SUCCESS_EXIT_CODE
+        for _node_to_patch in aWave:
+            # Run dbnu plugin on each Node before patchmgr command
+            _dbnu_plugin_handler = self.mGetDbnuPluginHandler()
+            if _dbnu_plugin_handler:
+                _rc = _dbnu_plugin_handler.mApply(_node_to_patch, PATCH_DOM0)
+                if _rc != PATCH_SUCCESS_EXIT_CODE:
+                    self.mPatchLogError(f"Error running Dbnu plugins validation. Return code was {str(_rc)}. Errors on screen and in logs")
+                    return _rc
+
+            # Run Pre Post Plugins
+            if self.mIsExacloudPluginEnabled():
+                _read_patch_state = mGetPatchStatesForNode(aLaunchNodes, self.mGetMetadataJsonFile(),
+                                                           _node_to_patch, PRE_PATCH, aUser=aLaunchNodeUser)
+                self.mPatchLogInfo(f"Dom0 pre plugin patch status: {_read_patch_state}")
+                if not _read_patch_state:
+                    _rc = DOM0_PRECHECK_EXECUTION_FAILED_ERROR
+                    self.mAddError(_rc, f"Invalid patch state found during rolling patch = {_read_patch_state}")
+                    return _rc
+
+                if _read_patch_state in [PATCH_PENDING, PATCH_RUNNING]:
+                    if _read_patch_state == PATCH_PENDING:
+                        mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                             self.mGetMetadataJsonFile(), PRE_PATCH, PATCH_RUNNING, aUser=aLaunchNodeUser)
+                    _rc = self.mGetPluginHandler().mApply(_node_to_patch, PATCH_DOM0, PRE_PATCH, aRollback=aRollback)
+                    if _rc != PATCH_SUCCESS_EXIT_CODE:
+                        mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                             self.mGetMetadataJsonFile(), PRE_PATCH, PATCH_FAILED, aUser=aLaunchNodeUser)
+                        return _rc
+                    mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                         self.mGetMetadataJsonFile(), PRE_PATCH, PATCH_COMPLETED, aUser=aLaunchNodeUser)
+                elif _read_patch_state == PATCH_FAILED:
+                    _rc = DOM0_PRECHECK_EXECUTION_FAILED_ERROR
+                    self.mAddError(_rc, f"Patch read state : FAILED on : {_node_to_patch}")
+                    return _rc
+
+        # Run plugin metadata based exacloud plugins before patchmgr cmd
+        if self.mGetTask() in [ TASK_PATCH ] and not self.mIsExaSplice() and len(self.mGetPluginMetadata()) > 0:
+            _plugin_metadata_based_exacloud_plugin_enabled, _ = checkPluginEnabledFromInfraPatchMetadata(self.mGetPluginMetadata())
+            if _plugin_metadata_based_exacloud_plugin_enabled:
+                self.mPatchLogInfo(
+                    f"Executing Exacloud Plugins implicitly based on the infra patch plugin metadata during PrePatch stage and as part of {self.mGetOpStyle()} patching.")
+                _rc = self.mGetPluginHandler().mExacloudPluginMetadataExecutor(list(aWave), "pre")
+                if _rc != PATCH_SUCCESS_EXIT_CODE:
+                    return _rc
+
+        # Run DB healtchecks on vms where crs auto_start is enabled and crs is running
+        for _node_to_patch in aWave:
+            _crs_running_vm_list = [_vm for _vm in aNodeData[_node_to_patch][0]
+                                    if _vm in self.mGetCRSHelper().mGetCRSAutoStartEnabledVMSet()]
+            _rc = self.mGetCRSHelper().mDetectCDBDowntimeDuringDom0Patching(_node_to_patch, _crs_running_vm_list)
+            if _rc != PATCH_SUCCESS_EXIT_CODE:
+                return _rc
+            _rc = self.mGetCRSHelper().mDetectPDBDowntimeDuringDom0Patching(_node_to_patch, _crs_running_vm_list)
+            if _rc != PATCH_SUCCESS_EXIT_CODE:
+                return _rc
+
+        return _rc
+
+    def mPatchDom0RollingWave(self, aNodePatcher, aWave, aNodeData, aIsSystemValidState, aTask,
+                              aLaunchNodes, aLaunchNodeUser, aListOfEluNodes, aPreviousWave=None):
+        """
+        Patches the dom0s of aWave at the same time with a single patchmgr
+        run (without --rolling) from aNodePatcher, after shutting down their
+        VMs like a non-rolling patch does.
+
+        Returns (rc, node patcher used, True when patchmgr was run)
+        """
+        _node_patch_base_after_unzip = self.mGetDom0PatchBaseAfterUnzip()
+        _wave = list(aWave)
+
+        # update with current dom0 patcher which will be used in CNS monitor
+        _node_patch_progress = os.path.join(self.mGetLogPath(), CNS_DOM0_PATCHER)
+        with open(_node_patch_progress, "w") as write_nodestat:
+            write_nodestat.write(f"{aNodePatcher}:{self.mGetPatchmgrLogPathOnLaunchNode()}")
+
+        _patchMgrObj = InfraPatchManager(aTarget=PATCH_DOM0, aOperation=aTask, aPatchBaseAfterUnzip=_node_patch_base_after_unzip,
+                                         aLogPathOnLaunchNode=self.mGetPatchmgrLogPathOnLaunchNode(), aHandler=self)
+        _patchMgrObj.mSetIsoRepo(aIsoRepo=self.mGetDom0PatchZip2Name())
+        _patchMgrObj.mSetIsExaSpliceEnabled(aIsExaSpliceEnabled=self.mIsExaSplice())
+        _patchMgrObj.mSetTargetVersion(aTargetVersion=self.mGetTargetVersion())
+        _patchMgrObj.mSetSystemConsistencyState(aSystemConsistencyState=aIsSystemValidState)
+        # The wave is patched in one go, the rolling is done across the waves
+        _patchMgrObj.mSetOperationStyle(aOperationStyle=OP_STYLE_NON_ROLLING)
+
+        _input_file = _patchMgrObj.mCreateNodesToBePatchedFile(aLaunchNode=aNodePatcher, aHostList=_wave)
+        _patch_cmd = _patchMgrObj.mGetPatchMgrCmd()
+
+        # patchmgr expects the VMs of the dom0s patched together to be down
+        _domU_up_per_dom0 = {_node: aNodeData[_node][0] for _node in _wave}
+        if not self.mIsExaSplice() and any(_domU_up_per_dom0.values()):
+            _rc = self.mParallelShutdownAllDomUinDom0(_wave, _domU_up_per_dom0)
+            if _rc != PATCH_SUCCESS_EXIT_CODE:
+                _rc = DOM0_FAILED_TO_SHUTDOWN_VMS
+                self.mAddError(_rc, f"Shutdown VMs during dom0 rolling upgrade of {str(_wave)} failed. Failure reason for shutdown of VM's needs to be investigated.")
+                return _rc, aNodePatcher, False
+
+        _patchmgr_session_exit = PATCH_SUCCESS_EXIT_CODE
+        _patchmgr_active_node = None
+        _patchmgr_run = False
+
+        if self.mPerformPatchmgrExistenceCheck():
+            _patchMgrObj.mSetLaunchNode(aLaunchNode=None)
+            if len(aListOfEluNodes) > 0:
+                _patchMgrObj.mSetCustomizedNodeList(aCustomizedNodeList=aListOfEluNodes)
+            else:
+                _patchMgrObj.mSetCustomizedNodeList(aCustomizedNodeList=self.mGetCustomizedDom0List())
+            _patchmgr_session_exit, _patchmgr_active_node = _patchMgrObj.mCheckForPatchMgrSessionExistence()
+
+        if _patchmgr_session_exit == PATCH_SUCCESS_EXIT_CODE:
+            for _node_to_patch in _wave:
+                mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                     self.mGetMetadataJsonFile(), PATCH_MGR, PATCH_RUNNING, aUser=aLaunchNodeUser)
+                # Write crs stop message into cell alert logs, skipped during exasplice patch.
+                if not self.mIsExaSplice():
+                    _rc = self.mWriteCRSMessagesToCellTraceLogs(_node_to_patch)
+                    if _rc != PATCH_SUCCESS_EXIT_CODE:
+                        return _rc, aNodePatcher, False
+
+            _patchMgrObj.mSetLaunchNode(aLaunchNode=aNodePatcher)
+            _rc = _patchMgrObj.mExecutePatchMgrCmd(aPatchMgrCmd=_patch_cmd)
+            if _rc != PATCH_SUCCESS_EXIT_CODE:
+                return _rc, aNodePatcher, False
+            _patchmgr_run = True
+
+            # Capture time profile details
+            if not aPreviousWave:
+                self.mPopulateInfrapatchingTimeStatsEntries(aNewStage="PATCH_MGR", aNewSubStage="",
+                                                            aNewStageNodes=str(_wave),
+                                                            aCompletedStage="PRE_PATCH", aCompletedSubStage="")
+            else:
+                self.mPopulateInfrapatchingTimeStatsEntries(aNewStage="PATCH_MGR", aNewSubStage="",
+                                                            aNewStageNodes=str(_wave),
+                                                            aCompletedStage="POST_PATCH", aCompletedSubStage="",
+                                                            aCompletedStageNodeDetails=str(aPreviousWave))
+        else:
+            if not self.mPatchRequestRetried():
+                self.mPatchLogError('Found older patchmgr session. Forcibly terminating patching request')
+                return _patchmgr_session_exit, aNodePatcher, False
+
+            # Already patchmgr is running, just monitor patchmgr console on the node.
+            self.mPatchLogInfo(
+                f"Patchmanager session exists and return code = {_patchmgr_session_exit}, Patchmgr session active node = {_patchmgr_active_node}")
+            _patchMgrObj.mSetLaunchNode(aLaunchNode=_patchmgr_active_node)
+            aNodePatcher = _patchmgr_active_node
+
+        _patchMgrObj.mSetCustomizedNodeList(aCustomizedNodeList=None)
+        _patchMgrObj.mWaitForPatchMgrCmdExecutionToComplete()
+        self.mPatchLogInfo("Finished waiting for Patch Manager command execution. Starting to handle exit code from Patch Manager")
+        _rc = _patchMgrObj.mGetStatusCode()
+
+        self.mPopulateInfrapatchingTimeStatsEntries(aNewStage="POST_PATCH", aNewSubStage="",
+                                                    aNewStageNodes=str(_wave),
+                                                    aCompletedStage="PATCH_MGR", aCompletedSubStage="",
+                                                    aCompletedStageNodeDetails=str(_wave))
+
+        _patch_metadata_status = PATCH_COMPLETED if _rc == PATCH_SUCCESS_EXIT_CODE else PATCH_FAILED
+        for _node_to_patch in _wave:
+            mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                 self.mGetMetadataJsonFile(), PATCH_MGR, _patch_metadata_status, aUser=aLaunchNodeUser)
+
+        # Get the logs, diags and so on
+        _patch_log = str(self.mGetDom0FileCode(aNodePatcher, self.mGetPatchmgrLogPathOnLaunchNode()))
+        self.mGetPatchMgrOutFiles(aNodePatcher, self.mGetPatchmgrLogPathOnLaunchNode(), _patch_log)
+        if _rc != PATCH_SUCCESS_EXIT_CODE:
+            self.mGetPatchMgrDiagFiles(aNodePatcher, PATCH_DOM0, _wave, self.mGetPatchmgrLogPathOnLaunchNode())
+        else:
+            self.mPatchLogInfo("Patchmgr diag logs are not collected in case of a successful infra patch operation.")
+        self.mGetPatchMgrMiscLogFiles(aNodePatcher, self.mGetPatchmgrLogPathOnLaunchNode())
+        self.mPrintPatchmgrLogFormattedDetails()
+
+        _dom0 = exaBoxNode(get_gcontext())
+        self.mSetConnectionUser(_dom0)
+        _dom0.mConnect(aHost=aNodePatcher)
+        _dom0.mExecuteCmdLog(f"rm -f {_input_file}")
+        # Moving log_dir to log_dir_<node_patched>, before starting another one
+        _dom0.mExecuteCmdLog(
+            f"mv -f {self.mGetPatchmgrLogPathOnLaunchNode()} {self.mGetPatchmgrLogPathOnLaunchNode()}_{aNodePatcher.split('.')[0]}")
+        _dom0.mDisconnect()
+
+        # Log location is updated in mUpdateNodePatcherLogDir for proper collection of final CNS notification
+        self.mUpdateNodePatcherLogDir(aNodePatcher, CNS_DOM0_PATCHER)
+
+        return _rc, aNodePatcher, _patchmgr_run
+
+    def mPostCheckDom0RollingWave(self, aWave, aNodeData, aLaunchNodes, aLaunchNodeUser, aRollback):
+        """
+        Post-patch checks and plugins on the dom0s of aWave. This is the
+        health gate of the next wave: it runs while the next wave is staged
+        and the next wave is only patched when it succeeds.
+
+        Returns (rc, dom0 which failed or None)
+        """
+        for _node_to_patch in aWave:
+            # We need this data for the plugins
+            if self.mIsExacloudPluginEnabled():
+                self.mGetPluginHandler().mSetLastNodePatched(_node_to_patch)
+
+            _domU_listed_by_xm_list, _pre_patch_version = aNodeData[_node_to_patch]
+            _rc = self.mPostDom0PatchCheck(aDom0=_node_to_patch,
+                                           aDomUList=_domU_listed_by_xm_list,
+                                           aPrePatchVersion=_pre_patch_version,
+                                           aPostPatchTargetVersion=self.mGetTargetVersion(),
+                                           aRollback=aRollback)
+            if _rc != PATCH_SUCCESS_EXIT_CODE:
+                return _rc, _node_to_patch
+
+            # restart vmexacs_kvm service
+            self.mRestartMetricService(_node_to_patch, self.mGetTargetVersion())
+
+            if self.mIsExacloudPluginEnabled():
+                mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                     self.mGetMetadataJsonFile(), POST_PATCH, PATCH_RUNNING, aUser=aLaunchNodeUser)
+                _ret = self.mGetPluginHandler().mApply(_node_to_patch, PATCH_DOM0, POST_PATCH, aRollback=aRollback)
+                if _ret != PATCH_SUCCESS_EXIT_CODE:
+                    mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                         self.mGetMetadataJsonFile(), POST_PATCH, PATCH_FAILED, aUser=aLaunchNodeUser)
+                    # do not overwrite the error code from mApply
+                    _suggestion_msg = f"Exacloud plugin failed during post patch : {_node_to_patch}"
+                    _rc, _child_request_error_already_exists_in_db = self.mGetErrorCodeFromChildRequest()
+                    if _child_request_error_already_exists_in_db:
+                        self.mPatchLogError(_suggestion_msg)
+                    else:
+                        _rc = DOM0_POST_EXACLOUD_PLUGINS_FAILED
+                        self.mAddError(_ret, _suggestion_msg)
+                    return _rc, _node_to_patch
+                mUpdatePatchMetadata(PATCH_DOM0, aLaunchNodes, _node_to_patch,
+                                     self.mGetMetadataJsonFile(), POST_PATCH, PATCH_COMPLETED, aUser=aLaunchNodeUser)
+
+            #Cleanup dbnu plugins
+            if self.mIsDbnuPluginEnabled():
+                self.mGetDbnuPluginHandler().mCleanupDbnuPluginsFromNode(_node_to_patch, PATCH_DOM0)
+
+        # Run plugin metadata based exacloud plugins after patchmgr cmd
+        if self.mGetTask() in [ TASK_PATCH ] and not self.mIsExaSplice() and len(self.mGetPluginMetadata()) > 0:
+            _plugin_metadata_based_exacloud_plugin_enabled, _ = checkPluginEnabledFromInfraPatchMetadata(self.mGetPluginMetadata())
+            if _plugin_metadata_based_exacloud_plugin_enabled:
+                self.mPatchLogInfo(
+                    f"Executing Exacloud Plugins implicitly based on the infra patch plugin metadata during PostPatch stage and as part of {self.mGetOpStyle()} patching.")
+                _rc = self.mGetPluginHandler().mExacloudPluginMetadataExecutor(list(aWave), "post")
+                if _rc != PATCH_SUCCESS_EXIT_CODE:
+                    return _rc, None
+
+        return PATCH_SUCCESS_EXIT_CODE, None
+
+    def mPatchRollbackDom0sRollingWaves(self, aNodePatcherAndPatchList, aListOfNodesToBePatched, aRollback,
+                                        aListOfEluNodes, aMaxParallelNodes):
+        """
+        Rolling patch/rollback of the dom0s by waves of up to
+        aMaxParallelNodes dom0s (dom0_rolling_max_parallel_nodes), see
+        mBuildDom0RollingWaves for the cluster constraints.
+
+        The dom0s of a wave are patched together. The post-patch checks of
+        wave i run while wave i+1 is staged (node data gathered), and wave
+        i+1 is only patched when they pass: any failure stops the rolling
+        patch like a failed node does in mPatchRollbackDom0sRolling.
+        """
+        _task = TASK_ROLLBACK if aRollback else TASK_PATCH
+        _rc = PATCH_SUCCESS_EXIT_CODE
+        _nodes_successfuly_patched = []
+        _nodes_not_patched = list(aListOfNodesToBePatched)
+        _node_patch_failed = None
+        _patch_failed_message = ""
+        _no_action_required = True
+        _node_stat_index = 0
+        _round = 0
+        _count_nodes = 0
+        _num_nodes_to_patch = 0
+
+        self.mPreDom0UPatchCheck(aListOfNodesToBePatched)
+
+        _launch_nodes = [self.mGetDom0ToPatchDom0()]
+        if self.mGetDom0ToPatchInitialDom0():
+            _launch_nodes.append(self.mGetDom0ToPatchInitialDom0())
+        self.mPatchLogInfo(f"LaunchNodes = {str(_launch_nodes)}")
+
+        if (len(aNodePatcherAndPatchList) == 1 and
+                aNodePatcherAndPatchList[0][0] == self.mGetDom0ToPatchDom0()):
+            _round = 1
+
+        for _, _l in aNodePatcherAndPatchList:
+            _num_nodes_to_patch += len(_l)
+        self.mPatchLogInfo(f"Number of nodes available to update = {_num_nodes_to_patch}")
+
+        # Before patching started, fail if there are no domUs available on dom0.
+        # However, this check can be ignored if caller specified forcibly.
+        if (self.mGetAdditionalOptions() and 'SkipDomuCheck' in self.mGetAdditionalOptions()[0] \
+                and self.mGetAdditionalOptions()[0]['SkipDomuCheck'].lower() == 'yes'):
+            self.mPatchLogWarn("Before Patch Started: User opted to skip DomU validation check on dom0s")
+        elif self.mGetInfrapatchExecutionValidator().mCheckCondition('checkHAChecksOnDom0'):
+            self.mPatchLogWarn("DomU Availability Check: Before Patching Started.")
+            _rc = self.mCheckDomuAvailability()
+            if _rc != PATCH_SUCCESS_EXIT_CODE:
+                return _rc
+
+        _max_down_per_cluster = self.mGetDom0RollingMaxNodesDownPerCluster()
+
+        # One worker stages the next wave, the other post-checks the last one
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dom0_wave") as _executor:
+            for _node_patcher, _node_patch_list in aNodePatcherAndPatchList:
+                _round += 1
+                if _rc != PATCH_SUCCESS_EXIT_CODE or _node_patch_failed:
+                    self.mPatchLogError(f"Failure detected in the node upgrade. Return code = {_rc}")
+                    break
+
+                _waves = self.mBuildDom0RollingWaves(_node_patch_list, aMaxParallelNodes, _max_down_per_cluster)
+                self.mPatchLogInfo(
+                    f"{PATCH_DOM0.upper()} {_node_patcher} will be used to patch {str(_node_patch_list)} rolling in waves {str(_waves)}")
+
+                self.mSetPatchmgrLogPathOnLaunchNode(self.mGetDom0PatchBaseAfterUnzip() + "patchmgr_log_" +
+                                                     self.mGetMasterReqId())
+                self.__crs_config_enable_stat = {}
+
+                _launch_node_user = 'root'
+                if self.mGetInfrapatchExecutionValidator().mCheckCondition('mIsManagementHostLaunchNodeForClusterless'):
+                    _launch_node_user = 'opc'
+                mUpdateMetadataLaunchNode(_launch_nodes, self.mGetMetadataJsonFile(), PATCH_DOM0, _node_patcher, aUser=_launch_node_user)
+
+                _staged = _executor.submit(self.mStageDom0RollingWave, _waves[0], aRollback)
+                _post_check = None
+                _post_check_wave = None
+
+                for _wave_index, _wave in enumerate(_waves):
+                    _count_nodes += len(_wave)
+                    _node_stat_index += 1
+                    _comment = f"[{_count_nodes}/{_num_nodes_to_patch}]_{','.join(_wave)}"
+                    self.mPatchLogInfo(
+                        f"Wave {_wave_index + 1} out of {len(_waves)} with {len(_wave)} node(s) is progressing at the moment: {str(_wave)}")
+                    self.mUpdatePatchStatus(True,
+                                            (STEP_GATHER_NODE_DATA + '_' + PATCH_DOM0 + f'_[{_node_stat_index:d}]'), _comment)
+
+                    _stage_rc, _node_data, _is_system_valid_state = _staged.result()
+                    _staged = None
+
+                    # Health gate: the previous wave must be healthy before taking down this one
+                    if _post_check is not None:
+                        _rc, _failed = _post_check.result()
+                        _post_check = None
+                        if _rc != PATCH_SUCCESS_EXIT_CODE:
+                            _node_patch_failed = _failed or _post_check_wave
+                            _patch_failed_message = f"dom0 {str(_post_check_wave)} patching succeeded, but post-patch checks failed"
+                            break
+
+                    if _stage_rc != PATCH_SUCCESS_EXIT_CODE:
+                        _rc = _stage_rc
+                        _node_patch_failed = _wave
+                        break
+
+                    _rc = self.mPrePatchDom0RollingWave(_wave, _node_data, _launch_nodes, _launch_node_user, aRollback)
+                    if _rc != PATCH_SUCCESS_EXIT_CODE:
+                        _patch_failed_message = f"Pre patch validations failed on dom0 {str(_wave)}. Return code was {str(_rc)}"
+                        break
+
+                    if _round == 1:
+                        self.mUpdatePatchStatus(True, (STEP_RUN_PATCH_SECOND_DOM0 + f'_[{_node_stat_index:d}]'), _comment)
+                    else:
+                        self.mUpdatePatchStatus(True, (STEP_RUN_PATCH_DOM0 + f'_[{_node_stat_index:d}]'), _comment)
+
+                    _rc, _node_patcher, _patchmgr_run = self.mPatchDom0RollingWave(
+                        _node_patcher, _wave, _node_data, _is_system_valid_state, _task,
+                        _launch_nodes, _launch_node_user, aListOfEluNodes, _post_check_wave)
+                    if _patchmgr_run:
+                        # Let upper layer look for notification detail to be evaluated.
+                        _no_action_required = False
+                    self.mUpdatePatchStatus(True, (STEP_CLEAN_ENV + '_' + PATCH_DOM0 + f'_[{_node_stat_index:d}]'), _comment)
+                    if _rc != PATCH_SUCCESS_EXIT_CODE:
+                        _node_patch_failed = _wave
+                        _patch_failed_message = f"Error patching {str(_wave)} using {_node_patcher} to patch it. return code was {str(_rc)}. Errors on screen and in logs"
+                        break
+
+                    for _node_to_patch in _wave:
+                        _nodes_successfuly_patched.append(_node_to_patch)
+                        _nodes_not_patched.remove(_node_to_patch)
+
+                    self.mUpdatePatchStatus(True, (STEP_POSTCHECKS + '_' + PATCH_DOM0 + f'_[{_node_stat_index:d}]'), _comment)
+                    _post_check = _executor.submit(self.mPostCheckDom0RollingWave, _wave, _node_data,
+                                                   _launch_nodes, _launch_node_user, aRollback)
+                    _post_check_wave = _wave
+                    if _wave_index + 1 < len(_waves):
+                        _staged = _executor.submit(self.mStageDom0RollingWave, _waves[_wave_index + 1], aRollback)
+
+                # Wait for the background work of the waves before leaving
+                if _staged is not None:
+                    _staged.result()
+                if _post_check is not None:
+                    _post_rc, _failed = _post_check.result()
+                    if _post_rc != PATCH_SUCCESS_EXIT_CODE and _rc == PATCH_SUCCESS_EXIT_CODE:
+                        _rc = _post_rc
+                        _node_patch_failed = _failed or _post_check_wave
+                        _patch_failed_message = f"dom0 {str(_post_check_wave)} patching succeeded, but post-patch checks failed"
+
+                if _rc != PATCH_SUCCESS_EXIT_CODE or _node_patch_failed:
+                    break
+
+                if (len(self.mGetIncludeNodeList()) >= 2) and \
+                        self.mGetSleepbetweenComputeTimeInSec() > 0 and \
+                        _num_nodes_to_patch > _count_nodes:
+                    mUpdatePatchMetadata(PATCH_DOM0, _launch_nodes, _node_patch_list[-1],
+                                         self.mGetMetadataJsonFile(), POST_PATCH, PATCH_SLEEP_START, aUser=_launch_node_user)
+                    self.mSleepBtwNodes()
+                    mUpdatePatchMetadata(PATCH_DOM0, _launch_nodes, _node_patch_list[-1],
+                                         self.mGetMetadataJsonFile(), POST_PATCH, PATCH_SLEEP_END, aUser=_launch_node_user)
+
+        self.mPatchLogInfo(
+            f"\n{PATCH_DOM0.upper()}s patched: {' '.join(_nodes_successfuly_patched)}\n{PATCH_DOM0.upper()}s not patched: {' '.join(_nodes_not_patched)}")
+        if _node_patch_failed:
+            if _patch_failed_message:
+                self.mPatchLogError(_patch_failed_message)
+            self.mPatchLogError(f"{PATCH_DOM0.upper()} patching or post-patching failed on: {str(_node_patch_failed)}")
+
+        # To be extra careful, after the patch completed with all success, do the domUs available check on dom0 also.
+        if _rc == PATCH_SUCCESS_EXIT_CODE and _no_action_required == False:
+            if (self.mGetAdditionalOptions() and 'SkipDomuCheck' in self.mGetAdditionalOptions()[0] \
+                    and self.mGetAdditionalOptions()[0]['SkipDomuCheck'].lower() == 'yes'):
+                self.mPatchLogWarn("After Patch completed: User opted to skip DomU validation check on dom0s")
+            elif self.mGetInfrapatchExecutionValidator().mCheckCondition('checkHAChecksOnDom0'):
+                self.mPatchLogWarn("DomU Availability Check: After Patch Completed.")
+                _rc = self.mCheckDomuAvailability()
+
+        if _rc == PATCH_SUCCESS_EXIT_CODE and _no_action_required == True:
+            _rc = NO_ACTION_REQUIRED
+
+        return _rc
+
     def mPatchRollbackDom0sNonRolling(self, aBackupMode,
                                       aNodePatcherAndPatchList, aListOfNodesToBePatched, aRollback, aListOfEluNodes=[]):
         """
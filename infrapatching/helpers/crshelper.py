@@ -13,6 +13,8 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - CRS/DB validation snapshot of the domUs swept on
+#                           threads
 #    araghave    04/12/26 - FIX HELPER FILES RELATED CODE ISSUES REPORTED 
 #                           BY CODEV
 #    remamid     01/21/26 - Bug 38707554 Handle all cases for start crs
@@ -120,6 +122,8 @@ from exabox.core.Context import get_gcontext
 from exabox.infrapatching.utils.constants import *
 from exabox.infrapatching.core.infrapatcherror import *
 from exabox.infrapatching.handlers.loghandler import LogHandler
+from exabox.infrapatching.helpers.crssnapshot import CrsSnapshot, CRS_SNAPSHOT_CRS_AUTOSTART, \
+    CRS_SNAPSHOT_CDB_STATE, CRS_SNAPSHOT_PDB_STATE
 from exabox.infrapatching.utils.utility import mValidateTime, mConvertTimeEscli, mTruncateErrorMessageDescription, \
     mGetPdbDegradedStatesMatrix
 from exabox.ovm.cludbaas import ebCluDbaas
@@ -135,6 +139,7 @@ class CrsHelper(LogHandler):
         self.__dom0_hb_info = {}
         # Contains all the vms on which crs auto start is enabled and crs is running
         self.__crs_autostart_enabled_vm_set = set()
+        self.__crs_snapshot = None
 
     def mGetHandlerInstance(self):
         return self.__handler
@@ -142,6 +147,18 @@ class CrsHelper(LogHandler):
     def mGetCRSAutoStartEnabledVMSet(self):
         return self.__crs_autostart_enabled_vm_set
 
+    def mIsCrsSnapshotEnabled(self):
+        return self.mGetHandlerInstance().mIsCrsValidationSnapshotEnabled()
+
+    def mGetCrsSnapshot(self):
+        """
+         CRS/DB state of the domUs for the current patch stage, see
+         crssnapshot.py
+        """
+        if self.__crs_snapshot is None:
+            self.__crs_snapshot = CrsSnapshot(self.mGetHandlerInstance().mGetCrsValidationSnapshotMaxThreads())
+        return self.__crs_snapshot
+
     def mCheckCrsIsEnabled(self, aDomU):
         """
          Checks the CRS config is enabled or disabled. Returns PATCH_SUCCESS_EXIT_CODE if enabled
@@ -1049,8 +1066,16 @@ class CrsHelper(LogHandler):
         """
         _list_of_vms_crs_auto_startup_enabled = []
         _ret = PATCH_SUCCESS_EXIT_CODE
+        _snapshot_results = {}
+        if self.mIsCrsSnapshotEnabled():
+            # CRS config of all the VMs in one sweep, reused within the stage
+            _snapshot_results, _ = self.mGetCrsSnapshot().mSweep(
+                aListofVMs, [(CRS_SNAPSHOT_CRS_AUTOSTART, self.mCheckCrsIsEnabled)])
         for _domu in aListofVMs:
-            _ret = self.mCheckCrsIsEnabled(_domu)
+            if CRS_SNAPSHOT_CRS_AUTOSTART in _snapshot_results.get(_domu, {}):
+                _ret = _snapshot_results[_domu][CRS_SNAPSHOT_CRS_AUTOSTART]
+            else:
+                _ret = self.mCheckCrsIsEnabled(_domu)
             if _ret in [ DOMU_INVALID_CRS_HOME, CRS_COMMAND_EXCEPTION_ENCOUNTERED ]:
                 if self.mGetHandlerInstance().mGetTask() == TASK_PREREQ_CHECK:
                     self.mPatchLogWarn(
@@ -2779,6 +2804,186 @@ class CrsHelper(LogHandler):
                 self.mPatchLogWarn(f"Exception {str(e)} occurred while parsing for json from dbaascli command output")
         return _parsed_json
 
+    def mProbeCDBDowntime(self, aDomUCustomerHostname):
+        """
+        :param aDomUCustomerHostname: VM customer hostname
+        :return: (PATCH_SUCCESS_EXIT_CODE or error code, resources with complete downtime)
+
+        CDB downtime detection of a VM, run in parallel on the VMs of a dom0.
+        """
+        _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(aDomUCustomerHostname)
+
+        _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
+        # Default to None in case of _user is not opc.
+        _user = "opc" if _user == "opc" else None
+
+        _rc, _downtime_expected_res = self.mExecuteInfraPreSanityCheck(_domu_node, aUser=_user)
+        if _rc != PATCH_SUCCESS_EXIT_CODE:
+            _sanity_check_log_on_remote_node = f"{DBAASAPI_SANITY_CHECK_LOG_PATH}/{DBAASAPI_SANITY_CHECK_LOG}"
+            _sanity_check_log_local_path = f"{self.mGetHandlerInstance().mGetLogPath()}/{_domu_node}_{DBAASAPI_SANITY_CHECK_LOG}"
+            self.mPatchLogInfo(
+                f"Copying {_sanity_check_log_on_remote_node} from remote node {_domu_node} to {_sanity_check_log_local_path}")
+            self.mGetHandlerInstance().mCopyFileFromRemote(_domu_node, _sanity_check_log_on_remote_node,
+                                                           _sanity_check_log_local_path, aCopytoTmp=True,
+                                                           aUser=_user)
+            self.mPatchLogError(f"cdb downtime detected on {aDomUCustomerHostname}")
+        return _rc, _downtime_expected_res
+
+    def mProbeCDBDegradation(self, aDomUCustomerHostname):
+        """
+        :param aDomUCustomerHostname: VM customer hostname
+        :return: (PATCH_SUCCESS_EXIT_CODE or error code, degraded resources)
+
+        CDB degradation detection of a VM, the post sanity check is polled
+        until it succeeds or the DB healthchecks wait time is over.
+        """
+        _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(aDomUCustomerHostname)
+        _rc = PATCH_SUCCESS_EXIT_CODE
+        _degraded_res = []
+        _user = None
+        self.mPatchLogInfo(f"CDB degradation check started on {_domu_node}.")
+        _db_healthchecks_wait_time = self.mGetHandlerInstance().mGetDBHealthChecksWaitTimeInSeconds()
+        _starttime = time()
+        _elapsed = 0
+        _iteration = 0
+        _sanity_chek_log_name = f"{self.mGetHandlerInstance().mGetLogPath()}/{_domu_node}_{DBAASAPI_SANITY_CHECK_LOG}"
+        _sanity_check_log_on_remote_node = f"{DBAASAPI_SANITY_CHECK_LOG_PATH}/{DBAASAPI_SANITY_CHECK_LOG}"
+        self.mPatchLogInfo(
+            f"Start CDB healthchecks of the VM: [{_domu_node}] every {DBHEALTHCHECK_TIMEOUT_IN_SECONDS} seconds with a wait time of {_db_healthchecks_wait_time} seconds.")
+        while _elapsed < _db_healthchecks_wait_time:
+            _iteration = _iteration + 1
+            sleep(DBHEALTHCHECK_TIMEOUT_IN_SECONDS)
+            self.mPatchLogInfo(
+                f"**** DomU healthchecks are polled for another {DBHEALTHCHECK_TIMEOUT_IN_SECONDS} seconds and re-validated.")
+
+            _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
+            # Default to None in case of _user is not opc.
+            _user = "opc" if _user == "opc" else None
+
+            _rc, _degraded_res = self.mExecuteInfraPostSanityCheck(_domu_node, aUser=_user)
+            _elapsed = time() - _starttime
+            if _rc == PATCH_SUCCESS_EXIT_CODE:
+                self.mPatchLogInfo(
+                    f"mDetectCDBDegradationDuringDom0Patching: Completed CDB healtchecks of the VM: {_domu_node}, elapsed time: {str(_elapsed)}")
+                break
+
+            self.mGetHandlerInstance().mCopyFileFromRemote(_domu_node, _sanity_check_log_on_remote_node,
+                                                           f"{_sanity_chek_log_name}.{_iteration:d}",
+                                                           aCopytoTmp=True,
+                                                           aUser=_user)
+            self.mPatchLogInfo(
+                'mDetectCDBDegradationDuringDom0Patching: Waiting for completion of CDB healtchecks of the VM: {'
+                '0}, iteration {1} time elapsed: {2}'.format(_domu_node, _iteration, _elapsed))
+
+        if _rc != PATCH_SUCCESS_EXIT_CODE:
+            self.mPatchLogError("CDB healthcheck has returned non zero exit status")
+            self.mPatchLogInfo(
+                f"Copying {_sanity_check_log_on_remote_node} from remote node {_domu_node} to {_sanity_chek_log_name}.{_iteration:d}")
+            self.mGetHandlerInstance().mCopyFileFromRemote(_domu_node, _sanity_check_log_on_remote_node,
+                                                           f"{_sanity_chek_log_name}.{_iteration:d}",
+                                                           aCopytoTmp=True,
+                                                           aUser=_user)
+            self.mPatchLogError(f"cdb degradation detected on {aDomUCustomerHostname}")
+
+        self.mPatchLogInfo(f"CDB degradation check completed on {_domu_node}.")
+        return _rc, _degraded_res
+
+    def mProbePDBDowntime(self, aDomUCustomerHostname):
+        """
+        :param aDomUCustomerHostname: VM customer hostname
+        :return: (PATCH_SUCCESS_EXIT_CODE or error code, pdb error details)
+
+        Stores the pre patch db system details of a VM and runs the PDB
+        downtime detection on them when enabled.
+        """
+        _affected_pdb_cdb_names = {}
+        _enable_pdb_downtime_check = self.mGetHandlerInstance().mGetInfrapatchExecutionValidator().mCheckCondition(
+            'mIsPDBDowntimeCheckEnabled')
+        _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(aDomUCustomerHostname)
+
+        _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
+        # Default to None in case of _user is not opc.
+        _user = "opc" if _user == "opc" else None
+
+        # Fetch dbsystem details json for post patch comparison to detect if pdb is in degraded state
+        _rc = self.mFetchAndStoreDBSystemDetailsToFile(_domu_node, "pre", aUser=_user)
+        if _rc == PATCH_SUCCESS_EXIT_CODE and _enable_pdb_downtime_check:
+            self.mPatchLogInfo("PDB downtime check started.")
+            _rc, _affected_pdb_cdb_names = self.mDetectPDBDowntime(_domu_node, aUser=_user)
+            self.mPatchLogInfo("PDB downtime check completed.")
+        else:
+            self.mPatchLogInfo("PDB downtime check is not run as enable_pdb_downtime_check is False.")
+
+        if _rc != PATCH_SUCCESS_EXIT_CODE:
+            self.mPatchLogError(f"pdb downtime detected on {aDomUCustomerHostname}")
+        return _rc, _affected_pdb_cdb_names
+
+    def mProbePDBDegradation(self, aDomUCustomerHostname, aIsRetry=False):
+        """
+        :param aDomUCustomerHostname: VM customer hostname
+        :param aIsRetry: Boolean value indicating that request is a retry request
+        :return: (PATCH_SUCCESS_EXIT_CODE or error code, pdb error details)
+        """
+        _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(aDomUCustomerHostname)
+        self.mPatchLogInfo("PDB degradation check started.")
+
+        _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
+        # Default to None in case of _user is not opc.
+        _user = "opc" if _user == "opc" else None
+
+        _rc, _pdb_status_dict = self.mValidateForPDBDegradation(_domu_node, aIsRetry, aUser=_user)
+        self.mPatchLogInfo("PDB degradation check completed.")
+        if _rc != PATCH_SUCCESS_EXIT_CODE:
+            self.mPatchLogError(f"pdb degradation detected on {aDomUCustomerHostname}")
+        return _rc, _pdb_status_dict
+
+    def mSweepDBHealthSnapshot(self, aDom0, aPhase, aDomUList, aProbe, aDetailsKey, aIsRetry=False):
+        """
+        :param aDom0: dom0 node on which patching happens
+        :param aPhase: "pre" or "post" patch
+        :param aDomUList: VM node list - contains customerhostnames
+        :param aProbe: CRS_SNAPSHOT_CDB_STATE or CRS_SNAPSHOT_PDB_STATE
+        :param aDetailsKey: key of the failure details in the status entries
+        :param aIsRetry: Boolean value indicating that request is a retry request
+        :return: (status entries of the failed VMs, VMs not probed within the timeout)
+
+        All the enabled CDB and PDB checks of aPhase are run in one sweep on
+        the VMs, the detection of the other database layer for the same dom0
+        finds its results in the snapshot. Results are used once, a detection
+        run again probes the VMs again.
+        """
+        _validator = self.mGetHandlerInstance().mGetInfrapatchExecutionValidator()
+        _probes = []
+        if aPhase == "pre":
+            if _validator.mCheckCondition('mIsCDBDowntimeCheckEnabled'):
+                _probes.append((CRS_SNAPSHOT_CDB_STATE, self.mProbeCDBDowntime))
+            if _validator.mCheckCondition('mIsPDBDowntimeCheckEnabled') or \
+                    _validator.mCheckCondition('mIsPDBDegradationCheckEnabled'):
+                _probes.append((CRS_SNAPSHOT_PDB_STATE, self.mProbePDBDowntime))
+        else:
+            if _validator.mCheckCondition('mIsCDBDegradationCheckEnabled'):
+                _probes.append((CRS_SNAPSHOT_CDB_STATE, self.mProbeCDBDegradation))
+            if _validator.mCheckCondition('mIsPDBDegradationCheckEnabled'):
+                _probes.append((CRS_SNAPSHOT_PDB_STATE, lambda aDomU: self.mProbePDBDegradation(aDomU, aIsRetry)))
+
+        _snapshot = self.mGetCrsSnapshot()
+        _snapshot.mSetStage(f"{aPhase}_patch:{aDom0}")
+        if all(_snapshot.mHas(_domu, aProbe) for _domu in aDomUList):
+            # Collected by the sweep of the other detection, nothing to probe
+            _probes = [(_probe, _fx) for _probe, _fx in _probes if _probe == aProbe]
+        _results, _pending = _snapshot.mSweep(aDomUList, _probes,
+                                              self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
+
+        _rc_status = []
+        for _domu in aDomUList:
+            _snapshot.mInvalidate(_domu, aProbe)
+            if aProbe not in _results.get(_domu, {}):
+                continue
+            _rc, _details = _results[_domu][aProbe]
+            if _rc != PATCH_SUCCESS_EXIT_CODE:
+                _rc_status.append({'domu': _domu, 'status': 'failed', 'errorcode': _rc, aDetailsKey: _details})
+        return _rc_status, _pending
+
     def mDetectCDBDowntimeDuringDom0Patching(self, aDom0, aDomUList):
         """
         :param aDom0: dom0 node on which patching happens
@@ -2788,6 +2993,7 @@ class CrsHelper(LogHandler):
         Note:
             1. mExecuteInfraPreSanityCheck in called parallely on all the vms here
             2. For EXACS, opc user and for EXACC root user keys are injected to connect to VM nodes
+            3. With enable_crs_validation_snapshot, the VMs are probed on threads by mSweepDBHealthSnapshot
         """
         _cdb_downtime_detection_vm_list = []
         _ret = PATCH_SUCCESS_EXIT_CODE
@@ -2803,56 +3009,48 @@ class CrsHelper(LogHandler):
         if _enable_health_checks_from_cp and _enable_cdb_downtime_check:
             try:
                 def _detect_cdbdowntime_during_dom0_patching(_domu_customer_hostname, aStatus):
-                    _downtime_expected_res = []
-                    _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(
-                        _domu_customer_hostname)
-
-                    _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
-                    # Default to None in case of _user is not opc.
-                    _user = "opc" if _user == "opc" else None
-
-                    _rc, _downtime_expected_res = self.mExecuteInfraPreSanityCheck(_domu_node, aUser=_user)
+                    _rc, _downtime_expected_res = self.mProbeCDBDowntime(_domu_customer_hostname)
                     if _rc != PATCH_SUCCESS_EXIT_CODE:
-                        _sanity_check_log_on_remote_node = f"{DBAASAPI_SANITY_CHECK_LOG_PATH}/{DBAASAPI_SANITY_CHECK_LOG}"
-                        _sanity_check_log_local_path = f"{self.mGetHandlerInstance().mGetLogPath()}/{_domu_node}_{DBAASAPI_SANITY_CHECK_LOG}"
-                        self.mPatchLogInfo(
-                            f"Copying {_sanity_check_log_on_remote_node} from remote node {_domu_node} to {_sanity_check_log_local_path}")
-                        self.mGetHandlerInstance().mCopyFileFromRemote(_domu_node, _sanity_check_log_on_remote_node,
-                                                                       _sanity_check_log_local_path, aCopytoTmp=True,
-                                                                       aUser=_user)
                         aStatus.append({'domu': _domu_customer_hostname, 'status': 'failed', 'errorcode': _rc,
                                         'downtime_expected_resources': _downtime_expected_res})
-                        self.mPatchLogError(f"cdb downtime detected on {_domu_customer_hostname}")
 
                 # End of _detect_cdbdowntime_during_dom0_patching
 
-                """
-                 Parallelize execution on all target nodes.
-                """
-                _plist = ProcessManager()
-                _rc_status = _plist.mGetManager().list()
                 _non_autonomous_vm_list = [_non_autonomous_vm for _non_autonomous_vm in aDomUList if
                                            _non_autonomous_vm not in {_vm_name for _, _vms in
                                                                       self.mGetHandlerInstance().mGetAutonomousVMListWithCustomerHostnames()
                                                                       for _vm_name in _vms}]
-                for _remote_node in _non_autonomous_vm_list:
-                    _p = ProcessStructure(_detect_cdbdowntime_during_dom0_patching, [_remote_node, _rc_status],
-                                          _remote_node)
+                _timed_out = False
+                if self.mIsCrsSnapshotEnabled():
+                    _rc_status, _pending = self.mSweepDBHealthSnapshot(aDom0, "pre", _non_autonomous_vm_list,
+                                                                       CRS_SNAPSHOT_CDB_STATE,
+                                                                       'downtime_expected_resources')
+                    _timed_out = len(_pending) > 0
+                else:
+                    """
+                     Parallelize execution on all target nodes.
+                    """
+                    _plist = ProcessManager()
+                    _rc_status = _plist.mGetManager().list()
+                    for _remote_node in _non_autonomous_vm_list:
+                        _p = ProcessStructure(_detect_cdbdowntime_during_dom0_patching, [_remote_node, _rc_status],
+                                              _remote_node)
 
-                    '''
-                     Timeout parameter configurable in Infrapatching.conf
-                     Currently it is set to 60 minutes
-                    '''
-                    _p.mSetMaxExecutionTime(
-                        self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
+                        '''
+                         Timeout parameter configurable in Infrapatching.conf
+                         Currently it is set to 60 minutes
+                        '''
+                        _p.mSetMaxExecutionTime(
+                            self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
 
-                    _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
-                    _p.mSetLogTimeoutFx(self.mPatchLogWarn)
-                    _plist.mStartAppend(_p)
+                        _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
+                        _p.mSetLogTimeoutFx(self.mPatchLogWarn)
+                        _plist.mStartAppend(_p)
 
-                _plist.mJoinProcess()
+                    _plist.mJoinProcess()
+                    _timed_out = _plist.mGetStatus() == "killed"
 
-                if _plist.mGetStatus() == "killed":
+                if _timed_out:
                     _suggestion_msg = f"Timeout occured while validating for cdb downtime on the VM nodes of the dom0 {aDom0} "
                     _ret = DB_HEALTCHECKS_DETECTION_TIMEOUT_ERROR
                     self.mGetHandlerInstance().mAddError(_ret, _suggestion_msg)
@@ -2909,6 +3107,7 @@ class CrsHelper(LogHandler):
         Note:
             1. mExecuteInfraPostSanityCheck in called parallely on all the vms here
             2. For EXACS, opc user and for EXACC root user keys are injected to connect to VM nodes
+            3. With enable_crs_validation_snapshot, the VMs are probed on threads by mSweepDBHealthSnapshot
         """
         _cdb_degradation_failed_vm_list = []
         _ret = PATCH_SUCCESS_EXIT_CODE
@@ -2923,87 +3122,46 @@ class CrsHelper(LogHandler):
         if _enable_health_checks_from_cp and _enable_cdb_degradation_check:
             try:
                 def _detect_cdb_degradation_during_dom0_patching(_domu_customer_hostname, aStatus):
-                    _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(
-                        _domu_customer_hostname)
-                    _rc = PATCH_SUCCESS_EXIT_CODE
-                    _degraded_res = []
-                    self.mPatchLogInfo(f"CDB degradation check started on {_domu_node}.")
-                    _db_healthchecks_wait_time = self.mGetHandlerInstance().mGetDBHealthChecksWaitTimeInSeconds()
-                    _starttime = time()
-                    _elapsed = 0
-                    _iteration = 0
-                    _sanity_chek_log_name = f"{self.mGetHandlerInstance().mGetLogPath()}/{_domu_node}_{DBAASAPI_SANITY_CHECK_LOG}"
-                    _sanity_check_log_on_remote_node = f"{DBAASAPI_SANITY_CHECK_LOG_PATH}/{DBAASAPI_SANITY_CHECK_LOG}"
-                    self.mPatchLogInfo(
-                        f"Start CDB healthchecks of the VM: [{_domu_node}] every {DBHEALTHCHECK_TIMEOUT_IN_SECONDS} seconds with a wait time of {_db_healthchecks_wait_time} seconds.")
-                    while _elapsed < _db_healthchecks_wait_time:
-                        _iteration = _iteration + 1
-                        sleep(DBHEALTHCHECK_TIMEOUT_IN_SECONDS)
-                        self.mPatchLogInfo(
-                            f"**** DomU healthchecks are polled for another {DBHEALTHCHECK_TIMEOUT_IN_SECONDS} seconds and re-validated.")
-
-                        _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
-                        # Default to None in case of _user is not opc.
-                        _user = "opc" if _user == "opc" else None
-
-                        _rc, _degraded_res = self.mExecuteInfraPostSanityCheck(_domu_node, aUser=_user)
-                        _elapsed = time() - _starttime
-                        if _rc == PATCH_SUCCESS_EXIT_CODE:
-                            self.mPatchLogInfo(
-                                f"mDetectCDBDegradationDuringDom0Patching: Completed CDB healtchecks of the VM: {_domu_node}, elapsed time: {str(_elapsed)}")
-                            break
-
-                        self.mGetHandlerInstance().mCopyFileFromRemote(_domu_node, _sanity_check_log_on_remote_node,
-                                                                       f"{_sanity_chek_log_name}.{_iteration:d}",
-                                                                       aCopytoTmp=True,
-                                                                       aUser=_user)
-                        self.mPatchLogInfo(
-                            'mDetectCDBDegradationDuringDom0Patching: Waiting for completion of CDB healtchecks of the VM: {'
-                            '0}, iteration {1} time elapsed: {2}'.format(_domu_node, _iteration, _elapsed))
-
+                    _rc, _degraded_res = self.mProbeCDBDegradation(_domu_customer_hostname)
                     if _rc != PATCH_SUCCESS_EXIT_CODE:
-                        self.mPatchLogError("CDB healthcheck has returned non zero exit status")
-                        self.mPatchLogInfo(
-                            f"Copying {_sanity_check_log_on_remote_node} from remote node {_domu_node} to {_sanity_chek_log_name}.{_iteration:d}")
-                        self.mGetHandlerInstance().mCopyFileFromRemote(_domu_node, _sanity_check_log_on_remote_node,
-                                                                       f"{_sanity_chek_log_name}.{_iteration:d}",
-                                                                       aCopytoTmp=True,
-                                                                       aUser=_user)
                         aStatus.append({'domu': _domu_customer_hostname, 'status': 'failed', 'errorcode': _rc, "degraded_resources":_degraded_res})
-                        self.mPatchLogError(f"cdb degradation detected on {_domu_customer_hostname}")
-
-                    self.mPatchLogInfo(f"CDB degradation check completed on {_domu_node}.")
 
                 # End of _detect_cdb_degradation_during_dom0_patching
 
-                """
-                 Parallelize execution on all target nodes.
-                """
-                _plist = ProcessManager()
-                _rc_status = _plist.mGetManager().list()
-
                 _non_autonomous_vm_list = [_non_autonomous_vm for _non_autonomous_vm in aDomUList if
                                            _non_autonomous_vm not in {_vm_name for _, _vms in
                                                                       self.mGetHandlerInstance().mGetAutonomousVMListWithCustomerHostnames()
                                                                       for _vm_name in _vms}]
-                for _remote_node in _non_autonomous_vm_list:
-                    _p = ProcessStructure(_detect_cdb_degradation_during_dom0_patching, [_remote_node, _rc_status],
-                                          _remote_node)
+                _timed_out = False
+                if self.mIsCrsSnapshotEnabled():
+                    _rc_status, _pending = self.mSweepDBHealthSnapshot(aDom0, "post", _non_autonomous_vm_list,
+                                                                       CRS_SNAPSHOT_CDB_STATE, 'degraded_resources')
+                    _timed_out = len(_pending) > 0
+                else:
+                    """
+                     Parallelize execution on all target nodes.
+                    """
+                    _plist = ProcessManager()
+                    _rc_status = _plist.mGetManager().list()
+                    for _remote_node in _non_autonomous_vm_list:
+                        _p = ProcessStructure(_detect_cdb_degradation_during_dom0_patching, [_remote_node, _rc_status],
+                                              _remote_node)
 
-                    '''
-                     Timeout parameter configurable in Infrapatching.conf
-                     Currently it is set to 60 minutes
-                    '''
-                    _p.mSetMaxExecutionTime(
-                        self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
+                        '''
+                         Timeout parameter configurable in Infrapatching.conf
+                         Currently it is set to 60 minutes
+                        '''
+                        _p.mSetMaxExecutionTime(
+                            self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
 
-                    _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
-                    _p.mSetLogTimeoutFx(self.mPatchLogWarn)
-                    _plist.mStartAppend(_p)
+                        _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
+                        _p.mSetLogTimeoutFx(self.mPatchLogWarn)
+                        _plist.mStartAppend(_p)
 
-                _plist.mJoinProcess()
+                    _plist.mJoinProcess()
+                    _timed_out = _plist.mGetStatus() == "killed"
 
-                if _plist.mGetStatus() == "killed":
+                if _timed_out:
                     _suggestion_msg = f"Timeout occurred while validating for cdb downtime on the VM nodes of the dom0 {aDom0} "
                     _ret = DB_HEALTCHECKS_DETECTION_TIMEOUT_ERROR
                     self.mGetHandlerInstance().mAddError(_ret, _suggestion_msg)
@@ -3061,6 +3219,7 @@ class CrsHelper(LogHandler):
         Note:
             1. mDetectPDBDowntime in called parallely on all the vms here
             2. For EXACS, opc user and for EXACC root user keys are injected to connect to VM nodes
+            3. With enable_crs_validation_snapshot, the VMs are probed on threads by mSweepDBHealthSnapshot
         """
         _pdb_downtime_detection_vm_list = []
         _ret = PATCH_SUCCESS_EXIT_CODE
@@ -3076,58 +3235,47 @@ class CrsHelper(LogHandler):
         if _enable_health_checks_from_cp and (_enable_pdb_downtime_check or _enable_pdb_degradation_check):
             try:
                 def _detect_pdb_downtime_during_dom0_patching(_domu_customer_hostname, aStatus):
-                    _affected_pdb_cdb_names = {}
-                    _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(
-                        _domu_customer_hostname)
-
-                    _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
-                    # Default to None in case of _user is not opc.
-                    _user = "opc" if _user == "opc" else None
-
-                    # Fetch dbsystem details json for post patch comparison to detect if pdb is in degraded state
-                    _rc = self.mFetchAndStoreDBSystemDetailsToFile(_domu_node, "pre", aUser=_user)
-                    if _rc == PATCH_SUCCESS_EXIT_CODE and _enable_pdb_downtime_check:
-                        self.mPatchLogInfo("PDB downtime check started.")
-                        _rc, _affected_pdb_cdb_names = self.mDetectPDBDowntime(_domu_node, aUser=_user)
-                        self.mPatchLogInfo("PDB downtime check completed.")
-                    else:
-                        self.mPatchLogInfo("PDB downtime check is not run as enable_pdb_downtime_check is False.")
-
+                    _rc, _affected_pdb_cdb_names = self.mProbePDBDowntime(_domu_customer_hostname)
                     if _rc != PATCH_SUCCESS_EXIT_CODE:
                         aStatus.append({'domu': _domu_customer_hostname, 'status': 'failed', 'errorcode': _rc,
                                         'pdb_error_details': _affected_pdb_cdb_names})
-                        self.mPatchLogError(f"pdb downtime detected on {_domu_customer_hostname}")
 
                 # End of _detect_pdb_downtime_during_dom0_patching
 
-                """
-                 Parallelize execution on all target nodes.
-                """
-                _plist = ProcessManager()
-                _rc_status = _plist.mGetManager().list()
-
                 _non_autonomous_vm_list = [_non_autonomous_vm for _non_autonomous_vm in aDomUList if
                                            _non_autonomous_vm not in {_vm_name for _, _vms in
                                                                       self.mGetHandlerInstance().mGetAutonomousVMListWithCustomerHostnames()
                                                                       for _vm_name in _vms}]
-                for _remote_node in _non_autonomous_vm_list:
-                    _p = ProcessStructure(_detect_pdb_downtime_during_dom0_patching, [_remote_node, _rc_status],
-                                          _remote_node)
+                _timed_out = False
+                if self.mIsCrsSnapshotEnabled():
+                    _rc_status, _pending = self.mSweepDBHealthSnapshot(aDom0, "pre", _non_autonomous_vm_list,
+                                                                       CRS_SNAPSHOT_PDB_STATE, 'pdb_error_details')
+                    _timed_out = len(_pending) > 0
+                else:
+                    """
+                     Parallelize execution on all target nodes.
+                    """
+                    _plist = ProcessManager()
+                    _rc_status = _plist.mGetManager().list()
+                    for _remote_node in _non_autonomous_vm_list:
+                        _p = ProcessStructure(_detect_pdb_downtime_during_dom0_patching, [_remote_node, _rc_status],
+                                              _remote_node)
 
-                    '''
-                     Timeout parameter configurable in Infrapatching.conf
-                     Currently it is set to 60 minutes
-                    '''
-                    _p.mSetMaxExecutionTime(
-                        self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
+                        '''
+                         Timeout parameter configurable in Infrapatching.conf
+                         Currently it is set to 60 minutes
+                        '''
+                        _p.mSetMaxExecutionTime(
+                            self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
 
-                    _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
-                    _p.mSetLogTimeoutFx(self.mPatchLogWarn)
-                    _plist.mStartAppend(_p)
+                        _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
+                        _p.mSetLogTimeoutFx(self.mPatchLogWarn)
+                        _plist.mStartAppend(_p)
 
-                _plist.mJoinProcess()
+                    _plist.mJoinProcess()
+                    _timed_out = _plist.mGetStatus() == "killed"
 
-                if _plist.mGetStatus() == "killed":
+                if _timed_out:
                     _suggestion_msg = f"Timeout occured while validating for cdb downtime on the VM nodes of the dom0 {aDom0}"
                     _ret = DB_HEALTCHECKS_DETECTION_TIMEOUT_ERROR
                     self.mGetHandlerInstance().mAddError(_ret, _suggestion_msg)
@@ -3189,6 +3337,7 @@ class CrsHelper(LogHandler):
         Note:
             1. mValidateForPDBDegradation in called parallely on all the vms here
             2. For EXACS, opc user and for EXACC root user keys are injected to connect to VM nodes
+            3. With enable_crs_validation_snapshot, the VMs are probed on threads by mSweepDBHealthSnapshot
         """
         _pdb_degradation_failed_vm_list = []
         _ret = PATCH_SUCCESS_EXIT_CODE
@@ -3203,52 +3352,48 @@ class CrsHelper(LogHandler):
         if _enable_health_checks_from_cp and _enable_pdb_degradation_check:
             try:
                 def _detect_pdb_degrdation_during_dom0_patching(_domu_customer_hostname, aStatus):
-                    _pdb_status_dict = {}
-                    _domu_node = self.mGetHandlerInstance().mGetDomUNatHostNameforDomuCustomerHostName(
-                        _domu_customer_hostname)
-                    self.mPatchLogInfo("PDB degradation check started.")
-
-                    _user = self.mGetHandlerInstance().mGetUserDetailsBasedOnDomUhostname(_domu_node)
-                    # Default to None in case of _user is not opc.
-                    _user = "opc" if _user == "opc" else None
-
-                    _rc, _pdb_status_dict = self.mValidateForPDBDegradation(_domu_node, aIsRetry, aUser=_user)
-                    self.mPatchLogInfo("PDB degradation check completed.")
+                    _rc, _pdb_status_dict = self.mProbePDBDegradation(_domu_customer_hostname, aIsRetry)
                     if _rc != PATCH_SUCCESS_EXIT_CODE:
                         aStatus.append({'domu': _domu_customer_hostname, 'status': 'failed', 'errorcode': _rc,
                                         'pdb_error_details': _pdb_status_dict})
-                        self.mPatchLogError(f"pdb degradation detected on {_domu_customer_hostname}")
 
                 # End of _detect_pdb_degradation_during_dom0_patching
 
-                """
-                 Parallelize execution on all target nodes.
-                """
-                _plist = ProcessManager()
-                _rc_status = _plist.mGetManager().list()
-
                 _non_autonomous_vm_list = [_non_autonomous_vm for _non_autonomous_vm in aDomUList if
                                            _non_autonomous_vm not in {_vm_name for _, _vms in
                                                                       self.mGetHandlerInstance().mGetAutonomousVMListWithCustomerHostnames()
                                                                       for _vm_name in _vms}]
-                for _remote_node in _non_autonomous_vm_list:
-                    _p = ProcessStructure(_detect_pdb_degrdation_during_dom0_patching, [_remote_node, _rc_status],
-                                          _remote_node)
+                _timed_out = False
+                if self.mIsCrsSnapshotEnabled():
+                    _rc_status, _pending = self.mSweepDBHealthSnapshot(aDom0, "post", _non_autonomous_vm_list,
+                                                                       CRS_SNAPSHOT_PDB_STATE, 'pdb_error_details',
+                                                                       aIsRetry=aIsRetry)
+                    _timed_out = len(_pending) > 0
+                else:
+                    """
+                     Parallelize execution on all target nodes.
+                    """
+                    _plist = ProcessManager()
+                    _rc_status = _plist.mGetManager().list()
+                    for _remote_node in _non_autonomous_vm_list:
+                        _p = ProcessStructure(_detect_pdb_degrdation_during_dom0_patching, [_remote_node, _rc_status],
+                                              _remote_node)
 
-                    '''
-                     Timeout parameter configurable in Infrapatching.conf
-                     Currently it is set to 60 minutes
-                    '''
-                    _p.mSetMaxExecutionTime(
-                        self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
+                        '''
+                         Timeout parameter configurable in Infrapatching.conf
+                         Currently it is set to 60 minutes
+                        '''
+                        _p.mSetMaxExecutionTime(
+                            self.mGetHandlerInstance().mGetDBHealthChecksParallelExecutionWaitTimeInSeconds())
 
-                    _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
-                    _p.mSetLogTimeoutFx(self.mPatchLogWarn)
-                    _plist.mStartAppend(_p)
+                        _p.mSetJoinTimeout(PARALLEL_OPERATION_TIMEOUT_IN_SECONDS)
+                        _p.mSetLogTimeoutFx(self.mPatchLogWarn)
+                        _plist.mStartAppend(_p)
 
-                _plist.mJoinProcess()
+                    _plist.mJoinProcess()
+                    _timed_out = _plist.mGetStatus() == "killed"
 
-                if _plist.mGetStatus() == "killed":
+                if _timed_out:
                     _suggestion_msg = f"Timeout occured while validating for cdb downtime on the VM nodes of the dom0 {aDom0} "
                     _ret = DB_HEALTCHECKS_DETECTION_TIMEOUT_ERROR
                     self.mGetHandlerInstance().mAddError(_ret, _suggestion_msg)
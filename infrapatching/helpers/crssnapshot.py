@@ -0,0 +1,160 @@
+#
+# crssnapshot.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      crssnapshot.py - Snapshot of the CRS/DB state of the domUs for a
+#      patch stage
+#
+#    DESCRIPTION
+#      Runs the CRS/DB probes of a list of domUs in one parallel sweep on
+#      threads, instead of a process per domU, and keeps their results for
+#      the current patch stage so that the detection methods of crshelper
+#      query the snapshot instead of going back to the domUs.
+#
+#    NOTES
+#      Each sweep thread registers an SSH pool (see exaBoxNode.mConnect), so
+#      all the probes of a domU share one session per user.
+#
+#      Results are kept until the stage changes. Without stage (None) only
+#      the results of the sweep itself are returned. A probe raising an
+#      exception has no result and runs again on the next sweep.
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from exabox.core.Node import exaBoxNodePool
+from exabox.core.Context import get_gcontext
+from exabox.infrapatching.handlers.loghandler import LogHandler
+
+# Probes of the snapshot
+CRS_SNAPSHOT_CRS_AUTOSTART = "crs_autostart"
+CRS_SNAPSHOT_CDB_STATE = "cdb_state"
+CRS_SNAPSHOT_PDB_STATE = "pdb_state"
+
+
+class CrsSnapshot(LogHandler):
+    def __init__(self, aMaxThreads=8):
+        super(CrsSnapshot, self).__init__()
+        self.__max_threads = max(1, int(aMaxThreads))
+        self.__lock = threading.Lock()
+        self.__stage = None
+        # domU -> {probe: result}
+        self.__entries = {}
+
+    def mGetStage(self):
+        return self.__stage
+
+    def mSetStage(self, aStage):
+        """
+         Start a new patch stage, the results of the previous
+         stage are dropped.
+        """
+        with self.__lock:
+            if aStage == self.__stage:
+                return
+            self.__stage = aStage
+            self.__entries = {}
+        self.mPatchLogInfo(f"CRS/DB validation snapshot stage set to {str(aStage)}.")
+
+    def mInvalidate(self, aDomU=None, aProbe=None):
+        with self.__lock:
+            if aDomU is None:
+                self.__entries = {}
+            elif aProbe is None:
+                self.__entries.pop(aDomU, None)
+            else:
+                self.__entries.get(aDomU, {}).pop(aProbe, None)
+
+    def mHas(self, aDomU, aProbe):
+        with self.__lock:
+            return aProbe in self.__entries.get(aDomU, {})
+
+    def mGet(self, aDomU, aProbe, aDefault=None):
+        with self.__lock:
+            return self.__entries.get(aDomU, {}).get(aProbe, aDefault)
+
+    def mProbeDomU(self, aDomU, aProbes, aResults):
+        """
+         Run aProbes (list of (probe, fx)) on aDomU from the calling
+         thread with an SSH pool registered for the thread.
+        """
+        _connkey = f"{threading.get_ident()}-{os.getpid()}"
+        _connectionPool = exaBoxNodePool(_connkey)
+        get_gcontext().mSetRegEntry(f'SSH-POOL-{_connkey}', _connectionPool)
+        try:
+            for _probe, _fx in aProbes:
+                try:
+                    _result = _fx(aDomU)
+                except Exception as e:
+                    self.mPatchLogWarn(f"CRS/DB probe {_probe} failed on {aDomU} : {str(e)}")
+                    self.mPatchLogTrace(traceback.format_exc())
+                    continue
+                with self.__lock:
+                    aResults.setdefault(aDomU, {})[_probe] = _result
+        finally:
+            _connectionPool.mCloseConnections()
+            get_gcontext().mDelRegEntry(f'SSH-POOL-{_connkey}')
+
+    def mSweep(self, aDomUList, aProbes, aTimeout=None):
+        """
+        :param aDomUList: domUs to probe
+        :param aProbes: list of (probe, fx), fx(domU) returns the result of the probe
+        :param aTimeout: seconds to wait for the sweep, None to wait for all the domUs
+        :return: ({domU: {probe: result}}, list of domUs not done within aTimeout)
+
+         Probes already in the snapshot of the stage are not run again. The
+         probes of a domU run in the given order on the same thread.
+        """
+        _stage = self.__stage
+        _results = {}
+        _units = {}
+        with self.__lock:
+            for _domu in dict.fromkeys(aDomUList):
+                _cached = self.__entries.get(_domu, {}) if _stage is not None else {}
+                _results[_domu] = dict(_cached)
+                _todo = [(_probe, _fx) for _probe, _fx in aProbes if _probe not in _cached]
+                if _todo:
+                    _units[_domu] = _todo
+
+        if not _units:
+            return _results, []
+
+        self.mPatchLogInfo(f"Probing {str(list(_units.keys()))} for the CRS/DB validation snapshot of stage {str(_stage)}.")
+        _swept = {}
+        _executor = ThreadPoolExecutor(max_workers=min(self.__max_threads, len(_units)))
+        try:
+            _futures = {_executor.submit(self.mProbeDomU, _domu, _todo, _swept): _domu
+                        for _domu, _todo in _units.items()}
+            _done, _not_done = wait(_futures, timeout=aTimeout)
+        finally:
+            # Threads still running cannot be stopped, they are left behind
+            _executor.shutdown(wait=False)
+
+        for _future in _done:
+            if _future.exception() is not None:
+                self.mPatchLogWarn(f"CRS/DB probes could not run on {_futures[_future]} : {str(_future.exception())}")
+
+        _pending = []
+        for _future in _not_done:
+            _future.cancel()
+            _pending.append(_futures[_future])
+
+        with self.__lock:
+            for _domu, _probed in _swept.items():
+                if _domu in _pending:
+                    continue
+                _results[_domu].update(_probed)
+                if _stage is not None and _stage == self.__stage:
+                    self.__entries.setdefault(_domu, {}).update(_probed)
+
+        if _pending:
+            self.mPatchLogWarn(f"CRS/DB validation snapshot not completed within {str(aTimeout)} seconds on {str(_pending)}.")
+        return _results, _pending
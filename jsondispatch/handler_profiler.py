@@ -4,7 +4,7 @@
 #
 # handler_profiler.py
 #
-# Copyright (c) 2024, Oracle and/or its affiliates.
+# Copyright (c) 2024, 2026, Oracle and/or its affiliates.
 #
 #    NAME
 #      handler_profiler.py - <one-line expansion of the name>
@@ -16,6 +16,7 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Flame graph of the sampling profiler (flamegraph)
 #    jesandov    01/08/24 - Creation
 #
 
@@ -26,6 +27,7 @@ import os
 
 from exabox.core.Context import get_gcontext
 from exabox.jsondispatch.jsonhandler import JDHandler
+from exabox.tools.profiling.sampler import ebSamplingToCollapsed, SAMPLER_PROFILER_TYPE
 
 
 class ProfilerHandler(JDHandler):
@@ -36,8 +38,47 @@ class ProfilerHandler(JDHandler):
         self.mSetEmptyPayloadAllowed(False)
         self.mSetSchemaFile(os.path.abspath("exabox/jsondispatch/schemas/profiler.json"))
 
+    def mExecuteFlameGraph(self):
+        """
+        Samples of the sampling profiler (tools/profiling/sampler.py) of the
+        request operationId, or of the workflow, as collapsed stacks: one
+        '<stage>;<thread>;<frame>;...;<frame> <count>' line per stack, the
+        input of flamegraph.pl
+        """
+
+        _jconf = self.mGetOptions().jsonconf
+        _rows = self.mGetDB().mGetProfilerSamples(
+            _jconf.get("operationId"),
+            _jconf.get("workflowId"),
+            _jconf.get("exaunitId")
+        )
+
+        _stacks = {}
+        _stages = {}
+        for _row in _rows:
+            _details = json.loads(_row["details"])
+            _merged = _stacks.setdefault(_row["step"], {})
+            for _stack, _count in _details.get("stacks", {}).items():
+                _merged[_stack] = _merged.get(_stack, 0) + _count
+            _stages[_row["step"]] = {
+                "StartTime": _row["start_time"],
+                "EndTime": _row["end_time"],
+                "IntervalMs": _details.get("interval_ms")
+            }
+
+        for _stage, _info in _stages.items():
+            _info["Samples"] = sum(_stacks[_stage].values())
+
+        return (0, {
+            "stages": _stages,
+            "collapsed": ebSamplingToCollapsed(_stacks)
+        })
+
     def mExecute(self):
 
+        if self.mGetOptions().jsonconf.get("flamegraph"):
+            return self.mExecuteFlameGraph()
+
         _profilerData = self.mGetDB().mGetProfilerData(
             self.mGetOptions().jsonconf.get("workflowId"),
             self.mGetOptions().jsonconf.get("exaunitId")
@@ -66,6 +107,10 @@ class ProfilerHandler(JDHandler):
 
         for _row in _profilerData:
 
+            # Sampling profiler rows, see mExecuteFlameGraph
+            if _row["profiler_type"] == SAMPLER_PROFILER_TYPE:
+                continue
+
             if _row["step"] not in _stepId:
                 _stepId[_row["step"]] = f"{str(len(_stepId)).zfill(2)}_{_row['step']}"
 
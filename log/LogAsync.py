@@ -0,0 +1,354 @@
+"""
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    LogAsync - Asynchronous writer of the log files
+
+FUNCTION:
+    The file handlers of the loggers queue the records, a writer thread of
+    the process formats them and writes them in batches, flushing the files
+    every 'log_async_flush_ms' and as soon as an error is logged.
+
+NOTE:
+    Enabled with 'log_async_enabled': 'True'. Tunables:
+        log_async_queue_size    records queued before backpressure (10000)
+        log_async_flush_ms      interval between two flushes of a file (200)
+        log_async_batch_size    records written between two queue checks (512)
+
+    Under backpressure (queue full) the records below WARNING are dropped
+    and a line reports how many, the others wait for room in the queue. Past
+    half of the queue, the repetitions of the last record of a file are
+    coalesced into a 'last message repeated N times' line.
+
+    The caller location (file, line, function) of a record is resolved in
+    the logging thread by the formatter (mPrepareRecord), the writer only
+    formats. The queue is drained before fork and at exit, a forked child
+    starts its own writer.
+
+History:
+    jydas       10/18/2026 - Creation
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+import collections
+from copy import copy
+from logging.handlers import RotatingFileHandler
+
+LOG_ASYNC_QUEUE_SIZE = 10000
+LOG_ASYNC_FLUSH_MS   = 200
+LOG_ASYNC_BATCH_SIZE = 512
+LOG_ASYNC_BLOCK_SEC  = 5
+
+gLogAsyncWriter = None
+
+
+class ebLogAsyncWriter(object):
+
+    def __init__(self, aQueueSize=LOG_ASYNC_QUEUE_SIZE, aFlushMs=LOG_ASYNC_FLUSH_MS,
+                 aBatchSize=LOG_ASYNC_BATCH_SIZE):
+
+        self.__queueSize = max(1, aQueueSize)
+        self.__flushInterval = max(0, aFlushMs) / 1000.0
+        self.__batchSize = max(1, aBatchSize)
+        self.mReset()
+
+    def mReset(self):
+        """ Fresh state, also used in a forked child: the writer thread is not inherited """
+
+        self.__cond = threading.Condition()
+        # [handler, record, repetitions]
+        self.__queue = collections.deque()
+        # id(handler) -> last queued entry of the handler, for coalescing
+        self.__last = {}
+        # id(handler) -> [handler, dropped records]
+        self.__dropped = {}
+        self.__inflight = 0
+        self.__thread = None
+        self.__running = True
+        self.__pid = os.getpid()
+        self.__stats = {"written": 0, "dropped": 0, "coalesced": 0, "batches": 0, "flushes": 0}
+
+    def mGetStats(self):
+        with self.__cond:
+            _stats = dict(self.__stats)
+            _stats["queued"] = len(self.__queue)
+            return _stats
+
+    def mIsRunning(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def mStartLocked(self):
+
+        if self.__pid != os.getpid():
+            return False
+
+        if not self.mIsRunning():
+            self.__running = True
+            self.__thread = threading.Thread(target=self.mRun, name="ebLogAsyncWriter", daemon=True)
+            self.__thread.start()
+
+        return True
+
+    def mPut(self, aHandler, aRecord):
+
+        with self.__cond:
+
+            if self.__pid != os.getpid() or not self.__running:
+                return False
+            self.mStartLocked()
+
+            if len(self.__queue) >= self.__queueSize:
+                if aRecord.levelno < logging.WARNING:
+                    _entry = self.__dropped.setdefault(id(aHandler), [aHandler, 0])
+                    _entry[1] += 1
+                    self.__stats["dropped"] += 1
+                    return True
+
+                _deadline = time.monotonic() + LOG_ASYNC_BLOCK_SEC
+                while len(self.__queue) >= self.__queueSize and self.mIsRunning():
+                    _left = _deadline - time.monotonic()
+                    if _left <= 0:
+                        break
+                    self.__cond.wait(_left)
+
+            elif len(self.__queue) * 2 >= self.__queueSize:
+                _last = self.__last.get(id(aHandler))
+                if _last is not None and _last[1].levelno == aRecord.levelno and \
+                   _last[1].name == aRecord.name and _last[1].msg == aRecord.msg:
+                    _last[2] += 1
+                    self.__stats["coalesced"] += 1
+                    return True
+
+            _entry = [aHandler, aRecord, 0]
+            self.__queue.append(_entry)
+            self.__last[id(aHandler)] = _entry
+            self.__cond.notify_all()
+
+        return True
+
+    def mRun(self):
+
+        _dirty = {}
+        _lastFlush = time.monotonic()
+
+        while True:
+
+            with self.__cond:
+                while not self.__queue and not self.__dropped and self.__running:
+                    if _dirty:
+                        _left = self.__flushInterval - (time.monotonic() - _lastFlush)
+                        if _left <= 0:
+                            break
+                        self.__cond.wait(_left)
+                    else:
+                        self.__cond.wait()
+
+                _batch = []
+                while self.__queue and len(_batch) < self.__batchSize:
+                    _entry = self.__queue.popleft()
+                    if self.__last.get(id(_entry[0])) is _entry:
+                        del self.__last[id(_entry[0])]
+                    _batch.append(_entry)
+
+                _dropped = list(self.__dropped.values())
+                self.__dropped = {}
+                self.__inflight = len(_batch) + len(_dropped)
+                _stop = not self.__running and not self.__queue
+                _drained = not self.__queue
+                self.__cond.notify_all()
+
+            _urgent = False
+            for _handler, _record, _repeated in _batch:
+                self.mWrite(_handler, _record)
+                if _repeated:
+                    self.mWrite(_handler, self.mNoticeRecord(_record, _record.levelno,
+                                                             f"last message repeated {_repeated} times"))
+                _dirty[id(_handler)] = _handler
+                _urgent = _urgent or _record.levelno >= logging.ERROR
+
+            for _handler, _count in _dropped:
+                self.mWrite(_handler, self.mNoticeRecord(None, logging.WARNING,
+                                                         f"{_count} log messages dropped, log queue full"))
+                _dirty[id(_handler)] = _handler
+
+            _flushed = False
+            if _dirty and (_urgent or _drained or time.monotonic() - _lastFlush >= self.__flushInterval):
+                for _handler in _dirty.values():
+                    _handler.mFlush()
+                _dirty = {}
+                _lastFlush = time.monotonic()
+                _flushed = True
+
+            with self.__cond:
+                self.__stats["flushes"] += 1 if _flushed else 0
+                self.__stats["written"] += len(_batch)
+                self.__stats["batches"] += 1 if _batch else 0
+                self.__inflight = 0
+                self.__cond.notify_all()
+
+            if _stop:
+                break
+
+    @staticmethod
+    def mWrite(aHandler, aRecord):
+        # The writer outlives a failing handler, like logging does with handleError
+        try:
+            aHandler.mWrite(aRecord)
+        except Exception:
+            pass
+
+    @staticmethod
+    def mNoticeRecord(aRecord, aLevel, aMessage):
+
+        if aRecord is not None:
+            _record = copy(aRecord)
+            _record.msg, _record.args, _record.exc_info, _record.exc_text = aMessage, None, None, None
+            return _record
+
+        _record = logging.LogRecord("ebLogAsync", aLevel, __file__, 0, aMessage, None, None)
+        _record.ebCaller = (os.path.basename(__file__), 0, "ebLogAsyncWriter")
+        return _record
+
+    def mFlush(self, aTimeout=10):
+        """ Wait until the records queued so far are written and flushed """
+
+        if self.__pid != os.getpid():
+            return False
+
+        _deadline = time.monotonic() + aTimeout
+        with self.__cond:
+            if not self.mIsRunning():
+                return not self.__queue
+            while self.__queue or self.__inflight or self.__dropped:
+                _left = _deadline - time.monotonic()
+                if _left <= 0 or not self.mIsRunning():
+                    return False
+                self.__cond.wait(_left)
+        return True
+
+    def mStop(self, aTimeout=10):
+        """ Drain the queue and stop the writer """
+
+        if self.__pid != os.getpid():
+            return
+
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify_all()
+            _thread = self.__thread
+
+        if _thread is not None and _thread is not threading.current_thread():
+            _thread.join(aTimeout)
+
+
+class ebAsyncRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler writing through the writer of the process. Without
+    writer (log_async_enabled unset, writer stopped) it writes synchronously.
+    """
+
+    def handle(self, aRecord):
+
+        _writer = gLogAsyncWriter
+        if _writer is None:
+            return super().handle(aRecord)
+
+        _rv = self.filter(aRecord)
+        if _rv:
+            self.mPrepareRecord(aRecord)
+            if not _writer.mPut(self, aRecord):
+                return super().handle(aRecord)
+        return _rv
+
+    def mPrepareRecord(self, aRecord):
+        """ Resolve in the logging thread what can not be resolved later """
+
+        _prepare = getattr(self.formatter, 'mPrepareRecord', None)
+        if _prepare is not None:
+            _prepare(aRecord)
+
+        if aRecord.args:
+            aRecord.msg = aRecord.getMessage()
+            aRecord.args = None
+
+        if aRecord.exc_info and not aRecord.exc_text:
+            aRecord.exc_text = logging.Formatter().formatException(aRecord.exc_info)
+        aRecord.exc_info = None
+
+    def mWrite(self, aRecord):
+        """ Write aRecord without flushing the file (writer thread) """
+
+        self.acquire()
+        try:
+            _msg = self.format(aRecord) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self.stream.tell() + len(_msg) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(_msg)
+        except Exception:
+            self.handleError(aRecord)
+        finally:
+            self.release()
+
+    def mFlush(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def close(self):
+        # Records still queued for this file are written before it is closed
+        if gLogAsyncWriter is not None:
+            gLogAsyncWriter.mFlush()
+        super().close()
+
+
+def ebLogAsyncStart(aQueueSize=LOG_ASYNC_QUEUE_SIZE, aFlushMs=LOG_ASYNC_FLUSH_MS,
+                    aBatchSize=LOG_ASYNC_BATCH_SIZE):
+
+    global gLogAsyncWriter
+    if gLogAsyncWriter is None:
+        gLogAsyncWriter = ebLogAsyncWriter(aQueueSize, aFlushMs, aBatchSize)
+    return gLogAsyncWriter
+
+
+def ebLogAsyncFlush(aTimeout=10):
+    if gLogAsyncWriter is not None:
+        return gLogAsyncWriter.mFlush(aTimeout)
+    return True
+
+
+def ebLogAsyncShutdown(aTimeout=10):
+    """ Write everything queued and go back to synchronous writes """
+
+    global gLogAsyncWriter
+    _writer = gLogAsyncWriter
+    if _writer is not None:
+        gLogAsyncWriter = None
+        _writer.mStop(aTimeout)
+
+
+def ebLogAsyncStats():
+    return gLogAsyncWriter.mGetStats() if gLogAsyncWriter is not None else {}
+
+
+def _mLogAsyncBeforeFork():
+    # Nothing queued is lost by a parent leaving with os._exit or copied to the child
+    if gLogAsyncWriter is not None:
+        gLogAsyncWriter.mFlush(aTimeout=5)
+
+
+def _mLogAsyncAfterForkChild():
+    if gLogAsyncWriter is not None:
+        gLogAsyncWriter.mReset()
+
+
+os.register_at_fork(before=_mLogAsyncBeforeFork, after_in_child=_mLogAsyncAfterForkChild)
+atexit.register(ebLogAsyncShutdown)
+
+# end of file
@@ -23,6 +23,8 @@ CRITICAL : This is a serious error, and some kind of application meltdown might
 History:
 
     MODIFIED   (MM/DD/YY)
+       jydas    10/18/26 - Asynchronous writes of the log files with
+                           log_async_enabled, caller resolved once per record
        shapatna 03/21/26 - Bug 38900262: Fix for issues reported by Codev Agent
                            in Exabox/Log
        aararora 02/27/26 - Bug 38902170: Correct resource leak issues
@@ -67,6 +69,9 @@ import enum
 import traceback
 import re
 
+from exabox.log.LogAsync import (ebAsyncRotatingFileHandler, ebLogAsyncStart, ebLogAsyncShutdown,
+                                 LOG_ASYNC_QUEUE_SIZE, LOG_ASYNC_FLUSH_MS, LOG_ASYNC_BATCH_SIZE)
+
 gLogMgrInit = False
 gLogMgrDirectory = '.'
 gLogMainThreadId = None
@@ -99,15 +104,27 @@ class ebDefaultFileFormatter(logging.Formatter):
 
 class ebFileFormatter(logging.Formatter):
 
-    def format(self, aRecord):
+    def mPrepareRecord(self, aRecord):
+        """
+        Resolve once per record the caller of ebLog*, in the logging thread
+        (the formatting may happen later in the async log writer).
+        """
+
+        if getattr(aRecord, "ebCaller", None) is not None:
+            return aRecord.ebCaller
 
         _exacloudPath = os.path.abspath(__file__)
         _exacloudPath = _exacloudPath[0: _exacloudPath.rfind("exacloud")+8] + "/"
 
-        _stack = traceback.extract_stack()
+        # Source lines are only read (from linecache, without the stat of
+        # every file of the stack done by extract_stack) when looked at
+        _stack = [traceback.FrameSummary(_f.f_code.co_filename, _lineno, _f.f_code.co_name, lookup_line=False)
+                  for _f, _lineno in traceback.walk_stack(None)]
+        _stack.reverse()
+        # Same filter as on str(frame), without formatting every frame
         _stack = list(filter(lambda x:
-            "helper" not in str(x) and \
-            "wrapper" not in str(x),
+            "helper" not in x.filename and "helper" not in x.name and \
+            "wrapper" not in x.filename and "wrapper" not in x.name,
         _stack))
 
         _currentLogId = 0
@@ -137,17 +154,26 @@ class ebFileFormatter(logging.Formatter):
             _frame = _stack[_currentLogId]
             _extra = "mConnect"
 
-        _current = copy(aRecord)
-
-        _current.filename = _frame.filename.replace(_exacloudPath, "")
-        _current.pathname = _frame.filename.replace(_exacloudPath, "")
-        _current.lineno = _frame.lineno
-
+        _funcName = aRecord.funcName
         _fxMatch = re.search("in (.*)>", str(_frame))
         if _fxMatch:
-            _current.funcName = _fxMatch.group(1)
+            _funcName = _fxMatch.group(1)
         if _extra:
-            _current.funcName = f"{_extra}/{_current.funcName}"
+            _funcName = f"{_extra}/{_funcName}"
+
+        aRecord.ebCaller = (_frame.filename.replace(_exacloudPath, ""), _frame.lineno, _funcName)
+        return aRecord.ebCaller
+
+    def format(self, aRecord):
+
+        _filename, _lineno, _funcName = self.mPrepareRecord(aRecord)
+
+        _current = copy(aRecord)
+
+        _current.filename = _filename
+        _current.pathname = _filename
+        _current.lineno = _lineno
+        _current.funcName = _funcName
 
         return super().format(_current)
 
@@ -164,6 +190,7 @@ class ebColorFormatter(ebFileFormatter):
     """
 
     def format(self, aRecord: logging.LogRecord) -> str:
+        self.mPrepareRecord(aRecord)
         colored_record = copy(aRecord)
         levelname = colored_record.levelname
         seq = MAPPING.get(levelname)
@@ -271,11 +298,12 @@ def ebLogAddDestinationToLoggers(aLoggerNames : Sequence[str],
     _trc_file = os.path.abspath(f"{aPathToHandlerFileWithoutExtension}.trc")
     os.makedirs(os.path.dirname(_log_file), exist_ok=True)
 
-    _log_handler = RotatingFileHandler(_log_file,
+    # Written by the async log writer when enabled, synchronously otherwise
+    _log_handler = ebAsyncRotatingFileHandler(_log_file,
         maxBytes=gLogMaxBytes, backupCount=gLogBackupCount)
-    _err_handler = RotatingFileHandler(_err_file,
+    _err_handler = ebAsyncRotatingFileHandler(_err_file,
         maxBytes=gLogMaxBytes, backupCount=gLogBackupCount)
-    _trc_handler = RotatingFileHandler(_trc_file,
+    _trc_handler = ebAsyncRotatingFileHandler(_trc_file,
         maxBytes=gLogMaxBytes, backupCount=gLogBackupCount)
 
     _formatter_inf = ebCreateFormatter(aFormatter.value)
@@ -442,6 +470,17 @@ def ebLogInit(aContext, aOptions):
         if 'log_level' in list(_coptions.keys()):
             default_log_level = _coptions['log_level']
 
+    if _coptions and str(_coptions.get('log_async_enabled', '')).upper() == 'TRUE':
+        def _mIntOption(aName, aDefault):
+            try:
+                return int(_coptions.get(aName, aDefault))
+            except (TypeError, ValueError):
+                return aDefault
+
+        ebLogAsyncStart(_mIntOption('log_async_queue_size', LOG_ASYNC_QUEUE_SIZE),
+                        _mIntOption('log_async_flush_ms', LOG_ASYNC_FLUSH_MS),
+                        _mIntOption('log_async_batch_size', LOG_ASYNC_BATCH_SIZE))
+
     if aOptions.log_level:
         default_log_level = aOptions.log_level
     if aOptions.debug:
@@ -539,6 +578,7 @@ def ebSetLogDiagLvl(lvl):
 def ebLogFinalize(aOptions, *aString):
     global gLogMgrInit
     if gLogMgrInit:
+        ebLogAsyncShutdown()
         gLogMgrInit = False
 
 @check_is_log_initialized
@@ -20,6 +20,7 @@ History:
                              exaBoxConnection.mWriteFile()
     jesandov    03/31/2023 - 35141247 - Add SSH Connection Pool
     scoral      03/21/2023 - Enh 34734317: Implemented mGetFileInfo
+    jydas       10/18/2026 - Add streaming execution and line iterator
 
 """
 
@@ -228,7 +229,8 @@ class exaBoxConnection(object):
         if self.__ssh_conn and aWaitExecList:
             return self.__ssh_conn.mExecuteCmdsAuthInteractive(aWaitExecList)
 
-    def mExecuteCmd(self, aCmd, aCurrDir=None, aStdIn=PIPE, aStdOut=PIPE, aStdErr=PIPE, aTimeout=None, aDecodeUtf8=False):
+    def mExecuteCmd(self, aCmd, aCurrDir=None, aStdIn=PIPE, aStdOut=PIPE, aStdErr=PIPE, aTimeout=None, aDecodeUtf8=False,
+                    aStdoutCallback=None, aStderrCallback=None, aStream=False):
         _curr_dir = aCurrDir
         _stdin = aStdIn
         _std_out = aStdOut
@@ -237,7 +239,14 @@ class exaBoxConnection(object):
         _decodeutf8 = aDecodeUtf8
 
         if self.__ssh_conn and aCmd:
-            return self.__ssh_conn.mExecuteCmd(aCmd, aCurrDir=_curr_dir, aStdIn=_stdin, aStdOut=_std_out, aStdErr=_stderr, aTimeout=_timeout, aDecodeUtf8=_decodeutf8)
+            return self.__ssh_conn.mExecuteCmd(aCmd, aCurrDir=_curr_dir, aStdIn=_stdin, aStdOut=_std_out, aStdErr=_stderr, aTimeout=_timeout, aDecodeUtf8=_decodeutf8,
+                                               aStdoutCallback=aStdoutCallback, aStderrCallback=aStderrCallback, aStream=aStream)
+
+    def mIterExecuteCmd(self, aCmd, aTimeout=None, aDecodeUtf8=True):
+
+        if self.__ssh_conn and aCmd:
+            return self.__ssh_conn.mIterExecuteCmd(aCmd, aTimeout=aTimeout, aDecodeUtf8=aDecodeUtf8)
+        return iter(())
 
     def mExecuteCmdLog(self, aCmd, aCurrDir=None, aStdIn=PIPE, aStdOut=PIPE, aStdErr=PIPE, aTimeout=None):
         _curr_dir = aCurrDir
@@ -0,0 +1,354 @@
+"""
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    Reachability - Batch reachability prober
+
+FUNCTION:
+    Probe a set of hosts concurrently from one thread: ICMP echo requests
+    when the process may open an ICMP socket (unprivileged ping socket or
+    raw socket), TCP connect probes on the SSH port otherwise.
+
+NOTE:
+    Enabled for exaBoxCluCtrl.mPingHost and sshgen.ping_host with
+    'ping_prober_enabled': 'True' (mock mode keeps forking /bin/ping).
+    Tunables:
+        ping_prober_tcp_port        port of the TCP probes (22)
+        ping_prober_cache_ttl_sec   seconds a reachable host is remembered,
+                                    0 disables the cache (2)
+
+    A TCP probe refused by the host counts as reachable, the host answered.
+    Without aFamily hosts are probed on IPv4 when they have an IPv4 address
+    (like /bin/ping), socket.AF_INET6 probes their IPv6 address.
+
+History:
+    jydas       10/18/2026 - Probe the address of the family asked by the
+                             caller (aFamily)
+    jydas       10/18/2026 - Creation
+"""
+
+import os
+import time
+import errno
+import random
+import select
+import socket
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from exabox.core.Context import get_gcontext
+from exabox.log.LogMgr import ebLogTrace, ebLogWarn
+
+PROBE_TIMEOUT_SEC   = 2
+PROBE_TCP_PORT      = 22
+PROBE_CACHE_TTL_SEC = 2
+PROBE_RESOLVERS     = 16
+
+ICMP_ECHO_REQUEST   = 8
+ICMP_ECHO_REPLY     = 0
+ICMP6_ECHO_REQUEST  = 128
+ICMP6_ECHO_REPLY    = 129
+
+# host, or (host, family) when probed on a given family -> (expiration
+# time, rtt) of the hosts found reachable
+_gReachableCache = {}
+_gReachableCacheLock = threading.Lock()
+
+
+def ebIsPingProberEnabled():
+    if get_gcontext().mCheckConfigOption('ping_prober_enabled') != 'True':
+        return False
+    _opt = get_gcontext().mGetArgsOptions()
+    return not (isinstance(_opt, dict) and 'mock_cmds' in _opt)
+
+
+def ebIcmpChecksum(aData):
+
+    if len(aData) % 2:
+        aData += b'\0'
+    _sum = sum(struct.unpack(f'!{len(aData) // 2}H', aData))
+    _sum = (_sum >> 16) + (_sum & 0xffff)
+    _sum += _sum >> 16
+    return ~_sum & 0xffff
+
+
+def ebBuildEchoRequest(aFamily, aIdent, aSeq):
+
+    _type = ICMP6_ECHO_REQUEST if aFamily == socket.AF_INET6 else ICMP_ECHO_REQUEST
+    _payload = b'exacloud-probe'
+    _header = struct.pack('!BBHHH', _type, 0, 0, aIdent, aSeq)
+    if aFamily == socket.AF_INET6:
+        # Checksum of ICMPv6 is computed by the kernel
+        return _header + _payload
+    _checksum = ebIcmpChecksum(_header + _payload)
+    return struct.pack('!BBHHH', _type, 0, _checksum, aIdent, aSeq) + _payload
+
+
+def ebParseEchoReply(aFamily, aData, aRaw):
+    """
+    Return (ident, seq) of an echo reply, None for any other packet
+    """
+
+    if aFamily == socket.AF_INET and aRaw and aData:
+        # Raw IPv4 sockets get the IP header
+        aData = aData[(aData[0] & 0x0f) * 4:]
+
+    if len(aData) < 8:
+        return None
+
+    _type, _, _, _ident, _seq = struct.unpack('!BBHHH', aData[:8])
+    if _type != (ICMP6_ECHO_REPLY if aFamily == socket.AF_INET6 else ICMP_ECHO_REPLY):
+        return None
+    return _ident, _seq
+
+
+class ebReachabilityProber(object):
+
+    def __init__(self, aTcpPort=None, aCacheTTL=None):
+
+        self.__tcpPort = aTcpPort or self.mIntOption('ping_prober_tcp_port', PROBE_TCP_PORT)
+        self.__cacheTTL = aCacheTTL if aCacheTTL is not None else \
+                          self.mIntOption('ping_prober_cache_ttl_sec', PROBE_CACHE_TTL_SEC)
+        self.__ident = (os.getpid() ^ random.randint(0, 0xffff)) & 0xffff
+
+    @staticmethod
+    def mIntOption(aName, aDefault):
+        _value = get_gcontext().mCheckConfigOption(aName)
+        try:
+            return int(_value) if _value is not None else aDefault
+        except ValueError:
+            ebLogWarn(f"Invalid value for {aName}: {_value}, using {aDefault}")
+            return aDefault
+
+    @staticmethod
+    def mCacheKey(aHost, aFamily=None):
+        return aHost if aFamily is None else (aHost, aFamily)
+
+    def mGetCached(self, aHost, aFamily=None):
+
+        if self.__cacheTTL <= 0:
+            return None
+        with _gReachableCacheLock:
+            _entry = _gReachableCache.get(self.mCacheKey(aHost, aFamily))
+            if _entry and _entry[0] > time.time():
+                return True, _entry[1]
+        return None
+
+    def mSetCached(self, aHost, aRtt, aFamily=None):
+
+        if self.__cacheTTL <= 0:
+            return
+        with _gReachableCacheLock:
+            _gReachableCache[self.mCacheKey(aHost, aFamily)] = (time.time() + self.__cacheTTL, aRtt)
+
+    @staticmethod
+    def mInvalidateCache(aHost=None):
+        with _gReachableCacheLock:
+            if aHost is None:
+                _gReachableCache.clear()
+            else:
+                for _key in [_key for _key in _gReachableCache
+                             if _key == aHost or (isinstance(_key, tuple) and _key[0] == aHost)]:
+                    del _gReachableCache[_key]
+
+    def mResolve(self, aHosts, aFamily=None):
+        """
+        Return host -> (family, sockaddr), None for unresolvable hosts
+        aFamily: only the addresses of this family, None for any
+        """
+
+        def _mResolve(aHost):
+            try:
+                _info = socket.getaddrinfo(aHost, None, family=aFamily or socket.AF_UNSPEC,
+                                           proto=socket.IPPROTO_TCP)
+            except (socket.gaierror, UnicodeError):
+                return None
+            if not _info:
+                return None
+            # Prefer IPv4 like ping does
+            _info.sort(key=lambda x: x[0] != socket.AF_INET)
+            return _info[0][0], _info[0][4]
+
+        if len(aHosts) == 1:
+            return {aHosts[0]: _mResolve(aHosts[0])}
+
+        with ThreadPoolExecutor(max_workers=min(PROBE_RESOLVERS, len(aHosts))) as _pool:
+            return dict(zip(aHosts, _pool.map(_mResolve, aHosts)))
+
+    def mOpenIcmpSocket(self, aFamily):
+        """
+        Return (socket, raw) for aFamily, (None, False) when ICMP is not
+        permitted to this process.
+        """
+
+        _proto = socket.IPPROTO_ICMPV6 if aFamily == socket.AF_INET6 else socket.IPPROTO_ICMP
+        for _type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+            try:
+                _sock = socket.socket(aFamily, _type, _proto)
+                _sock.setblocking(False)
+                return _sock, _type == socket.SOCK_RAW
+            except OSError:
+                continue
+        return None, False
+
+    def mProbe(self, aHosts, aTimeout=PROBE_TIMEOUT_SEC, aCount=1, aDeadlines=None, aUseCache=True, aTcpOnly=False,
+               aFamily=None):
+        """
+        Probe aHosts concurrently.
+
+        aTimeout:   seconds waited for each of the aCount attempts
+        aDeadlines: host -> seconds, overrides aTimeout * aCount for a host
+        aFamily:    socket.AF_INET6 to probe the IPv6 address of the hosts
+        :return: dict host -> (reachable, rtt in seconds or None)
+        """
+
+        _results = {}
+        _hosts = []
+        for _host in dict.fromkeys(aHosts):
+            _cached = self.mGetCached(_host, aFamily) if aUseCache else None
+            if _cached:
+                _results[_host] = _cached
+            else:
+                _hosts.append(_host)
+
+        if not _hosts:
+            return _results
+
+        _count = max(1, int(aCount))
+        _timeout = max(0.1, float(aTimeout or PROBE_TIMEOUT_SEC))
+        _deadlines = aDeadlines or {}
+
+        _addrs = self.mResolve(_hosts, aFamily)
+        _now = time.time()
+        _state = {}
+        for _host in _hosts:
+            if not _addrs.get(_host):
+                ebLogTrace(f"*** Probe: unable to resolve {_host}")
+                _results[_host] = (False, None)
+                continue
+            _family, _sockaddr = _addrs[_host]
+            _state[_host] = {"family": _family, "addr": _sockaddr, "tcp": aTcpOnly, "sent": 0,
+                             "next": _now, "deadline": _now + _deadlines.get(_host, _timeout * _count),
+                             "sock": None, "start": None}
+
+        _icmp = {}
+        if not aTcpOnly:
+            for _family in set([_s["family"] for _s in _state.values()]):
+                _sock, _raw = self.mOpenIcmpSocket(_family)
+                if _sock is not None:
+                    _icmp[_family] = (_sock, _raw)
+            for _s in _state.values():
+                _s["tcp"] = _s["family"] not in _icmp
+
+        # seq -> (host, send time) of the echo requests in flight
+        _inflight = {}
+        _seq = random.randint(0, 0xffff)
+
+        def _mDone(aHost, aReachable, aRtt=None):
+            _s = _state.pop(aHost)
+            if _s["sock"] is not None:
+                _s["sock"].close()
+            _results[aHost] = (aReachable, aRtt)
+            if aReachable:
+                self.mSetCached(aHost, aRtt, aFamily)
+
+        try:
+            while _state:
+
+                _now = time.time()
+                for _host, _s in list(_state.items()):
+
+                    if _now >= _s["deadline"]:
+                        _mDone(_host, False)
+                        continue
+
+                    if _s["sent"] >= _count or _now < _s["next"] or _s["sock"] is not None:
+                        continue
+
+                    _s["sent"] += 1
+                    _s["next"] = _now + _timeout
+
+                    if not _s["tcp"]:
+                        _seq = (_seq + 1) & 0xffff
+                        _sock, _ = _icmp[_s["family"]]
+                        try:
+                            _sock.sendto(ebBuildEchoRequest(_s["family"], self.__ident, _seq), _s["addr"])
+                            _inflight[_seq] = (_host, _now)
+                        except PermissionError:
+                            # ICMP filtered locally, try the TCP port
+                            _s["tcp"] = True
+                            _s["next"] = _now
+                        except OSError as e:
+                            ebLogTrace(f"*** Probe: ICMP to {_host} failed: {e}")
+                        continue
+
+                    _tcp = socket.socket(_s["family"], socket.SOCK_STREAM)
+                    _tcp.setblocking(False)
+                    _addr = (_s["addr"][0], self.__tcpPort) + tuple(_s["addr"][2:])
+                    _rc = _tcp.connect_ex(_addr)
+                    _s["start"] = _now
+                    if _rc in (0, errno.ECONNREFUSED):
+                        _s["sock"] = _tcp
+                        _mDone(_host, True, time.time() - _now)
+                    elif _rc in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                        _s["sock"] = _tcp
+                    else:
+                        _tcp.close()
+
+                if not _state:
+                    break
+
+                _readers = [_sock for _sock, _ in _icmp.values()]
+                _writers = {_s["sock"]: _host for _host, _s in _state.items() if _s["sock"] is not None}
+                _wait = min([min(_s["deadline"], _s["next"]) if _s["sent"] < _count and _s["sock"] is None
+                             else _s["deadline"] for _s in _state.values()]) - time.time()
+
+                _r, _w, _ = select.select(_readers, list(_writers.keys()), [], max(0, _wait))
+                _now = time.time()
+
+                for _family, (_sock, _raw) in _icmp.items():
+                    if _sock not in _r:
+                        continue
+                    while True:
+                        try:
+                            _data, _from = _sock.recvfrom(2048)
+                        except (BlockingIOError, InterruptedError):
+                            break
+                        except OSError:
+                            break
+                        _reply = ebParseEchoReply(_family, _data, _raw)
+                        if not _reply:
+                            continue
+                        _ident, _rseq = _reply
+                        # Ping sockets rewrite the identifier, raw ones see every reply
+                        if _raw and _ident != self.__ident:
+                            continue
+                        _host, _sent = _inflight.get(_rseq, (None, None))
+                        if _host in _state and _state[_host]["addr"][0] == _from[0]:
+                            _mDone(_host, True, _now - _sent)
+
+                for _tcp in _w:
+                    _host = _writers[_tcp]
+                    if _host not in _state:
+                        continue
+                    _err = _tcp.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if _err in (0, errno.ECONNREFUSED):
+                        _mDone(_host, True, _now - _state[_host]["start"])
+                    else:
+                        _state[_host]["sock"] = None
+                        _tcp.close()
+
+        finally:
+            for _sock, _ in _icmp.values():
+                _sock.close()
+            for _s in _state.values():
+                if _s["sock"] is not None:
+                    _s["sock"].close()
+
+        return _results
+
+    def mIsReachable(self, aHost, aTimeout=PROBE_TIMEOUT_SEC, aCount=1, aUseCache=True, aFamily=None):
+        return self.mProbe([aHost], aTimeout, aCount, aUseCache=aUseCache, aFamily=aFamily)[aHost][0]
+
+# end of file
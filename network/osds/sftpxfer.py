@@ -0,0 +1,318 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/network/osds/sftpxfer.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# sftpxfer.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      sftpxfer.py - Parallel and resumable SFTP transfer engine
+#
+#    DESCRIPTION
+#      Pushes a list of files to a remote host over several SFTP channels
+#      of one SSH transport. Every file is cut in blocks dispatched round
+#      robin to the channels, each channel writes its blocks with pipelined
+#      SFTP requests, so the transfer is not bound by the window of a single
+#      stream. The SHA-256 of every file is computed while it is read and
+#      verified remotely before the file is renamed to its final name.
+#
+#    NOTES
+#      Files are written to '<remote>.xferpart' first. When a partial file
+#      is found (previous attempt interrupted) its block aligned prefix is
+#      checked remotely against the local file and the transfer resumes
+#      after it. Tunables:
+#        sftp_xfer_engine_enabled   use the engine for sshconn.mCopyFile
+#        sftp_xfer_streams          SFTP channels written in parallel
+#        sftp_xfer_block_kb         size of the blocks dispatched per channel
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import queue
+import shlex
+import hashlib
+import threading
+
+from exabox.core.Context import get_gcontext
+from exabox.core.Error import ExacloudRuntimeError
+from exabox.log.LogMgr import ebLogInfo, ebLogTrace, ebLogWarn
+
+SFTP_XFER_STREAMS     = 4
+SFTP_XFER_BLOCK_KB    = 4096
+SFTP_XFER_QUEUE_DEPTH = 2
+SFTP_XFER_PART_SUFFIX = '.xferpart'
+SFTP_XFER_HASH_READ   = 1024 * 1024
+
+def ebIsSftpXferEnabled():
+    return get_gcontext().mCheckConfigOption('sftp_xfer_engine_enabled') == 'True'
+
+def ebSftpXferPartPath(aRemotePath):
+    return f"{aRemotePath}{SFTP_XFER_PART_SUFFIX}"
+
+
+class ebSftpXferStream(threading.Thread):
+    """
+    One SFTP channel writing the blocks queued to it. Errors are kept and
+    reported to the reader, the queue is drained so the reader never blocks.
+    """
+
+    def __init__(self, aSftp, aDepth=SFTP_XFER_QUEUE_DEPTH):
+
+        super().__init__(daemon=True)
+        self.__sftp = aSftp
+        self.__queue = queue.Queue(maxsize=aDepth)
+        self.__handles = {}
+        self.__error = None
+
+    def mGetSftp(self):
+        return self.__sftp
+
+    def mGetError(self):
+        return self.__error
+
+    def mPutBlock(self, aPath, aOffset, aData):
+        self.__queue.put(("write", aPath, aOffset, aData))
+
+    def mCloseFile(self, aPath, aAcks):
+        """ Close aPath (waiting for the pending writes), ack through aAcks """
+        self.__queue.put(("close", aPath, aAcks, None))
+
+    def mStop(self):
+        self.__queue.put(None)
+
+    def run(self):
+
+        while True:
+
+            _item = self.__queue.get()
+            if _item is None:
+                break
+
+            _op, _path, _arg, _data = _item
+
+            if _op == "write":
+                if self.__error:
+                    continue
+                try:
+                    _fd = self.__handles.get(_path)
+                    if _fd is None:
+                        _fd = self.__sftp.open(_path, 'r+b')
+                        _fd.set_pipelined(True)
+                        self.__handles[_path] = _fd
+                    _fd.seek(_arg)
+                    _fd.write(_data)
+                except Exception as e:
+                    self.__error = e
+
+            else:
+                _fd = self.__handles.pop(_path, None)
+                try:
+                    if _fd is not None:
+                        _fd.close()
+                except Exception as e:
+                    self.__error = self.__error or e
+                _arg.put(self.__error)
+
+        for _fd in self.__handles.values():
+            try:
+                _fd.close()
+            except Exception:
+                pass
+        self.__handles = {}
+
+
+class ebSftpTransfer(object):
+    """
+    Transfer engine of one connection.
+
+    aOpenSftpFx: callable returning a new SFTP client (channel) over the
+                 connection, e.g. paramiko SSHClient.open_sftp
+    aExecFx:     callable running a remote command, returning (rc, stdout)
+    """
+
+    def __init__(self, aOpenSftpFx, aExecFx, aStreams=None, aBlockSize=None, aResume=True, aVerify=True):
+
+        self.__openSftpFx = aOpenSftpFx
+        self.__execFx = aExecFx
+        self.__streams = aStreams or self.mGetIntOption('sftp_xfer_streams', SFTP_XFER_STREAMS)
+        self.__blockSize = aBlockSize or self.mGetIntOption('sftp_xfer_block_kb', SFTP_XFER_BLOCK_KB) * 1024
+        self.__resume = aResume
+        self.__verify = aVerify
+        self.__stats = {"files": 0, "bytes": 0, "resumed_bytes": 0}
+
+    @staticmethod
+    def mGetIntOption(aName, aDefault):
+        _value = get_gcontext().mCheckConfigOption(aName)
+        try:
+            return max(1, int(_value)) if _value is not None else aDefault
+        except ValueError:
+            ebLogWarn(f"Invalid value for {aName}: {_value}, using {aDefault}")
+            return aDefault
+
+    def mGetStats(self):
+        return dict(self.__stats)
+
+    def mGetRemoteSha256(self, aPath, aSize=None):
+        """
+        sha256 of a remote file, or of its first aSize bytes
+        """
+
+        _path = shlex.quote(aPath)
+        if aSize is None:
+            _cmd = f"/usr/bin/sha256sum {_path}"
+        else:
+            _cmd = f"/usr/bin/head -c {int(aSize)} {_path} | /usr/bin/sha256sum"
+
+        _rc, _out = self.__execFx(_cmd)
+        if isinstance(_out, bytes):
+            _out = _out.decode('utf-8', 'replace')
+        if _rc or not _out:
+            return None
+        return _out.strip().split(" ")[0]
+
+    def mHashLocalPrefix(self, aLocalFile, aSize):
+
+        _hash = hashlib.sha256()
+        _left = aSize
+        with open(aLocalFile, 'rb') as _fd:
+            while _left > 0:
+                _data = _fd.read(min(SFTP_XFER_HASH_READ, _left))
+                if not _data:
+                    break
+                _hash.update(_data)
+                _left -= len(_data)
+        return _hash
+
+    def mPrepareRemote(self, aSftp, aLocalFile, aPart, aSize):
+        """
+        Create (or truncate) the partial remote file and return the offset to
+        start from with the hash of the local bytes before it.
+        """
+
+        _prefix = 0
+        if self.__resume:
+            try:
+                _partSize = aSftp.stat(aPart).st_size or 0
+            except IOError:
+                _partSize = 0
+            # Blocks are written out of order, only a verified prefix is kept
+            _prefix = (min(_partSize, aSize) // self.__blockSize) * self.__blockSize
+
+        if _prefix:
+            _hash = self.mHashLocalPrefix(aLocalFile, _prefix)
+            if self.mGetRemoteSha256(aPart, _prefix) == _hash.hexdigest():
+                aSftp.truncate(aPart, _prefix)
+                ebLogInfo(f"*** Resuming transfer of {aLocalFile} at {_prefix}/{aSize} bytes")
+                self.__stats["resumed_bytes"] += _prefix
+                return _prefix, _hash
+            ebLogTrace(f"Partial file {aPart} does not match {aLocalFile}, restarting")
+
+        with aSftp.open(aPart, 'wb'):
+            pass
+        return 0, hashlib.sha256()
+
+    def mTransfer(self, aFiles):
+        """
+        Copy aFiles, a list of (local path, remote path), and return a dict
+        remote path -> sha256 of the transferred file.
+        """
+
+        if not aFiles:
+            return {}
+
+        _ctl = self.__openSftpFx()
+        _streams = []
+        _pending = []
+        _digests = {}
+
+        try:
+            _block = 0
+            for _local, _remote in aFiles:
+
+                _size = os.path.getsize(_local)
+                _part = ebSftpXferPartPath(_remote)
+                _offset, _hash = self.mPrepareRemote(_ctl, _local, _part, _size)
+
+                ebLogTrace(f'*** SFTP XFER: {_local} --> {_remote} ({_size} bytes)')
+
+                with open(_local, 'rb') as _fd:
+                    _fd.seek(_offset)
+                    while _offset < _size:
+
+                        _data = _fd.read(self.__blockSize)
+                        if not _data:
+                            raise ExacloudRuntimeError(0x0701, 0xA, f"File {_local} truncated during transfer")
+                        _hash.update(_data)
+
+                        # Channels are only opened when there is data for them
+                        if len(_streams) < self.__streams:
+                            _stream = ebSftpXferStream(self.__openSftpFx())
+                            _stream.start()
+                            _streams.append(_stream)
+
+                        _stream = _streams[_block % len(_streams)]
+                        if _stream.mGetError():
+                            raise _stream.mGetError()
+                        _stream.mPutBlock(_part, _offset, _data)
+
+                        _offset += len(_data)
+                        _block += 1
+
+                _acks = queue.Queue()
+                for _stream in _streams:
+                    _stream.mCloseFile(_part, _acks)
+                _pending.append((_local, _remote, _part, _hash.hexdigest(), _acks, len(_streams)))
+
+            for _local, _remote, _part, _digest, _acks, _count in _pending:
+                _digests[_remote] = self.mFinishFile(_ctl, _local, _remote, _part, _digest, _acks, _count)
+
+        except ExacloudRuntimeError:
+            raise
+        except Exception as e:
+            ebLogWarn(f"SFTP transfer failed: {e}")
+            raise ExacloudRuntimeError(0x0701, 0xA, f"Something wrong happened while in SFTP transfer: {e}") from e
+
+        finally:
+            for _stream in _streams:
+                _stream.mStop()
+            for _stream in _streams:
+                _stream.join()
+                self.mCloseSftp(_stream.mGetSftp())
+            self.mCloseSftp(_ctl)
+
+        return _digests
+
+    def mFinishFile(self, aSftp, aLocal, aRemote, aPart, aDigest, aAcks, aCount):
+
+        for _ in range(aCount):
+            _error = aAcks.get()
+            if _error:
+                raise _error
+
+        if self.__verify:
+            _remoteDigest = self.mGetRemoteSha256(aPart)
+            if _remoteDigest != aDigest:
+                try:
+                    aSftp.remove(aPart)
+                except IOError:
+                    pass
+                raise ExacloudRuntimeError(0x0779, 0xA,
+                    f"Checksum mismatch for {aRemote}: local {aDigest}, remote {_remoteDigest}")
+
+        aSftp.chmod(aPart, os.stat(aLocal).st_mode & 0o777)
+        aSftp.posix_rename(aPart, aRemote)
+
+        self.__stats["files"] += 1
+        self.__stats["bytes"] += os.path.getsize(aLocal)
+        return aDigest
+
+    def mCloseSftp(self, aSftp):
+        try:
+            aSftp.close()
+        except Exception:
+            pass
+
+# end of file
@@ -11,6 +11,20 @@ NOTE:
     None
 
 History:
+    jydas       10/18/2026 - Retry the streaming execution only before the
+                             first chunk is sent to the callbacks, time out
+                             commands with never ending output
+    jydas       10/18/2026 - Record command latency per host and command
+                             family and SFTP throughput in the hot path
+                             metrics registry
+    jydas       10/18/2026 - ping_host probes with the batch reachability
+                             prober when enabled
+    jydas       10/18/2026 - Add parallel resumable SFTP transfers with in
+                             flight sha256 (mTransferFiles)
+    jydas       10/18/2026 - Reuse authenticated transports from the process
+                             wide SSH transport pool
+    jydas       10/18/2026 - Add event driven streaming execution without the
+                             2MB transport window ceiling
     jesandov    06/10/2026 - Bug#39462050: Add secure client
     bhpati      04/03/2026 - Bug 39067888: add NLS_LANG variable to ssh commands
     jesandov    11/03/2025 - Bug#38606181: Fix UT
@@ -92,6 +106,8 @@ import math
 import tempfile
 import functools
 import glob
+import collections
+import contextlib
 
 from exabox.tools.AttributeWrapper import wrapStrBytesFunctions
 from exabox.core.Context import get_gcontext
@@ -105,6 +121,12 @@ from exabox.log.LogMgr import (ebLogError, ebLogDebug, ebLogInfo,
 from exabox.core.Error import ExacloudRuntimeError
 from exabox.recordreplay.record_replay import ebRecordReplay
 from exabox.network.osds.sshclient import SshClient
+from exabox.network.osds.sshpool import (ebGetSshTransportPool, ebSshKeyFingerprint,
+                                         ebIsSshTransportPoolEnabled)
+from exabox.network.osds.sftpxfer import ebSftpTransfer, ebIsSftpXferEnabled
+from exabox.network.Reachability import ebReachabilityProber, ebIsPingProberEnabled
+from exabox.core.Metrics import (ebMetricsObserve, ebMetricsIncrement, ebMetricsHost,
+                                 ebMetricsCommandFamily, ebMetricsEnabled)
 
 try:
     from subprocess import DEVNULL # Python 3X
@@ -117,6 +139,60 @@ sc_influx       = 1
 sc_connected    = 1 << 1
 sc_disconnected = 1 << 2
 
+SSH_STREAM_RECV_SIZE        = 32768
+SSH_STREAM_DEFAULT_MAX_MB   = 256
+SSH_STREAM_TIMEOUT_EXITCODE = 124
+
+class ebSshStreamBuffer(object):
+    """
+    Bounded in-memory buffer used to drain the stdout/stderr of a remote
+    command while it is running. Once aMaxSize bytes are stored the oldest
+    chunks are dropped, so the tail of the output is always preserved.
+    """
+
+    def __init__(self, aMaxSize=None):
+        self.__chunks = collections.deque()
+        self.__size = 0
+        self.__dropped = 0
+        self.__maxsize = aMaxSize
+
+    def mAppend(self, aData):
+
+        if not aData:
+            return
+
+        self.__chunks.append(aData)
+        self.__size += len(aData)
+
+        if not self.__maxsize:
+            return
+
+        while self.__size > self.__maxsize and len(self.__chunks) > 1:
+            _chunk = self.__chunks.popleft()
+            self.__size -= len(_chunk)
+            self.__dropped += len(_chunk)
+
+        if self.__size > self.__maxsize:
+            _extra = self.__size - self.__maxsize
+            self.__chunks[0] = self.__chunks[0][_extra:]
+            self.__size -= _extra
+            self.__dropped += _extra
+
+    def mGetSize(self):
+        return self.__size
+
+    def mGetDroppedBytes(self):
+        return self.__dropped
+
+    def mIsTruncated(self):
+        return self.__dropped > 0
+
+    def mGetValue(self):
+        return b"".join(self.__chunks)
+
+    def mGetStream(self):
+        return wrapStrBytesFunctions(io.BytesIO(self.mGetValue()))
+
 def retry_decorator(func):
     """
     This decorator receive one function inside sshconn class as first argument
@@ -261,6 +337,7 @@ class sshconn(object):
         self.__sudo    = None
         self.__console_raw_output = ""
         self.__lastclient = None
+        self.__pooled = None
 
         if aOptions is not None:
             self.__debug   = aOptions.debug
@@ -343,6 +420,9 @@ class sshconn(object):
 
     def __del__(self):
 
+        if self.__pooled:
+            self.mReleasePooledTransport()
+
         if self.__transport:
             self.__transport.close()
             self.__transport = None
@@ -409,6 +489,68 @@ class sshconn(object):
     def mGetSSHClient(self):
         return self.__client
 
+    def mGetPooledTransport(self):
+        return self.__pooled
+
+    def mAttachPooledTransport(self):
+        """
+        Attach this connection to an authenticated transport of the process
+        wide pool, skipping handshake, ExaKms lookup and authentication.
+
+        :return: True if a pooled transport was attached
+        """
+
+        # Only key based connections are pooled
+        _fingerprint = ebSshKeyFingerprint(self.mGetExaKmsEntry())
+        if not _fingerprint:
+            return False
+
+        _pool = ebGetSshTransportPool()
+        _entry = _pool.mAcquire(self.__user, self.__host, _fingerprint)
+        if not _entry:
+            return False
+
+        self.__pooled = _entry
+        self.__client = _entry.mGetClient()
+        self.__transport = _entry.mGetTransport()
+        self.__state = sc_connected
+
+        ebLogTrace(f'*** SSH Connection to: {self.__user}@{self.__host} (pooled transport)')
+        return True
+
+    def mRegisterPooledTransport(self):
+
+        if self.__pooled or not self.mGetExaKmsEntry() or not self.__client:
+            return
+
+        _pool = ebGetSshTransportPool()
+        self.__pooled = _pool.mRegister(self.__user, self.__host, self.mGetExaKmsEntry(),
+                                        self.__client, self.__lastclient)
+        # The pool owns the client and the known_host helper from now on
+        self.__lastclient = None
+
+    def mReleasePooledTransport(self, aDiscard=False):
+
+        if not self.__pooled:
+            return
+
+        _entry = self.__pooled
+        self.__pooled = None
+        self.__client = None
+        self.__transport = None
+
+        ebGetSshTransportPool().mRelease(_entry, aDiscard=aDiscard)
+
+    def mChannelSlot(self):
+        """
+        Bound the concurrent channels opened over a pooled transport, no-op
+        for non pooled connections.
+        """
+
+        if self.__pooled:
+            return self.__pooled.mChannelSlot()
+        return contextlib.nullcontext()
+
     def mAddPreferredPubkeys(self, aExaKmsEntry, aCount):
 
         if aExaKmsEntry.mGetHostType() == ExaKmsHostType.SWITCH and (aCount%2 == 0):
@@ -619,6 +761,12 @@ class sshconn(object):
         if aTimeout is not None:
             _timeout = int(aTimeout)
 
+        #condition added for only CPS backup node connect
+        _remote_cps = get_gcontext().mCheckConfigOption('remote_cps_host')
+        _ociexacc = get_gcontext().mCheckConfigOption('ociexacc','True')
+        _isRemoteCps = _ociexacc and _remote_cps and \
+                       _remote_cps.split(".")[0] == self.__host.split(".")[0]
+
         # Fetch KMS key
         if not self.mGetExaKmsEntry():
 
@@ -641,9 +789,11 @@ class sshconn(object):
             if not self.mGetExaKmsEntry():
                 raise ExacloudRuntimeError(0x0701, 0xA, "SSH Key is required but not provided")
 
-        #condition added for only CPS backup node connect
-        _remote_cps = get_gcontext().mCheckConfigOption('remote_cps_host')
-        _ociexacc = get_gcontext().mCheckConfigOption('ociexacc','True')
+        # Reuse an authenticated transport of the process wide pool, once
+        # the key is known so that only a transport of the same key is used
+        if ebIsSshTransportPoolEnabled() and not _isRemoteCps:
+            if self.mAttachPooledTransport():
+                return True
 
         # check if its an exacc env and remote cps host name is not NONE before proceeding
         if _ociexacc and _remote_cps:
@@ -766,6 +916,9 @@ class sshconn(object):
                 self.__transport.set_keepalive(30)
                 self.__state = sc_connected
 
+                if ebIsSshTransportPoolEnabled() and not _isRemoteCps:
+                    self.mRegisterPooledTransport()
+
                 _retry = False
 
                 ebLogDebug("Connection Success")
@@ -1089,7 +1242,11 @@ class sshconn(object):
             raise
 
 
-    def mGenericRetry(self, aInsideLoopFx=None, aInsideLoopArgs=[], aInsideLoopKwargs={}):
+    def mGenericRetry(self, aInsideLoopFx=None, aInsideLoopArgs=[], aInsideLoopKwargs={}, aCanRetryFx=None):
+        """
+        aCanRetryFx: optional callable, the failure is raised without retry
+        when it returns False
+        """
 
         _count = 0
         _retry = True
@@ -1099,7 +1256,7 @@ class sshconn(object):
             try:
                 if _count >= self.__max_retries/2:
                     ebLogTrace("Retry connection ...")
-                    self.mDisconnect()
+                    self.mDisconnect(aDiscardPooled=True)
                     self.mConnect(aRetryStrategy=False)
                     self.__sftp = None
 
@@ -1107,7 +1264,7 @@ class sshconn(object):
 
             except Exception as e:
                 ebLogTrace('%s(%s%s): Exception:: %s : %s' % (aInsideLoopFx, aInsideLoopArgs, aInsideLoopKwargs, e.__class__, e))
-                if _count >= self.__max_retries:
+                if _count >= self.__max_retries or (aCanRetryFx and not aCanRetryFx()):
                     raise
                 else:
                     ebLogTrace("Retrying {0} in {1}s".format(aInsideLoopFx, _timewait))
@@ -1116,13 +1273,7 @@ class sshconn(object):
 
         return None
 
-    @retry_decorator
-    def mSimpleExecuteCmd(self, aCmd, aTimeout=None, aDecodeUtf8=False):
-        """
-        WARNING: This implementation works only for output of 2MB or less which is the default transport window size for linux systems.
-        If your command generates an output of size 2MB or greater consider using a different ssh mechanism or implementation.
-        For output of size equal to or more than 2MB, this method will hang if the timeout is not set. For calls where timeout is set, the output buffer will be incomplete.
-        """
+    def mMaskCmd(self, aCmd):
 
         _maskedCmd = aCmd
         if ("pass" in aCmd and not self.__debug and not "7pass" in aCmd) or \
@@ -1132,6 +1283,262 @@ class sshconn(object):
            "BEGIN PRIVATE KEY" in aCmd:
             _maskedCmd = "*"*10
 
+        return _maskedCmd
+
+    def mIsStreamingExecEnabled(self):
+        return get_gcontext().mCheckConfigOption('enable_ssh_streaming_exec') == 'True'
+
+    def mGetStreamMaxBufferSize(self):
+
+        _maxmb = get_gcontext().mCheckConfigOption('ssh_stream_max_buffer_mb')
+        try:
+            _maxmb = int(_maxmb) if _maxmb is not None else SSH_STREAM_DEFAULT_MAX_MB
+        except ValueError:
+            ebLogWarn(f"Invalid ssh_stream_max_buffer_mb value: {_maxmb}, using {SSH_STREAM_DEFAULT_MAX_MB}")
+            _maxmb = SSH_STREAM_DEFAULT_MAX_MB
+
+        if _maxmb <= 0:
+            return None
+
+        return _maxmb * 1024 * 1024
+
+    def __mExecOnChannel(self, aChannel, aCmd):
+
+        if get_gcontext().mCheckConfigOption('enable_multilanguage_support') == 'True':
+            aChannel.exec_command(f"export LANG=en_US.UTF-8;export NLS_LANG=AMERICAN_AMERICA.UTF8;{aCmd}")
+        else:
+            aChannel.exec_command(aCmd)
+
+    def __mDrainChannel(self, aChannel, aTimeout=None):
+        """
+        Generator that yields (aIsStderr, aChunk) tuples as soon as data is
+        available on the channel. It blocks on the channel file descriptor
+        (readable for both stdout and stderr) instead of polling, so the
+        remote side never stalls on a full transport window.
+
+        When the generator finishes, the exit status of the command is
+        stored and can be read with mGetCmdExitStatus. On timeout the channel
+        is closed and the exit status is set to SSH_STREAM_TIMEOUT_EXITCODE.
+        """
+
+        _deadline = None
+        if aTimeout:
+            _deadline = time.monotonic() + float(aTimeout)
+
+        _timedout = False
+
+        def _mExpired():
+            return _deadline is not None and time.monotonic() >= _deadline
+
+        while True:
+
+            # A command producing output without pause must still time out
+            while aChannel.recv_ready() and not _mExpired():
+                _data = aChannel.recv(SSH_STREAM_RECV_SIZE)
+                if not _data:
+                    break
+                yield False, _data
+
+            while aChannel.recv_stderr_ready() and not _mExpired():
+                _data = aChannel.recv_stderr(SSH_STREAM_RECV_SIZE)
+                if not _data:
+                    break
+                yield True, _data
+
+            if aChannel.exit_status_ready() and \
+               not aChannel.recv_ready() and \
+               not aChannel.recv_stderr_ready():
+                break
+
+            _wait = None
+            if _deadline is not None:
+                _wait = _deadline - time.monotonic()
+                if _wait <= 0:
+                    _timedout = True
+                    break
+
+            if aChannel.eof_received:
+                # Output streams are closed, only the exit status is pending
+                aChannel.status_event.wait(_wait)
+            else:
+                select.select([aChannel], [], [], _wait)
+
+        if _timedout:
+            self.__exit_status = SSH_STREAM_TIMEOUT_EXITCODE
+            aChannel.close()
+        else:
+            self.__exit_status = aChannel.recv_exit_status()
+
+    def __mOpenStreamChannel(self, aCmd):
+
+        _channel = self.__client.get_transport().open_session()
+        self.__mExecOnChannel(_channel, aCmd)
+        return _channel
+
+    def __mStreamExecuteCmd(self, aCmd, aMaskedCmd, aTimeout=None, aStdoutCallback=None,
+                            aStderrCallback=None, aMaxBufferSize=None, aDecodeUtf8=False):
+
+        if aMaxBufferSize is None:
+            aMaxBufferSize = self.mGetStreamMaxBufferSize()
+
+        _out = ebSshStreamBuffer(aMaxBufferSize)
+        _err = ebSshStreamBuffer(aMaxBufferSize)
+
+        _command_exec_time = time.time()
+
+        with self.mChannelSlot():
+            _channel = self.__mOpenStreamChannel(aCmd)
+            try:
+                for _isStderr, _data in self.__mDrainChannel(_channel, aTimeout):
+                    if _isStderr:
+                        _err.mAppend(_data)
+                        if aStderrCallback:
+                            aStderrCallback(_data)
+                    else:
+                        _out.mAppend(_data)
+                        if aStdoutCallback:
+                            aStdoutCallback(_data)
+            finally:
+                _channel.close()
+
+        _command_exec_time = time.time() - _command_exec_time
+        ebLogTrace("mStreamExecuteCmd :: Executed on {0} [RC:{1}] [TIME:{2:.4}] the command <+< {3} >+>".format(self.__host, self.__exit_status, _command_exec_time, aMaskedCmd))
+        self.mRecordCmdMetrics(aMaskedCmd, _command_exec_time)
+
+        if self.__exit_status == SSH_STREAM_TIMEOUT_EXITCODE:
+            ebLogTrace(f"mStreamExecuteCmd timeout of {aTimeout}s reached for command: {aMaskedCmd}")
+        elif self.__exit_status != os.EX_OK:
+            ebLogTrace(f"mStreamExecuteCmd failed for command: {aMaskedCmd}")
+
+        for _name, _buffer in (("stdout", _out), ("stderr", _err)):
+            if _buffer.mIsTruncated():
+                ebLogWarn(f"mStreamExecuteCmd :: {_name} of command on {self.__host} exceeded the buffer limit, {_buffer.mGetDroppedBytes()} leading bytes were dropped")
+
+        if aDecodeUtf8:
+            # Same str streams as mSimpleExecuteCmd, a truncated buffer may start mid character
+            return io.StringIO(""), io.StringIO(_out.mGetValue().decode("utf-8", errors='ignore')), \
+                   io.StringIO(_err.mGetValue().decode("utf-8", errors='ignore'))
+
+        return wrapStrBytesFunctions(io.BytesIO()), _out.mGetStream(), _err.mGetStream()
+
+    def mRecordCmdMetrics(self, aMaskedCmd, aSeconds):
+        """
+        Latency of a command per host and command family (core/Metrics.py)
+        """
+
+        if not ebMetricsEnabled():
+            return
+
+        _labels = {"host": ebMetricsHost(self.__host), "family": ebMetricsCommandFamily(aMaskedCmd)}
+        ebMetricsObserve("ssh_command_us", aSeconds * 1000000, _labels)
+        if self.__exit_status != os.EX_OK:
+            ebMetricsIncrement("ssh_command_failures", _labels)
+
+    def mRecordXferMetrics(self, aMethod, aSeconds, aBytes=None, aFilename=None):
+
+        if not ebMetricsEnabled():
+            return
+
+        if aBytes is None:
+            aBytes = os.path.getsize(aFilename) if aFilename and os.path.isfile(aFilename) else 0
+        if not aBytes:
+            return
+
+        _labels = {"host": ebMetricsHost(self.__host), "method": aMethod}
+        ebMetricsIncrement("sftp_bytes", _labels, aBytes)
+        ebMetricsObserve("sftp_bytes_per_sec", aBytes / max(aSeconds, 0.000001), _labels)
+
+    def mStreamExecuteCmd(self, aCmd, aTimeout=None, aStdoutCallback=None, aStderrCallback=None, aMaxBufferSize=None,
+                          aDecodeUtf8=False):
+        """
+        Event driven command execution. stdout and stderr are drained while
+        the command runs, so there is no output size ceiling.
+
+        A failure is retried (mGenericRetry) only until the first chunk is
+        handed to a callback, the output is never sent twice.
+
+        :param aCmd: command to execute in the remote shell.
+        :param aTimeout: seconds to wait for the command, None waits forever.
+        :param aStdoutCallback: optional callable receiving each stdout chunk (bytes).
+        :param aStderrCallback: optional callable receiving each stderr chunk (bytes).
+        :param aMaxBufferSize: bytes kept per stream, defaults to ssh_stream_max_buffer_mb.
+        :param aDecodeUtf8: return str streams (io.StringIO) like mSimpleExecuteCmd.
+        :return: a triple (in,out,err) of file like objects
+        """
+
+        _maskedCmd = self.mMaskCmd(aCmd)
+        ebLogTrace("mStreamExecuteCmd :: Executing on {0}: command <+< {1} >+>".format(self.__host, _maskedCmd))
+
+        _streamed = threading.Event()
+
+        def _mWrapCallback(aCallback):
+            if aCallback is None:
+                return None
+
+            def _mCallback(aData):
+                _streamed.set()
+                aCallback(aData)
+            return _mCallback
+
+        return self.mGenericRetry(self.__mStreamExecuteCmd,
+                                  [aCmd, _maskedCmd, aTimeout, _mWrapCallback(aStdoutCallback),
+                                   _mWrapCallback(aStderrCallback), aMaxBufferSize, aDecodeUtf8],
+                                  {}, aCanRetryFx=lambda: not _streamed.is_set())
+
+    def mIterExecuteCmd(self, aCmd, aTimeout=None, aDecodeUtf8=True):
+        """
+        Event driven command execution returning an iterator over the output
+        lines as they are produced by the remote command.
+
+        :param aCmd: command to execute in the remote shell.
+        :param aTimeout: seconds to wait for the command, None waits forever.
+        :param aDecodeUtf8: yield str lines instead of bytes.
+        :return: generator of (aIsStderr, aLine) tuples, lines keep their EOL.
+        """
+
+        if self.mGetUser() == "opc" and self.mGetSudo():
+            aCmd = "sudo " + aCmd
+
+        _maskedCmd = self.mMaskCmd(aCmd)
+        ebLogTrace("mIterExecuteCmd :: Executing on {0}: command <+< {1} >+>".format(self.__host, _maskedCmd))
+
+        _pending = {False: b"", True: b""}
+
+        def _mDecode(aLine):
+            if aDecodeUtf8:
+                return aLine.decode("utf-8", errors="ignore")
+            return aLine
+
+        with self.mChannelSlot():
+            _channel = self.__mOpenStreamChannel(aCmd)
+            try:
+                for _isStderr, _data in self.__mDrainChannel(_channel, aTimeout):
+                    _lines = (_pending[_isStderr] + _data).split(b"\n")
+                    _pending[_isStderr] = _lines.pop()
+                    for _line in _lines:
+                        yield _isStderr, _mDecode(_line + b"\n")
+
+                for _isStderr in (False, True):
+                    if _pending[_isStderr]:
+                        yield _isStderr, _mDecode(_pending[_isStderr])
+            finally:
+                _channel.close()
+
+        ebLogTrace("mIterExecuteCmd :: Executed on {0} [RC:{1}] the command <+< {2} >+>".format(self.__host, self.__exit_status, _maskedCmd))
+
+    @retry_decorator
+    def mSimpleExecuteCmd(self, aCmd, aTimeout=None, aDecodeUtf8=False):
+        """
+        WARNING: This implementation works only for output of 2MB or less which is the default transport window size for linux systems.
+        If your command generates an output of size 2MB or greater consider using a different ssh mechanism or implementation.
+        For output of size equal to or more than 2MB, this method will hang if the timeout is not set. For calls where timeout is set, the output buffer will be incomplete.
+
+        When 'enable_ssh_streaming_exec' is set to True, the execution is delegated to
+        mStreamExecuteCmd which does not have the 2MB limitation.
+        """
+
+        _maskedCmd = self.mMaskCmd(aCmd)
+
         ebLogTrace("mSimpleExecuteCmd :: Executing on {0}: command <+< {1} >+>".format(self.__host, _maskedCmd))
 
         if aDecodeUtf8 == True:
@@ -1140,74 +1547,126 @@ class sshconn(object):
             _err = ""
 
             _command_exec_time = time.time()
-            try:
+            with self.mChannelSlot():
+                try:
 
-                if get_gcontext().mCheckConfigOption('enable_multilanguage_support') == 'True':
-                    fin, fout, ferr = self.__client.exec_command(command=f"export LANG=en_US.UTF-8;export NLS_LANG=AMERICAN_AMERICA.UTF8;{aCmd}")
-                else:
-                    fin, fout, ferr = self.__client.exec_command(command=aCmd)
+                    if get_gcontext().mCheckConfigOption('enable_multilanguage_support') == 'True':
+                        fin, fout, ferr = self.__client.exec_command(command=f"export LANG=en_US.UTF-8;export NLS_LANG=AMERICAN_AMERICA.UTF8;{aCmd}")
+                    else:
+                        fin, fout, ferr = self.__client.exec_command(command=aCmd)
 
-                _err = ferr.read().decode("utf-8")
-                _out = fout.read().decode("utf-8", errors='ignore')
-                self.__exit_status = fout.channel.recv_exit_status()
+                    _err = ferr.read().decode("utf-8")
+                    _out = fout.read().decode("utf-8", errors='ignore')
+                    self.__exit_status = fout.channel.recv_exit_status()
 
-            except Exception as e:
-                ebLogError(f"mSimpleExecuteCmd Error : {e}")
+                except Exception as e:
+                    ebLogError(f"mSimpleExecuteCmd Error : {e}")
 
             _command_exec_time = time.time() - _command_exec_time
             ebLogTrace("mSimpleExecuteCmd :: Executed on {0} [RC:{1}] [TIME:{2:.4}] the command <+< {3} >+>".format(self.__host, self.__exit_status, _command_exec_time, _maskedCmd))
+            self.mRecordCmdMetrics(_maskedCmd, _command_exec_time)
 
             return io.StringIO(_in), io.StringIO(_out), io.StringIO(_err)
 
+        if self.mIsStreamingExecEnabled():
+            return self.__mStreamExecuteCmd(aCmd, _maskedCmd, aTimeout)
+
         _timeout = aTimeout
-        _channel = self.__client.get_transport().open_session()
-        if _timeout:
-            _channel.settimeout(_timeout)
 
-        _command_exec_time = time.time()
+        with self.mChannelSlot():
+            _channel = self.__client.get_transport().open_session()
+            if _timeout:
+                _channel.settimeout(_timeout)
 
-        if get_gcontext().mCheckConfigOption('enable_multilanguage_support') == 'True':
-            _channel.exec_command(f"export LANG=en_US.UTF-8;export NLS_LANG=AMERICAN_AMERICA.UTF8;{aCmd}")
-        else:
-            _channel.exec_command(aCmd)
+            _command_exec_time = time.time()
 
-        _i = _channel.makefile_stdin("wb")
-        _o = _channel.makefile("r")
-        _e = _channel.makefile_stderr("r")
+            if get_gcontext().mCheckConfigOption('enable_multilanguage_support') == 'True':
+                _channel.exec_command(f"export LANG=en_US.UTF-8;export NLS_LANG=AMERICAN_AMERICA.UTF8;{aCmd}")
+            else:
+                _channel.exec_command(aCmd)
 
-        if _timeout:
-            _initial_time = time.time()
-            while True:
-                _elapsed_time = time.time() - _initial_time
+            _i = _channel.makefile_stdin("wb")
+            _o = _channel.makefile("r")
+            _e = _channel.makefile_stderr("r")
 
-                if _channel.exit_status_ready():
-                    self.__exit_status = _channel.recv_exit_status()
-                    break
+            if _timeout:
+                _initial_time = time.time()
+                while True:
+                    _elapsed_time = time.time() - _initial_time
 
-                if _timeout < _elapsed_time:
-                    self.__exit_status = 124
-                    break
+                    if _channel.exit_status_ready():
+                        self.__exit_status = _channel.recv_exit_status()
+                        break
 
-                time.sleep(0.05)
-        else:
-            while not _channel.exit_status_ready():
-                time.sleep(0.05)
+                    if _timeout < _elapsed_time:
+                        self.__exit_status = 124
+                        break
 
-        if _channel.exit_status_ready():
-            self.__exit_status = _channel.recv_exit_status()
+                    time.sleep(0.05)
+            else:
+                while not _channel.exit_status_ready():
+                    time.sleep(0.05)
+
+            if _channel.exit_status_ready():
+                self.__exit_status = _channel.recv_exit_status()
+
+            if self.__pooled:
+                # The slot bounds the open channels of the pooled transport:
+                # the channel is closed before the slot is released
+                return self.__mDrainExitedChannel(_channel, _maskedCmd, _command_exec_time)
 
         _command_exec_time = time.time() - _command_exec_time
 
         ebLogTrace("mSimpleExecuteCmd :: Executed on {0} [RC:{1}] [TIME:{2:.4}] the command <+< {3} >+>".format(self.__host, self.__exit_status, _command_exec_time, _maskedCmd))
+        self.mRecordCmdMetrics(_maskedCmd, _command_exec_time)
         if self.__exit_status != os.EX_OK:
             ebLogTrace(f"mSimpleExecuteCmd failed for command: {_maskedCmd}")
 
         return (wrapStrBytesFunctions(stream) for stream in (_i, _o, _e))
 
+    def __mDrainExitedChannel(self, aChannel, aMaskedCmd, aStartTime):
+        """
+        Read the output already received for a command that exited (or timed
+        out) and close its channel, return the (in, out, err) streams.
+        """
+
+        _out = ebSshStreamBuffer()
+        _err = ebSshStreamBuffer()
+        try:
+            _received = True
+            while _received:
+                _received = False
+                while aChannel.recv_ready():
+                    _data = aChannel.recv(SSH_STREAM_RECV_SIZE)
+                    if not _data:
+                        break
+                    _out.mAppend(_data)
+                    _received = True
+                while aChannel.recv_stderr_ready():
+                    _data = aChannel.recv_stderr(SSH_STREAM_RECV_SIZE)
+                    if not _data:
+                        break
+                    _err.mAppend(_data)
+                    _received = True
+        finally:
+            aChannel.close()
+
+        _command_exec_time = time.time() - aStartTime
+        ebLogTrace(f"mSimpleExecuteCmd :: Executed on {self.__host} [RC:{self.__exit_status}] [TIME:{_command_exec_time:.4}] the command <+< {aMaskedCmd} >+>")
+        self.mRecordCmdMetrics(aMaskedCmd, _command_exec_time)
+        if self.__exit_status != os.EX_OK:
+            ebLogTrace(f"mSimpleExecuteCmd failed for command: {aMaskedCmd}")
+
+        return wrapStrBytesFunctions(io.BytesIO()), _out.mGetStream(), _err.mGetStream()
+
     @ebRecordReplay.mRecordReplayWrapper
-    def mExecuteCmd(self, aCmd, aCurrDir=None, aStdIn=PIPE, aStdOut=PIPE, aStdErr=PIPE, aTimeout=None, aDecodeUtf8=False):
+    def mExecuteCmd(self, aCmd, aCurrDir=None, aStdIn=PIPE, aStdOut=PIPE, aStdErr=PIPE, aTimeout=None, aDecodeUtf8=False,
+                    aStdoutCallback=None, aStderrCallback=None, aStream=False):
         """
         :param aCmd: string containing the command line to execute in the remote shell
+        :param aStdoutCallback: optional callable receiving stdout chunks while the command runs
+        :param aStderrCallback: optional callable receiving stderr chunks while the command runs
+        :param aStream: use the event driven execution (implied by the callbacks)
         :return: a triple (in,out,err) of filedescriptor
         """
 
@@ -1216,6 +1675,9 @@ class sshconn(object):
             aCmd = "sudo " + aCmd
 
         if self.__client and aCmd:
+            if aStream or aStdoutCallback or aStderrCallback:
+                return self.mStreamExecuteCmd(aCmd, aTimeout, aStdoutCallback, aStderrCallback,
+                                              aDecodeUtf8=_decodeutf8)
             return self.mSimpleExecuteCmd(aCmd, aTimeout, aDecodeUtf8=_decodeutf8)
         else:
             return None, None, None
@@ -1372,11 +1834,20 @@ class sshconn(object):
            # is owned by non-opc user.
            aRemotePath = "/tmp/" + basename
 
+        if ebIsSftpXferEnabled():
+            # Parallel SFTP over the open transport, /tmp staging of opc included.
+            # Already retried by mCopyFile
+            self.__mTransferFiles([(aFilename, _path)])
+            return
+
+        _xfer_time = time.time()
+
         if not self.mGetExaKmsEntry() or get_gcontext().mCheckConfigOption('disable_scpx') == 'True':
             if not self.__sftp:
                 self.__sftp = self.__client.open_sftp()
             self.xferdone = False
             rc = self.__sftp.put(aFilename, aRemotePath, self.mCallbackSFTP)
+            self.mRecordXferMetrics("sftp", time.time() - _xfer_time, aFilename=aFilename)
         else:
             # SCPX
             if not os.path.isdir('.ssh'):
@@ -1385,8 +1856,9 @@ class sshconn(object):
 
             _valid_host = validate_hostname(self.__host)
             if _valid_host:
-                _ret = ping_host(self.__host)
-                if not _ret:
+                # No need to ping a host answering on the connected transport
+                _transport = self.__client.get_transport()
+                if not (_transport and _transport.is_active()) and not ping_host(self.__host):
                     raise ExacloudRuntimeError(0x0766, 0xA, "Ping failed for the hostname")
             else:
                 raise ExacloudRuntimeError(0x0766, 0xA, "Failed in validating the hostname")
@@ -1424,6 +1896,8 @@ class sshconn(object):
                 ebLogError(f"_std_out: {_std_out}, _std_err: {_std_err}, _rc: {_rc}")
                 raise ExacloudRuntimeError(0x0701, 0xA, "Something wrong happened while in FTL")
 
+            self.mRecordXferMetrics("scp", time.time() - _xfer_time, aFilename=aFilename)
+
         if self.mGetUser() == "opc":
             # Move the file from /tmp to the desired location.
             _tempfile = "/tmp/" + basename
@@ -1431,6 +1905,59 @@ class sshconn(object):
                 ebLogWarn("*** Moving {0} to {1}".format(_tempfile, _path))
                 self.mExecuteCmdLog("mv " + _tempfile  + " " + _path)
 
+    def mRemoteExec(self, aCmd):
+        """
+        Run aCmd and return (exit status, stdout) for the transfer engine
+        """
+
+        _i, _o, _e = self.mExecuteCmd(aCmd)
+        _out = _o.read() if _o else ""
+        return self.mGetCmdExitStatus(), _out
+
+    @retry_decorator
+    def mTransferFiles(self, aFiles, aResume=True, aVerify=True):
+        """
+        Copy several files over parallel SFTP channels of this connection.
+        A retry resumes the files left partially transferred.
+
+        :param aFiles: list of (local path, remote path)
+        :return: dict remote path -> sha256, verified remotely when aVerify
+        """
+
+        return self.__mTransferFiles(aFiles, aResume, aVerify)
+
+    def __mTransferFiles(self, aFiles, aResume=True, aVerify=True):
+
+        if not self.__client or not aFiles:
+            return {}
+
+        _files = []
+        _moves = []
+        for _local, _remote in aFiles:
+            _basename = os.path.basename(_local)
+            _remote = _remote or './' + _basename
+            if self.mGetUser() == "opc":
+                # See mCopyFile, opc can only write in /tmp
+                _tmp = "/tmp/" + _basename
+                _files.append((_local, _tmp))
+                if _tmp != _remote:
+                    _moves.append((_tmp, _remote))
+            else:
+                _files.append((_local, _remote))
+
+        _engine = ebSftpTransfer(self.__client.open_sftp, self.mRemoteExec, aResume=aResume, aVerify=aVerify)
+        _xfer_time = time.time()
+        _digests = _engine.mTransfer(_files)
+        ebLogTrace(f'*** SFTP XFER to {self.__host} done: {_engine.mGetStats()}')
+        self.mRecordXferMetrics("engine", time.time() - _xfer_time, aBytes=_engine.mGetStats()["bytes"])
+
+        for _tmp, _remote in _moves:
+            ebLogWarn(f"*** Moving {_tmp} to {_remote}")
+            self.mExecuteCmdLog("mv " + _tmp + " " + _remote)
+            _digests[_remote] = _digests.pop(_tmp)
+
+        return _digests
+
     @retry_decorator
     @ebRecordReplay.mRecordReplayWrapper
     def mCopy2Local(self, aRemotePath, aLocalPath=None):
@@ -1514,7 +2041,7 @@ class sshconn(object):
         self.__chan = self.__client.invoke_shell()
 
     @ebRecordReplay.mRecordReplayWrapper
-    def mDisconnect(self):
+    def mDisconnect(self, aDiscardPooled=False):
 
         self.__state = sc_influx
 
@@ -1526,6 +2053,17 @@ class sshconn(object):
             self.__chan.close()
             self.__chan = None
 
+        # Pooled transports are handed back to the pool instead of closed
+        if self.__pooled:
+
+            if self.__sftp:
+                self.__sftp.close()
+                self.__sftp = None
+
+            self.mReleasePooledTransport(aDiscard=aDiscardPooled)
+            self.__state = sc_disconnected
+            return
+
         if self.__client:
             self.__client.close()
             self.__client = None
@@ -1758,6 +2296,9 @@ def ping_host(aHost, aCount=4):
     _host = aHost
     _count = aCount
 
+    if ebIsPingProberEnabled():
+        return ebReachabilityProber().mIsReachable(_host, aCount=_count)
+
     _cmd_list = ["/bin/ping", "-c", "1"]
     _cmd_list.append(_host)
 
@@ -0,0 +1,405 @@
+#!/bin/python
+#
+# $Header: ecs/exacloud/exabox/network/osds/sshpool.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# sshpool.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      sshpool.py - Process wide pool of authenticated SSH transports
+#
+#    DESCRIPTION
+#      Keeps authenticated paramiko transports keyed by user@host and key
+#      fingerprint, so every thread of the process can open exec/sftp
+#      channels over an already negotiated connection instead of running a
+#      new handshake, ExaKms lookup and authentication per exaBoxNode.
+#
+#    NOTES
+#      Enabled with 'ssh_transport_pool_enabled': 'True'. Tunables:
+#        ssh_pool_max_transports            total pooled transports (LRU)
+#        ssh_pool_max_transports_per_host   transports opened per user@host
+#        ssh_pool_max_channels              concurrent channels per transport,
+#                                           keep it below sshd MaxSessions
+#        ssh_pool_channel_wait_sec          wait for a free channel before
+#                                           the command fails
+#        ssh_pool_idle_ttl_sec              idle time before eviction
+#        ssh_pool_keepalive_sec             transport keepalive interval
+#        ssh_pool_probe_after_sec           idle time before a health probe
+#
+#      The pool belongs to the process that created it; a forked child gets
+#      a new empty pool and never touches the sockets of the parent.
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#    jydas       10/18/26 - Exact host match in mCloseConnections
+#    jydas       10/18/26 - Fail instead of exceeding the channel cap
+#
+
+import os
+import time
+import hashlib
+import threading
+import collections
+from contextlib import contextmanager
+
+from exabox.core.Context import get_gcontext
+from exabox.core.Error import ExacloudRuntimeError
+from exabox.log.LogMgr import ebLogTrace, ebLogWarn
+
+SSH_POOL_MAX_TRANSPORTS          = 64
+SSH_POOL_MAX_TRANSPORTS_PER_HOST = 4
+SSH_POOL_MAX_CHANNELS            = 8
+SSH_POOL_IDLE_TTL_SEC            = 300
+SSH_POOL_KEEPALIVE_SEC           = 30
+SSH_POOL_PROBE_AFTER_SEC         = 60
+SSH_POOL_CHANNEL_WAIT_SEC        = 300
+
+def ebSshKeyFingerprint(aExaKmsEntry):
+    """
+    Return a short fingerprint identifying the private key of an ExaKms
+    entry, or None when there is no entry (password based login).
+    """
+
+    if aExaKmsEntry is None:
+        return None
+
+    try:
+        _privkey = aExaKmsEntry.mGetPrivateKey()
+    except Exception:
+        return None
+
+    if not _privkey:
+        return None
+
+    return hashlib.sha256(_privkey.encode("utf-8")).hexdigest()[:32]
+
+
+class ebSshPooledTransport(object):
+
+    def __init__(self, aKey, aFingerprint, aClient, aSshClientHelper, aExaKmsEntry, aMaxChannels,
+                 aChannelWait=SSH_POOL_CHANNEL_WAIT_SEC):
+
+        self.__key = aKey
+        self.__fingerprint = aFingerprint
+        self.__client = aClient
+        self.__helper = aSshClientHelper
+        self.__exakmsEntry = aExaKmsEntry
+        self.__channels = threading.BoundedSemaphore(aMaxChannels)
+        self.__channel_wait = aChannelWait
+        self.__borrowers = 0
+        self.__lastused = time.monotonic()
+        self.__closed = False
+
+    def mGetKey(self):
+        return self.__key
+
+    def mGetFingerprint(self):
+        return self.__fingerprint
+
+    def mGetClient(self):
+        return self.__client
+
+    def mGetTransport(self):
+        if self.__client:
+            return self.__client.get_transport()
+        return None
+
+    def mGetExaKmsEntry(self):
+        return self.__exakmsEntry
+
+    def mGetBorrowers(self):
+        return self.__borrowers
+
+    def mGetIdleTime(self):
+        return time.monotonic() - self.__lastused
+
+    def mIsClosed(self):
+        return self.__closed
+
+    def mBorrow(self):
+        self.__borrowers += 1
+        self.__lastused = time.monotonic()
+
+    def mRelease(self):
+        self.__borrowers = max(0, self.__borrowers - 1)
+        self.__lastused = time.monotonic()
+
+    def mIsActive(self, aProbe=False):
+
+        if self.__closed:
+            return False
+
+        try:
+            _transport = self.mGetTransport()
+            if not _transport or not _transport.is_active():
+                return False
+            if aProbe:
+                _transport.send_ignore()
+        except Exception as e:
+            ebLogTrace(f"SSH pool health check failed for {self.__key}: {e}")
+            return False
+
+        return True
+
+    @contextmanager
+    def mChannelSlot(self):
+        """
+        Context manager bounding the number of concurrent channels opened over
+        this transport. The cap is never exceeded: raise ExacloudRuntimeError
+        when no channel is freed within ssh_pool_channel_wait_sec.
+        """
+
+        if not self.__channels.acquire(timeout=self.__channel_wait):
+            _msg = f"SSH pool: no free channel on {self.__key} after {self.__channel_wait}s"
+            ebLogWarn(_msg)
+            raise ExacloudRuntimeError(0x0701, 0xA, _msg)
+        try:
+            yield
+        finally:
+            self.__channels.release()
+
+    def mClose(self):
+
+        if self.__closed:
+            return
+
+        self.__closed = True
+        try:
+            if self.__client:
+                self.__client.close()
+        except Exception as e:
+            ebLogTrace(f"SSH pool: error closing {self.__key}: {e}")
+
+        if self.__helper:
+            self.__helper.mCleanUp()
+
+        self.__client = None
+        self.__helper = None
+
+
+class ebSshTransportPool(object):
+
+    def __init__(self, aMaxTransports=SSH_POOL_MAX_TRANSPORTS,
+                 aMaxTransportsPerHost=SSH_POOL_MAX_TRANSPORTS_PER_HOST,
+                 aMaxChannels=SSH_POOL_MAX_CHANNELS,
+                 aIdleTTL=SSH_POOL_IDLE_TTL_SEC,
+                 aKeepAlive=SSH_POOL_KEEPALIVE_SEC,
+                 aProbeAfter=SSH_POOL_PROBE_AFTER_SEC,
+                 aChannelWait=SSH_POOL_CHANNEL_WAIT_SEC):
+
+        self.__pid = os.getpid()
+        self.__lock = threading.RLock()
+        # user@host -> list of ebSshPooledTransport, ordered by last use (LRU first)
+        self.__entries = collections.OrderedDict()
+        self.__max_transports = aMaxTransports
+        self.__max_per_host = aMaxTransportsPerHost
+        self.__max_channels = aMaxChannels
+        self.__idle_ttl = aIdleTTL
+        self.__keepalive = aKeepAlive
+        self.__probe_after = aProbeAfter
+        self.__channel_wait = aChannelWait
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def mGetPid(self):
+        return self.__pid
+
+    def mGetKeepAlive(self):
+        return self.__keepalive
+
+    def mGetStats(self):
+        with self.__lock:
+            _stats = dict(self.__stats)
+            _stats["transports"] = self.mGetSize()
+            return _stats
+
+    def mGetSize(self):
+        with self.__lock:
+            return sum(len(_list) for _list in self.__entries.values())
+
+    @staticmethod
+    def mBuildKey(aUser, aHost):
+        return f"{aUser}@{aHost}"
+
+    def mAcquire(self, aUser, aHost, aFingerprint=None):
+        """
+        Borrow a healthy pooled transport for aUser@aHost. If aFingerprint is
+        given only transports authenticated with that key are considered.
+
+        :return: ebSshPooledTransport or None if a new connection is needed
+        """
+
+        _key = self.mBuildKey(aUser, aHost)
+
+        with self.__lock:
+
+            self.mEvictIdle()
+
+            _candidates = []
+            for _entry in list(self.__entries.get(_key, [])):
+                if aFingerprint and _entry.mGetFingerprint() != aFingerprint:
+                    continue
+                _probe = _entry.mGetIdleTime() > self.__probe_after
+                if not _entry.mIsActive(aProbe=_probe):
+                    self.mInvalidate(_entry)
+                    continue
+                _candidates.append(_entry)
+
+            if not _candidates:
+                self.__stats["misses"] += 1
+                return None
+
+            _entry = min(_candidates, key=lambda _e: _e.mGetBorrowers())
+
+            # Every transport is saturated, open a new one while the host cap allows it
+            if _entry.mGetBorrowers() >= self.__max_channels and \
+               len(self.__entries.get(_key, [])) < self.__max_per_host:
+                self.__stats["misses"] += 1
+                return None
+
+            _entry.mBorrow()
+            self.__entries.move_to_end(_key)
+            self.__stats["hits"] += 1
+            ebLogTrace(f"SSH pool: reusing transport for {_key} (borrowers: {_entry.mGetBorrowers()})")
+            return _entry
+
+    def mRegister(self, aUser, aHost, aExaKmsEntry, aClient, aSshClientHelper=None):
+        """
+        Add a freshly authenticated client to the pool. The pool takes the
+        ownership of aClient/aSshClientHelper, the returned entry is already
+        borrowed by the caller.
+        """
+
+        _key = self.mBuildKey(aUser, aHost)
+        _entry = ebSshPooledTransport(_key, ebSshKeyFingerprint(aExaKmsEntry), aClient,
+                                      aSshClientHelper, aExaKmsEntry, self.__max_channels,
+                                      self.__channel_wait)
+        _entry.mBorrow()
+
+        try:
+            _transport = aClient.get_transport()
+            if _transport and self.__keepalive:
+                _transport.set_keepalive(self.__keepalive)
+        except Exception as e:
+            ebLogTrace(f"SSH pool: could not set keepalive on {_key}: {e}")
+
+        with self.__lock:
+            self.__entries.setdefault(_key, []).append(_entry)
+            self.__entries.move_to_end(_key)
+            self.mEvictIdle()
+            self.mEvictLRU()
+
+        ebLogTrace(f"SSH pool: registered transport for {_key}")
+        return _entry
+
+    def mRelease(self, aEntry, aDiscard=False):
+
+        with self.__lock:
+            aEntry.mRelease()
+            _pooled = aEntry in self.__entries.get(aEntry.mGetKey(), [])
+            if aDiscard or not _pooled or not aEntry.mIsActive():
+                self.mInvalidate(aEntry)
+            else:
+                self.mEvictIdle()
+
+    def mInvalidate(self, aEntry):
+
+        with self.__lock:
+            _list = self.__entries.get(aEntry.mGetKey(), [])
+            if aEntry in _list:
+                _list.remove(aEntry)
+                self.__stats["invalidations"] += 1
+            if not _list:
+                self.__entries.pop(aEntry.mGetKey(), None)
+
+        if aEntry.mGetBorrowers() == 0:
+            aEntry.mClose()
+
+    def mEvictIdle(self):
+
+        with self.__lock:
+            for _key in list(self.__entries.keys()):
+                for _entry in list(self.__entries[_key]):
+                    if _entry.mGetBorrowers() == 0 and _entry.mGetIdleTime() > self.__idle_ttl:
+                        ebLogTrace(f"SSH pool: evicting idle transport {_key}")
+                        self.__entries[_key].remove(_entry)
+                        self.__stats["evictions"] += 1
+                        _entry.mClose()
+                if not self.__entries[_key]:
+                    del self.__entries[_key]
+
+    def mEvictLRU(self):
+
+        with self.__lock:
+            for _key in list(self.__entries.keys()):
+                if self.mGetSize() <= self.__max_transports:
+                    return
+                for _entry in list(self.__entries[_key]):
+                    if _entry.mGetBorrowers() == 0:
+                        ebLogTrace(f"SSH pool: evicting LRU transport {_key}")
+                        self.__entries[_key].remove(_entry)
+                        self.__stats["evictions"] += 1
+                        _entry.mClose()
+                if not self.__entries[_key]:
+                    del self.__entries[_key]
+
+    def mCloseConnections(self, aHost=None):
+        """
+        Close the idle pooled transports, all of them or only the ones of aHost.
+        Borrowed transports are closed when their last borrower releases them.
+        """
+
+        with self.__lock:
+            for _key in list(self.__entries.keys()):
+                # Keys are user@host, the host has to match exactly
+                if aHost and _key.partition("@")[2] != aHost:
+                    continue
+                for _entry in list(self.__entries[_key]):
+                    self.mInvalidate(_entry)
+
+
+_gSshTransportPool = None
+_gSshTransportPoolLock = threading.Lock()
+# Pools of the parent left behind by a fork. Garbage collecting them would
+# close paramiko transports still carrying the parent's SSH sessions
+_gSshInheritedPools = []
+
+def ebIsSshTransportPoolEnabled():
+    return get_gcontext().mCheckConfigOption('ssh_transport_pool_enabled') == 'True'
+
+def ebGetSshTransportPool():
+    """
+    Return the SSH transport pool of the current process, creating it on the
+    first call (and after a fork) from the ssh_pool_* config options.
+    """
+
+    global _gSshTransportPool
+
+    with _gSshTransportPoolLock:
+
+        if _gSshTransportPool is not None and _gSshTransportPool.mGetPid() == os.getpid():
+            return _gSshTransportPool
+
+        if _gSshTransportPool is not None:
+            _gSshInheritedPools.append(_gSshTransportPool)
+
+        def _mIntOption(aName, aDefault):
+            _value = get_gcontext().mCheckConfigOption(aName)
+            try:
+                return int(_value) if _value is not None else aDefault
+            except ValueError:
+                ebLogWarn(f"Invalid value for {aName}: {_value}, using {aDefault}")
+                return aDefault
+
+        _gSshTransportPool = ebSshTransportPool(
+            aMaxTransports=_mIntOption('ssh_pool_max_transports', SSH_POOL_MAX_TRANSPORTS),
+            aMaxTransportsPerHost=_mIntOption('ssh_pool_max_transports_per_host', SSH_POOL_MAX_TRANSPORTS_PER_HOST),
+            aMaxChannels=_mIntOption('ssh_pool_max_channels', SSH_POOL_MAX_CHANNELS),
+            aIdleTTL=_mIntOption('ssh_pool_idle_ttl_sec', SSH_POOL_IDLE_TTL_SEC),
+            aKeepAlive=_mIntOption('ssh_pool_keepalive_sec', SSH_POOL_KEEPALIVE_SEC),
+            aProbeAfter=_mIntOption('ssh_pool_probe_after_sec', SSH_POOL_PROBE_AFTER_SEC),
+            aChannelWait=_mIntOption('ssh_pool_channel_wait_sec', SSH_POOL_CHANNEL_WAIT_SEC))
+
+        return _gSshTransportPool
+
+# end of file
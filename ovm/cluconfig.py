@@ -15,6 +15,10 @@ NOTE:
 History:
 
     MODIFIED   (MM/DD/YY)
+       jydas    10/18/26 - Hostname index for mGetMachineConfig
+       jydas    10/18/26 - Bump the topology generation in the host and
+                           network setters, hostname index for
+                           mGetNetworkConfigByName
        mpedapro 11/17/25 - Enh::38235082 xml patching changes for sriov
        pbellary 10/02/25 - Bug 38426506 - X11M-Z: CREATE VM CLUSTER FAILS CREATE VM CAUSED BY WRONG EXACLOUD/OEDA STEPS MAPPING
        ajayasin 05/13/25 - 37673251: log optimization
@@ -57,6 +61,7 @@ from typing import Optional
 from exabox.core.Context import get_gcontext
 from exabox.core.Error import ebError, ExacloudRuntimeError
 from exabox.log.LogMgr import ebLogError, ebLogInfo, ebLogWarn, ebLogDebug, ebLogVerbose,ebLogTrace
+from exabox.ovm.clutopology import ebTopologyChanged
 
 MAX_CLU_NAME_LEN = 11
 
@@ -240,6 +245,7 @@ class ebCluMachineConfig(object):
     #
     def mSetMacHostName(self,aHostName):
         self.__hostname.text = aHostName
+        ebTopologyChanged()
 
     def mSetMacType(self,aType):
         self.__Type=aType
@@ -293,6 +299,7 @@ class ebCluMachineConfig(object):
                 _network = net
         if _network is not None:
             self.__config.find('networks').remove(_network)
+            ebTopologyChanged()
         else:
             ebLogWarn('Network Element not found: ' + aNetworkId)
 
@@ -435,10 +442,17 @@ class ebCluMachinesConfig(object):
         self.__config = aConfig
         machines = aConfig.mGetConfigElement('machines')
         self.__mac_list = {}
+        # hostname -> machine id, rebuilt when a lookup does not match
+        self.__hostname_index = {}
         for machine in machines:
             mac = ebCluMachineConfig(machine)
             self.__mac_list[mac.mGetMacId()] = mac
 
+    def mBuildHostnameIndex(self):
+        self.__hostname_index = {}
+        for _mac_id, _mac in self.__mac_list.items():
+            self.__hostname_index.setdefault(_mac.mGetMacHostName(), _mac_id)
+
     def mGetMachineConfig(self, aMachineId):
         if not aMachineId:
             return None
@@ -450,13 +464,17 @@ class ebCluMachinesConfig(object):
             except:
                 #
                 # If aMachineId does not end with _id
-                # Go through all machine element and check if hostname matches.
+                # Look for a machine element whose hostname matches.
+                # Hostnames can be changed in place, a hit is checked and a
+                # miss rebuilds the index once.
                 #
                 if aMachineId[-3:] != '_id':
-                    for _mac in list(self.__mac_list.keys()):
-                        _mac_hostname = self.__mac_list[_mac].mGetMacHostName()
-                        if  _mac_hostname == aMachineId:
-                            return self.__mac_list[_mac]
+                    for _rebuild in (False, True):
+                        if _rebuild:
+                            self.mBuildHostnameIndex()
+                        _mac = self.__mac_list.get(self.__hostname_index.get(aMachineId))
+                        if _mac is not None and _mac.mGetMacHostName() == aMachineId:
+                            return _mac
                 return None
 
     def mGetMachineConfigList(self):
@@ -489,6 +507,7 @@ class ebCluMachinesConfig(object):
                 ebLogInfo("removing machine %s from machines/machine" % (_machine.get('id')))
                 _machines.remove(_machine)
                 del self.__mac_list[_machine.get('id')]
+                ebTopologyChanged()
 
     def mDumpConfig(self, aMachineId=None):
 
@@ -508,6 +527,7 @@ class ebCluMachinesConfig(object):
               _mach = 'machines' + '/' + _machine.get('id')[:-3] + '/' + 'networks'
               ebLogInfo("*** append machine %s from machines/machine " % (_machine.get('id')))
               _machine = _machine.find('networks').append(_network)
+      ebTopologyChanged()
 
 #
 # DR VIP config
@@ -679,6 +699,7 @@ class ebCluClusterConfig(object):
                 self.__config.find('diskGroups').remove(_dg)
                 break
         self.__clusterDGroups.remove(aDiskGroup)
+        ebTopologyChanged()
 
     def mGetCluId(self):
         return self.__cluster_id
@@ -763,6 +784,7 @@ class ebCluClusterConfig(object):
 
         # Remove it from the XML file
         self.__config.find('diskGroups').remove(_cdg)
+        ebTopologyChanged()
 
     def mAddCluDiskGroupConfig(self, aDg):
 
@@ -775,6 +797,7 @@ class ebCluClusterConfig(object):
 
         _cluDiskGroups.append(_sparseDg)
         self.__clusterDGroups.append(aDg)
+        ebTopologyChanged()
 
     def mDumpConfig(self):
 
@@ -1493,6 +1516,7 @@ class ebCluNetworkConfig(object):
 
     def mSetNetId(self, aId):
         self.__config.set('id', aId)
+        ebTopologyChanged()
 
     def mSetNetGateWay(self, aGateWay):
         if self.__netGateWay is not None:
@@ -1514,6 +1538,7 @@ class ebCluNetworkConfig(object):
             ip.text = aAddr
             self.__netIpAddr = ip
             self.__config.append(ip)
+        ebTopologyChanged()
 
     def mSetNetMask(self, aMask):
         if aMask.find('/') != -1:
@@ -1528,12 +1553,15 @@ class ebCluNetworkConfig(object):
             netMask.text = aMask
             self.__netMask = netMask
             self.__config.append(netMask)
+        ebTopologyChanged()
 
     def mSetNetHostName(self, aHostName):
         self.__netHostName.text = aHostName
+        ebTopologyChanged()
 
     def mSetNetDomainName(self, aDomainName):
         self.__domainName.text = aDomainName
+        ebTopologyChanged()
 
     def mSetNetSlave(self, aSlave):
         self.__netSlave.text = aSlave
@@ -1557,9 +1585,11 @@ class ebCluNetworkConfig(object):
     #
     def mSetNatHostName(self, aHostName):
         self.__netNatHostName.text = aHostName
+        ebTopologyChanged()
 
     def mSetNatDomainName(self, aDomainName):
         self.__netNatDomainName.text = aDomainName
+        ebTopologyChanged()
 
     def mSetNatMask(self, aMask):
         if self.__netNatMask is None:
@@ -1569,6 +1599,7 @@ class ebCluNetworkConfig(object):
 
     def mSetNatAddr(self, aAddr):
         self.__netNatAddr.text = aAddr
+        ebTopologyChanged()
 
     def mSetMacAddr(self, aMac):
         self.__macAddr.text = aMac
@@ -1602,11 +1633,20 @@ class ebCluNetworksConfig(object):
         self.__config = aConfig
 
         self.__net_list = {}
+        # hostname and fqdn -> network id, rebuilt when a lookup does not match
+        self.__hostname_index = {}
 
         for net in networks:
             neto = ebCluNetworkConfig(net)
             self.__net_list[neto.mGetNetId()] = neto
 
+    def mBuildHostnameIndex(self):
+        self.__hostname_index = {}
+        for _key, _neto in self.__net_list.items():
+            _host = _neto.mGetNetHostName()
+            self.__hostname_index.setdefault(_host, _key)
+            self.__hostname_index.setdefault(_host+'.'+_neto.mGetNetDomainName(), _key)
+
     def mDumpConfig(self):
 
         for netId in list(self.__net_list.keys()):
@@ -1633,11 +1673,17 @@ class ebCluNetworksConfig(object):
 
     def mGetNetworkConfigByName(self, aHostname):
 
-        for _key in list(self.__net_list.keys()):
-            _host = self.__net_list[ _key ].mGetNetHostName()
-            _dom  = self.__net_list[ _key ].mGetNetDomainName()
-            if aHostname == _host or (aHostname == _host+'.'+_dom):
-                return self.__net_list[ _key ]
+        # Hostnames can be changed in place, a hit is checked and a miss
+        # rebuilds the index once
+        for _rebuild in (False, True):
+            if _rebuild:
+                self.mBuildHostnameIndex()
+            _neto = self.__net_list.get(self.__hostname_index.get(aHostname))
+            if _neto is None:
+                continue
+            _host = _neto.mGetNetHostName()
+            if aHostname == _host or (aHostname == _host+'.'+_neto.mGetNetDomainName()):
+                return _neto
 
     def mDumpNetworkConfig(self, aNetworkId):
 
@@ -1656,6 +1702,7 @@ class ebCluNetworksConfig(object):
                 ebLogInfo("Removing network information %s from networks/network" % (_id))
                 _networks.remove(_net)
                 del self.__net_list[_id]
+                ebTopologyChanged()
 
     def mSetNetworkConfigV6(self, aClusterName, aNetDict):
       _network = etree.Element('network')
@@ -1672,6 +1719,7 @@ class ebCluNetworksConfig(object):
       etree.SubElement(_network,'master').text = 'bondeth0'
       etree.SubElement(_network,'slave').text = 'bondeth0'
       self.__config.mGetConfigElement('networks').append(_network)
+      ebTopologyChanged()
 
 class ebCluSwitchConfig(object):
 
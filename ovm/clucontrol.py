@@ -21,6 +21,16 @@ NOTE:
 History:
 
        MODIFIED (MM/DD/YY)
+       jydas     10/18/26 - Reachability prober probes the IPv6 address
+                            when aIPtype is '6'
+       jydas     10/18/26 - OEDA installer version from the data cache
+                            (datacache_enabled)
+       jydas     10/18/26 - Probe hosts with the batch reachability prober
+                            (mPingHosts) instead of forking /bin/ping
+       jydas     10/18/26 - Memoize the dom0/domU pairs and cells in a
+                            topology invalidated on XML/payload changes
+       jydas     10/18/26 - Memoize the switches, topology key includes the
+                            XML config setters generation
        jfsaldan  06/22/26 - Migrate Exacloud IMDSv1 references to IMDSv2
        aypaul    06/09/26 - Bug#39439673 Remove misleading logs for selinux
                             configuration
@@ -475,6 +485,7 @@ from subprocess import PIPE
 import threading
 import xml.etree.cElementTree as etree
 from exabox.core.Context import get_gcontext
+from exabox.core.DataCache import ebGetDataCache, ebDataCacheEnabled
 from exabox.tools.ebTree.ebTree import ebTree
 from exabox.infrapatching.core.cluinfrapatch import ebCluInfraPatch
 from exabox.core.Core import exaBoxCoreInit
@@ -507,6 +518,9 @@ from exabox.ovm.clupowermanagement import ebCluStartStopHostFromIlom
 from exabox.ovm.clumisc import ebSubnetSet, ebCluPostComputeValidate, ebMiscFx, ebCluFaultInjection, ebMigrateUsersUtil
 from exabox.ovm.cluinfradelete import ebCluInfraDelete
 from exabox.ovm.clubackup import backupCreateVMLogs
+from exabox.network.Reachability import ebReachabilityProber, ebIsPingProberEnabled, PROBE_TIMEOUT_SEC
+from exabox.ovm.clutopology import ebCluTopology, ebGetPayloadNodeFilters, ebTopologyMutator, \
+    ebGetTopologyGeneration
 import exabox.ovm.clusshkey as clusshkey
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 import time
@@ -904,6 +918,8 @@ class exaBoxCluCtrl(object):
         self.__dyndep_update  = True
         self.__domus_dom0s = {}
         self.__domus_dom0s_nat = None
+        self.__topology = None
+        self.__topology_gen = 0
         self.__disable_dom0_cell_lockdown = self.mCheckConfigOption("disable_dom0_cell_lockdown")
 
         self._hash_file_cache = {}
@@ -1518,6 +1534,37 @@ class exaBoxCluCtrl(object):
     def mGetDomUsDom0s(self):
         return self.__domus_dom0s
 
+    def mGetPayloadNodeFilters(self):
+        """
+        Return the (ComputeNodeList, StorageNodeList) filters of the payload
+        """
+        if self.__options and self.__options.jsonconf:
+            return ebGetPayloadNodeFilters(self.__options.jsonconf)
+        return (), ()
+
+    def mGetTopology(self):
+        """
+        Return the memoized topology of the current XML and payload
+        """
+
+        _machines = self.__machines.mGetMachineConfigList() if self.__machines else {}
+        _key = (self.__topology_gen, ebGetTopologyGeneration(), id(self.__machines), id(self.__clusters),
+                id(self.__storage), id(self.__networks), id(self.__switches), len(_machines),
+                repr(self.mGetPayloadNodeFilters()), repr(self.mGetExcludedList()))
+
+        if self.__topology is None or self.__topology.mGetKey() != _key:
+            self.__topology = ebCluTopology(_key)
+
+        return self.__topology
+
+    def mInvalidateTopology(self):
+        """
+        Drop the memoized topology, to be called when the XML is mutated
+        (node added, removed or renamed)
+        """
+        self.__topology_gen += 1
+        self.__topology = None
+
     def mSetDomUsDom0s(self, aClusterID, aDom0DomUPair):
         self.__domus_dom0s[aClusterID] = aDom0DomUPair
 
@@ -1964,6 +2011,7 @@ class exaBoxCluCtrl(object):
 
     def mSetConfig(self, aConfig):
         self.__config = aConfig
+        self.mInvalidateTopology()
 
     def mGetConfigPath(self):
         return self.__configPath
@@ -1994,6 +2042,7 @@ class exaBoxCluCtrl(object):
     
     def mSetStorage(self, aStorage):
         self.__storage = aStorage
+        self.mInvalidateTopology()
 
     def mGetConfig(self):
         return self.__config
@@ -2003,6 +2052,7 @@ class exaBoxCluCtrl(object):
 
     def mSetNetworks(self, aNetworks):
         self.__networks = aNetworks
+        self.mInvalidateTopology()
 
     def mGetVMNetConfigs(
             self,
@@ -2053,6 +2103,7 @@ class exaBoxCluCtrl(object):
 
     def mSetClusters(self, aClusters):
         self.__clusters = aClusters
+        self.mInvalidateTopology()
 
     def mGetShortClusterPath(self, aKey):
         return self.__short_cluster_folder.get(aKey)
@@ -2065,6 +2116,7 @@ class exaBoxCluCtrl(object):
 
     def mSetMachines(self, aMachines):
         self.__machines = aMachines
+        self.mInvalidateTopology()
 
     def mGetDatabases(self):
         return self.__databases
@@ -2122,6 +2174,7 @@ class exaBoxCluCtrl(object):
 
     def mSetSwitches(self, aSwitches):
         self.__switches = aSwitches
+        self.mInvalidateTopology()
 
     def mGetUsers(self):
         return self.__users
@@ -2379,6 +2432,7 @@ class exaBoxCluCtrl(object):
         ebLogVerbose('mParseXMLConfig: Parse XML configuration file.')
 
         self.__parsexml = False
+        self.mInvalidateTopology()
         #
         # Note: __configPath can be set in case we are not using -cf option the XML file path
         #
@@ -5520,25 +5574,13 @@ class exaBoxCluCtrl(object):
         if self.mIsExaScale():
             return {}
 
-        _jconf = None
-        if self.__options and self.__options.jsonconf:
-            _raw = self.__options.jsonconf
-            if isinstance(_raw, dict):
-                _jconf = _raw
-            elif isinstance(_raw, str):
-                try:
-                    with open(_raw, "r", encoding="utf-8") as f:
-                        _jconf = json.load(f)
-                except (OSError, json.JSONDecodeError):
-                    try:
-                        _jconf = json.loads(_raw)
-                    except json.JSONDecodeError:
-                        _jconf = None
-            else:
-                _jconf = None
+        return self.mGetTopology().mGetValue("cell_nodes", (aNetMask, aIsClusterLessXML, aIsXS, self.mIsXS()),
+            lambda: self.mComputeCellNodes(aNetMask, aIsClusterLessXML, aIsXS))
+
+    def mComputeCellNodes(self, aNetMask=False, aIsClusterLessXML=False, aIsXS=False):
 
         _excluded_node_list = self.mGetExcludedList()
-        _allowed_node_list = _jconf.get("StorageNodeList", []) if isinstance(_jconf, dict) else []
+        _, _allowed_node_list = self.mGetPayloadNodeFilters()
 
         if aIsClusterLessXML:
             _data={}
@@ -5805,7 +5847,8 @@ class exaBoxCluCtrl(object):
         if get_gcontext().mCheckRegEntry("ROCE_SWITCHES") and aRoceQinQ:
             return get_gcontext().mGetRegEntry("ROCE_SWITCHES")
 
-        return list(set(mCalculateSwitches(self, aMode)))
+        return self.mGetTopology().mGetValue("switches", (aMode,),
+            lambda: list(set(mCalculateSwitches(self, aMode))))
 
     def mGetExaKmsHostMap(self, aAddIloms=True):
 
@@ -14121,6 +14164,7 @@ IPV6INIT=no"""
             return {'aTimeout': 300, 'aRetryDelay': 10}
         return {}
 
+    @ebTopologyMutator
     def mRemoveUnreachableNodes(self, aOptions):
         """
         This method is applicable for clusterless xmls only.
@@ -14137,14 +14181,15 @@ IPV6INIT=no"""
 
         _dom0s, _, _cells, _ = self.mReturnAllClusterHosts()
         _cluhosts = _dom0s + _cells
-        for _host in _cluhosts:
 
-            # Skip removal in case of machine found in the ECRA Payload and only for patching
-            if _jconf and _host in str(_jconf) and \
-               ebCluCmdCheckOptions(self.mGetCmd(), ['patch']):
-                continue
+        # Skip removal in case of machine found in the ECRA Payload and only for patching
+        if _jconf and ebCluCmdCheckOptions(self.mGetCmd(), ['patch']):
+            _cluhosts = [_host for _host in _cluhosts if _host not in str(_jconf)]
 
-            if not self.mPingHost(_host, **_pingArgs):
+        _pingable = self.mPingHosts(_cluhosts, **_pingArgs)
+        for _host in _cluhosts:
+
+            if not _pingable[_host]:
 
                 _machineList.append(self.__machines.mGetMacIdFromMacHostName(_host))
                 ebLogInfo('*** mRemoveUnreachableNodes: removing ' + self.__machines.mGetMacIdFromMacHostName(_host) + ' from hosts list ***')
@@ -14462,6 +14507,7 @@ IPV6INIT=no"""
             ebDNSConfig(aOptions, self.__patchconfig).mConfigureDNS('guest') # Update DNS entries for "guest" networks
 
 
+    @ebTopologyMutator
     def mRemoveUnusedVmMachines(self):
         """
         This method removes from the XML the machines that don't
@@ -14971,50 +15017,12 @@ IPV6INIT=no"""
         if self.isBaseDB() or self.isExacomputeVM():
             return self.mReadBaseDBdom0domU()
 
-        # Get filter if present in the payload
-        _jconf = None
-
-        if self.__options and self.__options.jsonconf:
-            _raw = self.__options.jsonconf
-            if isinstance(_raw, dict):
-                _jconf = _raw
-            elif isinstance(_raw, str):
-                try:
-                    with open(_raw, "r", encoding="utf-8") as f:
-                        _jconf = json.load(f)
-                except (OSError, json.JSONDecodeError):
-                    try:
-                        _jconf = json.loads(_raw)
-                    except json.JSONDecodeError:
-                        _jconf = None
-            else:
-                _jconf = None
-                
-        _allowed = _jconf.get("ComputeNodeList", []) if isinstance(_jconf, dict) else []
-        _excluded_node_list = self.mGetExcludedList()
-
         if aIsClusterLessXML:
-            _dom0List = self.mReadComputes()
-            
-            def _generateDummy(aDom0):
-                _pos = aDom0.find('.')
-                return [aDom0, aDom0[:_pos] + 'dummydomu' + aDom0[_pos:]]
-
-            if aRetDummyDomu:
-                _orig_node_list = [_generateDummy(_dom0) for _dom0 in _dom0List]
-            else:
-                _orig_node_list = []
-                for _dom0 in _dom0List:
-                    _orig_node_list.append([_dom0, ""])
-
-            if len(_allowed) > 0:
-                _orig_node_list = [[_dom0, _domU] for _dom0, _domU in _orig_node_list if _dom0 in _allowed]
-
-            if aExcludeNodeList:
-                _excluded_node_list = aExcludeNodeList
-
-            return list(filter(lambda x: x[0] not in _excluded_node_list, _orig_node_list))
-
+            _args = (aRetDummyDomu, tuple(aExcludeNodeList or ()))
+            if aForce:
+                self.mInvalidateTopology()
+            return self.mGetTopology().mGetValue("clusterless_dom0_domu_pairs", _args,
+                lambda: self.mComputeClusterLessDom0DomUPair(aRetDummyDomu, aExcludeNodeList))
 
         # If aClusterId is not defined return the first cluster
         # By default contains only entry corresponding to the cluster at hand
@@ -15028,25 +15036,30 @@ IPV6INIT=no"""
         if not aForce and clusterId in self.__domus_dom0s:
             return self.__domus_dom0s[clusterId]
 
+        # Get filter if present in the payload
+        _allowed, _ = self.mGetPayloadNodeFilters()
+        _excluded_node_list = self.mGetExcludedList()
+
         _ddpair = []
+        _ml = self.__machines.mGetMachineConfigList()
+        # domU machine id -> dom0 hostnames, one pass over the machines
+        _dom0s_of = {}
+        for _m in list(_ml.keys()):
+            for _vm in dict.fromkeys(_ml[_m].mGetMacMachines()):
+                _dom0s_of.setdefault(_vm, []).append(_ml[_m].mGetMacHostName())
+
         _mac_list = self.__clusters.mGetClusterMachines(clusterId)
         for _mac in _mac_list:
             _mac_config = self.__machines.mGetMachineConfig(_mac)
-            ### _host = _mac_config.mGetMacHostName()
             _id = _mac_config.mGetMacId()
-            _ml = self.__machines.mGetMachineConfigList()
-            for _m in list(_ml.keys()):
-                _vml = _ml[_m].mGetMacMachines()
-                if _id in _vml:
-                    _dom0 = _ml[_m].mGetMacHostName()
-                    _host = _mac_config.mGetMacHostName()
-                    _ddpair.append([_dom0, _host])
+            for _dom0 in _dom0s_of.get(_id, []):
+                _ddpair.append([_dom0, _mac_config.mGetMacHostName()])
 
         # Filter dom0s if allowed list has a length of more than zero
         if _allowed:
             _ddpair = list(filter(lambda x: x[0] in _allowed, _ddpair))
         if _excluded_node_list:
-            _ddpair = list(filter(lambda x: x[0] not in _excluded_node_list))
+            _ddpair = list(filter(lambda x: x[0] not in _excluded_node_list, _ddpair))
 
         if self.mIsXmlElasticShape():
             self.__domus_dom0s[clusterId] = _ddpair
@@ -15056,6 +15069,32 @@ IPV6INIT=no"""
         self.__domus_dom0s[clusterId] = _sddpair
         return _sddpair
 
+    def mComputeClusterLessDom0DomUPair(self, aRetDummyDomu=True, aExcludeNodeList=None):
+
+        _allowed, _ = self.mGetPayloadNodeFilters()
+        _excluded_node_list = self.mGetExcludedList()
+
+        _dom0List = self.mReadComputes()
+
+        def _generateDummy(aDom0):
+            _pos = aDom0.find('.')
+            return [aDom0, aDom0[:_pos] + 'dummydomu' + aDom0[_pos:]]
+
+        if aRetDummyDomu:
+            _orig_node_list = [_generateDummy(_dom0) for _dom0 in _dom0List]
+        else:
+            _orig_node_list = []
+            for _dom0 in _dom0List:
+                _orig_node_list.append([_dom0, ""])
+
+        if len(_allowed) > 0:
+            _orig_node_list = [[_dom0, _domU] for _dom0, _domU in _orig_node_list if _dom0 in _allowed]
+
+        if aExcludeNodeList:
+            _excluded_node_list = aExcludeNodeList
+
+        return list(filter(lambda x: x[0] not in _excluded_node_list, _orig_node_list))
+
     def mSortDom0DomUPair(self, aDdPair=None):
         _ddpair = aDdPair
         #
@@ -16958,6 +16997,7 @@ IPV6INIT=no"""
                 except AttributeError:
                     ebLogWarn('*** XML don\'t have characterset node')
 
+    @ebTopologyMutator
     def mUpdatePrivNetworks(self):
 
         for _, domu in self.mReturnDom0DomUPair():
@@ -19986,6 +20026,7 @@ IPV6INIT=no"""
 
                 ebLogInfo(f"Configured all the servers ips in dom0: {_dom0}")
 
+    @ebTopologyMutator
     def mCustomerNetworkXMLUpdate(self,aOptions,aJConf=None):
 
         ebLogInfo('*** mCustomerNetworkXMLUpdate: CustomerNetwork XML Update ...')
@@ -20858,6 +20899,7 @@ IPV6INIT=no"""
         ebLogInfo('ebCluCtrl: Saved patched Cluster Config for DR (Updated DR slaves in xml): ' + _patchconfig)
         self.mCopyFile(_patchconfig, self.__remoteconfig)
 
+    @ebTopologyMutator
     def mKvmRoceXMLUpdate(self, aOptions, aJConf=None):
 
         # Apply new patching of KVM-Roce
@@ -21868,6 +21910,11 @@ IPV6INIT=no"""
                         else:
                             return False
 
+        if ebIsPingProberEnabled():
+            _interval = (aTimeout or PROBE_TIMEOUT_SEC) + aRetryDelay
+            return ebReachabilityProber().mIsReachable(_host, aTimeout=_interval, aCount=aCount,
+                                                       aFamily=self.mGetPingFamily(_host, aIPtype))
+
         _totalCount = int(aCount)
         _count = _totalCount
         # If IP address in passed as _host - detect if it is ipv6 address.
@@ -21900,6 +21947,53 @@ IPV6INIT=no"""
 
         return False
 
+    @staticmethod
+    def mGetPingFamily(aHost, aIPtype='4'):
+        """ Address family probed for aIPtype, None lets the prober prefer IPv4 like /bin/ping """
+
+        if str(aIPtype) == '6' or ':' in aHost:
+            return socket.AF_INET6
+        return None
+
+    def mPingHosts(self, aHostnames, aCount=4, aTimeout=0, aIPtype='4', aRetryDelay=0):
+        """
+        Ping all aHostnames at once with the reachability prober when it is
+        enabled, one after the other with mPingHost otherwise.
+
+        :return: dict hostname -> True if the host answered
+        """
+
+        _hosts = list(dict.fromkeys(aHostnames))
+        if not ebIsPingProberEnabled() or len(_hosts) < 2:
+            return {_host: self.mPingHost(_host, aCount, aTimeout, aIPtype, aRetryDelay) for _host in _hosts}
+
+        _ctx = get_gcontext()
+        _postfix = _ctx.mCheckRegEntry('ssh_post_fix') and _ctx.mGetRegEntry('ssh_post_fix') == "True"
+
+        _results = {}
+        _targets = {}
+        for _host in _hosts:
+            _target = _host
+            if _ctx.mCheckRegEntry('_natHN_' + _host):
+                _target = _ctx.mGetRegEntry('_natHN_' + _host)
+            if _postfix and _target in _ctx.mGetRegEntry('domU_set'):
+                # Pinged through the vm ping endpoint of the dom0
+                _results[_host] = self.mPingHost(_host, aCount, aTimeout, aIPtype, aRetryDelay)
+            else:
+                _targets[_host] = _target
+
+        _interval = (aTimeout or PROBE_TIMEOUT_SEC) + aRetryDelay
+        _prober = ebReachabilityProber()
+        _byFamily = {}
+        for _host, _target in _targets.items():
+            _byFamily.setdefault(self.mGetPingFamily(_target, aIPtype), {})[_host] = _target
+        for _family, _familyTargets in _byFamily.items():
+            _probe = _prober.mProbe(list(_familyTargets.values()), aTimeout=_interval, aCount=aCount, aFamily=_family)
+            for _host, _target in _familyTargets.items():
+                _results[_host] = _probe[_target][0]
+
+        return _results
+
     def mHandlerUnLockDBMUsers(self):
         return self.mLockDBMUsers(False)
 
@@ -21954,8 +22048,9 @@ IPV6INIT=no"""
         else:
             _list = aList
 
+        _pingable = self.mPingHosts([_host for _, _host in _list])
         for _, _host in _list:
-            if not self.mPingHost(_host):
+            if not _pingable[_host]:
                 ebLogInfo('*** (SECURE_DOMU_SSH) Host: %s is not responding' % (_host))
                 continue
             _node = exaBoxNode(get_gcontext())
@@ -29750,6 +29845,27 @@ IPV6INIT=no"""
         if aCmd == 'exascale_remove_user_privilege':
             return self.mGetCommandHandler().mHandlerXsRemoveVMUserPrivilege()
 
+    def mFetchOedaLongVersion(self):
+        """ 'Version' line of install.sh -h of the OEDA of the request, None on failure """
+
+        _cmd_str1 = '/bin/bash install.sh -h'
+        _cmd_str2 = '/bin/grep Version'
+
+        _retryCount = 5
+        _sleepTime = 30 #seconds
+
+        while _retryCount > 0:
+            _, _cmd_out1, _ = self.mExecuteCmd(_cmd_str1, aCurrDir=self.__oeda_path)
+            _, _out, _ = self.mExecuteCmd(_cmd_str2, aCurrDir=self.__oeda_path, aStdIn=_cmd_out1)
+            if self.__cmd_status == 0 and _out:
+                _out = _out.readlines()
+                if _out:
+                    return _out[0]
+            _retryCount = _retryCount - 1
+            time.sleep(_sleepTime)
+
+        return None
+
     def mExecuteOEDAStep(self, aCmd, aOptions=None, aOedaPath=None):
 
         if ebCluCmdCheckOptions(aCmd, ['instant_commands']):
@@ -29791,27 +29907,22 @@ IPV6INIT=no"""
         # Check version of OEDA
         #
         _cmd_str = self.__oeda_path+'/install.sh -h | grep Version'
-        _cmd_str1 = '/bin/bash install.sh -h'
-        _cmd_str2 = '/bin/grep Version'
-
-        _retryCount = 5
-        _sleepTime = 30 #seconds
-        _success = False
         _oeda_version = None
-        _oeda_long_version = None
 
-        while _retryCount > 0 and not _success:
-            _, _cmd_out1, _ = self.mExecuteCmd(_cmd_str1, aCurrDir=self.__oeda_path)
-            _, _out, _ = self.mExecuteCmd(_cmd_str2, aCurrDir=self.__oeda_path, aStdIn=_cmd_out1)
-            if self.__cmd_status == 0 and _out:
-                _out = _out.readlines()
-                if _out:
-                    _oeda_long_version = _out[0]
-                    _success = True
-                    break
-            _retryCount = _retryCount - 1
-            time.sleep(_sleepTime)
-        if not _success :
+        if ebDataCacheEnabled():
+            # install.sh -h is run once per OEDA install, not once per request
+            _installer = os.path.join(self.__oeda_path, 'install.sh')
+            try:
+                _st = os.stat(_installer)
+                _key = f"oeda_version:{os.path.realpath(_installer)}:{int(_st.st_mtime)}:{_st.st_size}"
+                _oeda_long_version = ebGetDataCache().mGet(_key, self.mFetchOedaLongVersion)
+            except Exception as e:
+                ebLogWarn(f'*** OEDA version not available from the data cache: {e}')
+                _oeda_long_version = self.mFetchOedaLongVersion()
+        else:
+            _oeda_long_version = self.mFetchOedaLongVersion()
+
+        if not _oeda_long_version:
             ebLogError('*** Unable to fetch the oeda version using installer command %s : %s' % (self.__node.mGetHostname(), _cmd_str))
             return ebError(0x0101)                                        # ERROR_101 : COULD NOT EXECUTE OEDA INSTALLER
 
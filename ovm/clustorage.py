@@ -15,6 +15,8 @@ NOTE:
 History:
 
     MODIFIED   (MM/DD/YY)
+      jydas     10/18/26 - Bump the topology generation when a disk group
+                           is added or removed
       rajsag    05/28/26 - Fix storage precision XML tests
       jfsaldan  04/22/26 - Bug 39236016 - EXADB-D: EXACLOUD: STORAGE RESIZE
                            (SHRINK) AFTER ADD STORAGE IS ESTIMATING PERCENTAGE
@@ -185,6 +187,7 @@ ebLogJson, ebLogTrace, ebLogCritical
 from exabox.ovm.cludiskgroups import ebDiskgroupOpConstants, \
 ebCluManageDiskgroup
 from exabox.ovm.clumisc import mWaitForSystemBoot
+from exabox.ovm.clutopology import ebTopologyChanged
 from exabox.ovm.csstep.exascale.escli_util import ebEscliUtils
 from exabox.ovm.utils.clu_utils import ebCluUtils
 from exabox.core.Error import gElasticError
@@ -536,6 +539,7 @@ class ebCluStorageConfig(object):
         _dgco = self.__dgo_list[aDGId]
         del self.__dgo_list[aDGId]
         self.__config.find('storage/diskGroups').remove(_dgco.mGetXMLObject())
+        ebTopologyChanged()
 
     def mAddDiskGroupConfig(self, aDgConfig):
 
@@ -544,6 +548,7 @@ class ebCluStorageConfig(object):
 
         self.__dgo_list[aDgConfig.mGetDgId()] = aDgConfig
         self.__config.find('storage/diskGroups').append(aDgConfig.mGetXMLObject())
+        ebTopologyChanged()
 
     def DumpStorageConfig(self):
 
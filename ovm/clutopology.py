@@ -0,0 +1,177 @@
+"""
+$Header:
+
+ Copyright (c) 2026, Oracle and/or its affiliates.
+
+NAME:
+    clutopology.py - Memoized cluster topology of exaBoxCluCtrl
+
+FUNCTION:
+    Keep the host lists computed from the parsed XML and the payload
+    (dom0/domU pairs, cells, switches) so they are built once per request instead
+    of every time a helper needs them.
+
+NOTE:
+    A topology is bound to a key describing the XML objects and the payload
+    node filters it was computed from; exaBoxCluCtrl drops it when the key
+    changes or when the XML is mutated (mInvalidateTopology). The setters of
+    the XML config objects bump a global generation (ebTopologyChanged)
+    which is part of the key, so in place patching done outside of
+    exaBoxCluCtrl drops the topology too. Values are handed out as copies
+    so callers can not alter the memoized ones.
+
+History:
+
+    MODIFIED   (MM/DD/YY)
+       jydas    10/18/26 - Creation
+       jydas    10/18/26 - Generation bumped by the XML config setters
+"""
+
+import os
+import copy
+import json
+import functools
+import threading
+
+from exabox.log.LogMgr import ebLogTrace
+
+# payload path/text -> (file stamp, compute node list, storage node list)
+_gPayloadFilters = {}
+_gPayloadFiltersLock = threading.Lock()
+_PAYLOAD_FILTERS_MAX = 64
+
+# Bumped on every in place change of the XML config objects
+_gTopologyGeneration = 0
+_gTopologyGenerationLock = threading.Lock()
+
+
+def ebTopologyChanged():
+    """
+    To be called by the setters of the XML config objects (machines,
+    networks, disk groups), the memoized topologies are dropped on their
+    next use.
+    """
+    global _gTopologyGeneration
+
+    with _gTopologyGenerationLock:
+        _gTopologyGeneration += 1
+
+
+def ebGetTopologyGeneration():
+    return _gTopologyGeneration
+
+
+def ebLoadPayload(aRaw):
+    """
+    Return the payload of jsonconf, a dict, a json file path or a json text
+    """
+
+    if isinstance(aRaw, dict):
+        return aRaw
+
+    if isinstance(aRaw, str):
+        try:
+            with open(aRaw, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            try:
+                return json.loads(aRaw)
+            except json.JSONDecodeError:
+                return None
+
+    return None
+
+
+def ebGetPayloadNodeFilters(aRaw):
+    """
+    Return the (ComputeNodeList, StorageNodeList) of the payload as tuples.
+    A payload file is only parsed again when its mtime or size changes.
+    """
+
+    if not aRaw:
+        return (), ()
+
+    if isinstance(aRaw, dict):
+        return tuple(aRaw.get("ComputeNodeList") or []), tuple(aRaw.get("StorageNodeList") or [])
+
+    if not isinstance(aRaw, str):
+        return (), ()
+
+    try:
+        _st = os.stat(aRaw)
+        _stamp = (_st.st_mtime_ns, _st.st_size)
+    except (OSError, ValueError):
+        _stamp = None
+
+    with _gPayloadFiltersLock:
+        _cached = _gPayloadFilters.get(aRaw)
+        if _cached and _cached[0] == _stamp:
+            return _cached[1], _cached[2]
+
+    _jconf = ebLoadPayload(aRaw)
+    if isinstance(_jconf, dict):
+        _filters = (tuple(_jconf.get("ComputeNodeList") or []), tuple(_jconf.get("StorageNodeList") or []))
+    else:
+        _filters = ((), ())
+
+    with _gPayloadFiltersLock:
+        if len(_gPayloadFilters) >= _PAYLOAD_FILTERS_MAX:
+            _gPayloadFilters.clear()
+        _gPayloadFilters[aRaw] = (_stamp,) + _filters
+
+    return _filters
+
+
+def ebTopologyMutator(aFunc):
+    """
+    Decorator of the exaBoxCluCtrl methods patching the parsed XML in place,
+    the topology is dropped once they return (or fail half way).
+    """
+
+    @functools.wraps(aFunc)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return aFunc(self, *args, **kwargs)
+        finally:
+            self.mInvalidateTopology()
+    return wrapper
+
+
+class ebCluTopology(object):
+
+    def __init__(self, aKey):
+        self.__key = aKey
+        self.__values = {}
+        self.__lock = threading.Lock()
+        self.__stats = {"hits": 0, "misses": 0}
+
+    def mGetKey(self):
+        return self.__key
+
+    def mGetStats(self):
+        with self.__lock:
+            return dict(self.__stats)
+
+    def mGetValue(self, aName, aArgs, aComputeFx):
+        """
+        Return the value aName for aArgs, computing it with aComputeFx on
+        the first call. Exceptions of aComputeFx are not memoized.
+        """
+
+        _key = (aName,) + tuple(aArgs)
+
+        with self.__lock:
+            if _key in self.__values:
+                self.__stats["hits"] += 1
+                return copy.deepcopy(self.__values[_key])
+            self.__stats["misses"] += 1
+
+        _value = aComputeFx()
+
+        with self.__lock:
+            self.__values[_key] = copy.deepcopy(_value)
+
+        ebLogTrace(f"Topology {aName}{tuple(aArgs)} computed")
+        return _value
+
+# end of file
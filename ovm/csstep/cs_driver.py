@@ -1,5 +1,5 @@
 """
- Copyright (c) 2019, 2025, Oracle and/or its affiliates.
+ Copyright (c) 2019, 2026, Oracle and/or its affiliates.
 
 NAME:
     cs_driver.py - Create Service Step Wise Execution
@@ -15,6 +15,7 @@ EXTERNAL INTERFACES:
     csDriver: handleRequest()
 
 History:
+    jydas     10/18/2026 - Attribute the sampling profiler samples to the step
     prsshukl  11/19/2025 - Bug 38037088 - Refactor Create Service Flow for BaseDB
     pbellary  06/14/2024 - ENH 36721696 - IMPLEMENT DELETE SERVICE STEPS FOR EXASCALE SERVICE
     pbellary  06/10/2024 - ENH 36690543 - EXACLOUD: PATCH XML WITH EXASCALE INFORMATION FOR INFO COMMAND
@@ -36,6 +37,7 @@ from exabox.ovm.csstep.exabasedb.cs_stephandler import BaseDBStepFactory, csBase
 from exabox.ovm.csstep.cs_util import csUtil
 from exabox.tools.profiling.profiler import measure_exec_time, flush_profiled_data
 from exabox.tools.profiling.stepwise import log_profiled_data, steal_steplist
+from exabox.tools.profiling.sampler import ebSamplingSetStage
 
 # this class implements the create service step wise execution
 # driver which calls doExecute() and undoExecute() functions
@@ -150,6 +152,7 @@ class csDriver(object):
         for _step in _step_list:
 
             ebLogInfo('csDriver: Executing step='+ _step)
+            ebSamplingSetStage(_step)
             #lookup the dictionary to get appropriate class
             _stepHandle = self.__driver.getCSHandle(_step, _storageType)
 
@@ -1,5 +1,5 @@
 """
- Copyright (c) 2024, Oracle and/or its affiliates.
+ Copyright (c) 2024, 2026, Oracle and/or its affiliates.
 
 NAME:
     exametrics - Responsible for adding methods for collection of metrics
@@ -12,6 +12,7 @@ NOTE:
 
 History:
     MODIFIED   (MM/DD/YY)
+    jydas       10/18/26 - Add ec_hotpath_metric (mGetHotPathMetrics)
     shapatna    06/14/24 -Bug 36732867: Create File
 """
 import psutil
@@ -25,6 +26,7 @@ import json
 from exabox.core.DBStore import ebExacloudDB, ebGetDefaultDB
 from exabox.log.LogMgr import ebLogInfo
 from exabox.core.Context import get_gcontext
+from exabox.core.Metrics import ebMetricsEnabled, ebMetricsCollect, ebMetricsSummary
         
 class ebExacloudSysMetrics():
     CONVERSION_TO_GB = 1024 ** 3
@@ -1015,6 +1017,18 @@ class ebExacloudSysMetrics():
             "current size(GB)" : _size
         }
 
+    def mGetHotPathMetrics(self):
+        '''
+            Returns the hot path counters and latency histograms (SSH connect, commands per host and family, SFTP throughput, SQL per statement template, process queue wait) merged over all the exacloud processes, see core/Metrics.py
+        '''
+        if not ebMetricsEnabled():
+            return {}
+
+        _merged = ebMetricsCollect()
+        _summary = ebMetricsSummary(_merged)
+        _summary["processes"] = _merged["processes"]
+        return _summary
+
     def mGetResults(self):
         '''
             This method returns a dictionary where under each key (metric_category) the corresponding dictionary of the key-value pair (in this case the names of the methods and their respective results) is present.
@@ -1050,7 +1064,11 @@ class ebExacloudSysMetrics():
                 "mGetFsEcUsage" : self.mGetFsEcUsage(),
                 "mGetFsEcLogFolderUsage" : self.mGetFsEcLogFolderUsage(),
                 "mGetFsEcImagesFolderUsage" : self.mGetFsEcImagesFolderUsage(),
-            }   
+            },
+
+            "ec_hotpath_metric" : {
+                "mGetHotPathMetrics" : self.mGetHotPathMetrics(),
+            }
         }
         
         return _response
@@ -22,6 +22,7 @@ History:
     ndesanto    10/02/2019 - Enh 30374491: EXACC PYTHON 3 MIGRATION BATCH 02
     araghave    20/02/2020 - Enh 30908782: ksplice configuration on dom0 and cells
     araghave    28/02/2024 - Enh 36295801 - IMPLEMENT ONEOFFV2 PLUGIN EXACLOUD CHANGES
+    jydas       18/10/2026 - Read the UI requests as rows instead of literal_eval
 """
 
 try:
@@ -611,7 +612,6 @@ def build_requests_html_page(auto_refresh=True, aParams=None):
 
     _offset = (_pagenum - 1) * _pagesize
     _db = ebGetDefaultDB()
-    _body = _db.mGetUIRequests(aClustername=_clustername, aCmdtype=_cmdtype, aLimit=_pagesize, aOffset=_offset)
     _rowcount = _db.mGetUIRowCount(_clustername, _cmdtype)[0]
     _pagecount = _rowcount / _pagesize
 
@@ -621,7 +621,7 @@ def build_requests_html_page(auto_refresh=True, aParams=None):
     _error = None
     _list = []
     try:
-        _list = ast.literal_eval(_body)
+        _list = _db.mGetUIRequestRows(aClustername=_clustername, aCmdtype=_cmdtype, aLimit=_pagesize, aOffset=_offset)
     except Exception as e:
         _error = "Error retrieving requests information from Database."
         ebLogError("Error retrieving requests from Database. Original exception:\n" + str(e))
@@ -680,7 +680,8 @@ def build_requests_html_page(auto_refresh=True, aParams=None):
         _uuid_n = _row[0]
         _cmdt_s = _row[4]
 
-        _params = ast.literal_eval(_row[5])
+        # Erased params are kept as a string
+        _params = _row[5] if isinstance(_row[5], dict) else {}
 
         _requestID = "0000-0000-0000-0000"
         if ("request_id" in list(_params.keys())) and (_params["request_id"] is not None):
@@ -716,7 +717,7 @@ def build_requests_html_page(auto_refresh=True, aParams=None):
 
         # Cluster Configuration (_cluster_conf_s)
 
-        _params_d = ast.literal_eval(_row[5])
+        _params_d = _params
 
         if "configpath" in list(_params_d.keys()):
             _link_s = "/AgentCtrl?ccluster="+_row[0]
@@ -20,6 +20,8 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Incremental cleanup (cleanup_engine) when
+#                           cleanup_engine_enabled is set
 #    aypaul      04/16/26 - Bug#38900303 Fix codev identified issues.
 #    aararora    12/19/23 - Bug 35863722: Scheduler to delete xml files under
 #                           PodRepo directory periodically.
@@ -31,6 +33,7 @@ import time
 from exabox.core.Context import get_gcontext
 from exabox.core.Core import exaBoxCoreInit
 from exabox.log.LogMgr import ebLogInit, ebLogInfo, ebLogError
+from exabox.scheduleJobs.cleanup_engine import ebCleanupEngine, ebCleanupEngineEnabled, ebCleanupPolicy
 
 class CleanUpClustersFolder():
 
@@ -61,6 +64,12 @@ class CleanUpClustersFolder():
 
         _exacloud_clusters_PodRepo_dir = os.path.join(self.__exacloudPath, "clusters/PodRepo")
         ebLogInfo(f"Executing CleanUpClustersFolder on directory: {_exacloud_clusters_PodRepo_dir}")
+
+        if ebCleanupEngineEnabled():
+            _policy = ebCleanupPolicy("clusters_podrepo", _exacloud_clusters_PodRepo_dir, ("*.xml",), aMaxDepth=1,
+                                      aMaxAgeSec=self.__clusters_podrepo_cleanup_duration_hours * 3600)
+            ebCleanupEngine(self.__exacloudPath).mRun([_policy])
+            return
         _podrepo_xml_files = list(glob.glob(os.path.join(_exacloud_clusters_PodRepo_dir, "*.xml")))
 
         _current_time = time.time()
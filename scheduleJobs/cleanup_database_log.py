@@ -16,6 +16,8 @@
 #      Needs database_files_limit and database_age_limit_in_days defined in exacloud config
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Incremental cleanup (cleanup_engine) when
+#                           cleanup_engine_enabled is set
 #    aypaul      04/16/26 - Bug#38900303 Fix codev identified issues.
 #    gurkasin    03/18/21 - Creation
 #
@@ -25,6 +27,7 @@ import time
 from exabox.core.Context import get_gcontext
 from exabox.core.Core import exaBoxCoreInit
 from exabox.log.LogMgr import ebLogInit, ebLogInfo
+from exabox.scheduleJobs.cleanup_engine import ebCleanupEngine, ebCleanupEngineEnabled, ebCleanupPolicy
 
 
 class CleanUpDatabaseLog():
@@ -57,6 +60,12 @@ class CleanUpDatabaseLog():
         if not self.__database_files_limit:
             self.__database_files_limit = 30
 
+    def mGetCleanupPolicies(self):
+
+        return [ebCleanupPolicy("database_log", os.path.join(self.__exacloudPath, "log"), ("database_*",),
+                                aMaxAgeSec=self.__max_age_in_seconds, aMaxFiles=self.__database_files_limit,
+                                aExclude=lambda aPath: aPath.endswith("err"))]
+
     def mExecuteJob(self):
 
         _exacloud_log_dir = os.path.join(self.__exacloudPath, "log")
@@ -64,6 +73,10 @@ class CleanUpDatabaseLog():
         ebLogInfo("Database file limit is: %d"%(self.__database_files_limit))
         ebLogInfo("Database file age limit is: %d"%(self.__max_age_in_days))
 
+        if ebCleanupEngineEnabled():
+            ebCleanupEngine(self.__exacloudPath).mRun(self.mGetCleanupPolicies())
+            return
+
         _database_files = []
 
         #Get list of all matching files in the exacloud/log directory.
@@ -0,0 +1,502 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/scheduleJobs/cleanup_engine.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# cleanup_engine.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      cleanup_engine.py - Incremental cleanup of the log and archive trees
+#
+#    DESCRIPTION
+#      Engine of the cleanup scheduler jobs (cleanup_log_files,
+#      cleanup_database_log, cleanup_incident_tar_zipfiles,
+#      cleanup_oeda_requests, cleanup_clusters). A job describes what it
+#      cleans with ebCleanupPolicy objects and ebCleanupEngine applies them.
+#
+#      Every policy keeps a cursor in <cleanup_engine_state_dir>/<policy>.json:
+#        dirs     directory -> [mtime_ns, subdirectories]. A directory whose
+#                 mtime did not change has no new or removed entry, it is
+#                 not listed again, only its subdirectories are visited.
+#        entries  directory -> {name: [mtime, size]}, the entries matched so
+#                 far. The age and count limits are evaluated on them, each
+#                 candidate is stat'ed again before it is removed or archived.
+#        pending  directories still to scan when the previous run ran out of
+#                 budget, the next run resumes from them.
+#
+#      The directories are listed with os.scandir by a small thread pool, a
+#      level of the tree at a time. The I/O of a run is bounded by a time
+#      budget and a throttle (operations and bytes per second), and the
+#      process lowers its CPU and I/O priority (nice / ionice idle class).
+#
+#    NOTES
+#      Enabled with 'cleanup_engine_enabled': 'True'. Tunables:
+#        cleanup_engine_state_dir     cursors (log/cleanup)
+#        cleanup_engine_threads       scandir threads (4)
+#        cleanup_engine_time_budget   seconds per policy and run (600)
+#        cleanup_engine_iops          stat/scandir/remove per second (2000)
+#        cleanup_engine_io_mb_sec     MB per second removed or archived (50)
+#        cleanup_engine_ionice        lower the I/O priority ('True')
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import json
+import stat
+import time
+import shutil
+import fnmatch
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from exabox.core.Context import get_gcontext
+from exabox.log.LogMgr import ebLogInfo, ebLogWarn, ebLogError, ebLogTrace
+
+CLEANUP_THREADS     = 4
+CLEANUP_TIME_BUDGET = 600
+CLEANUP_IOPS        = 2000
+CLEANUP_IO_MB_SEC   = 50
+CLEANUP_NICE        = 10
+
+
+def ebCleanupEngineEnabled():
+    return str(get_gcontext().mCheckConfigOption('cleanup_engine_enabled')) == 'True'
+
+
+class ebCleanupPolicy(object):
+    """
+    What a cleanup job removes or archives under aRoot:
+      aPatterns    fnmatch patterns of the entry names
+      aMinDepth    aMaxDepth: depth of the entries, 1 is directly under
+                   aRoot (aMaxDepth None: whole tree)
+      aDirs        directories are entries too, a matched directory is
+                   not descended into
+      aMaxAgeSec   entries older than this
+      aMaxFiles    oldest entries over this count
+      aArchiveDir  entries are moved there instead of removed
+      aExclude     callable(path): entries never touched
+      aFilter      callable(path): last check before an entry is touched
+    """
+
+    def __init__(self, aName, aRoot, aPatterns, aMinDepth=1, aMaxDepth=None, aDirs=False,
+                 aMaxAgeSec=None, aMaxFiles=None, aArchiveDir=None, aExclude=None, aFilter=None):
+
+        self.__name = aName
+        self.__root = os.path.abspath(aRoot)
+        self.__patterns = tuple(aPatterns)
+        self.__minDepth = aMinDepth
+        self.__maxDepth = aMaxDepth
+        self.__dirs = aDirs
+        self.__maxAge = aMaxAgeSec
+        self.__maxFiles = aMaxFiles
+        self.__archiveDir = aArchiveDir
+        self.__exclude = aExclude
+        self.__filter = aFilter
+
+    def mGetName(self):
+        return self.__name
+
+    def mGetRoot(self):
+        return self.__root
+
+    def mGetMaxAge(self):
+        return self.__maxAge
+
+    def mGetMaxFiles(self):
+        return self.__maxFiles
+
+    def mGetArchiveDir(self):
+        return self.__archiveDir
+
+    def mIsDirPolicy(self):
+        return self.__dirs
+
+    def mDepth(self, aPath):
+        _rel = os.path.relpath(aPath, self.__root)
+        return 0 if _rel == "." else _rel.count(os.sep) + 1
+
+    def mDescend(self, aDepth):
+        """ Whether the subdirectories of a directory at aDepth can hold entries """
+        return self.__maxDepth is None or aDepth + 2 <= self.__maxDepth
+
+    def mMatches(self, aPath, aDepth=None):
+
+        if aDepth is None and not aPath.startswith(self.__root.rstrip(os.sep) + os.sep):
+            return False
+        _depth = self.mDepth(aPath) if aDepth is None else aDepth
+        if _depth < self.__minDepth or (self.__maxDepth is not None and _depth > self.__maxDepth):
+            return False
+
+        _name = os.path.basename(aPath)
+        if not any(fnmatch.fnmatch(_name, _pattern) for _pattern in self.__patterns):
+            return False
+
+        return not (self.__exclude is not None and self.__exclude(aPath))
+
+    def mAccept(self, aPath):
+        return self.__filter is None or self.__filter(aPath)
+
+
+class ebCleanupThrottle(object):
+    """ Token buckets of operations and bytes per second, shared by the threads """
+
+    def __init__(self, aOpsPerSec=CLEANUP_IOPS, aBytesPerSec=CLEANUP_IO_MB_SEC * 1024 * 1024):
+
+        self.__ops = float(aOpsPerSec) if aOpsPerSec else 0.0
+        self.__bytes = float(aBytesPerSec) if aBytesPerSec else 0.0
+        self.__lock = threading.Lock()
+        self.__next = time.monotonic()
+        self.__slept = 0.0
+
+    def mGetSlept(self):
+        return self.__slept
+
+    def mConsume(self, aOps=1, aBytes=0):
+
+        _cost = 0.0
+        if self.__ops:
+            _cost = max(_cost, aOps / self.__ops)
+        if self.__bytes:
+            _cost = max(_cost, aBytes / self.__bytes)
+        if not _cost:
+            return
+
+        with self.__lock:
+            _now = time.monotonic()
+            # No credit for the time spent idle beyond one second
+            self.__next = max(self.__next, _now - 1.0) + _cost
+            _wait = self.__next - _now
+            if _wait > 0:
+                self.__slept += _wait
+
+        if _wait > 0:
+            time.sleep(_wait)
+
+
+class ebCleanupEngine(object):
+
+    def __init__(self, aBaseDir=".", aStateDir=None, aThreads=None, aTimeBudget=None, aThrottle=None):
+        """ aBaseDir: exacloud directory, the cursors default to its log/cleanup """
+
+        _ctx = get_gcontext()
+
+        def _mNumber(aName, aDefault, aType=int):
+            _value = _ctx.mCheckConfigOption(aName)
+            try:
+                return aType(_value) if _value not in (None, "") else aDefault
+            except ValueError:
+                ebLogWarn(f"Invalid {aName}: {_value}, using {aDefault}")
+                return aDefault
+
+        if aStateDir is None:
+            aStateDir = _ctx.mCheckConfigOption('cleanup_engine_state_dir') or os.path.join(aBaseDir, "log", "cleanup")
+        self.__stateDir = aStateDir
+        self.__threads = max(1, aThreads or _mNumber('cleanup_engine_threads', CLEANUP_THREADS))
+        self.__timeBudget = aTimeBudget if aTimeBudget is not None else \
+                            _mNumber('cleanup_engine_time_budget', CLEANUP_TIME_BUDGET, float)
+        self.__throttle = aThrottle or ebCleanupThrottle(
+            _mNumber('cleanup_engine_iops', CLEANUP_IOPS),
+            _mNumber('cleanup_engine_io_mb_sec', CLEANUP_IO_MB_SEC, float) * 1024 * 1024)
+        self.__ionice = str(_ctx.mCheckConfigOption('cleanup_engine_ionice') or 'True') == 'True'
+
+    def mLowerPriority(self):
+        """ Background priority for the rest of the (scheduler job) process """
+
+        if not self.__ionice:
+            return
+
+        try:
+            os.nice(CLEANUP_NICE)
+        except OSError as e:
+            ebLogTrace(f"Cleanup engine: nice failed: {e}")
+
+        if shutil.which("ionice"):
+            # Avoid cyclical dependency
+            from exabox.scheduleJobs.utils import mExecuteLocal
+            try:
+                _rc, _, _, _err = mExecuteLocal(f"ionice -c 3 -p {os.getpid()}")
+                if _rc:
+                    ebLogTrace(f"Cleanup engine: ionice failed: {_err}")
+            except Exception as e:
+                ebLogTrace(f"Cleanup engine: ionice failed: {e}")
+
+    def mStatePath(self, aPolicy):
+        return os.path.join(self.__stateDir, f"{aPolicy.mGetName()}.json")
+
+    def mLoadState(self, aPolicy):
+
+        _empty = {"root": aPolicy.mGetRoot(), "dirs": {}, "entries": {}, "pending": []}
+        _path = self.mStatePath(aPolicy)
+        if not os.path.exists(_path):
+            return _empty
+
+        try:
+            with open(_path) as _fd:
+                _state = json.load(_fd)
+        except Exception as e:
+            ebLogWarn(f"Cleanup cursor {_path} unreadable ({e}), full scan")
+            return _empty
+
+        # Root moved (config change): the cursor is of no use
+        if _state.get("root") != aPolicy.mGetRoot():
+            return _empty
+        for _key, _value in _empty.items():
+            _state.setdefault(_key, _value)
+        return _state
+
+    def mSaveState(self, aPolicy, aState):
+
+        os.makedirs(self.__stateDir, exist_ok=True)
+        _path = self.mStatePath(aPolicy)
+        _tmp = f"{_path}.{os.getpid()}.tmp"
+        with open(_tmp, "w") as _fd:
+            json.dump(aState, _fd)
+        os.replace(_tmp, _path)
+
+    def mScanDir(self, aPolicy, aDir, aKnown):
+        """
+        (mtime_ns, subdirectories, matched {name: [mtime, size]} or None when
+        the directory did not change since aKnown) or None when aDir is gone
+        """
+
+        try:
+            _st = os.stat(aDir)
+        except OSError:
+            return None
+        self.__throttle.mConsume()
+
+        if aKnown is not None and aKnown[0] == _st.st_mtime_ns:
+            return _st.st_mtime_ns, aKnown[1], None
+
+        _depth = aPolicy.mDepth(aDir)
+        _subdirs = []
+        _matched = {}
+        try:
+            with os.scandir(aDir) as _it:
+                for _entry in _it:
+                    self.__throttle.mConsume()
+                    try:
+                        _isdir = _entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+
+                    if (not _isdir or aPolicy.mIsDirPolicy()) and aPolicy.mMatches(_entry.path, _depth + 1):
+                        try:
+                            _est = _entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        _matched[_entry.name] = [_est.st_mtime, 0 if _isdir else _est.st_size]
+                        if _isdir:
+                            continue
+
+                    if _isdir and aPolicy.mDescend(_depth):
+                        _subdirs.append(_entry.name)
+        except OSError as e:
+            ebLogWarn(f"Cleanup engine: cannot list {aDir}: {e}")
+            return None
+
+        return _st.st_mtime_ns, sorted(_subdirs), _matched
+
+    def mScan(self, aPolicy, aState, aReport, aDeadline):
+        """ Update the cursor with the directories changed since the previous run """
+
+        _dirs = aState["dirs"]
+        _entries = aState["entries"]
+        _queue = aState["pending"] or [aPolicy.mGetRoot()]
+        _seen = set()
+
+        with ThreadPoolExecutor(max_workers=self.__threads) as _pool:
+            while _queue:
+
+                if time.monotonic() > aDeadline:
+                    aReport["complete"] = False
+                    break
+
+                _batch, _queue = _queue[:self.__threads * 8], _queue[self.__threads * 8:]
+                _results = _pool.map(lambda _dir: (_dir, self.mScanDir(aPolicy, _dir, _dirs.get(_dir))), _batch)
+
+                for _dir, _result in _results:
+                    _seen.add(_dir)
+                    if _result is None:
+                        self.mForgetDir(aState, _dir)
+                        continue
+
+                    _mtime, _subdirs, _matched = _result
+                    if _matched is None:
+                        aReport["dirs_unchanged"] += 1
+                    else:
+                        aReport["dirs_listed"] += 1
+                        _known = _entries.pop(_dir, {})
+                        aReport["entries_new"] += len(set(_matched) - set(_known))
+                        if _matched:
+                            _entries[_dir] = _matched
+
+                        # Subdirectories gone since the previous listing
+                        _old = _dirs.get(_dir)
+                        for _name in set(_old[1] if _old else []) - set(_subdirs):
+                            self.mForgetDir(aState, os.path.join(_dir, _name))
+
+                    _dirs[_dir] = [_mtime, _subdirs]
+                    _queue.extend([os.path.join(_dir, _name) for _name in _subdirs])
+
+        aState["pending"] = _queue
+        if not _queue and not aReport["resumed"]:
+            # Full scan: the directories not reached are not in the tree anymore
+            for _dir in [_dir for _dir in _dirs if _dir not in _seen]:
+                self.mForgetDir(aState, _dir)
+
+    @staticmethod
+    def mForgetDir(aState, aDir):
+
+        _prefix = aDir.rstrip(os.sep) + os.sep
+        for _table in (aState["dirs"], aState["entries"]):
+            for _dir in [_dir for _dir in _table if _dir == aDir or _dir.startswith(_prefix)]:
+                del _table[_dir]
+
+    def mCandidates(self, aPolicy, aState, aNow):
+        """ Entries over the age or the count limit, the oldest first """
+
+        _entries = sorted([(os.path.join(_dir, _name), _info)
+                           for _dir, _names in aState["entries"].items()
+                           for _name, _info in _names.items()], key=lambda _item: _item[1][0])
+        _candidates = []
+
+        _excess = 0
+        if aPolicy.mGetMaxFiles() is not None:
+            _excess = max(0, len(_entries) - aPolicy.mGetMaxFiles())
+
+        for _idx, (_path, _info) in enumerate(_entries):
+            _old = aPolicy.mGetMaxAge() is not None and aNow - _info[0] > aPolicy.mGetMaxAge()
+            if _idx < _excess or _old:
+                _candidates.append((_path, _idx < _excess))
+            else:
+                # Sorted by mtime: no older entry left
+                break
+
+        return _candidates
+
+    def mApply(self, aPolicy, aState, aReport, aDeadline):
+
+        _now = time.time()
+
+        for _path, _overCount in self.mCandidates(aPolicy, aState, _now):
+
+            if time.monotonic() > aDeadline:
+                aReport["complete"] = False
+                break
+
+            _names = aState["entries"].get(os.path.dirname(_path), {})
+            _name = os.path.basename(_path)
+            try:
+                _st = os.lstat(_path)
+            except OSError:
+                _names.pop(_name, None)
+                continue
+
+            _names[_name] = [_st.st_mtime, _names[_name][1]]
+            # Written again since it was indexed
+            if not _overCount and _now - _st.st_mtime <= aPolicy.mGetMaxAge():
+                continue
+            if not aPolicy.mAccept(_path):
+                aReport["skipped"] += 1
+                continue
+
+            _isdir = stat.S_ISDIR(_st.st_mode)
+            _size = self.mDiskUsage(_path) if _isdir else _st.st_size
+            self.__throttle.mConsume(1, _size)
+
+            try:
+                if aPolicy.mGetArchiveDir():
+                    self.mArchive(_path, aPolicy.mGetArchiveDir(), _isdir)
+                    aReport["archived"] += 1
+                elif _isdir:
+                    shutil.rmtree(_path)
+                    aReport["removed"] += 1
+                else:
+                    os.remove(_path)
+                    aReport["removed"] += 1
+                aReport["bytes"] += _size
+                _names.pop(_name, None)
+                ebLogTrace(f"Cleanup policy {aPolicy.mGetName()}: {_path} {'archived' if aPolicy.mGetArchiveDir() else 'removed'}")
+
+            except Exception as e:
+                aReport["errors"] += 1
+                ebLogWarn(f"Error: {e} encountered while cleaning {_path}. Continue to process next entry.")
+                ebLogTrace(traceback.format_exc())
+
+    def mDiskUsage(self, aDir):
+
+        _size = 0
+        for _root, _, _files in os.walk(aDir):
+            for _file in _files:
+                try:
+                    _size += os.lstat(os.path.join(_root, _file)).st_size
+                except OSError:
+                    pass
+                self.__throttle.mConsume()
+        return _size
+
+    @staticmethod
+    def mArchive(aPath, aArchiveDir, aIsDir):
+
+        os.makedirs(aArchiveDir, exist_ok=True)
+        _target = os.path.join(aArchiveDir, os.path.basename(aPath))
+        if os.path.isdir(_target) and not os.path.islink(_target):
+            shutil.rmtree(_target)
+        elif os.path.lexists(_target):
+            os.remove(_target)
+
+        if aIsDir:
+            shutil.move(aPath, _target)
+        else:
+            shutil.copy2(aPath, _target)
+            os.remove(aPath)
+
+    def mRunPolicy(self, aPolicy):
+
+        _start = time.monotonic()
+        _deadline = _start + self.__timeBudget
+        _state = self.mLoadState(aPolicy)
+        _report = {"dirs_listed": 0, "dirs_unchanged": 0, "entries_new": 0, "removed": 0,
+                   "archived": 0, "skipped": 0, "errors": 0, "bytes": 0,
+                   "resumed": bool(_state["pending"]), "complete": True}
+
+        try:
+            self.mScan(aPolicy, _state, _report, _deadline)
+            self.mApply(aPolicy, _state, _report, _deadline)
+        finally:
+            _report["entries"] = sum([len(_names) for _names in _state["entries"].values()])
+            _report["seconds"] = round(time.monotonic() - _start, 3)
+            _state["report"] = _report
+            self.mSaveState(aPolicy, _state)
+
+        ebLogInfo(f"Cleanup policy {aPolicy.mGetName()}: {_report['removed']} removed, "
+                  f"{_report['archived']} archived, {_report['bytes']} bytes reclaimed, "
+                  f"{_report['errors']} errors; {_report['dirs_listed']} directories listed, "
+                  f"{_report['dirs_unchanged']} unchanged, {_report['entries']} entries tracked "
+                  f"in {_report['seconds']}s{'' if _report['complete'] else ' (budget exhausted, resumes next run)'}")
+        return _report
+
+    def mRun(self, aPolicies):
+        """ Apply aPolicies in order, returns {policy name: report} """
+
+        self.mLowerPriority()
+
+        _reports = {}
+        for _policy in aPolicies:
+            try:
+                _reports[_policy.mGetName()] = self.mRunPolicy(_policy)
+            except Exception as e:
+                ebLogError(f"Cleanup policy {_policy.mGetName()} failed: {e}")
+                ebLogError(traceback.format_exc())
+
+        _bytes = sum([_report["bytes"] for _report in _reports.values()])
+        ebLogInfo(f"Cleanup engine: {_bytes} bytes reclaimed by {len(_reports)} policies, "
+                  f"{self.__throttle.mGetSlept():.1f}s throttled")
+        return _reports
+
+# end of file
@@ -11,6 +11,8 @@ NOTE:
     None
 
     MODIFIED   (MM/DD/YY)
+    jydas       10/18/26 - Incremental cleanup (cleanup_engine) when
+                           cleanup_engine_enabled is set
     aypaul      04/16/26 - Bug#38900303 Fix codev identified issues.
 
 """
@@ -24,6 +26,7 @@ from exabox.log.LogMgr import ebLogInit, ebLogInfo, ebLogTrace
 
 from exabox.ovm.cluincident import TFACTL_PREFIX
 from exabox.ovm.kvmcpumgr import CPULOG_DIR
+from exabox.scheduleJobs.cleanup_engine import ebCleanupEngine, ebCleanupEngineEnabled, ebCleanupPolicy
 
 class CleanUpIncidentTarAndZipFiles():
 
@@ -51,6 +54,27 @@ class CleanUpIncidentTarAndZipFiles():
         self.__tfactl_zipfiles_limit = int(get_gcontext().mGetConfigOptions().get("tfactl_zip_files_limit", "20"))
         self.__cpuresize_diagfiles_limit = int(get_gcontext().mGetConfigOptions().get("cpuresize_diag_files_limit", "20"))
 
+    def mGetCleanupPolicies(self):
+
+        _exacloud_log_dir = os.path.join(self.__exacloudPath, "log")
+        _cpuresize = ebCleanupPolicy("cpuresize_diag", os.path.join(_exacloud_log_dir, CPULOG_DIR), ("*tar*",),
+                                     aMinDepth=2, aMaxDepth=2, aMaxFiles=self.__cpuresize_diagfiles_limit)
+        _tfactl = ebCleanupPolicy("tfactl_zip", os.path.join(_exacloud_log_dir, "tfactl_logs"),
+                                  (f"{TFACTL_PREFIX}*.zip",), aMaxDepth=1, aMaxFiles=self.__tfactl_zipfiles_limit)
+
+        # Files of the two policies above are not incident archives
+        def _mExclude(aPath):
+            return _cpuresize.mMatches(aPath) or _tfactl.mMatches(aPath)
+
+        return [
+            _tfactl,
+            _cpuresize,
+            ebCleanupPolicy("incident_tar", _exacloud_log_dir, ("*.tar*",),
+                            aMaxFiles=self.__incident_zipfiles_limit, aExclude=_mExclude),
+            ebCleanupPolicy("incident_zip", _exacloud_log_dir, ("*.zip",),
+                            aMaxFiles=self.__incident_zipfiles_limit, aExclude=_mExclude),
+        ]
+
     def mExecuteJob(self):
 
         _exacloud_log_dir = os.path.join(self.__exacloudPath, "log")
@@ -59,6 +83,10 @@ class CleanUpIncidentTarAndZipFiles():
         ebLogInfo(f"Tfactl zip files limit is {self.__tfactl_zipfiles_limit}")
         ebLogInfo(f"Cpuresize diagnostic files limit is {self.__cpuresize_diagfiles_limit}")
 
+        if ebCleanupEngineEnabled():
+            ebCleanupEngine(self.__exacloudPath).mRun(self.mGetCleanupPolicies())
+            return
+
         _tar_files = []
         _zip_files = []
         _tfactl_zip_files = []
@@ -16,6 +16,8 @@
 #      <other useful comments, qualifications, etc.>
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Incremental cleanup (cleanup_engine) when
+#                           cleanup_engine_enabled is set
 #    aararora    04/17/26 - Bug 39097556: Tar the contents under folders being
 #                           added to exacloud log archive directory
 #    aypaul      04/16/26 - Bug#38900303 Fix codev identified issues.
@@ -51,6 +53,7 @@ from exabox.core.Core import exaBoxCoreInit
 from exabox.log.LogMgr import ebLogInit, ebLogInfo, ebLogWarn, ebLogError, ebLogTrace
 from exabox.core.DBStore import ebGetDefaultDB
 from exabox.utils.common import exception_handler_decorator
+from exabox.scheduleJobs.cleanup_engine import ebCleanupEngine, ebCleanupEngineEnabled, ebCleanupPolicy
 
 
 class CleanUpLogFiles():
@@ -215,6 +218,34 @@ class CleanUpLogFiles():
                 ebLogError(f"Error: {e} encountered while archiving/removing contents from {_absolute_log_archive_directory}")
                 ebLogError(traceback.format_exc())
 
+    def mGetCleanupPolicies(self, aDB):
+        """ Policies of the cleanup engine equivalent to the scans of mExecuteJob """
+
+        def _mRequestDone(aPath):
+            try:
+                _resultSet = aDB.mGetRequest(str(os.path.basename(aPath).split("_")[0]))
+                return _resultSet is None or _resultSet[1] == "Done"
+            except Exception as ex:
+                ebLogWarn(f"Error: {ex} encountered while checking the request of {aPath}. Continue to process next file.")
+                return False
+
+        _oeda_request_archive_directory = os.path.join(self.__log_file_archive_directory, "oeda_requests")
+        return [
+            ebCleanupPolicy("log_threads", os.path.join(self.__exacloudPath, "log/threads"),
+                            ('*.log*', '*.trc*', '*.err*', '*.xml*'),
+                            aMaxAgeSec=self.__log_file_persist_duration_hrs * 3600,
+                            aArchiveDir=self.__log_file_archive_directory, aFilter=_mRequestDone),
+            ebCleanupPolicy("log_workers", os.path.join(self.__exacloudPath, "log/workers"),
+                            ('*.log.*', '*.trc.*', '*.err.*'),
+                            aMaxAgeSec=0, aArchiveDir=self.__log_file_archive_directory),
+            ebCleanupPolicy("oeda_requests_tar", os.path.join(self.__exacloudPath, "oeda/requests"),
+                            ('*.tar*',), aMaxDepth=1, aMaxAgeSec=0,
+                            aArchiveDir=_oeda_request_archive_directory),
+            ebCleanupPolicy("oeda_requests_bak_tar", os.path.join(self.__exacloudPath, "oeda/requests.bak"),
+                            ('*.tar*',), aMaxDepth=1, aMaxAgeSec=0,
+                            aArchiveDir=_oeda_request_archive_directory),
+        ]
+
     @exception_handler_decorator
     def mExecuteJob(self):
 
@@ -231,6 +262,12 @@ class CleanUpLogFiles():
         ebLogInfo(f"First checking and removing archive log directories from {_log_base_archive_directory} older than {self.__log_archive_cleanup_age_limit_in_days} days.")
         self.mCleanupExacloudLogArchiveDirectory(_log_base_archive_directory)
 
+        if ebCleanupEngineEnabled():
+            # Only the entries new since the previous run are visited
+            ebCleanupEngine(self.__exacloudPath).mRun(self.mGetCleanupPolicies(aDB))
+            self.mArchiveLogDirectories(_log_base_archive_directory)
+            return
+
         _move_files = False
         if self.__log_file_archive_directory is not None:
             ebLogInfo("Moving all log files older than {0} hours to {1} directory.".format(self.__log_file_persist_duration_hrs, self.__log_file_archive_directory))
@@ -11,6 +11,8 @@ NOTE:
     None
 
     MODIFIED   (MM/DD/YY)
+    jydas       10/18/26 - Incremental cleanup (cleanup_engine) when
+                           cleanup_engine_enabled is set
     aypaul      04/16/26 - Bug#38900303 Fix codev identified issues.
 
 """
@@ -27,6 +29,7 @@ from exabox.core.Context import get_gcontext
 from exabox.core.Core import exaBoxCoreInit
 from exabox.log.LogMgr import ebLogInit, ebLogInfo, ebLogError, ebLogWarn, ebLogTrace
 from exabox.utils.common import exception_handler_decorator
+from exabox.scheduleJobs.cleanup_engine import ebCleanupEngine, ebCleanupEngineEnabled, ebCleanupPolicy
 
 
 class CleanUpOedaRequests():
@@ -154,19 +157,8 @@ class CleanUpOedaRequests():
 
         """
         requests = []
-        requests_backup_dir = ""
+        requests_backup_dir = self.mGetRequestsBakDir()
 
-        # Fetch the path for the requests.bak from exabox.conf
-        _requests_backup_path = get_gcontext().mGetConfigOptions().get("oeda_archive_requests_path", "")
-        
-        # If the path provided is not valid then create one
-        if _requests_backup_path == "":
-            ebLogInfo(f"Missing oeda_archive_requests_path parameter from exabox.conf. Setting it to default oeda/requests.bak")
-            requests_backup_dir = os.path.join(self.__exacloudPath, "oeda/requests.bak")
-        else:
-            requests_backup_dir = os.path.join(self.__exacloudPath, _requests_backup_path)
-            ebLogInfo(f"oeda_archive_requests_path parameter from exabox.conf: {_requests_backup_path}. Backup directory to be checked: {requests_backup_dir}")
-        
         # Fetch all the entries inside requests.bak directory, store them inside a list and return it
         try:
             if os.path.exists(requests_backup_dir):
@@ -183,6 +175,34 @@ class CleanUpOedaRequests():
         return requests
 
 
+    def mGetRequestsBakDir(self):
+        """
+            Description:
+                This class method returns the path of the requests.bak directory, from oeda_archive_requests_path in exabox.conf
+                or oeda/requests.bak by default
+
+            Args:
+                self: Instance of the class calling this method.
+
+            Returns:
+                requests_backup_dir: The path of the requests.bak directory
+        """
+        requests_backup_dir = ""
+
+        # Fetch the path for the requests.bak from exabox.conf
+        _requests_backup_path = get_gcontext().mGetConfigOptions().get("oeda_archive_requests_path", "")
+        
+        # If the path provided is not valid then create one
+        if _requests_backup_path == "":
+            ebLogInfo(f"Missing oeda_archive_requests_path parameter from exabox.conf. Setting it to default oeda/requests.bak")
+            requests_backup_dir = os.path.join(self.__exacloudPath, "oeda/requests.bak")
+        else:
+            requests_backup_dir = os.path.join(self.__exacloudPath, _requests_backup_path)
+            ebLogInfo(f"oeda_archive_requests_path parameter from exabox.conf: {_requests_backup_path}. Backup directory to be checked: {requests_backup_dir}")
+
+        return requests_backup_dir
+
+
     def mCheckAndMoveOldOedaRequests(self, requests):
         """ 
             Description:
@@ -244,6 +264,14 @@ class CleanUpOedaRequests():
             ebLogInfo("Skipping CleanUpOedaRequests process since oeda_request_archive_directory cannot be found")
             return
 
+        if ebCleanupEngineEnabled():
+            # requests.bak entries, files and folders, moved like mCheckAndMoveOldOedaRequests does
+            _policy = ebCleanupPolicy("oeda_requests_bak", self.mGetRequestsBakDir(), ("*",), aMaxDepth=1, aDirs=True,
+                                      aMaxAgeSec=self.__max_seconds, aArchiveDir=self.__oeda_request_archive_directory)
+            ebCleanupEngine(self.__exacloudPath).mRun([_policy])
+            ebLogInfo("Schedule Oeda Requests Done")
+            return
+
         requests = self.mFetchEntriesInRequestsBakDir()
             
         if requests:
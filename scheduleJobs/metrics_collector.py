@@ -12,6 +12,7 @@ NOTE:
 
 History:
     MODIFIED   (MM/DD/YY)
+    jydas       10/18/26 - Persist the hot path metrics (ec_hotpath_metric)
     aypaul      04/16/26 - Bug#38900303 Fix codev identified issues.
     shapatna    06/21/24 - Adding in methods for adding 'metrics_collector' scheduler job
     shapatna    06/14/24 - Bug 36732867: Create File
@@ -22,6 +23,7 @@ from exabox.core.Context import get_gcontext
 from exabox.core.Core import exaBoxCoreInit
 from exabox.log.LogMgr import ebLogInfo, ebLogInit
 from exabox.core.DBStore import ebGetDefaultDB
+from exabox.core.Metrics import ebMetricsEnabled
 import os
 import json
 
@@ -65,6 +67,11 @@ class MetricsCollector():
             This method first fetches in the selected metrics, calculates their values and then pushes the respective values to the database
         '''
         _functionNames = self.mParseConfig()
+        if ebMetricsEnabled():
+            # Hot path metrics are persisted whenever the registry is enabled
+            _functionNames.setdefault("ec_hotpath_metric", [])
+            if "mGetHotPathMetrics" not in _functionNames["ec_hotpath_metric"]:
+                _functionNames["ec_hotpath_metric"].append("mGetHotPathMetrics")
         ebLogInfo("*** Entering the execution of metrics_collector job ***")
         aMetric = ebExacloudSysMetrics()
         ebLogInfo(aMetric.mInsertUpdatedDataIntoDb(_functionNames))
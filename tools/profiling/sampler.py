@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+#
+# $Header: ecs/exacloud/exabox/tools/profiling/sampler.py /main/1 2026/10/18 10:00:00 jydas Exp $
+#
+# sampler.py
+#
+# Copyright (c) 2026, Oracle and/or its affiliates.
+#
+#    NAME
+#      sampler.py - Sampling profiler of the requests run by a worker.
+#
+#    DESCRIPTION
+#      A thread samples the stacks of the other threads of the process
+#      (sys._current_frames, like core/Threads.ebThreadMonitor) and counts
+#      them per csstep or patching stage in collapsed format:
+#
+#          <stage>;<thread>;<file>:<function>;...;<file>:<function> <count>
+#
+#      which is the input of flamegraph.pl and of most flame graph viewers.
+#      The samples are stored in the profiler table (profiler_type
+#      'samples') when the request ends and returned by the profiler
+#      endpoint with "flamegraph": true.
+#
+#    NOTES
+#      Opt-in per request: the UUID is listed in 'sampling_profiler_uuids'
+#      (comma separated, 'all' for every request) or the request is
+#      submitted with sampling_profiler=True. Tunables:
+#        sampling_profiler_hz         samples per second (20)
+#        sampling_profiler_max_depth  frames kept per stack, from the leaf (64),
+#                                     the root of a deeper stack is replaced
+#                                     by SAMPLER_TRUNCATED
+#      Only the threads of the worker process are sampled, the forked
+#      ProcessManager processes are not.
+#
+#    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Keep the leaf frames of the stacks deeper than
+#                           sampling_profiler_max_depth
+#    jydas       10/18/26 - Creation
+#
+
+import os
+import sys
+import json
+import time
+import threading
+
+from exabox.core.Context import get_gcontext
+from exabox.log.LogMgr import ebLogInfo, ebLogWarn
+
+SAMPLER_HZ             = 20
+SAMPLER_MAX_DEPTH      = 64
+SAMPLER_NO_STAGE       = "NO_STAGE"
+SAMPLER_TRUNCATED      = "[truncated]"
+SAMPLER_PROFILER_TYPE  = "samples"
+# Stay below the 64KB of the TEXT column of profiler.details
+SAMPLER_ROW_BYTES      = 48000
+# Background threads of the process, their samples are only noise
+SAMPLER_IGNORED_THREADS = frozenset(["ebLogAsyncWriter", "ebMetricsDumper"])
+
+gSamplingProfiler = None
+gSamplingStage = None
+
+
+class ebSamplingProfiler(threading.Thread):
+
+    def __init__(self, aUuid, aHz=SAMPLER_HZ, aMaxDepth=SAMPLER_MAX_DEPTH):
+
+        super().__init__(name="ebSamplingProfiler", daemon=True)
+        self.__uuid = aUuid
+        self.__interval = 1.0 / max(1, aHz)
+        self.__maxDepth = max(1, aMaxDepth)
+        self.__stop = threading.Event()
+        self.__lock = threading.Lock()
+        # stage -> {collapsed stack -> count}
+        self.__stacks = {}
+        # stage -> [first sample, last sample]
+        self.__times = {}
+        # code object -> "file:function"
+        self.__labels = {}
+        self.__samples = 0
+        self.__overhead = 0.0
+
+    def mGetUuid(self):
+        return self.__uuid
+
+    def mGetInterval(self):
+        return self.__interval
+
+    def mGetSampleCount(self):
+        return self.__samples
+
+    def mGetOverhead(self):
+        """ Seconds spent sampling """
+        return self.__overhead
+
+    def mLabel(self, aCode):
+
+        _label = self.__labels.get(aCode)
+        if _label is None:
+            _label = f"{os.path.basename(aCode.co_filename)}:{aCode.co_name}"
+            self.__labels[aCode] = _label
+        return _label
+
+    def mCollapse(self, aFrame):
+        """ Frames of aFrame from the root, ';' separated, at most maxDepth from the leaf """
+
+        _frames = []
+        while aFrame is not None and len(_frames) < self.__maxDepth:
+            _frames.append(self.mLabel(aFrame.f_code))
+            aFrame = aFrame.f_back
+        if aFrame is not None:
+            _frames.append(SAMPLER_TRUNCATED)
+        _frames.reverse()
+        return ";".join(_frames)
+
+    def mSample(self, aStage=None):
+
+        _start = time.perf_counter()
+        _stage = aStage or gSamplingStage or SAMPLER_NO_STAGE
+        _names = {_thread.ident: _thread.name for _thread in threading.enumerate()}
+        _self = threading.get_ident()
+        _now = time.time()
+
+        with self.__lock:
+            _stacks = self.__stacks.setdefault(_stage, {})
+            for _ident, _frame in sys._current_frames().items():
+                _name = _names.get(_ident, str(_ident))
+                if _ident == _self or _name in SAMPLER_IGNORED_THREADS:
+                    continue
+                _key = f"{_name};{self.mCollapse(_frame)}"
+                _stacks[_key] = _stacks.get(_key, 0) + 1
+
+            _times = self.__times.setdefault(_stage, [_now, _now])
+            _times[1] = _now
+            self.__samples += 1
+            self.__overhead += time.perf_counter() - _start
+
+    def run(self):
+        while not self.__stop.wait(self.__interval):
+            try:
+                self.mSample()
+            except Exception:
+                # Never break the request for the profiler
+                pass
+
+    def mStop(self):
+        self.__stop.set()
+        if self.is_alive() and self is not threading.current_thread():
+            self.join(5)
+
+    def mGetStacks(self):
+        with self.__lock:
+            return {_stage: dict(_stacks) for _stage, _stacks in self.__stacks.items()}
+
+    def mGetTimes(self):
+        with self.__lock:
+            return {_stage: list(_times) for _stage, _times in self.__times.items()}
+
+    def mGetCollapsed(self):
+        """ Collapsed stacks, one '<stage>;<stack> <count>' line per stack """
+        return ebSamplingToCollapsed(self.mGetStacks())
+
+    def mChunkRows(self):
+        """ (stage, first sample, last sample, stacks) with stacks small enough for a DB row """
+
+        _rows = []
+        _times = self.mGetTimes()
+        for _stage, _stacks in self.mGetStacks().items():
+            _chunk = {}
+            _size = 0
+            for _stack, _count in sorted(_stacks.items(), key=lambda _item: -_item[1]):
+                _entry = len(json.dumps(_stack)) + 12
+                if _chunk and _size + _entry > SAMPLER_ROW_BYTES:
+                    _rows.append((_stage, _times[_stage][0], _times[_stage][1], _chunk))
+                    _chunk = {}
+                    _size = 0
+                _chunk[_stack] = _count
+                _size += _entry
+            if _chunk:
+                _rows.append((_stage, _times[_stage][0], _times[_stage][1], _chunk))
+        return _rows
+
+
+def ebSamplingToCollapsed(aStacks):
+    """ {stage: {stack: count}} -> collapsed lines sorted by stage and stack """
+
+    _lines = []
+    for _stage in sorted(aStacks):
+        for _stack, _count in sorted(aStacks[_stage].items()):
+            _lines.append(f"{_stage};{_stack} {_count}")
+    return _lines
+
+
+def ebSamplingSetStage(aStage):
+    """ Current csstep or patching stage, the next samples are attributed to it """
+
+    global gSamplingStage
+    gSamplingStage = aStage
+
+
+def ebSamplingGetStage():
+    return gSamplingStage
+
+
+def ebSamplingEnabled(aUuid, aParams=None):
+
+    _params = aParams or {}
+    _jconf = _params.get('jsonconf') or {}
+    for _value in (_params.get('sampling_profiler'), _jconf.get('sampling_profiler') if isinstance(_jconf, dict) else None):
+        if str(_value).lower() == 'true':
+            return True
+
+    _uuids = get_gcontext().mCheckConfigOption('sampling_profiler_uuids') or ""
+    _uuids = [_uuid.strip() for _uuid in str(_uuids).split(",") if _uuid.strip()]
+    return "all" in _uuids or aUuid in _uuids
+
+
+def ebSamplingProfilerStart(aUuid, aParams=None):
+    """
+    Start the sampling of the request aUuid when it is enabled for it.
+    Returns the profiler or None.
+    """
+
+    global gSamplingProfiler
+
+    try:
+        if not ebSamplingEnabled(aUuid, aParams):
+            return None
+
+        def _mIntOption(aName, aDefault):
+            _value = get_gcontext().mCheckConfigOption(aName)
+            try:
+                return int(_value) if _value is not None else aDefault
+            except ValueError:
+                return aDefault
+
+        ebSamplingProfilerStop(aStore=False)
+        ebSamplingSetStage(None)
+        gSamplingProfiler = ebSamplingProfiler(aUuid, _mIntOption('sampling_profiler_hz', SAMPLER_HZ),
+                                               _mIntOption('sampling_profiler_max_depth', SAMPLER_MAX_DEPTH))
+        gSamplingProfiler.start()
+        ebLogInfo(f"*** Sampling profiler started for {aUuid} every {gSamplingProfiler.mGetInterval()}s")
+        return gSamplingProfiler
+
+    except Exception as e:
+        ebLogWarn(f"Sampling profiler not started: {e}")
+        return None
+
+
+def ebSamplingProfilerStop(aStore=True, aCmdType=""):
+    """ Stop the profiler of the process and store its samples in the profiler table """
+
+    global gSamplingProfiler
+
+    _profiler = gSamplingProfiler
+    if _profiler is None:
+        return None
+
+    gSamplingProfiler = None
+    _profiler.mStop()
+    ebSamplingSetStage(None)
+
+    ebLogInfo(f"*** Sampling profiler of {_profiler.mGetUuid()}: {_profiler.mGetSampleCount()} samples, "
+              f"{_profiler.mGetOverhead():.3f}s spent sampling")
+
+    if aStore:
+        try:
+            ebSamplingStore(_profiler, aCmdType)
+        except Exception as e:
+            # Profiling data is never worth failing the request
+            ebLogWarn(f"Could not store the sampling profiler data: {e}")
+
+    return _profiler
+
+
+def ebSamplingStore(aProfiler, aCmdType=""):
+
+    # Avoid cyclical dependency
+    from exabox.core.DBStore import ebGetDefaultDB
+    from exabox.tools.profiling.stepwise import create_profile_info
+
+    def _mRegEntry(aName):
+        if get_gcontext().mCheckRegEntry(aName):
+            return get_gcontext().mGetRegEntry(aName) or ""
+        return ""
+
+    _db = ebGetDefaultDB()
+    _db.mCreateProfilerTable()
+
+    _details = {"interval_ms": round(aProfiler.mGetInterval() * 1000, 3)}
+    for _stage, _first, _last, _stacks in aProfiler.mChunkRows():
+        _details["stacks"] = _stacks
+        _pi = create_profile_info(
+            _stage,
+            SAMPLER_PROFILER_TYPE,
+            _first,
+            _last,
+            aProfiler.mGetUuid(),
+            _mRegEntry("workflow_id"),
+            _mRegEntry("exaunit_id"),
+            aCmdType,
+            _details,
+            _mRegEntry("undo"),
+        )
+        # Frames named after OEDA are still exacloud code
+        _pi.mSetComponent("EXACLOUD")
+        _db.mInsertProfiler(_pi)
+
+# end of file
@@ -17,6 +17,8 @@
 #        with all the default checks enabled.
 #
 #    MODIFIED   (MM/DD/YY)
+#    jydas       10/18/26 - Add node_exec_cmd_many() fan-out executor
+#    jydas       10/18/26 - Add streaming execution and node_iter_cmd_lines()
 #    avimonda    04/08/26 - Bug 39084339: Add PATH fallback for node cmd lookup
 #    jesandov    09/30/25 - 36206155: Add log of strerr and stdout on error
 #    aypaul      09/17/25 - Bug#38440580 Revert changes for add defunct childs
@@ -63,12 +65,16 @@ Auxiliary functions for remote node operations.
 
 import itertools
 import os
+import threading
 import psutil
 import signal
 import time
+from concurrent.futures import (CancelledError, Future, ThreadPoolExecutor,
+                                as_completed)
 from contextlib import contextmanager
 from functools import wraps
-from typing import Generator, Mapping, NamedTuple, Optional, Sequence
+from typing import (Callable, Dict, Generator, Iterator, Mapping, NamedTuple,
+                    Optional, Sequence, Tuple, Union)
 
 from exabox.core.Context import exaBoxContext, get_gcontext
 from exabox.core.Error import ExacloudRuntimeError
@@ -77,6 +83,11 @@ from exabox.log.LogMgr import ebLogError, ebLogWarn, ebLogInfo, ebLogTrace
 
 UNIX_SUCCESS_CODE = 0
 PROCESS_KILLED_WAITTIME = 5
+# Exit codes reported by node_exec_cmd_many() for hosts where the command
+# could not run: connection failure (ssh(1) convention) and fail-fast skip.
+NODE_CONNECT_ERROR_CODE = 255
+NODE_CANCELLED_CODE = -1
+NODE_FANOUT_DEFAULT_WORKERS = 16
 
 # Public API
 __all__ = [
@@ -87,6 +98,9 @@ __all__ = [
     'node_connect_to_host',
     'node_exec_cmd',
     'node_exec_cmd_check',
+    'node_exec_cmd_many',
+    'node_iter_cmd_lines',
+    'node_iter_exec_cmd_many',
     'node_list_process',
     'node_read_text_file',
     'node_update_key_val_file',
@@ -369,7 +383,10 @@ def node_exec_cmd(  # pylint: disable=too-many-arguments
         log_error: bool = False,
         log_stdout_on_error: bool = False,
         check_error: bool = False,
-        timeout: Optional[int] = None) -> CmdRet:
+        timeout: Optional[int] = None,
+        stream: bool = False,
+        stdout_callback: Optional[Callable[[bytes], None]] = None,
+        stderr_callback: Optional[Callable[[bytes], None]] = None) -> CmdRet:
     """Execute a command in a node.
 
     Just a convenient wrapper around node.mExecuteCmd() that returns the
@@ -379,6 +396,10 @@ def node_exec_cmd(  # pylint: disable=too-many-arguments
     On error, if log_error or log_warning is True, an error/warning will be
     logged (if log_error=True, log_warning is ignored).
 
+    If stream=True or any callback is given, the command is run with the
+    event driven execution, which drains the output while the command runs
+    (no 2MB output limit) and passes every chunk to the callbacks.
+
     :param node: node where to execute the command.
     :param cmd: command to execute.
     :param log_warning: whether log a warning if the command failed.
@@ -386,6 +407,9 @@ def node_exec_cmd(  # pylint: disable=too-many-arguments
     :param log_stdout_on_error: whether to add stdout to the logged error.
     :param check_error: whether raise an exception if command failed.
     :param timeout: seconds for command execution timeout.
+    :param stream: whether to use the event driven execution.
+    :param stdout_callback: callable receiving the stdout chunks (bytes).
+    :param stderr_callback: callable receiving the stderr chunks (bytes).
     :returns: tuple with command's (exit_code, stdout, stderr)
     :raises ExacloudRuntimeError: if an error occurred.
     """
@@ -396,7 +420,12 @@ def node_exec_cmd(  # pylint: disable=too-many-arguments
     err = None
 
     try:
-        _stdin, stdout, stderr = node.mExecuteCmd(cmd, aTimeout=timeout)
+        if stream or stdout_callback or stderr_callback:
+            _stdin, stdout, stderr = node.mExecuteCmd(
+                cmd, aTimeout=timeout, aStdoutCallback=stdout_callback,
+                aStderrCallback=stderr_callback, aStream=True)
+        else:
+            _stdin, stdout, stderr = node.mExecuteCmd(cmd, aTimeout=timeout)
         ret = node.mGetCmdExitStatus()
         if stdout:
             out = stdout.read()
@@ -448,6 +477,205 @@ def node_exec_cmd_check(
         timeout=timeout)
 
 
+def node_iter_cmd_lines(
+        node: exaBoxNode,
+        cmd: str,
+        timeout: Optional[int] = None) -> Iterator[Tuple[bool, str]]:
+    """Execute a command in a node and iterate over its output lines.
+
+    Lines are yielded as soon as the remote command produces them, so large
+    outputs (log dumps, cellcli listings) can be processed without keeping
+    them in memory.  The exit code is available through
+    node.mGetCmdExitStatus() once the iterator is exhausted.
+
+    Example:
+
+        for is_stderr, line in node_iter_cmd_lines(node, "cellcli -e ..."):
+            ...
+
+    :param node: node where to execute the command.
+    :param cmd: command to execute.
+    :param timeout: seconds for command execution timeout.
+    :returns: iterator of (is_stderr, line) tuples, lines keep their EOL.
+    """
+    return node.mIterExecuteCmd(cmd, aTimeout=timeout)
+
+
+def _node_fanout_max_workers(hosts_count: int,
+                             max_workers: Optional[int] = None) -> int:
+    """Size of the thread pool used to fan out a command to hosts_count."""
+    if not max_workers:
+        max_workers = NODE_FANOUT_DEFAULT_WORKERS
+        _conf = get_gcontext().mCheckConfigOption('node_fanout_max_workers')
+        if _conf:
+            max_workers = int(_conf)
+    return max(1, min(hosts_count, max_workers))
+
+
+def _node_exec_cmd_on_host(  # pylint: disable=too-many-arguments
+        hostname: str,
+        cmd: str,
+        ctx: exaBoxContext,
+        username: Optional[str],
+        timeout: Optional[int],
+        connect_timeout: Optional[int],
+        cancelled: threading.Event) -> CmdRet:
+    """Connect to a host and run cmd on it, never raises."""
+    if cancelled.is_set():
+        return CmdRet(NODE_CANCELLED_CODE, '', 'Cancelled (fail-fast)')
+    try:
+        with connect_to_host(hostname, ctx, username,
+                             connect_timeout) as node:
+            return node_exec_cmd(node, cmd, timeout=timeout)
+    except Exception as e:  # pylint: disable=broad-except
+        ebLogWarn(f'Could not run command on host={hostname}: {e}')
+        return CmdRet(NODE_CONNECT_ERROR_CODE, '', str(e))
+
+
+def node_iter_exec_cmd_many(  # pylint: disable=too-many-arguments
+        hosts: Sequence[str],
+        cmd: str,
+        ctx: Optional[exaBoxContext] = None,
+        username: Optional[str] = None,
+        timeout: Union[None, int, Mapping[str, int]] = None,
+        connect_timeout: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        fail_fast: bool = False,
+        ordered: bool = True) -> Iterator[Tuple[str, CmdRet]]:
+    """Execute a command in several hosts concurrently.
+
+    Every host gets its own connection from a bounded thread pool (when the
+    SSH transport pool is enabled the connections reuse the shared
+    transports).  Results are yielded as (hostname, CmdRet) tuples, either in
+    the order of 'hosts' (ordered=True) or as soon as each host finishes
+    (ordered=False).  Duplicated hosts are executed only once.
+
+    Errors never raise: a host that cannot be reached reports
+    NODE_CONNECT_ERROR_CODE with the error in stderr.  With fail_fast=True,
+    the first failure cancels the hosts that did not start yet, which report
+    NODE_CANCELLED_CODE.
+
+    :param hosts: FQDNs of the hosts where to execute the command.
+    :param cmd: command to execute.
+    :param ctx: exaBoxContext for the connections (global one by default).
+    :param username: username to connect as.
+    :param timeout: seconds for command execution timeout, either for all
+        the hosts or as a mapping hostname -> seconds.
+    :param connect_timeout: seconds for connection timeout.
+    :param max_workers: maximum number of concurrent hosts (config
+        node_fanout_max_workers, 16 by default).
+    :param fail_fast: whether to stop scheduling hosts on first failure.
+    :param ordered: whether to yield results in the order of 'hosts'.
+    :returns: iterator of (hostname, CmdRet) tuples.
+    """
+    _hosts = list(dict.fromkeys(hosts))
+    if not _hosts:
+        return
+
+    _ctx = ctx if ctx is not None else get_gcontext()
+    _cancelled = threading.Event()
+    _futures: Dict[Future, str] = {}
+
+    def _on_done(future: Future) -> None:
+        # Runs on a worker thread while _futures may still be filled: only
+        # flag the failure, the submitting thread cancels the futures.
+        if not fail_fast or future.cancelled():
+            return
+        if (future.exception() is not None
+                or future.result().exit_code != UNIX_SUCCESS_CODE):
+            _cancelled.set()
+
+    def _cancel_pending() -> None:
+        for _pending in _futures:
+            _pending.cancel()
+
+    def _result(future: Future) -> CmdRet:
+        try:
+            return future.result()
+        except CancelledError:
+            return CmdRet(NODE_CANCELLED_CODE, '', 'Cancelled (fail-fast)')
+        except Exception as e:  # pylint: disable=broad-except
+            return CmdRet(NODE_CONNECT_ERROR_CODE, '', str(e))
+
+    with ThreadPoolExecutor(
+            max_workers=_node_fanout_max_workers(len(_hosts), max_workers),
+            thread_name_prefix='node_exec_cmd_many') as _executor:
+        for _host in _hosts:
+            _timeout = timeout
+            if isinstance(timeout, Mapping):
+                _timeout = timeout.get(_host)
+            _future = _executor.submit(
+                _node_exec_cmd_on_host, _host, cmd, _ctx, username,
+                _timeout, connect_timeout, _cancelled)
+            _futures[_future] = _host
+            _future.add_done_callback(_on_done)
+
+        try:
+            if ordered:
+                for _future, _host in _futures.items():
+                    if _cancelled.is_set():
+                        _cancel_pending()
+                    yield _host, _result(_future)
+            else:
+                for _future in as_completed(_futures):
+                    if _cancelled.is_set():
+                        _cancel_pending()
+                    yield _futures[_future], _result(_future)
+        finally:
+            # Consumer stopped early: do not start the remaining hosts.
+            _cancelled.set()
+            _cancel_pending()
+
+
+def node_exec_cmd_many(  # pylint: disable=too-many-arguments
+        hosts: Sequence[str],
+        cmd: str,
+        ctx: Optional[exaBoxContext] = None,
+        username: Optional[str] = None,
+        timeout: Union[None, int, Mapping[str, int]] = None,
+        connect_timeout: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        fail_fast: bool = False,
+        log_error: bool = False,
+        check_error: bool = False) -> Dict[str, CmdRet]:
+    """Execute a command in several hosts concurrently and aggregate results.
+
+    Convenient wrapper around node_iter_exec_cmd_many() that waits for all
+    the hosts.  If check_error=True, an ExacloudRuntimeError exception is
+    raised if the command failed in any host, with the failing hosts in the
+    message.
+
+    Example:
+
+        results = node_exec_cmd_many(dom0s, "imageinfo -ver")
+        for host, ret in results.items():
+            ...
+
+    See node_iter_exec_cmd_many() for a complete description.
+
+    :returns: dict hostname -> CmdRet, in the order of 'hosts'.
+    :raises ExacloudRuntimeError: if check_error=True and any host failed.
+    """
+    results = dict(node_iter_exec_cmd_many(
+        hosts, cmd, ctx, username, timeout, connect_timeout, max_workers,
+        fail_fast, ordered=True))
+
+    failed = {_host: _ret for _host, _ret in results.items()
+              if _ret.exit_code != UNIX_SUCCESS_CODE}
+    if failed:
+        _detail = '; '.join(
+            f'host={_host} rc={_ret.exit_code} stderr="{_ret.stderr}"'
+            for _host, _ret in failed.items())
+        msg = (f'Remote command execution failed in {len(failed)} of '
+               f'{len(results)} hosts: cmd="{cmd}"; {_detail}')
+        if log_error:
+            ebLogError(msg)
+        if check_error:
+            raise ExacloudRuntimeError(0x10, 0xA, msg)
+
+    return results
+
+
 def node_read_text_file(node: exaBoxNode, file_path: str) -> str:
     """Read content of a text file in a node.
 